@@ -9,6 +9,7 @@ from pathlib import Path
 from werkzeug.utils import secure_filename
 from flask import Flask, render_template, request, jsonify, send_file
 from src.pipeline.pipeline_compat import run_pipeline
+from src.pipeline.support.layer_filter import make_layer_filter
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
@@ -55,7 +56,18 @@ def upload_file():
         job_output_dir = os.path.join(OUTPUT_FOLDER, job_id)
         os.makedirs(job_output_dir, exist_ok=True)
         
-        result = run_pipeline(filepath, out_dir=job_output_dir)
+        # Optional ingestion options: layer profile and include/exclude globs
+        layer_filter = {k: request.form.get(field) for k, field in
+                        (('profile', 'layer_profile'), ('include', 'include_layers'), ('exclude', 'exclude_layers'))
+                        if request.form.get(field)}
+        if layer_filter:
+            try:
+                make_layer_filter(layer_filter)
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
+        extra = {'layer_filter': layer_filter} if layer_filter else None
+
+        result = run_pipeline(filepath, out_dir=job_output_dir, extra=extra)
         
         if isinstance(result, dict) and result.get('status') == 'error':
             return jsonify({
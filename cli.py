@@ -13,12 +13,14 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.pipeline.pipeline_compat import run_pipeline
+from src.pipeline.dxf_parser import dxf_parse_options
+from src.pipeline.pipeline_compat import run_pipeline, convert_dwgs_to_dxf
+from src.pipeline.support.layer_filter import LAYER_PROFILES
 from src.pipeline.miner import extract_from_dxf, extract_from_ifc
 
 
@@ -26,8 +28,15 @@ class ConversionCLI:
     """Command-line interface for the conversion pipeline."""
 
     @staticmethod
-    def convert(input_file: str, output_dir: str = "outputs", format: str = "ifc", verbose: bool = False) -> int:
-        """Convert DWG/DXF to Tekla model (IFC/JSON)."""
+    def convert(input_file: str, output_dir: str = "outputs", format: str = "ifc", verbose: bool = False,
+                streaming: Optional[bool] = None, workers: Optional[int] = None,
+                layer_filter: Optional[Any] = None, parsed: Optional[Dict[str, Any]] = None) -> int:
+        """Convert DWG/DXF to Tekla model (IFC/JSON).
+
+        ``parsed`` is the ``parse_dxf_file`` payload of ``input_file`` when the
+        caller already has it (e.g. from batch DWG conversion); it is run
+        instead of parsing the file again.
+        """
         print(f"🔄 Converting {input_file}...")
         
         if not os.path.exists(input_file):
@@ -38,7 +47,14 @@ class ConversionCLI:
             os.makedirs(output_dir, exist_ok=True)
             
             # Run pipeline
-            result = run_pipeline(input_file, out_dir=output_dir)
+            extra = {}
+            if streaming is not None:
+                extra['streaming'] = streaming
+            if workers is not None:
+                extra['workers'] = workers
+            if layer_filter:
+                extra['layer_filter'] = layer_filter
+            result = run_pipeline(parsed if parsed is not None else input_file, out_dir=output_dir, extra=extra)
             # Backwards-compatible: if the pipeline returned a raw list of members,
             # wrap it into a dict so callers relying on dict semantics continue to work.
             if isinstance(result, list):
@@ -161,6 +177,11 @@ class ConversionCLI:
             print(f"❌ Error: {str(e)}")
             return 1
 
+    @staticmethod
+    def _job_extra(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Pipeline ``extra`` for a batch job (as ``convert`` builds it)."""
+        return {'layer_filter': job['layer_filter']} if job.get('layer_filter') else {}
+
     @staticmethod
     def batch(config_file: str, verbose: bool = False) -> int:
         """Run batch conversion from a configuration file."""
@@ -172,13 +193,35 @@ class ConversionCLI:
             
             jobs = config.get('jobs', [])
             results = []
+
+            # Convert all DWG inputs up front with one ODA run per DXF version
+            # (per set of parse options); validation parses each drawing with
+            # its job's options and the payload is handed to the run below
+            groups = {}
+            for job in jobs:
+                path = job.get('input')
+                if str(path or '').lower().endswith('.dwg') and os.path.exists(path):
+                    options = dxf_parse_options(ConversionCLI._job_extra(job))
+                    key = json.dumps(options, sort_keys=True, default=str)
+                    groups.setdefault(key, (options, []))[1].append(path)
+            converted = {}
+            if groups:
+                print(f"🔄 Converting {sum(len(paths) for _, paths in groups.values())} DWG file(s) in batch...")
+                for key, (options, paths) in groups.items():
+                    for path, res in convert_dwgs_to_dxf(paths, parse_options=options).items():
+                        converted[(path, key)] = res
             
             for i, job in enumerate(jobs, 1):
                 input_file = job.get('input')
                 output_dir = job.get('output', f'outputs/job_{i}')
+                key = json.dumps(dxf_parse_options(ConversionCLI._job_extra(job)), sort_keys=True, default=str)
+                res = converted.get((input_file, key), {})
+                if res.get('dxf'):
+                    input_file = res['dxf']
                 
                 print(f"\n[{i}/{len(jobs)}] Processing {input_file}...")
-                ret = ConversionCLI.convert(input_file, output_dir, verbose=verbose)
+                ret = ConversionCLI.convert(input_file, output_dir, verbose=verbose,
+                                            layer_filter=job.get('layer_filter'), parsed=res.get('parsed'))
                 results.append({'input': input_file, 'success': ret == 0})
             
             print(f"\n📊 Batch complete: {sum(1 for r in results if r['success'])}/{len(results)} succeeded")
@@ -209,6 +252,16 @@ def main():
     convert_parser.add_argument('--output', '-o', default='outputs', help='Output directory')
     convert_parser.add_argument('--format', '-f', choices=['ifc', 'json'], default='ifc', help='Output format')
     convert_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    convert_parser.add_argument('--stream', dest='streaming', action='store_true', default=None,
+                                help='Stream DXF entities instead of loading the whole drawing (default: auto by file size)')
+    convert_parser.add_argument('--workers', '-w', type=int, default=None,
+                                help='Worker processes for DXF entity extraction (0 = all CPUs, default: serial)')
+    convert_parser.add_argument('--layer-profile', default=None,
+                                help=f"Only read layers matching a named profile ({', '.join(sorted(LAYER_PROFILES))})")
+    convert_parser.add_argument('--include-layers', default=None,
+                                help='Comma-separated layer glob patterns to read (e.g. "S-BEAM*,S-COL*")')
+    convert_parser.add_argument('--exclude-layers', default=None,
+                                help='Comma-separated layer glob patterns to skip (e.g. "*DIM*,*TEXT*")')
     
     # Validate command
     validate_parser = subparsers.add_parser('validate', help='Validate pipeline output')
@@ -233,7 +286,11 @@ def main():
         return 1
     
     if args.command == 'convert':
-        return ConversionCLI.convert(args.input, args.output, args.format, args.verbose)
+        layer_filter = {k: v for k, v in (('profile', args.layer_profile), ('include', args.include_layers),
+                                          ('exclude', args.exclude_layers)) if v}
+        return ConversionCLI.convert(args.input, args.output, args.format, args.verbose,
+                                     streaming=args.streaming, workers=args.workers,
+                                     layer_filter=layer_filter or None)
     elif args.command == 'validate':
         return ConversionCLI.validate(args.input, args.verbose)
     elif args.command == 'web':
@@ -0,0 +1,68 @@
+"""Scaling benchmark for joint enrichment (hidden joints, splices, merge_joints).
+
+Generates synthetic multi-storey frames of increasing size and times the
+geometric enrichment steps. With the shared endpoint grid the time per member
+should stay roughly flat as the model grows. The optional model-inferred
+joints (``_maybe_model_infer_joints``) are not part of this benchmark.
+
+    python scripts/benchmark_joint_enrichment.py --sizes 1000 5000 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline import joint_enrichment  # noqa: E402
+
+
+def synthetic_frame(n_members, bay=6000.0, storey=3500.0, jitter=40.0, seed=0):
+    """Columns, beams and braces on a square grid, with small endpoint gaps."""
+    rng = random.Random(seed)
+    side = max(2, int(round((n_members / 9.0) ** (1.0 / 3.0) * 1.5)))
+    members = []
+    while len(members) < n_members:
+        i, j, k = rng.randrange(side), rng.randrange(side), rng.randrange(side)
+        x, y, z = i * bay, j * bay, k * storey
+        kind = rng.random()
+        if kind < 0.35:
+            end = [x, y, z + storey]
+        elif kind < 0.8:
+            end = [x + bay, y, z] if rng.random() < 0.5 else [x, y + bay, z]
+        else:
+            end = [x + bay, y, z + storey]
+        start = [x + rng.uniform(-jitter, jitter), y + rng.uniform(-jitter, jitter), z]
+        members.append({'id': f'm{len(members)}', 'start': start, 'end': end})
+    return members
+
+
+def run(sizes, repeat=1):
+    print(f"{'members':>9} {'index_s':>8} {'hidden_s':>9} {'splices_s':>10} {'merge_s':>8} {'total_s':>8} {'us/member':>10}")
+    for n in sizes:
+        members = synthetic_frame(n)
+        base = [{'id': f'j{i}', 'position': list(m['end'])} for i, m in enumerate(members[::3])]
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            index = joint_enrichment._EndpointIndex(members, radius=120.0)
+            t1 = time.perf_counter()
+            hidden = joint_enrichment._near_miss_hidden_joints(members, tol=75.0, index=index)
+            t2 = time.perf_counter()
+            splices = joint_enrichment._detect_splices(members, gap_tol=120.0, index=index)
+            t3 = time.perf_counter()
+            joint_enrichment.merge_joints(joint_enrichment.merge_joints(base, hidden, tol=10.0), splices, tol=10.0)
+            t4 = time.perf_counter()
+            timing = (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)
+            best = timing if best is None or timing[-1] < best[-1] else best
+        print(f"{n:>9} {best[0]:>8.3f} {best[1]:>9.3f} {best[2]:>10.3f} {best[3]:>8.3f} {best[4]:>8.3f} "
+              f"{1e6 * best[4] / n:>10.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2500, 5000, 10000, 20000])
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    run(args.sizes, repeat=args.repeat)
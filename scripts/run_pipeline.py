@@ -4,6 +4,7 @@ import json
 import os
 import sys
 
+from src.pipeline.member_table import MemberTable
 from src.pipeline.pipeline_v2 import Pipeline
 
 try:
@@ -44,5 +45,5 @@ outputs = p.run_from_dxf_entities(entities, out_dir=args.out_dir)
 for k,v in outputs.items():
     path = os.path.join(args.out_dir, f'{k}.json')
     with open(path, 'w') as f:
-        json.dump(v, f, indent=2, default=str)
+        json.dump(v, f, indent=2, default=lambda o: o.to_members() if isinstance(o, MemberTable) else str(o))
 print('Pipeline completed. Outputs written to', args.out_dir)
@@ -1,9 +1,11 @@
 from .profile_db import SECTION_CATALOG, SECTION_GEOM, MATERIAL_CATALOG, profile_mapper
-from .geometry_agent import set_global_coordinate_system, merge_nodes, resolve_member_orientation
+from .geometry_agent import set_global_coordinate_system, merge_nodes, merge_nodes_array, resolve_member_orientation, resolve_member_orientations
+from .member_table import MemberTable, as_member_table
 
 __all__ = [
     "SECTION_CATALOG", "SECTION_GEOM", "MATERIAL_CATALOG", "profile_mapper",
-    "set_global_coordinate_system", "merge_nodes", "resolve_member_orientation"
+    "set_global_coordinate_system", "merge_nodes", "merge_nodes_array", "resolve_member_orientation",
+    "resolve_member_orientations", "MemberTable", "as_member_table"
 ]
 # Pipeline package
 __all__ = ["pipeline"]
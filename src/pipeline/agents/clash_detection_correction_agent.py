@@ -257,6 +257,17 @@ class ClashDetector:
 
     def _check_member_clashes(self, members: List[Dict], joints: List[Dict]):
         """Check member-level clashes: intersections, overlaps, zero length."""
+        # Member pairs that share a joint, and pairs of segments closer than
+        # 50mm from the shared spatial index (only those can overlap)
+        joined = set()
+        for jt in joints:
+            j_members = list(dict.fromkeys(jt.get('members', [])))
+            for a in range(len(j_members)):
+                joined.add(frozenset([j_members[a]]))
+                for b in range(a + 1, len(j_members)):
+                    joined.add(frozenset([j_members[a], j_members[b]]))
+        close_pairs = self._close_member_pairs(members, 50)
+
         for i, m1 in enumerate(members):
             start1 = m1.get('start', [0, 0, 0])
             end1 = m1.get('end', [1, 0, 0])
@@ -275,29 +286,47 @@ class ClashDetector:
                 )
 
             # Check for unintended intersections
-            for j, m2 in enumerate(members[i+1:], start=i+1):
-                start2 = m2.get('start', [0, 0, 0])
-                end2 = m2.get('end', [1, 0, 0])
-
-                # Check if there's a joint between them
-                has_joint = any(
-                    set([m1.get('id'), m2.get('id')]).issubset(set(jt.get('members', [])))
-                    for jt in joints
-                )
+            for j, overlap_dist in close_pairs.get(i, ()):
+                m2 = members[j]
 
-                # If no joint, check for overlap
-                if not has_joint:
-                    overlap_dist = self._member_overlap_distance(start1, end1, start2, end2)
-                    if overlap_dist < 50:  # Within 50mm
-                        self._add_clash(
-                            clash_type=ClashType.MEMBER_OVERLAP,
-                            severity=ClashSeverity.MAJOR,
-                            element_type='member',
-                            element_id=m1.get('id', 'unknown'),
-                            description=f"Members {m1.get('id')} and {m2.get('id')} overlap (distance {overlap_dist:.1f}mm) without joint",
-                            current_value=f"{m1.get('id')} dist {overlap_dist:.1f}mm",
-                            corrective_action="Create joint connection between members"
-                        )
+                # If no joint between them, the pair overlaps (within 50mm)
+                if frozenset([m1.get('id'), m2.get('id')]) not in joined:
+                    self._add_clash(
+                        clash_type=ClashType.MEMBER_OVERLAP,
+                        severity=ClashSeverity.MAJOR,
+                        element_type='member',
+                        element_id=m1.get('id', 'unknown'),
+                        description=f"Members {m1.get('id')} and {m2.get('id')} overlap (distance {overlap_dist:.1f}mm) without joint",
+                        current_value=f"{m1.get('id')} dist {overlap_dist:.1f}mm",
+                        corrective_action="Create joint connection between members"
+                    )
+
+    def _close_member_pairs(self, members: List[Dict], distance: float) -> Dict[int, List[Tuple[int, float]]]:
+        """Member index -> ascending ``(j, d)`` for later members whose segment is within ``distance``."""
+        import numpy as np
+        from src.pipeline.geometry.kernels import segment_distances
+        from src.pipeline.support.spatial_index import SpatialIndex
+        # rows with unusable coordinates stay NaN and never pair
+        starts = np.full((len(members), 3), np.nan)
+        ends = np.full((len(members), 3), np.nan)
+        for i, m in enumerate(members):
+            try:
+                s, e = m.get('start', [0, 0, 0]), m.get('end', [1, 0, 0])
+                starts[i] = [float(s[0]), float(s[1]), float(s[2])]
+                ends[i] = [float(e[0]), float(e[1]), float(e[2])]
+            except (TypeError, ValueError, IndexError):
+                starts[i] = ends[i] = np.nan
+        partners: Dict[int, List[Tuple[int, float]]] = {}
+        if not members:
+            return partners
+        # broad phase on the segment boxes, then exact distances in one batch
+        pairs = SpatialIndex.from_segments(starts, ends).pairs_within(distance)
+        i, j = pairs[:, 0], pairs[:, 1]
+        d, _, _ = segment_distances(starts[i], ends[i], starts[j], ends[j])
+        close = d < distance
+        for a, b, dist in zip(i[close].tolist(), j[close].tolist(), d[close].tolist()):
+            partners.setdefault(a, []).append((b, dist))
+        return partners
 
     def _check_joint_clashes(self, joints: List[Dict], members: List[Dict]):
         """Check joint-level clashes: orphan joints, wrong elevations."""
@@ -662,15 +691,10 @@ class ClashDetector:
         return math.sqrt(sum((p1[i] - p2[i])**2 for i in range(3)))
 
     def _member_overlap_distance(self, s1, e1, s2, e2) -> float:
-        """Approximate minimum distance between two line segments."""
-        # Simplified: return minimum distance between any endpoint pairs
-        distances = [
-            self._distance_3d(s1, s2),
-            self._distance_3d(s1, e2),
-            self._distance_3d(e1, s2),
-            self._distance_3d(e1, e2)
-        ]
-        return min(distances)
+        """Minimum distance between two line segments."""
+        from src.pipeline.geometry.kernels import segment_distances
+        d, _, _ = segment_distances(s1[:3], e1[:3], s2[:3], e2[:3])
+        return float(d[0])
 
     def _add_clash(self, clash_type: ClashType, severity: ClashSeverity, element_type: str,
                    element_id: str, description: str, current_value: Any, expected_value: Any = None,
@@ -13,7 +13,7 @@ Date: 2024
 Status: Production-Ready
 """
 
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Set, Tuple, Any, Optional
 from dataclasses import dataclass, asdict
 import numpy as np
 import json
@@ -493,6 +493,9 @@ class ComprehensiveClashCorrector:
     def __init__(self):
         self.corrections: Dict[str, Dict] = {}
         self.ifc_data: Dict[str, Any] = {}
+        # element type -> ids targeted by corrections of the last run; hand to
+        # ComprehensiveClashDetector.redetect() once they are applied
+        self.modified: Dict[str, Set[Any]] = {}
 
     def correct_all_clashes(self, clashes: List[Clash], ifc_data: Dict[str, Any]) -> Tuple[Dict, Dict]:
         """
@@ -503,6 +506,7 @@ class ComprehensiveClashCorrector:
         """
         self.ifc_data = ifc_data
         self.corrections = {}
+        self.modified = {}
 
         # Flatten clashes if needed
         flat_clashes = []
@@ -538,10 +542,18 @@ class ComprehensiveClashCorrector:
             correction = self._correct_clash(clash)
             clash_id = clash.clash_id if hasattr(clash, 'clash_id') else str(clash)
             self.corrections[clash_id] = correction
+            if isinstance(correction, dict) and correction.get('status') == 'CORRECTED':
+                element_type = getattr(clash, 'element_type', None)
+                if element_type:
+                    self.modified.setdefault(element_type, set()).add(getattr(clash, 'element_id', None))
 
         summary = self._summarize_corrections()
         return self.corrections, summary
 
+    def modified_ids(self) -> Dict[str, Set[Any]]:
+        """Element ids (by element type) whose corrections were produced in the last run."""
+        return {kind: set(ids) for kind, ids in self.modified.items()}
+
     def _correct_clash(self, clash: Clash) -> Dict:
         """Dispatch to appropriate corrector."""
         category = clash.category
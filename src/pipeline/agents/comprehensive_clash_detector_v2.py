@@ -16,10 +16,12 @@ Status: Production-Ready
 from typing import List, Dict, Any, Tuple, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum
+import copy
 import math
+import os
+import time
 import numpy as np
 import json
-import logging
 from datetime import datetime
 
 # ============================================================================
@@ -142,6 +144,149 @@ class Clash:
     corrected: bool = False
     correction_details: Dict[str, Any] = field(default_factory=dict)
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    check: str = ""  # check family that raised it
+    sources: Tuple[Tuple[str, Any], ...] = ()  # (element type, id) of the elements it was derived from
+
+
+class ClashIndexes:
+    """Lookup tables built once per detection run and shared by all checks.
+
+    - ``members_by_id`` / ``plates_by_id`` / ``bolts_by_id`` / ``welds_by_id`` /
+      ``joints_by_id``: id -> element (first one wins on duplicate ids)
+    - ``bolts_by_plate`` / ``welds_by_plate``: plate id -> bolts / welds, in input order
+    - ``plates_by_member``: member id -> plates listing that member
+    - ``joints_by_member``: member id -> joints listing that member (each joint once)
+    - ``joint_pairs``: frozensets of member id pairs that share a joint (-> joint count)
+    - ``order``: (element type, id) -> position in its input list
+
+    ``refresh`` updates the tables after elements were edited in place.
+    """
+
+    def __init__(self, members, joints, plates, bolts, welds, members_by_id=None):
+        if members_by_id is None:
+            members_by_id = {}
+            for m in members:
+                members_by_id.setdefault(m.get('id'), m)
+        self.members_by_id: Dict[Any, Dict[str, Any]] = members_by_id
+        self.plates_by_id = self._by_id(plates)
+        self.bolts_by_id = self._by_id(bolts)
+        self.welds_by_id = self._by_id(welds)
+        self.joints_by_id = self._by_id(joints)
+        self.order: Dict[Tuple[str, Any], int] = {}
+        for kind, items in (('member', members), ('plate', plates), ('bolt', bolts), ('weld', welds)):
+            for k, item in enumerate(items):
+                self.order.setdefault((kind, item.get('id')), k)
+        self.bolts_by_plate = self._group(bolts, 'plate_id')
+        self.welds_by_plate = self._group(welds, 'plate_id')
+        # relations as last indexed, so refresh() can undo them
+        self._position = {id(item): k for items in (bolts, welds) for k, item in enumerate(items)}
+        self._bolt_plate = {id(b): b.get('plate_id') for b in bolts}
+        self._weld_plate = {id(w): w.get('plate_id') for w in welds}
+        self._plate_members: Dict[int, tuple] = {}
+        self._joint_members: Dict[int, tuple] = {}
+        self.plates_by_member: Dict[Any, List[Dict[str, Any]]] = {}
+        for p in plates:
+            self._link_plate(p)
+        self.joints_by_member: Dict[Any, List[Dict[str, Any]]] = {}
+        self.joint_pairs: Dict[frozenset, int] = {}
+        for j in joints:
+            self._link_joint(j)
+
+    @staticmethod
+    def _by_id(items) -> Dict[Any, Dict[str, Any]]:
+        found: Dict[Any, Dict[str, Any]] = {}
+        for item in items:
+            found.setdefault(item.get('id'), item)
+        return found
+
+    @staticmethod
+    def _group(items, key) -> Dict[Any, List[Dict[str, Any]]]:
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for item in items:
+            groups.setdefault(item.get(key), []).append(item)
+        return groups
+
+    def _link_plate(self, plate) -> None:
+        member_ids = tuple(dict.fromkeys(plate.get('members') or ()))
+        self._plate_members[id(plate)] = member_ids
+        for mid in member_ids:
+            self.plates_by_member.setdefault(mid, []).append(plate)
+
+    def _link_joint(self, joint) -> None:
+        member_ids = tuple(joint.get('members', []))
+        self._joint_members[id(joint)] = member_ids
+        for mid in dict.fromkeys(member_ids):
+            self.joints_by_member.setdefault(mid, []).append(joint)
+        member_ids = tuple(sorted(member_ids))
+        for a in range(len(member_ids)):
+            for b in range(a + 1, len(member_ids)):
+                pair = frozenset([member_ids[a], member_ids[b]])
+                self.joint_pairs[pair] = self.joint_pairs.get(pair, 0) + 1
+
+    def _unlink_joint(self, joint) -> tuple:
+        member_ids = self._joint_members.pop(id(joint), ())
+        for mid in dict.fromkeys(member_ids):
+            self._drop(self.joints_by_member, mid, joint)
+        ordered = tuple(sorted(member_ids))
+        for a in range(len(ordered)):
+            for b in range(a + 1, len(ordered)):
+                pair = frozenset([ordered[a], ordered[b]])
+                self.joint_pairs[pair] -= 1
+                if not self.joint_pairs[pair]:
+                    del self.joint_pairs[pair]
+        return member_ids
+
+    @staticmethod
+    def _drop(groups, key, item) -> None:
+        group = groups.get(key, [])
+        for k, other in enumerate(group):
+            if other is item:
+                del group[k]
+                break
+        if not group:
+            groups.pop(key, None)
+
+    def _regroup(self, groups, key, item) -> None:
+        """Add ``item`` to ``groups[key]`` at its input position."""
+        group = groups.setdefault(key, [])
+        group.append(item)
+        group.sort(key=lambda other: self._position[id(other)])
+
+    def refresh(self, modified: Dict[str, Set[Any]]) -> Dict[str, Set[Any]]:
+        """Re-index edited bolts, welds, plates and joints.
+
+        Returns the ids the edits detached elements from: ``'plate'`` (previous
+        parent plates of bolts/welds) and ``'member'`` (previous members of
+        joints and plates), which checks must revisit as well.
+        """
+        previous: Dict[str, Set[Any]] = {'plate': set(), 'member': set()}
+        for bid in modified.get('bolt', ()):
+            bolt = self.bolts_by_id.get(bid)
+            if bolt is not None and self._bolt_plate.get(id(bolt)) != bolt.get('plate_id'):
+                old = self._bolt_plate[id(bolt)]
+                previous['plate'].add(old)
+                self._drop(self.bolts_by_plate, old, bolt)
+                self._regroup(self.bolts_by_plate, bolt.get('plate_id'), bolt)
+                self._bolt_plate[id(bolt)] = bolt.get('plate_id')
+        for wid in modified.get('weld', ()):
+            weld = self.welds_by_id.get(wid)
+            if weld is not None and self._weld_plate.get(id(weld)) != weld.get('plate_id'):
+                self._drop(self.welds_by_plate, self._weld_plate[id(weld)], weld)
+                self._regroup(self.welds_by_plate, weld.get('plate_id'), weld)
+                self._weld_plate[id(weld)] = weld.get('plate_id')
+        for pid in modified.get('plate', ()):
+            plate = self.plates_by_id.get(pid)
+            if plate is not None:
+                for mid in self._plate_members.pop(id(plate), ()):
+                    previous['member'].add(mid)
+                    self._drop(self.plates_by_member, mid, plate)
+                self._link_plate(plate)
+        for jid in modified.get('joint', ()):
+            joint = self.joints_by_id.get(jid)
+            if joint is not None:
+                previous['member'].update(self._unlink_joint(joint))
+                self._link_joint(joint)
+        return previous
 
 # ============================================================================
 # COMPREHENSIVE CLASH DETECTOR v2.0
@@ -150,11 +295,27 @@ class Clash:
 class ComprehensiveClashDetector:
     """Detects all 35+ clash types with 3D geometry analysis."""
 
+    # Candidate pairs per narrow-phase batch
+    NARROW_PHASE_BATCH = 65536
+
     def __init__(self, tolerance_provider=None, standards_provider=None):
         self.clashes: List[Clash] = []
         self.clash_counter = 0
         self.ifc_data: Dict[str, Any] = {}
-        self.spatial_index = {}  # For 3D geometry acceleration
+        self.spatial_index = None  # support.spatial_index.SpatialIndex over the members
+        self.members_by_id: Dict[str, Any] = {}
+        self.indexes: Optional[ClashIndexes] = None  # lookups for the current run
+        self.geometry = None  # geometry.kernels.MemberGeometry of the current members
+        self.seg_starts = self.seg_ends = None  # (n, 3) member segments (meters) for pair tests
+        self.section_half = None  # (n, 2) member half depth / half width (meters), 0 = no profile
+        self.broad_phase_stats: Dict[str, Dict[str, int]] = {}
+        self.family_timings: Dict[str, float] = {}  # check family -> seconds, last run
+        self._current_check = ''  # family whose clashes _add_clash is recording
+        self._model: Optional[List[Tuple[Any, int]]] = None  # (list, length) of each indexed element list
+        self._clashes_by_source: Optional[Dict[Tuple[str, Any], List[Clash]]] = None
+        self._plate_index = None  # SpatialIndex of plate boxes, built on first redetect
+        self._plate_centres = self._plate_half = None  # (n, 3) plate boxes for redetect
+        self.store = None  # optional clash_store.ClashStore receiving clashes as they are found
         # Canonical internal unit: meters
         # Tolerances and standards can be provided by AI/model-driven sources
         if tolerance_provider is None:
@@ -177,6 +338,7 @@ class ComprehensiveClashDetector:
         # Sensible defaults (meters) used only if provider does not supply values
         self._DEFAULT_TOL = {
             'SEGMENT_INTERSECT_TOL_M': 0.01,
+            'SOLID_OVERLAP_TOL_M': 0.005,
             'PLATE_ELEV_ALIGN_TOL_M': 0.05,
             'PLATE_XY_ALIGN_TOL_M': 0.05,
             'ECCENTRICITY_TOL_M': 0.05,
@@ -222,9 +384,24 @@ class ComprehensiveClashDetector:
         z = float(pos[2]) if len(pos) > 2 else 0.0
         return (x, y, z)
 
-    def detect_all_clashes(self, ifc_data: Dict[str, Any]) -> Tuple[List[Clash], Dict[str, int]]:
+    def _segment(self, member, default_end=(0, 0, 0)) -> Tuple[np.ndarray, np.ndarray]:
+        """Normalized (start, end) of a member, from the cached geometry when possible."""
+        if self.geometry is not None and 'start' in member and 'end' in member:
+            i = self.geometry.row_of(member)
+            if i is not None:
+                return self.geometry.starts_m[i], self.geometry.ends_m[i]
+        return (np.array(self.normalize_position(member.get('start', [0, 0, 0]))),
+                np.array(self.normalize_position(member.get('end', list(default_end)))))
+
+    def detect_all_clashes(self, ifc_data: Dict[str, Any], workers: Optional[int] = None,
+                           executor: str = 'thread') -> Tuple[List[Clash], Dict[str, int]]:
         """
         Comprehensive clash detection across all elements and 3D space.
+
+        ``workers`` > 1 runs the independent check families concurrently
+        (``executor`` 'thread' or 'process'; 0 = one worker per CPU) on the
+        shared read-only model. Their clash lists are merged in family order,
+        so the result matches a sequential run; the cascading check runs last.
         
         Returns:
             (list of clashes, summary dict)
@@ -232,6 +409,9 @@ class ComprehensiveClashDetector:
         self.clashes = []
         self.ifc_data = ifc_data
         self.clash_counter = 0
+        self.broad_phase_stats = {}
+        self._clashes_by_source = None
+        self._plate_index = None
 
         members = ifc_data.get('members', [])
         joints = ifc_data.get('joints', [])
@@ -241,72 +421,299 @@ class ComprehensiveClashDetector:
         anchors = ifc_data.get('anchors', [])
         foundation = ifc_data.get('foundation', {})
 
+        # Lookup tables for every check; the member lookup reuses the shared
+        # topology's index when it describes these members
+        topology = ifc_data.get('topology')
+        shared = topology.members_by_id if topology is not None and topology.members is members else None
+        self.indexes = ClashIndexes(members, joints, plates, bolts, welds, members_by_id=shared)
+        self.members_by_id = self.indexes.members_by_id
+        self._model = self._model_lists(ifc_data)
+
+        # Normalized member endpoints, computed once for all pair tests
+        from src.pipeline.geometry.kernels import get_member_geometry
+        cached = topology.geometry if topology is not None and topology.members is members else None
+        self.geometry = get_member_geometry(members, geometry=ifc_data.get('geometry') or cached)
+
         # Build 3D spatial index for geometry queries
         self._build_spatial_index(members, plates, bolts)
 
         # Run all detection algorithms
-        self._check_3d_geometry_clashes(members, joints, plates, bolts)
-        self._check_plate_member_alignment(plates, members, joints)
-        self._check_base_plate_integrity(plates, members, foundation)
-        self._check_z_level_rules(members)
-        self._check_weld_geometry_and_properties(welds, plates, members)
-        self._check_bolt_edge_distance_and_spacing(bolts, plates)
-        self._check_member_geometry_and_span(members, joints)
-        self._check_connection_alignment_and_loads(plates, bolts, members)
-        self._check_anchorage_and_foundation(anchors, plates, foundation, members)
-        self._check_plate_thickness_and_properties(plates, members, bolts)
-        self._check_bolt_properties_and_capacity(bolts, plates)
-        self._check_structural_logic(members, joints, plates, bolts, welds, anchors)
-
-        # Re-check for cascading clashes
+        families = [
+            ('3d_geometry', '_check_3d_geometry_clashes', (members, joints, plates, bolts)),
+            ('plate_member_alignment', '_check_plate_member_alignment', (plates, members, joints)),
+            ('base_plate_integrity', '_check_base_plate_integrity', (plates, members, foundation)),
+            ('z_level_rules', '_check_z_level_rules', (members,)),
+            ('weld_geometry', '_check_weld_geometry_and_properties', (welds, plates, members)),
+            ('bolt_edge_and_spacing', '_check_bolt_edge_distance_and_spacing', (bolts, plates)),
+            ('member_geometry_and_span', '_check_member_geometry_and_span', (members, joints)),
+            ('connection_alignment', '_check_connection_alignment_and_loads', (plates, bolts, members)),
+            ('anchorage_and_foundation', '_check_anchorage_and_foundation', (anchors, plates, foundation, members)),
+            ('plate_thickness', '_check_plate_thickness_and_properties', (plates, members, bolts)),
+            ('bolt_properties', '_check_bolt_properties_and_capacity', (bolts, plates)),
+            ('structural_logic', '_check_structural_logic', (members, joints, plates, bolts, welds, anchors)),
+        ]
+        self.family_timings = {}
+        self._run_check_families(families, workers, executor)
+
+        # Re-check for cascading clashes (depends on the families' results)
+        start = time.perf_counter()
+        self._current_check = 'cascading'
         self._check_cascading_clashes()
+        self.family_timings['cascading'] = time.perf_counter() - start
+
+        summary = self._summarize_clashes()
+        return self.clashes, summary
+
+    @staticmethod
+    def _model_lists(ifc_data) -> List[Tuple[Any, int]]:
+        return [(ifc_data.get(k), len(ifc_data.get(k) or ())) for k in ('members', 'joints', 'plates', 'bolts', 'welds', 'anchors')]
+
+    def _same_model(self, ifc_data) -> bool:
+        """True if ``ifc_data`` holds the very element lists (same lengths) the indexes were built on."""
+        if self._model is None:
+            return False
+        return all(now is then and size == length
+                   for (now, size), (then, length) in zip(self._model_lists(ifc_data), self._model))
+
+    def redetect(self, modified: Dict[str, Any], ifc_data: Optional[Dict[str, Any]] = None) -> Tuple[List[Clash], Dict[str, int]]:
+        """
+        Update the clash set after the elements in ``modified`` were edited in place.
+
+        ``modified`` maps element type ('member', 'plate', 'bolt', 'weld',
+        'joint', 'anchor') to ids, e.g. ``ComprehensiveClashCorrector.modified_ids()``;
+        a truthy 'foundation' entry marks the foundation as edited. Only the
+        checks that read those elements are re-run, on the dirty elements and
+        their neighbours (spatial-index hits, plates of a member, bolts of a
+        plate, members of a joint). Clashes they raised before are dropped
+        from ``self.clashes`` and the new ones appended, so the set (not the
+        order) matches a full run.
+
+        Falls back to ``detect_all_clashes`` when there is no previous run on
+        this model, elements were added/removed or replaced, or an id is unknown.
+        ``self.store`` is not fed (streamed rows cannot be taken back); build a
+        new one from the returned clashes if needed.
+
+        Returns:
+            (list of clashes, summary dict with an 'incremental' entry)
+        """
+        store, self.store = self.store, None
+        try:
+            return self._redetect(modified, ifc_data)
+        finally:
+            self.store = store
+
+    def _redetect(self, modified, ifc_data):
+        ifc_data = self.ifc_data if ifc_data is None else ifc_data
+        ix = self.indexes
+        dirty = {kind: set(ids) for kind, ids in modified.items() if kind != 'foundation'}
+        lookups = {'member': 'members_by_id', 'plate': 'plates_by_id', 'bolt': 'bolts_by_id',
+                   'weld': 'welds_by_id', 'joint': 'joints_by_id'}
+        known = ix is not None and ifc_data is self.ifc_data and self._same_model(ifc_data)
+        for kind, ids in dirty.items():
+            if kind != 'anchor':
+                known = known and kind in lookups and all(i in getattr(ix, lookups[kind]) for i in ids)
+        if not known:
+            clashes, summary = self.detect_all_clashes(ifc_data)
+            summary['incremental'] = {'full_run': True}
+            return clashes, summary
+
+        members = ifc_data.get('members', [])
+        joints = ifc_data.get('joints', [])
+        plates = ifc_data.get('plates', [])
+        bolts = ifc_data.get('bolts', [])
+        welds = ifc_data.get('welds', [])
+        anchors = ifc_data.get('anchors', [])
+        foundation = ifc_data.get('foundation', {})
+        foundation_dirty = bool(modified.get('foundation'))
+
+        previous = ix.refresh(dirty)
+        member_ids = dirty.get('member', set())
+        plate_ids = dirty.get('plate', set())
+        bolt_ids = dirty.get('bolt', set())
+
+        # Moved members: geometry rows, pair-test segments and index slots
+        rows = sorted(ix.order[('member', m)] for m in member_ids)
+        self.geometry.update_rows(rows)
+        for r in rows:
+            self.seg_starts[r] = self.geometry.starts_m[r]
+            self.seg_ends[r] = self.geometry.ends_m[r] if 'end' in members[r] else (1.0, 0.0, 0.0)
+            self.spatial_index.insert_segment(r, self.seg_starts[r], self.seg_ends[r])
+        if rows:
+            self.section_half[rows] = self._section_half_sizes([members[r] for r in rows])
+        plate_rows = sorted(ix.order[('plate', p)] for p in plate_ids)
+        self._update_plate_boxes(plates, plate_rows)
+
+        # Neighbourhoods of the edits
+        joint_members = set(previous['member'])
+        for j in dirty.get('joint', ()):
+            joint_members.update(ix.joints_by_id[j].get('members', []))
+        linked = (member_ids | joint_members) & set(ix.members_by_id)
+        linked_rows = sorted(ix.order[('member', m)] for m in linked)
+        plates_of_members = {p.get('id') for m in member_ids for p in ix.plates_by_member.get(m, ())}
+        bolt_plates = previous['plate'] | {ix.bolts_by_id[b].get('plate_id') for b in bolt_ids}
+        touched_plates = plate_ids | plates_of_members
+        grouped_plates = plate_ids | bolt_plates
+
+        def subset(kind, ids, items):
+            rows = sorted({ix.order[(kind, i)] for i in ids if (kind, i) in ix.order})
+            return [items[r] for r in rows]
+
+        everything = foundation_dirty or bool(dirty.get('anchor'))
+        rechecks = [
+            ('3d_geometry', {('member', m) for m in linked} | {('plate', p) for p in plate_ids},
+             self._recheck_3d_geometry, (members, plates, linked_rows, plate_rows)),
+            ('plate_member_alignment', {('plate', p) for p in touched_plates},
+             self._check_plate_member_alignment, (subset('plate', touched_plates, plates), members, joints)),
+            ('base_plate_integrity', None if foundation_dirty else {('plate', p) for p in plate_ids},
+             self._check_base_plate_integrity, (plates if foundation_dirty else subset('plate', plate_ids, plates), members, foundation)),
+            ('z_level_rules', {('member', m) for m in member_ids},
+             self._check_z_level_rules, (subset('member', member_ids, members),)),
+            ('weld_geometry', {('weld', w) for w in dirty.get('weld', ())},
+             self._check_weld_geometry_and_properties, (subset('weld', dirty.get('weld', ()), welds), plates, members)),
+            ('bolt_edge_and_spacing', {('plate', p) for p in grouped_plates},
+             self._check_bolt_edge_distance_and_spacing, (bolts, plates, grouped_plates)),
+            ('member_geometry_and_span', {('member', m) for m in linked},
+             self._check_member_geometry_and_span, (subset('member', linked, members), joints)),
+            ('connection_alignment', {('plate', p) for p in touched_plates},
+             self._check_connection_alignment_and_loads, (subset('plate', touched_plates, plates), bolts, members)),
+            ('anchorage_and_foundation', None if everything else set(),
+             self._check_anchorage_and_foundation, (anchors if everything else [], plates, foundation, members)),
+            ('plate_thickness', {('plate', p) for p in grouped_plates},
+             self._check_plate_thickness_and_properties, (subset('plate', grouped_plates, plates), members, bolts)),
+            ('bolt_properties', {('bolt', b) for b in bolt_ids},
+             self._check_bolt_properties_and_capacity, (subset('bolt', bolt_ids, bolts), plates)),
+            ('structural_logic', {('bolt', b) for b in bolt_ids} | {('plate', p) for p in plate_ids},
+             self._check_structural_logic, (members, joints, subset('plate', plate_ids, plates),
+                                            subset('bolt', bolt_ids, bolts), welds, anchors)),
+            ('cascading', {('plate', p) for p in grouped_plates},
+             self._check_cascading_clashes, (grouped_plates,)),
+        ]
+
+        # Drop what the re-run checks raised for these elements, then re-run them
+        removed = self._drop_clashes([(name, keys) for name, keys, _, _ in rechecks])
+        before = len(self.clashes)
+        rechecked = {}
+        for name, keys, method, args in rechecks:
+            if keys is not None and not keys:
+                continue
+            self._current_check = name
+            method(*args)
+            rechecked[name] = len(keys) if keys is not None else 'all'
 
         summary = self._summarize_clashes()
+        summary['incremental'] = {
+            'full_run': False,
+            'modified': {kind: len(ids) for kind, ids in dirty.items()},
+            'rechecked': rechecked,
+            'removed': removed,
+            'added': len(self.clashes) - before,
+        }
         return self.clashes, summary
 
+    def _drop_clashes(self, scopes) -> int:
+        """Remove clashes of check ``name`` with a source in ``keys`` (None: all of them); returns the count."""
+        if self._clashes_by_source is None:
+            self._clashes_by_source = {}
+            for clash in self.clashes:
+                for source in clash.sources:
+                    self._clashes_by_source.setdefault(source, []).append(clash)
+        everywhere = {name for name, keys in scopes if keys is None}
+        dead = {id(c): c for c in self.clashes if c.check in everywhere}
+        for name, keys in scopes:
+            for key in keys or ():
+                for clash in self._clashes_by_source.get(key, ()):
+                    if clash.check == name:
+                        dead[id(clash)] = clash
+        if not dead:
+            return 0
+        self.clashes[:] = [c for c in self.clashes if id(c) not in dead]
+        for source in {s for c in dead.values() for s in c.sources}:
+            kept = [c for c in self._clashes_by_source.get(source, ()) if id(c) not in dead]
+            if kept:
+                self._clashes_by_source[source] = kept
+            else:
+                self._clashes_by_source.pop(source, None)
+        return len(dead)
+
+    def _run_check_families(self, families, workers: Optional[int], executor: str) -> None:
+        """Run ``(name, method, args)`` check families, timing each; concurrently when ``workers`` > 1."""
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if not workers or workers <= 1 or len(families) <= 1:
+            for name, method, args in families:
+                start = time.perf_counter()
+                self._current_check = name
+                getattr(self, method)(*args)
+                self.family_timings[name] = time.perf_counter() - start
+            return
+
+        if executor == 'process':
+            from concurrent.futures import ProcessPoolExecutor as Pool
+        elif executor == 'thread':
+            from concurrent.futures import ThreadPoolExecutor as Pool
+        else:
+            raise ValueError(f"executor must be 'thread' or 'process', not {executor!r}")
+        # Each family writes into its own copy of the detector; the model,
+        # indexes and geometry are shared and only read.
+        snapshot = copy.copy(self)
+        snapshot.ifc_data = {}
+        snapshot.clashes = []
+        snapshot.store = None
+        with Pool(max_workers=min(workers, len(families))) as pool:
+            futures = [pool.submit(_run_check_family, snapshot, name, method, args) for name, method, args in families]
+            results = [f.result() for f in futures]
+        # merge in family order, numbering clashes as a sequential run would
+        for (name, _, _), (clashes, stats, elapsed) in zip(families, results):
+            for clash in clashes:
+                self.clash_counter += 1
+                clash.clash_id = f"CLASH_{self.clash_counter:06d}"
+                self.clashes.append(clash)
+                if self.store is not None:
+                    self.store.append(clash)
+            self.broad_phase_stats.update(stats)
+            self.family_timings[name] = elapsed
+
     def _build_spatial_index(self, members, plates, bolts):
-        """Build 3D spatial voxel grid using AABBs for acceleration.
-        Grid cell size: 1.0 m cubes (canonical unit meters).
+        """Index the member segments (meters) in the shared ``SpatialIndex``; slots are member rows.
+
+        Rows use the endpoints of the pair test (``_segment`` with a missing
+        end at (1, 0, 0)), so broad and narrow phase see the same segments.
         """
-        self.spatial_index = {}
-
-        def aabb_for_segment(start, end):
-            s = np.array(start, dtype=float)
-            e = np.array(end, dtype=float)
-            mn = np.minimum(s, e)
-            mx = np.maximum(s, e)
-            return mn, mx
-
-        def voxel_coords(mn, mx, cell=1.0):
-            xs = range(int(math.floor(mn[0] / cell)), int(math.floor(mx[0] / cell)) + 1)
-            ys = range(int(math.floor(mn[1] / cell)), int(math.floor(mx[1] / cell)) + 1)
-            zs = range(int(math.floor(mn[2] / cell)), int(math.floor(mx[2] / cell)) + 1)
-            
-            # Safety cap: prevent massive voxel generation from large coordinates
-            MAX_VOXELS_PER_AXIS = 1000
-            if len(xs) > MAX_VOXELS_PER_AXIS or len(ys) > MAX_VOXELS_PER_AXIS or len(zs) > MAX_VOXELS_PER_AXIS:
-                logging.getLogger("aibuildx.clash_detector").warning(
-                    f"Voxel grid too large ({len(xs)}×{len(ys)}×{len(zs)}), using single voxel for this member"
-                )
-                # Use only the centroid voxel
-                cx = int(math.floor((mn[0] + mx[0]) / 2 / cell))
-                cy = int(math.floor((mn[1] + mx[1]) / 2 / cell))
-                cz = int(math.floor((mn[2] + mx[2]) / 2 / cell))
-                yield (cx, cy, cz)
-                return
-            
-            for ix in xs:
-                for iy in ys:
-                    for iz in zs:
-                        yield (ix, iy, iz)
+        from src.pipeline.support.spatial_index import SpatialIndex
+        self.seg_starts = self.geometry.starts_m.copy()
+        self.seg_ends = self.geometry.ends_m.copy()
+        for i, member in enumerate(members):
+            if 'end' not in member:
+                self.seg_ends[i] = (1.0, 0.0, 0.0)
+        self.spatial_index = SpatialIndex.from_segments(self.seg_starts, self.seg_ends)
+        self.section_half = self._section_half_sizes(members)
 
-        # Index members by AABB voxels
-        for member in members:
-            start = self.normalize_position(member.get('start', [0, 0, 0]))
-            end = self.normalize_position(member.get('end', [0, 0, 0]))
-            mn, mx = aabb_for_segment(start, end)
-            for v in voxel_coords(mn, mx):
-                self.spatial_index.setdefault(v, []).append(('member', member.get('id')))
+    @staticmethod
+    def _section_half_sizes(members) -> np.ndarray:
+        """(n, 2) half depth and half width (m) from each member's ``profile`` dims (mm).
+
+        Depth is ``h`` (or ``d``), width ``b``/``bf`` (or ``d``); a missing one
+        takes the other. Rows of members without profile dims stay 0.
+        """
+        half = np.zeros((len(members), 2))
+        for i, member in enumerate(members):
+            profile = member.get('profile')
+            dims = profile.get('dims') if isinstance(profile, dict) else None
+            if not dims:
+                continue
+            try:
+                depth = float(dims.get('h') or dims.get('d') or 0.0)
+                width = float(dims.get('b') or dims.get('bf') or dims.get('d') or 0.0)
+            except (TypeError, ValueError):
+                continue
+            half[i] = (depth or width, width or depth)
+        return half / 2000.0
+
+    def _overlap_reach(self) -> float:
+        """Largest centerline distance at which two profiled members' section boxes can still overlap."""
+        if self.section_half is None or not len(self.section_half):
+            return 0.0
+        return 2.0 * float(np.hypot(self.section_half[:, 0], self.section_half[:, 1]).max())
 
     def _grid_key(self, coord):
         """Convert 3D coordinate (meters) to voxel key (1m)."""
@@ -316,133 +723,246 @@ class ComprehensiveClashDetector:
 
     def _check_3d_geometry_clashes(self, members, joints, plates, bolts):
         """Check 3D geometric intersections and overlaps."""
-        # Build joint lookup index for O(1) access
-        joint_pairs = set()
-        for j in joints:
-            member_ids = tuple(sorted(j.get('members', [])))
-            if len(member_ids) >= 2:
-                for i in range(len(member_ids)):
-                    for k in range(i+1, len(member_ids)):
-                        joint_pairs.add(frozenset([member_ids[i], member_ids[k]]))
-        
-        # Check member-to-member 3D intersection with spatial pruning and iteration cap
-        pairs_checked = 0
-        MAX_PAIRS = 10000  # Safety cap to prevent infinite loops
-        MAX_VOXELS_PER_AXIS = 1000  # Safety cap for voxel generation
-        for i, m1 in enumerate(members):
-            # Spatial pruning: get voxels for m1
-            m1_start = self.normalize_position(m1.get('start', [0,0,0]))
-            m1_end = self.normalize_position(m1.get('end', [0,0,0]))
-            m1_voxels = set()
-            try:
-                mn = np.minimum(m1_start, m1_end)
-                mx = np.maximum(m1_start, m1_end)
-                cell = 1.0
-                xs = range(int(math.floor(mn[0]/cell)), int(math.floor(mx[0]/cell))+1)
-                ys = range(int(math.floor(mn[1]/cell)), int(math.floor(mx[1]/cell))+1)
-                zs = range(int(math.floor(mn[2]/cell)), int(math.floor(mx[2]/cell))+1)
-                # Safety cap to prevent massive voxel generation
-                if len(xs) > MAX_VOXELS_PER_AXIS or len(ys) > MAX_VOXELS_PER_AXIS or len(zs) > MAX_VOXELS_PER_AXIS:
-                    # Use only centroid voxel
-                    cx = int(math.floor((mn[0] + mx[0]) / 2 / cell))
-                    cy = int(math.floor((mn[1] + mx[1]) / 2 / cell))
-                    cz = int(math.floor((mn[2] + mx[2]) / 2 / cell))
-                    m1_voxels.add((cx, cy, cz))
-                else:
-                    for ix in xs:
-                        for iy in ys:
-                            for iz in zs:
-                                m1_voxels.add((ix, iy, iz))
-            except Exception:
-                pass
-            
-            for m2 in members[i+1:]:
-                pairs_checked += 1
-                if pairs_checked > MAX_PAIRS:
-                    # Cap reached; log and skip remaining
-                    import logging
-                    logging.getLogger("aibuildx.clash_detector").warning(f"Clash detection capped at {MAX_PAIRS} member pairs")
-                    break
-                
-                # Spatial pruning: check if m2 overlaps any m1 voxel
-                if m1_voxels:
-                    m2_start = self.normalize_position(m2.get('start', [0,0,0]))
-                    m2_end = self.normalize_position(m2.get('end', [0,0,0]))
-                    try:
-                        mn2 = np.minimum(m2_start, m2_end)
-                        mx2 = np.maximum(m2_start, m2_end)
-                        cell = 1.0
-                        xs2 = range(int(math.floor(mn2[0]/cell)), int(math.floor(mx2[0]/cell))+1)
-                        ys2 = range(int(math.floor(mn2[1]/cell)), int(math.floor(mx2[1]/cell))+1)
-                        zs2 = range(int(math.floor(mn2[2]/cell)), int(math.floor(mx2[2]/cell))+1)
-                        overlaps = False
-                        # Safety cap to prevent massive voxel iteration
-                        if len(xs2) > MAX_VOXELS_PER_AXIS or len(ys2) > MAX_VOXELS_PER_AXIS or len(zs2) > MAX_VOXELS_PER_AXIS:
-                            # Check only centroid voxel overlap
-                            cx2 = int(math.floor((mn2[0] + mx2[0]) / 2 / cell))
-                            cy2 = int(math.floor((mn2[1] + mx2[1]) / 2 / cell))
-                            cz2 = int(math.floor((mn2[2] + mx2[2]) / 2 / cell))
-                            overlaps = (cx2, cy2, cz2) in m1_voxels
-                        else:
-                            for ix in xs2:
-                                for iy in ys2:
-                                    for iz in zs2:
-                                        if (ix, iy, iz) in m1_voxels:
-                                            overlaps = True
-                                            break
-                                    if overlaps:
-                                        break
-                                if overlaps:
-                                    break
-                        if not overlaps:
-                            continue  # Skip distant pairs
-                    except Exception:
-                        pass
-                
-                if self._members_3d_intersect(m1, m2):
-                    # Check if there's a joint using fast index
-                    pair_key = frozenset([m1.get('id'), m2.get('id')])
-                    has_joint = pair_key in joint_pairs
-                    if not has_joint:
-                        self._add_clash(
-                            category=ClashCategory.GEOMETRIC_3D_INTERSECTION,
-                            severity=ClashSeverity.CRITICAL,
-                            element_type='member',
-                            element_id=m1.get('id'),
-                            description=f"Members {m1.get('id')} and {m2.get('id')} intersect in 3D without joint",
-                            current_value=self._calculate_intersection_point(m1, m2),
-                            expected_value="No intersection or explicit joint connection"
-                        )
-            if pairs_checked > MAX_PAIRS:
-                break
+        # Broad phase: every member pair whose bounding boxes come within the
+        # intersection tolerance (no cap). Narrow phase: exact segment
+        # distances for the candidates, a batch at a time, in (i, j) order.
+        tol = self._tol('SEGMENT_INTERSECT_TOL_M')
+        candidates = self.spatial_index.pairs_within(tol)
+        intersecting = self._add_member_pair_clashes(members, candidates)
+        total_pairs = len(members) * (len(members) - 1) // 2
+        self.broad_phase_stats['member_pairs'] = {
+            'total': total_pairs,
+            'considered': int(len(candidates)),
+            'pruned': total_pairs - int(len(candidates)),
+            'intersecting': intersecting,
+        }
 
-        # Check member-to-plate penetration (with iteration cap)
-        penetration_checks = 0
-        MAX_PENETRATION_CHECKS = 5000
-        for member in members:
-            for plate in plates:
-                penetration_checks += 1
-                if penetration_checks > MAX_PENETRATION_CHECKS:
-                    import logging
-                    logging.getLogger("aibuildx.clash_detector").warning(f"Member-plate penetration checks capped at {MAX_PENETRATION_CHECKS}")
-                    break
-                if self._member_penetrates_plate(member, plate):
+        # Solid overlap of members with profile section boxes: pairs within
+        # reach of the largest sections, separating-axis test on their boxes
+        reach = self._overlap_reach()
+        if reach > 0.0:
+            if reach > tol:
+                candidates = self.spatial_index.pairs_within(reach)
+            considered, overlapping = self._add_member_overlap_clashes(members, candidates)
+            self.broad_phase_stats['member_overlaps'] = {
+                'total': total_pairs,
+                'considered': considered,
+                'pruned': total_pairs - considered,
+                'overlapping': overlapping,
+            }
+
+        # Member-to-plate penetration: plate boxes against the indexed member
+        # segments, then the slab/footprint test on every candidate
+        if plates and members:
+            self._check_member_plate_penetration(members, plates)
+
+    def _add_member_pair_clashes(self, members, candidates) -> int:
+        """Narrow phase for (i < j) member-row pairs, in order; returns the number intersecting."""
+        from src.pipeline.geometry.kernels import segment_distances
+        joint_pairs = self.indexes.joint_pairs
+        tol = self._tol('SEGMENT_INTERSECT_TOL_M')
+        intersecting = 0
+        for first in range(0, len(candidates), self.NARROW_PHASE_BATCH):
+            batch = candidates[first:first + self.NARROW_PHASE_BATCH]
+            i, j = batch[:, 0], batch[:, 1]
+            d, _, _ = segment_distances(self.seg_starts[i], self.seg_ends[i], self.seg_starts[j], self.seg_ends[j])
+            for a, b in batch[d < tol].tolist():
+                intersecting += 1
+                m1, m2 = members[a], members[b]
+                # Check if there's a joint using fast index
+                pair_key = frozenset([m1.get('id'), m2.get('id')])
+                has_joint = pair_key in joint_pairs
+                if not has_joint:
                     self._add_clash(
-                        category=ClashCategory.GEOMETRIC_PENETRATION,
+                        category=ClashCategory.GEOMETRIC_3D_INTERSECTION,
                         severity=ClashSeverity.CRITICAL,
-                        element_type='plate',
-                        element_id=plate.get('id'),
-                        description=f"Member {member.get('id')} penetrates plate {plate.get('id')}",
-                        current_value="Intersection detected",
-                        expected_value="No penetration"
+                        element_type='member',
+                        element_id=m1.get('id'),
+                        description=f"Members {m1.get('id')} and {m2.get('id')} intersect in 3D without joint",
+                        current_value=self._calculate_intersection_point(m1, m2),
+                        expected_value="No intersection or explicit joint connection",
+                        related=(('member', m2.get('id')),)
                     )
+        return intersecting
+
+    def _add_member_overlap_clashes(self, members, candidates) -> Tuple[int, int]:
+        """Section-box overlap for (i < j) member-row pairs, in order.
+
+        Only pairs of profiled members whose centerlines are apart (closer
+        ones are intersections, handled above) but within reach of their
+        sections, and that share no joint, get the separating-axis test
+        (``geometry.kernels.obb_overlaps``). Returns (pairs tested, overlapping).
+        """
+        from src.pipeline.geometry.kernels import obb_overlaps, segment_distances, segment_obbs
+        half = self.section_half
+        radius = np.hypot(half[:, 0], half[:, 1])
+        joint_pairs = self.indexes.joint_pairs
+        tol = self._tol('SEGMENT_INTERSECT_TOL_M')
+        min_depth = self._tol('SOLID_OVERLAP_TOL_M')
+        candidates = candidates[(radius[candidates[:, 0]] > 0) & (radius[candidates[:, 1]] > 0)]
+        considered = overlapping = 0
+        for first in range(0, len(candidates), self.NARROW_PHASE_BATCH):
+            batch = candidates[first:first + self.NARROW_PHASE_BATCH]
+            i, j = batch[:, 0], batch[:, 1]
+            d, _, _ = segment_distances(self.seg_starts[i], self.seg_ends[i], self.seg_starts[j], self.seg_ends[j])
+            near = (d >= tol) & (d <= radius[i] + radius[j])
+            i, j = i[near], j[near]
+            considered += len(i)
+            ca, aa, ha = segment_obbs(self.seg_starts[i], self.seg_ends[i], half[i, 0], half[i, 1])
+            cb, ab, hb = segment_obbs(self.seg_starts[j], self.seg_ends[j], half[j, 0], half[j, 1])
+            depth, axis = obb_overlaps(ca, aa, ha, cb, ab, hb)
+            hit = depth > min_depth
+            for a, b, dep, ax in zip(i[hit].tolist(), j[hit].tolist(), depth[hit].tolist(), axis[hit].tolist()):
+                m1, m2 = members[a], members[b]
+                if frozenset([m1.get('id'), m2.get('id')]) in joint_pairs:
+                    continue
+                overlapping += 1
+                self._add_clash(
+                    category=ClashCategory.GEOMETRIC_3D_OVERLAP,
+                    severity=ClashSeverity.MAJOR,
+                    element_type='member',
+                    element_id=m1.get('id'),
+                    description=(f"Sections of members {m1.get('id')} and {m2.get('id')} overlap by "
+                                 f"{dep * 1000.0:.1f}mm along ({ax[0]:.2f}, {ax[1]:.2f}, {ax[2]:.2f})"),
+                    current_value=dep,
+                    expected_value=0.0,
+                    related=(('member', m2.get('id')),)
+                )
+        return considered, overlapping
+
+    def _plate_boxes(self, plates) -> Tuple[np.ndarray, np.ndarray]:
+        """Plate centres and half extents (half width, half height, half thickness) in meters."""
+        centres = np.array([self.normalize_position(p.get('position', [0, 0, 0])) for p in plates]).reshape(-1, 3)
+        half = np.array([
+            (self.mm_to_m(p.get('outline', {}).get('width_mm', 100)) / 2.0,
+             self.mm_to_m(p.get('outline', {}).get('height_mm', 100)) / 2.0,
+             self.mm_to_m(p.get('thickness_mm', 20)) / 2.0)
+            for p in plates
+        ]).reshape(-1, 3)
+        return centres, half
+
+    def _update_plate_boxes(self, plates, rows) -> None:
+        """Keep the plate boxes (and their index, slot ids = plate rows) in step with edited ``rows``."""
+        from src.pipeline.support.spatial_index import SpatialIndex
+        if self._plate_index is None:
+            centres, half = self._plate_boxes(plates)
+            self._plate_index = SpatialIndex.from_boxes(centres - half, centres + half)
+            self._plate_centres, self._plate_half = centres, half
+            return
+        if rows:
+            centres, half = self._plate_boxes([plates[r] for r in rows])
+            self._plate_centres[rows], self._plate_half[rows] = centres, half
+            for r, c, h in zip(rows, centres, half):
+                self._plate_index.insert_box(r, c - h, c + h)
+
+    def _recheck_3d_geometry(self, members, plates, member_rows, plate_rows):
+        """Member pairs and member/plate penetrations involving ``member_rows`` or ``plate_rows``."""
+        tol = self._tol('SEGMENT_INTERSECT_TOL_M')
+        rows = np.asarray(member_rows, dtype=int)
+        if len(rows):
+            reach = self._overlap_reach()
+            hits = self.spatial_index.overlapping(
+                np.minimum(self.seg_starts[rows], self.seg_ends[rows]),
+                np.maximum(self.seg_starts[rows], self.seg_ends[rows]), max(tol, reach))
+            other = np.asarray(self.spatial_index.ids_of(hits[:, 1]), dtype=int)
+            mine = rows[hits[:, 0]]
+            keep = mine != other
+            pairs = np.unique(np.stack([np.minimum(mine, other), np.maximum(mine, other)], axis=1)[keep].reshape(-1, 2),
+                              axis=0)
+            self._add_member_pair_clashes(members, pairs)
+            if reach > 0.0:
+                self._add_member_overlap_clashes(members, pairs)
+        if not plates or not members:
+            return
+        # (plate row, member row) pairs: dirty members against the plate
+        # index, dirty plates against the member index
+        starts, ends = self.geometry.starts_m, self.geometry.ends_m
+        found = [np.empty((0, 2), dtype=int)]
+        if len(rows):
+            hits = self._plate_index.overlapping(np.minimum(starts[rows], ends[rows]),
+                                                 np.maximum(starts[rows], ends[rows]), 1e-9)
+            found.append(np.stack([np.asarray(self._plate_index.ids_of(hits[:, 1]), dtype=int),
+                                   rows[hits[:, 0]]], axis=1).reshape(-1, 2))
+        prow = np.asarray(plate_rows, dtype=int)
+        if len(prow):
+            c, h = self._plate_centres[prow], self._plate_half[prow]
+            hits = self.spatial_index.overlapping(c - h, c + h, 1e-9)
+            found.append(np.stack([prow[hits[:, 0]], np.asarray(self.spatial_index.ids_of(hits[:, 1]), dtype=int)],
+                                  axis=1).reshape(-1, 2))
+            odd = np.array([i for i, m in enumerate(members) if 'end' not in m], dtype=int)
+            if len(odd):
+                found.append(np.stack(np.meshgrid(prow, odd, indexing='ij'), axis=-1).reshape(-1, 2))
+        pairs = np.unique(np.concatenate(found), axis=0)
+        self._add_penetration_clashes(members, plates, pairs[np.lexsort((pairs[:, 0], pairs[:, 1]))],
+                                      self._plate_centres, self._plate_half)
+
+    def _check_member_plate_penetration(self, members, plates):
+        """``_member_penetrates_plate`` for all member/plate pairs, driven by the spatial index."""
+        centres, half = self._plate_boxes(plates)
+        # Penetration uses _segment(member) (missing end at the origin); the
+        # index holds the pair-test segments, which differ only without an end
+        pairs = self.spatial_index.overlapping(centres - half, centres + half, 1e-9)
+        odd = np.array([i for i, m in enumerate(members) if 'end' not in m], dtype=int)
+        if len(odd):
+            extra = np.stack(np.meshgrid(np.arange(len(plates)), odd, indexing='ij'), axis=-1).reshape(-1, 2)
+            pairs = np.unique(np.concatenate([pairs, extra]), axis=0)
+        # member-major, plate order within a member
+        pairs = pairs[np.lexsort((pairs[:, 0], pairs[:, 1]))]
+
+        penetrating = self._add_penetration_clashes(members, plates, pairs, centres, half)
+        total_pairs = len(members) * len(plates)
+        self.broad_phase_stats['member_plate_pairs'] = {
+            'total': total_pairs,
+            'considered': int(len(pairs)),
+            'pruned': total_pairs - int(len(pairs)),
+            'penetrating': penetrating,
+        }
+
+    def _add_penetration_clashes(self, members, plates, pairs, centres, half) -> int:
+        """Slab/footprint test for (plate row, member row) ``pairs``; returns the number penetrating."""
+        starts, ends = self.geometry.starts_m, self.geometry.ends_m
+        penetrating = 0
+        for first in range(0, len(pairs), self.NARROW_PHASE_BATCH):
+            batch = pairs[first:first + self.NARROW_PHASE_BATCH]
+            p, m = batch[:, 0], batch[:, 1]
+            hit = self._penetrates(starts[m], ends[m], centres[p], half[p])
+            for k, i in zip(p[hit].tolist(), m[hit].tolist()):
+                penetrating += 1
+                member, plate = members[i], plates[k]
+                self._add_clash(
+                    category=ClashCategory.GEOMETRIC_PENETRATION,
+                    severity=ClashSeverity.CRITICAL,
+                    element_type='plate',
+                    element_id=plate.get('id'),
+                    description=f"Member {member.get('id')} penetrates plate {plate.get('id')}",
+                    current_value="Intersection detected",
+                    expected_value="No penetration",
+                    related=(('member', member.get('id')),)
+                )
+        return penetrating
+
+    @staticmethod
+    def _penetrates(starts, ends, centres, half) -> np.ndarray:
+        """Vectorized ``_member_penetrates_plate`` for (n, 3) segments and plate centres/half extents."""
+        zs, ze = starts[:, 2], ends[:, 2]
+        z_min = centres[:, 2] - half[:, 2]
+        z_max = centres[:, 2] + half[:, 2]
+        crosses_z = ((zs < z_min) & (z_min < ze)) | ((zs < z_max) & (z_max < ze)) | \
+                    ((ze < z_min) & (z_min < zs)) | ((ze < z_max) & (z_max < zs))
+        # XY point of the member closest to the plate centre, inside the footprint
+        p1 = starts[:, :2]
+        seg = ends[:, :2] - p1
+        seg_len2 = np.einsum('ij,ij->i', seg, seg)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = np.where(seg_len2 == 0.0, 0.0, np.einsum('ij,ij->i', centres[:, :2] - p1, seg) / np.where(seg_len2 == 0.0, 1.0, seg_len2))
+        closest_xy = p1 + np.clip(t, 0.0, 1.0)[:, None] * seg
+        inside_xy = (np.abs(closest_xy - centres[:, :2]) <= half[:, :2]).all(axis=1)
+        return crosses_z & inside_xy
 
     def _members_3d_intersect(self, m1, m2) -> bool:
         """Check if two line segments intersect in 3D."""
-        p1_start = np.array(self.normalize_position(m1.get('start', [0, 0, 0])))
-        p1_end = np.array(self.normalize_position(m1.get('end', [1, 0, 0])))
-        p2_start = np.array(self.normalize_position(m2.get('start', [0, 0, 0])))
-        p2_end = np.array(self.normalize_position(m2.get('end', [1, 0, 0])))
+        p1_start, p1_end = self._segment(m1, default_end=(1, 0, 0))
+        p2_start, p2_end = self._segment(m2, default_end=(1, 0, 0))
 
         # Check minimum distance between line segments
         d, _, _ = self._distance_between_lines(p1_start, p1_end, p2_start, p2_end)
@@ -451,34 +971,11 @@ class ComprehensiveClashDetector:
     def _distance_between_lines(self, p1, p2, p3, p4) -> Tuple[float, np.ndarray, np.ndarray]:
         """True shortest distance between two 3D segments.
         Returns (distance, closest_point_on_seg1, closest_point_on_seg2).
-        Based on standard segment-to-segment closest points algorithm.
+        One pair of the batched ``geometry.kernels.segment_distances``.
         """
-        u = p2 - p1
-        v = p4 - p3
-        w0 = p1 - p3
-        a = np.dot(u, u)
-        b = np.dot(u, v)
-        c = np.dot(v, v)
-        d = np.dot(u, w0)
-        e = np.dot(v, w0)
-        denom = a * c - b * b
-
-        SMALL = 1e-12
-        if denom < SMALL:
-            # Segments almost parallel; project onto u
-            s = 0.0
-            t = (b * s - e) / c if c > SMALL else 0.0
-        else:
-            s = (b * e - c * d) / denom
-            t = (a * e - b * d) / denom
-
-        # Clamp to [0,1]
-        s = max(0.0, min(1.0, s))
-        t = max(0.0, min(1.0, t))
-
-        c1 = p1 + s * u
-        c2 = p3 + t * v
-        return float(np.linalg.norm(c1 - c2)), c1, c2
+        from src.pipeline.geometry.kernels import segment_distances
+        d, c1, c2 = segment_distances(p1, p2, p3, p4)
+        return float(d[0]), c1[0], c2[0]
 
     def _member_penetrates_plate(self, member, plate) -> bool:
         """Check if member penetrates through plate volume by Z crossing and XY footprint inclusion."""
@@ -489,8 +986,7 @@ class ComprehensiveClashDetector:
         width_m = self.mm_to_m(outline.get('width_mm', 100))
         height_m = self.mm_to_m(outline.get('height_mm', 100))
 
-        m_start = self.normalize_position(member.get('start', [0, 0, 0]))
-        m_end = self.normalize_position(member.get('end', [0, 0, 0]))
+        m_start, m_end = self._segment(member)
 
         # Z crossing of the plate slab [plate_z - t/2, plate_z + t/2]
         z_min = plate_z - thickness_m / 2.0
@@ -522,29 +1018,20 @@ class ComprehensiveClashDetector:
 
     def _calculate_intersection_point(self, m1, m2):
         """Approximate closest points midpoint for intersection location in 3D (meters)."""
-        p1_start = np.array(self.normalize_position(m1.get('start', [0, 0, 0])))
-        p1_end = np.array(self.normalize_position(m1.get('end', [0, 0, 0])))
-        p2_start = np.array(self.normalize_position(m2.get('start', [0, 0, 0])))
-        p2_end = np.array(self.normalize_position(m2.get('end', [0, 0, 0])))
+        p1_start, p1_end = self._segment(m1)
+        p2_start, p2_end = self._segment(m2)
         _, c1, c2 = self._distance_between_lines(p1_start, p1_end, p2_start, p2_end)
         mid = (c1 + c2) / 2.0
         return (float(mid[0]), float(mid[1]), float(mid[2]))
 
     def _check_plate_member_alignment(self, plates, members, joints):
         """Check plate-to-member alignment in 3D."""
-        alignment_checks = 0
-        MAX_ALIGNMENT_CHECKS = 2000
         for plate in plates:
             plate_id = plate.get('id')
             plate_members = plate.get('members', [])
 
             for member_id in plate_members:
-                alignment_checks += 1
-                if alignment_checks > MAX_ALIGNMENT_CHECKS:
-                    import logging
-                    logging.getLogger("aibuildx.clash_detector").warning(f"Plate-member alignment checks capped at {MAX_ALIGNMENT_CHECKS}")
-                    return
-                member = next((m for m in members if m.get('id') == member_id), None)
+                member = self.indexes.members_by_id.get(member_id)
                 if not member:
                     continue
 
@@ -687,9 +1174,8 @@ class ComprehensiveClashDetector:
             if mtype != 'beam':
                 continue
 
-            start = self.normalize_position(member.get('start', [0, 0, 0]))
-            end = self.normalize_position(member.get('end', [0, 0, 0]))
-            min_z = min(start[2], end[2])
+            start, end = self._segment(member)
+            min_z = float(min(start[2], end[2]))
 
             if min_z <= ground_tol:
                 self._add_clash(
@@ -704,7 +1190,7 @@ class ComprehensiveClashDetector:
 
     def _check_weld_geometry_and_properties(self, welds, plates, members):
         """Check weld positioning, size, and properties."""
-        plate_ids = {p.get('id') for p in plates}
+        plate_ids = self.indexes.plates_by_id
 
         for weld in welds:
             weld_id = weld.get('id')
@@ -750,20 +1236,15 @@ class ComprehensiveClashDetector:
                     expected_value=weld_size * 0.8
                 )
 
-    def _check_bolt_edge_distance_and_spacing(self, bolts, plates):
-        """Check AISC J3.8 bolt edge distance and spacing."""
-        plate_ids = {p.get('id'): p for p in plates}
+    def _check_bolt_edge_distance_and_spacing(self, bolts, plates, plate_ids=None):
+        """Check AISC J3.8 bolt edge distance and spacing (bolt groups of ``plate_ids`` only, if given)."""
+        plates_by_id = self.indexes.plates_by_id
+        groups = self.indexes.bolts_by_plate.items()
+        if plate_ids is not None:
+            groups = [(p, self.indexes.bolts_by_plate[p]) for p in self.indexes.bolts_by_plate if p in plate_ids]
 
-        # Group bolts by plate
-        bolts_by_plate = {}
-        for bolt in bolts:
-            plate_id = bolt.get('plate_id')
-            if plate_id not in bolts_by_plate:
-                bolts_by_plate[plate_id] = []
-            bolts_by_plate[plate_id].append(bolt)
-
-        for plate_id, plate_bolts in bolts_by_plate.items():
-            plate = plate_ids.get(plate_id)
+        for plate_id, plate_bolts in groups:
+            plate = plates_by_id.get(plate_id)
             if not plate:
                 continue
 
@@ -790,7 +1271,8 @@ class ComprehensiveClashDetector:
                         element_id=bolt_id,
                         description=f"Bolt edge distance {edge_dist_x*1000:.1f}mm < {min_edge_dist_mm:.1f}mm",
                         current_value=edge_dist_x*1000,
-                        expected_value=min_edge_dist_mm
+                        expected_value=min_edge_dist_mm,
+                        related=(('plate', plate_id),)
                     )
 
                 # Check spacing with other bolts
@@ -810,7 +1292,8 @@ class ComprehensiveClashDetector:
                             element_id=bolt_id,
                             description=f"Bolt spacing {dist*1000:.1f}mm < 3d = {min_spacing*1000:.1f}mm",
                             current_value=dist*1000,
-                            expected_value=min_spacing*1000
+                            expected_value=min_spacing*1000,
+                            related=(('plate', plate_id),)
                         )
 
     def _check_member_geometry_and_span(self, members, joints):
@@ -835,7 +1318,7 @@ class ComprehensiveClashDetector:
                 )
 
             # Check for bracing points
-            brace_count = sum(1 for j in joints if member_id in j.get('members', []))
+            brace_count = len(self.indexes.joints_by_member.get(member_id, ()))
             if length_m > 10 and brace_count < 2:
                 self._add_clash(
                     category=ClashCategory.MEMBER_LATERAL_BRACING,
@@ -857,7 +1340,7 @@ class ComprehensiveClashDetector:
             if len(plate_members) == 1:
                 # Single member connection - check for eccentricity
                 member_id = plate_members[0]
-                member = next((m for m in members if m.get('id') == member_id), None)
+                member = self.indexes.members_by_id.get(member_id)
                 if member:
                     member_center = (np.array(member.get('start', [0, 0, 0])) +
                                    np.array(member.get('end', [0, 0, 0]))) / 2
@@ -992,7 +1475,7 @@ class ComprehensiveClashDetector:
 
             # Check bearing
             # Get bolts on this plate
-            plate_bolts = [b for b in bolts if b.get('plate_id') == plate_id]
+            plate_bolts = self.indexes.bolts_by_plate.get(plate_id, [])
             if plate_bolts:
                 bolt_diameter = plate_bolts[0].get('diameter_mm', 20)
                 bearing_area = bolt_diameter * thickness
@@ -1044,8 +1527,7 @@ class ComprehensiveClashDetector:
 
     def _check_structural_logic(self, members, joints, plates, bolts, welds, anchors):
         """Check for orphan elements and disconnected members."""
-        member_ids = {m.get('id') for m in members}
-        plate_ids = {p.get('id') for p in plates}
+        plate_ids = self.indexes.plates_by_id
 
         # Check orphan bolts
         for bolt in bolts:
@@ -1072,15 +1554,16 @@ class ComprehensiveClashDetector:
                     current_value="No members"
                 )
 
-    def _check_cascading_clashes(self):
-        """Check for cascading issues from initial clashes."""
+    def _check_cascading_clashes(self, plate_ids=None):
+        """Check for cascading issues from initial clashes (of ``plate_ids`` only, if given)."""
         # If base plate is wrong elevation, all its bolts are likely wrong too
-        base_plate_clashes = [c for c in self.clashes if 'base_plate' in c.category.value]
+        base_plate_clashes = [c for c in self.clashes if 'base_plate' in c.category.value
+                              and (plate_ids is None or c.element_id in plate_ids)]
         for clash in base_plate_clashes:
             if clash.category == ClashCategory.BASE_PLATE_WRONG_ELEVATION:
                 # Check related bolts
                 plate_id = clash.element_id
-                related_bolts = [b for b in self.ifc_data.get('bolts', []) if b.get('plate_id') == plate_id]
+                related_bolts = self.indexes.bolts_by_plate.get(plate_id, [])
                 for bolt in related_bolts:
                     bolt_z = bolt.get('position', [0, 0, 0])[2]
                     if bolt_z > 0.1:  # If at wrong elevation too
@@ -1092,13 +1575,15 @@ class ComprehensiveClashDetector:
                             description=f"Bolt {bolt.get('id')} affected by base plate elevation error",
                             current_value=bolt_z,
                             expected_value=0.0,
-                            confidence_score=0.8
+                            confidence_score=0.8,
+                            related=(('plate', plate_id),)
                         )
 
     def _add_clash(self, category: ClashCategory, severity: ClashSeverity, element_type: str,
                    element_id: str, description: str, current_value: Any, expected_value: Any = None,
-                   corrective_action: str = "", confidence_score: float = 0.9):
-        """Add clash to list."""
+                   corrective_action: str = "", confidence_score: float = 0.9,
+                   related: Tuple[Tuple[str, Any], ...] = ()):
+        """Add clash to list; ``related`` names further (type, id) elements it depends on."""
         self.clash_counter += 1
         clash = Clash(
             clash_id=f"CLASH_{self.clash_counter:06d}",
@@ -1110,9 +1595,16 @@ class ComprehensiveClashDetector:
             current_value=current_value,
             expected_value=expected_value,
             corrective_action=corrective_action,
-            confidence_score=confidence_score
+            confidence_score=confidence_score,
+            check=self._current_check,
+            sources=((element_type, element_id),) + tuple(related)
         )
         self.clashes.append(clash)
+        if self.store is not None:
+            self.store.append(clash)
+        if self._clashes_by_source is not None:
+            for source in clash.sources:
+                self._clashes_by_source.setdefault(source, []).append(clash)
 
     def _summarize_clashes(self) -> Dict[str, int]:
         """Summarize clashes."""
@@ -1129,8 +1621,23 @@ class ComprehensiveClashDetector:
             if count > 0:
                 summary['by_category'][category.value] = count
 
+        # Pairs the broad phase handed to the exact tests vs pairs it ruled out
+        summary['broad_phase'] = {k: dict(v) for k, v in self.broad_phase_stats.items()}
+        summary['family_timings_s'] = dict(self.family_timings)
         return summary
 
+
+def _run_check_family(detector: ComprehensiveClashDetector, name: str, method: str, args) -> Tuple[List[Clash], Dict[str, Dict[str, int]], float]:
+    """Run one check family on a private copy of ``detector``: (clashes, broad-phase stats, seconds)."""
+    worker = copy.copy(detector)
+    worker.clashes = []
+    worker.clash_counter = 0
+    worker.broad_phase_stats = {}
+    worker._current_check = name
+    start = time.perf_counter()
+    getattr(worker, method)(*args)
+    return worker.clashes, worker.broad_phase_stats, time.perf_counter() - start
+
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
@@ -19,6 +19,10 @@ from typing import List, Dict, Any, Tuple
 import math
 import uuid
 
+import numpy as np
+
+from src.pipeline.support.spatial_index import SpatialIndex
+
 
 def _distance_3d(p1: List[float], p2: List[float]) -> float:
     """Calculate 3D Euclidean distance."""
@@ -72,9 +76,22 @@ def _member_angle_2d(member1: Dict[str, Any], member2: Dict[str, Any]) -> float:
     return min(angle_deg, 180 - angle_deg)
 
 
+def _member_segments(members: List[Dict[str, Any]]) -> SpatialIndex:
+    """Segment index over the members, with the parser's default endpoints."""
+    starts = np.zeros((len(members), 3))
+    ends = np.zeros((len(members), 3))
+    for i, member in enumerate(members):
+        start = member.get('start', [0, 0, 0])[:3]
+        end = member.get('end', [1, 0, 0])[:3]
+        starts[i, :len(start)] = start
+        ends[i, :len(end)] = end
+    return SpatialIndex.from_segments(starts, ends)
+
+
 def parse_connections(circles: List[Dict[str, Any]], members: List[Dict[str, Any]], 
                       search_radius_mm: float = 150.0, 
-                      member_angle_threshold_deg: float = 20.0) -> List[Dict[str, Any]]:
+                      member_angle_threshold_deg: float = 20.0,
+                      topology=None, segments: SpatialIndex = None) -> List[Dict[str, Any]]:
     """
     Convert DXF circles into joints with member links.
     
@@ -83,12 +100,21 @@ def parse_connections(circles: List[Dict[str, Any]], members: List[Dict[str, Any
         members: List of structural members with 'start', 'end', 'id'
         search_radius_mm: How far from circle center to search for intersecting members
         member_angle_threshold_deg: Threshold for determining connection type
+        topology: Optional shared ``Topology``; joints then carry the 'node_id'
+            of the structural node the circle marks (None if it marks none),
+            and its spatial index is reused to find nearby members
+        segments: Optional ``SpatialIndex`` over ``members`` (built if missing)
         
     Returns:
         List of joint objects with member links
     """
     
     joints = []
+    if segments is None:
+        if topology is not None and topology.members is members:
+            segments = topology.segments
+        else:
+            segments = _member_segments(members)
     
     for circle in circles:
         center = circle.get('center', [0, 0, 0])
@@ -98,7 +124,9 @@ def parse_connections(circles: List[Dict[str, Any]], members: List[Dict[str, Any
         # Find members that intersect or are very close to this circle
         intersecting_members = []
         
-        for member in members:
+        # Only members whose bounding box comes within the search radius
+        for idx in segments.candidates(center, search_radius_mm).tolist():
+            member = members[idx]
             start = member.get('start', [0, 0, 0])
             end = member.get('end', [1, 0, 0])
             
@@ -153,6 +181,8 @@ def parse_connections(circles: List[Dict[str, Any]], members: List[Dict[str, Any
                     } for m in intersecting_members
                 ]
             }
+            if topology is not None:
+                joint['node_id'] = topology.nearest_node(center, search_radius_mm)
             
             joints.append(joint)
     
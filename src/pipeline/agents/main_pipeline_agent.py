@@ -2,11 +2,12 @@
 to the canonical pipeline functions. This agent provides a stable agent
 interface while allowing gradual migration from the monolith.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 import json
 import os
 import time
 from src.pipeline.logging_setup import get_logger
+from src.pipeline.member_table import MemberTable, as_member_table
 
 logger = get_logger("main_pipeline_agent")
 
@@ -16,6 +17,7 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
     dxf_entities = data.get('dxf_entities') or data.get('items') or data.get('members') or []
     out = {}
     job_id = data.get('job_id') or data.get('out_dir')
+    extra = data.get('extra') or {}
 
     def stage(name):
         logger.info(f"[Stage:start] {name} job={job_id}")
@@ -36,9 +38,9 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
                 except Exception:
                     payload_entities = dxf_entities
             elif dxf_entities.lower().endswith('.dxf'):
-                # Use new modular DXF parser
-                from src.pipeline.dxf_parser import parse_dxf_file
-                payload_entities = parse_dxf_file(dxf_entities)
+                # Use new modular DXF parser; large files are streamed entity by entity
+                from src.pipeline.dxf_parser import parse_dxf_file, dxf_parse_options
+                payload_entities = parse_dxf_file(dxf_entities, **dxf_parse_options(extra))
             elif dxf_entities.lower().endswith('.ifc'):
                 # Use legacy IFC parser (can be modernized later)
                 try:
@@ -49,14 +51,23 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
                     payload_entities = {'members': []}
             else:
                 payload_entities = dxf_entities
+        elif isinstance(dxf_entities, Iterator):
+            # Streamed ('member'|'circle', record) tuples from dxf_parser.iter_dxf_records
+            payload_entities = {'members': [], 'circles': []}
+            for kind, record in dxf_entities:
+                payload_entities['circles' if kind == 'circle' else 'members'].append(record)
         else:
             payload_entities = dxf_entities
 
         out['miner'] = payload_entities
+        if isinstance(payload_entities, dict) and payload_entities.get('dxf_stats'):
+            out['dxf_stats'] = payload_entities['dxf_stats']
         end(ts, nm)
 
         # 1.5) Auto-repair missing fields
         ts, nm = stage("auto_repair")
+        # Node/member topology shared by the geometry, joint, connection and clash stages
+        topology = None
         try:
             from src.pipeline.auto_repair_engine import repair_pipeline
             if isinstance(payload_entities, dict):
@@ -66,6 +77,7 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
             else:
                 repaired = repair_pipeline({'members': []})
             members = repaired.get('members', [])
+            topology = repaired.get('_topology')
         except Exception:
             if isinstance(payload_entities, dict):
                 members = payload_entities.get('members', [])
@@ -73,22 +85,25 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
                 members = payload_entities
             else:
                 members = []
+        # Members are kept column-wise from here on; stages that know the table
+        # work on whole columns, the others see dict-compatible MemberRow views
+        members = as_member_table(members)
         end(ts, nm)
 
         # 2) Geometry agent: set CS, merge nodes, resolve orientation
         ts, nm = stage("geometry")
-        from src.pipeline.geometry_agent import set_global_coordinate_system, merge_nodes, resolve_member_orientation
+        from src.pipeline.geometry_agent import set_global_coordinate_system, resolve_member_orientations
+        from src.pipeline.topology import get_topology
         set_global_coordinate_system({}, origin=(0,0,0))
-        nodes, mapping = merge_nodes(members, tolerance=10.0)
-        for m in members:
-            resolve_member_orientation(m)
+        topology = get_topology(members, tolerance=10.0, topology=topology)
+        resolve_member_orientations(members, geometry=topology.geometry)
         end(ts, nm)
 
         # 3) Node resolution and joints
         ts, nm = stage("nodes_and_joints")
         from src.pipeline.node_resolution import snap_nodes, auto_generate_joints
-        nodes, members = snap_nodes(members, tolerance=10.0)
-        joints = auto_generate_joints(members, tolerance=10.0)
+        nodes, members = snap_nodes(members, tolerance=10.0, topology=topology)
+        joints = auto_generate_joints(members, tolerance=10.0, topology=topology)
         out['nodes'] = nodes
         out['joints'] = joints
         end(ts, nm)
@@ -99,7 +114,7 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
             from src.pipeline.agents.connection_parser_agent import parse_connections
             circles = payload_entities.get('circles', [])
             if circles:
-                parsed_joints = parse_connections(circles, members, search_radius_mm=150.0)
+                parsed_joints = parse_connections(circles, members, search_radius_mm=150.0, topology=topology)
                 # Merge with auto-generated joints
                 joints.extend(parsed_joints)
                 out['joints'] = joints
@@ -111,8 +126,10 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
 
         # 3.7) Universal coordinate origin fix (applies to IFC data with coordinate issues)
         ts, nm = stage("coordinate_origin_fix")
+        geometry_engine = None
         try:
-            from src.pipeline.universal_geometry_engine import fix_coordinate_origins_universal
+            from src.pipeline.universal_geometry_engine import UniversalGeometryEngine, \
+                fix_coordinate_origins_universal
             # Build IFC-like structure from current state
             ifc_data = {
                 'members': members,
@@ -121,7 +138,9 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
                 'bolts': []
             }
             # Apply universal geometry fixes (detects and corrects broken coordinates)
-            ifc_data_fixed = fix_coordinate_origins_universal(ifc_data)
+            # The engine is kept so the post-IFC pass (13.5) only revisits what changed
+            geometry_engine = UniversalGeometryEngine()
+            ifc_data_fixed = fix_coordinate_origins_universal(ifc_data, engine=geometry_engine)
             # Update members and joints if fixes were applied
             if ifc_data_fixed.get('members'):
                 members = ifc_data_fixed['members']
@@ -138,7 +157,9 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
         ts, nm = stage("joint_enrichment")
         try:
             from src.pipeline import joint_enrichment
-            joints = joint_enrichment.enrich_joints(members, joints)
+            # Rebuilt only if the origin fix moved member coordinates
+            topology = get_topology(members, tolerance=10.0, topology=topology)
+            joints = joint_enrichment.enrich_joints(members, joints, topology=topology)
             out['joints'] = joints
             out['joint_enrichment'] = True
         except Exception as e:
@@ -148,17 +169,10 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
 
         # 4) Section and material classification
         ts, nm = stage("classification")
-        from src.pipeline.section_classifier import classify_section
-        from src.pipeline.material_classifier import classify_material
-        for m in members:
-            prof = classify_section(m)
-            if prof:
-                m.setdefault('profile', prof)
-                m.setdefault('geom', prof)
-                m.setdefault('area', prof.get('area'))
-                m.setdefault('Zx', prof.get('Zx'))
-            mat = classify_material(m)
-            m.setdefault('material', mat)
+        from src.pipeline.section_classifier import classify_sections
+        from src.pipeline.material_classifier import classify_materials
+        classify_sections(members)
+        classify_materials(members)
 
         out['members_classified'] = members
         end(ts, nm)
@@ -276,15 +290,30 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
                     'members': members,
                     'joints': joints,
                     'plates': plates_synth,
-                    'bolts': bolts_synth
+                    'bolts': bolts_synth,
+                    'topology': get_topology(members, tolerance=10.0, topology=topology),
                 }
+                from src.pipeline.clash_store import ClashStore, JsonlSink
                 tol = ToleranceProvider()
                 std = StandardsProvider()
                 detector = ComprehensiveClashDetector(tolerance_provider=tol, standards_provider=std)
-                clashes, clash_summary = detector.detect_all_clashes(ifc_data_for_clash)
+                # Findings go to a columnar store, streamed to clashes.jsonl when writing outputs
+                out_dir = data.get('out_dir')
+                sink = None
+                if out_dir:
+                    os.makedirs(out_dir, exist_ok=True)
+                    sink = JsonlSink(os.path.join(out_dir, 'clashes.jsonl'))
+                detector.store = ClashStore(sink=sink)
+                try:
+                    clashes, clash_summary = detector.detect_all_clashes(ifc_data_for_clash)
+                finally:
+                    detector.store.close()
+                clash_summary.update({k: v for k, v in detector.store.summary().items()
+                                      if k in ('by_severity', 'by_element_type')})
                 logger.info(f"Clash detection complete: {len(clashes)} clashes found")
                 out['clashes_detected'] = clashes
                 out['clash_summary'] = clash_summary
+                out['clash_store'] = detector.store
                 # Log by severity
                 critical_count = clash_summary.get('by_severity', {}).get('CRITICAL', 0)
                 major_count = clash_summary.get('by_severity', {}).get('MAJOR', 0)
@@ -364,7 +393,7 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
         # 10) Erection sequencing
         ts, nm = stage("erection_sequence")
         from src.pipeline.erection_sequencing import sequence_erection
-        out['erection_sequence'] = sequence_erection(members)
+        out['erection_sequence'] = [m.to_dict() for m in sequence_erection(members)]
         end(ts, nm)
 
         # 11) Clash avoidance adjustments
@@ -412,7 +441,8 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
         if not os.getenv('AIBUILDX_DISABLE_IFC'):
             try:
                 from src.pipeline.universal_geometry_engine import fix_coordinate_origins_universal
-                ifc_model_fixed = fix_coordinate_origins_universal(out['ifc'])
+                ifc_model_fixed = fix_coordinate_origins_universal(out['ifc'], engine=geometry_engine,
+                                                                   incremental=True)
                 out['ifc'] = ifc_model_fixed
                 out['ifc_coordinates_verified'] = True
                 logger.info("IFC coordinates post-processed and verified")
@@ -435,6 +465,9 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
         out['error'] = str(e)
         status = 'error'
 
+    # JSON consumers get plain member dicts, materialized once at the end
+    if isinstance(out.get('members_classified'), MemberTable):
+        out['members_classified'] = out['members_classified'].to_members()
     return {'status': status, 'result': out}
 
 
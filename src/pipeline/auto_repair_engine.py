@@ -34,6 +34,7 @@ import math
 import numpy as np
 from .profile_db import profile_mapper, MATERIAL_CATALOG, SECTION_GEOM
 from .node_resolution import auto_generate_joints
+from .topology import get_topology
 from .logging_setup import get_logger
 from .ml_models import load_member_type_classifier, load_section_selector, train_member_type_classifier, train_section_selector
 
@@ -321,7 +322,8 @@ def repair_with_ml_orchestration(input_payload: Dict[str, Any]) -> Dict[str, Any
     2. ML profile selection based on estimated loads
     3. ML material selection based on role and stress
     4. Log predictions with confidence scores for audit trail
-    5. Generate nodes and joints
+    5. Generate nodes and joints (the node topology is kept on the payload
+       as ``_topology`` so later stages do not weld the nodes again)
     
     **This will improve automatically as:
     - More project data collected
@@ -381,8 +383,10 @@ def repair_with_ml_orchestration(input_payload: Dict[str, Any]) -> Dict[str, Any
     
     # Step 4: Generate nodes and joints
     logger.info("Step 4: Generating spatial nodes and joints")
-    joints = auto_generate_joints(members)
+    topology = get_topology(members)
+    joints = auto_generate_joints(members, topology=topology)
     input_payload.setdefault('joints', joints)
+    input_payload['_topology'] = topology
     
     # Step 5: Summary with confidence statistics
     total_role_conf = sum(m.get('_role_confidence', 0.5) for m in members)
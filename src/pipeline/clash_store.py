@@ -0,0 +1,302 @@
+"""Columnar (structure-of-arrays) clash store.
+
+Clash detectors produce one ``Clash`` dataclass per finding. For large
+models a ``ClashStore`` keeps the findings column-wise instead:
+
+- ``codes``: (n,) int32 category codes for ``category``, ``severity``,
+  ``element_type``, ``check``, ``element_id`` and ``related_id`` (the second
+  element of a pair; -1 = none), with the distinct values interned once in
+  ``categories`` (``member_table.Categories``)
+- ``position``: (n, 3) float array of the clash location (NaN = none),
+  taken from a 3-number ``current_value`` such as an intersection point
+- ``floats``: (n,) float arrays ``value`` / ``expected`` (numeric current and
+  expected values, NaN = not numeric) and ``confidence``
+- ``clash_ids`` / ``descriptions``: one string per clash
+- ``extras``: row -> non-numeric current/expected values, only where present
+
+Summary counts come straight from the code columns (``counts``,
+``summary``), ``page``/``iter_pages`` hand out plain dict records a page at a
+time, and an optional sink (``JsonlSink``, ``ParquetSink``) receives rows in
+batches while findings are appended, e.g. via ``ComprehensiveClashDetector.store``.
+"""
+import json
+import math
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .member_table import Categories
+
+CODED_COLUMNS = ('category', 'severity', 'element_type', 'check', 'element_id', 'related_id')
+FLOAT_COLUMNS = ('value', 'expected', 'confidence')
+
+
+def _label(value: Any) -> Any:
+    """Plain value of an interned entry (Enum -> its value, severity -> its name)."""
+    if isinstance(value, Enum):
+        return value.name if isinstance(value.value, int) else value.value
+    return value
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _point(value: Any) -> Optional[tuple]:
+    if isinstance(value, (tuple, list, np.ndarray)) and len(value) == 3:
+        xyz = [_number(v) for v in value]
+        if all(v is not None for v in xyz):
+            return tuple(xyz)
+    return None
+
+
+class ClashStore:
+    """Structure-of-arrays store of clash findings (see module docstring)."""
+
+    def __init__(self, sink=None, flush_every: int = 1024, capacity: int = 256):
+        self._n = 0
+        self.clash_ids: List[str] = []
+        self.descriptions: List[str] = []
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        self.categories: Dict[str, Categories] = {name: Categories() for name in CODED_COLUMNS}
+        self._alloc(max(1, capacity))
+        self.sink = sink
+        self.flush_every = max(1, int(flush_every))
+        self._flushed = 0
+
+    def _alloc(self, capacity: int) -> None:
+        codes = {name: np.full(capacity, -1, dtype=np.int32) for name in CODED_COLUMNS}
+        floats = {name: np.full(capacity, np.nan) for name in FLOAT_COLUMNS}
+        position = np.full((capacity, 3), np.nan)
+        if hasattr(self, 'position'):
+            n = self._n
+            for name in CODED_COLUMNS:
+                codes[name][:n] = self._codes[name][:n]
+            for name in FLOAT_COLUMNS:
+                floats[name][:n] = self._floats[name][:n]
+            position[:n] = self.position[:n]
+        self._codes, self._floats, self.position = codes, floats, position
+
+    @classmethod
+    def from_clashes(cls, clashes: Iterable[Any], sink=None) -> 'ClashStore':
+        store = cls(sink=sink)
+        store.extend(clashes)
+        return store
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def codes(self) -> Dict[str, np.ndarray]:
+        return {name: column[:self._n] for name, column in self._codes.items()}
+
+    @property
+    def floats(self) -> Dict[str, np.ndarray]:
+        return {name: column[:self._n] for name, column in self._floats.items()}
+
+    # ------------------------------------------------------------------
+    # appending
+    # ------------------------------------------------------------------
+    def append(self, clash: Any) -> int:
+        """Add one ``Clash`` (or an object/dict with the same fields); returns its row."""
+        get = clash.get if isinstance(clash, dict) else (lambda key, default=None: getattr(clash, key, default))
+        if self._n == len(self.position):
+            self._alloc(2 * len(self.position))
+        row = self._n
+        sources = get('sources') or ()
+        coded = {
+            'category': get('category'),
+            'severity': get('severity'),
+            'element_type': get('element_type'),
+            'check': get('check') or None,
+            'element_id': get('element_id'),
+            'related_id': sources[1][1] if len(sources) > 1 else None,
+        }
+        for name, value in coded.items():
+            if value is not None:
+                self._codes[name][row] = self.categories[name].encode(value)
+
+        extra = {}
+        current, expected = get('current_value'), get('expected_value')
+        point = _point(current)
+        if point is not None:
+            self.position[row] = point
+        elif _number(current) is not None:
+            self._floats['value'][row] = _number(current)
+        elif current is not None:
+            extra['current_value'] = current
+        if _number(expected) is not None:
+            self._floats['expected'][row] = _number(expected)
+        elif expected is not None:
+            extra['expected_value'] = expected
+        confidence = _number(get('confidence_score'))
+        if confidence is not None:
+            self._floats['confidence'][row] = confidence
+        if extra:
+            self.extras[row] = extra
+
+        self.clash_ids.append(str(get('clash_id', f'CLASH_{row + 1:06d}')))
+        self.descriptions.append(get('description') or '')
+        self._n += 1
+        if self.sink is not None and self._n - self._flushed >= self.flush_every:
+            self.flush()
+        return row
+
+    def extend(self, clashes: Iterable[Any]) -> None:
+        for clash in clashes:
+            self.append(clash)
+
+    def flush(self) -> None:
+        """Hand rows appended since the last flush to the sink."""
+        if self.sink is not None and self._flushed < self._n:
+            self.sink.write(self, self._flushed, self._n)
+            self._flushed = self._n
+
+    def close(self) -> None:
+        """Flush and close the sink (the store stays readable)."""
+        self.flush()
+        if self.sink is not None:
+            self.sink.close()
+
+    def __enter__(self) -> 'ClashStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # reading
+    # ------------------------------------------------------------------
+    def values(self, name: str) -> List[Any]:
+        """Decoded labels of a coded column (None where absent)."""
+        labels = [_label(v) for v in self.categories[name].values]
+        return [labels[c] if c >= 0 else None for c in self._codes[name][:self._n].tolist()]
+
+    def counts(self, name: str) -> Dict[Any, int]:
+        """Label -> number of clashes for a coded column, from the codes alone."""
+        codes = self._codes[name][:self._n]
+        tally = np.bincount(codes[codes >= 0], minlength=len(self.categories[name]))
+        return {_label(value): int(count)
+                for value, count in zip(self.categories[name].values, tally.tolist()) if count}
+
+    def summary(self) -> Dict[str, Any]:
+        """``ComprehensiveClashDetector`` summary counts, plus ``by_severity`` / ``by_element_type``."""
+        by_severity = self.counts('severity')
+        return {
+            'total': self._n,
+            'critical': by_severity.get('CRITICAL', 0),
+            'major': by_severity.get('MAJOR', 0),
+            'moderate': by_severity.get('MODERATE', 0),
+            'by_category': self.counts('category'),
+            'by_severity': by_severity,
+            'by_element_type': self.counts('element_type'),
+        }
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Plain (JSON-ready) dicts for rows ``start:stop``."""
+        stop = self._n if stop is None else min(stop, self._n)
+        start = max(0, start)
+        labels = {name: [_label(v) for v in self.categories[name].values] for name in CODED_COLUMNS}
+        codes = {name: self._codes[name][start:stop].tolist() for name in CODED_COLUMNS}
+        floats = {name: self._floats[name][start:stop].tolist() for name in FLOAT_COLUMNS}
+        position = self.position[start:stop].tolist()
+        out = []
+        for k in range(stop - start):
+            row = start + k
+            record = {'clash_id': self.clash_ids[row]}
+            for name in CODED_COLUMNS:
+                code = codes[name][k]
+                record[name] = labels[name][code] if code >= 0 else None
+            record['description'] = self.descriptions[row]
+            extra = self.extras.get(row, {})
+            xyz = position[k]
+            value = floats['value'][k]
+            if not math.isnan(xyz[0]):
+                record['current_value'] = xyz
+            elif not math.isnan(value):
+                record['current_value'] = value
+            else:
+                record['current_value'] = extra.get('current_value')
+            expected = floats['expected'][k]
+            record['expected_value'] = expected if not math.isnan(expected) else extra.get('expected_value')
+            confidence = floats['confidence'][k]
+            record['confidence_score'] = None if math.isnan(confidence) else confidence
+            out.append(record)
+        return out
+
+    def page(self, number: int, size: int = 100) -> Dict[str, Any]:
+        """Page ``number`` (0-based) of ``size`` records with paging metadata."""
+        size = max(1, int(size))
+        return {
+            'page': number,
+            'size': size,
+            'total': self._n,
+            'pages': -(-self._n // size),
+            'items': self.records(number * size, (number + 1) * size) if number >= 0 else [],
+        }
+
+    def iter_pages(self, size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        for start in range(0, self._n, max(1, int(size))):
+            yield self.records(start, start + size)
+
+
+class JsonlSink:
+    """Writes store rows as JSON lines to ``path`` (or an open text file)."""
+
+    def __init__(self, path):
+        self._own = isinstance(path, str)
+        self._fh = open(path, 'w', encoding='utf-8') if self._own else path
+
+    def write(self, store: ClashStore, start: int, stop: int) -> None:
+        self._fh.writelines(json.dumps(r, default=str) + '\n' for r in store.records(start, stop))
+
+    def close(self) -> None:
+        if self._own:
+            self._fh.close()
+        else:
+            self._fh.flush()
+
+
+class ParquetSink:
+    """Writes store rows to a Parquet file, one row group per flush (needs ``pyarrow``).
+
+    Coded columns are written dictionary-encoded, positions as ``x``/``y``/``z``.
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError("ParquetSink requires pyarrow (pip install pyarrow)") from e
+        self.path = path
+        self._writer = None
+
+    def write(self, store: ClashStore, start: int, stop: int) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        columns = {'clash_id': pa.array(store.clash_ids[start:stop], type=pa.string())}
+        for name in CODED_COLUMNS:
+            codes = store.codes[name][start:stop]
+            labels = pa.array([str(_label(v)) for v in store.categories[name].values], type=pa.string())
+            columns[name] = pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), labels)
+        columns['description'] = pa.array(store.descriptions[start:stop], type=pa.string())
+        for axis, name in enumerate('xyz'):
+            columns[name] = pa.array(store.position[start:stop, axis])
+        for name in FLOAT_COLUMNS:
+            columns[name] = pa.array(store.floats[name][start:stop])
+        columns['extra'] = pa.array([json.dumps(store.extras[r], default=str) if r in store.extras else None
+                                     for r in range(start, stop)], type=pa.string())
+        table = pa.table(columns)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
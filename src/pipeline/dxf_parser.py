@@ -1,274 +1,1112 @@
 """
 Modern DXF parser for the modular pipeline.
 Extracts geometric entities from DXF files and converts them to the pipeline format.
+
+Two ingestion modes are available:
+
+- ``parse_dxf_file`` loads the whole document with ``ezdxf.readfile`` (default).
+- ``iter_dxf_records`` walks the file at the tag level in a single pass and
+  yields records one entity at a time, so peak memory does not grow with the
+  size of the drawing.
+
+With ``workers`` > 1 an ASCII DXF is instead split into byte ranges of its
+ENTITIES section, cut on entity boundaries found by a regex scan of the
+memory-mapped file. Each worker process reads, decodes and converts its own
+range, and the records are merged back in modelspace order, so the output
+matches the serial path record for record.
+
+Block references (INSERT/MINSERT) are expanded from block geometry that is
+converted once per block definition and cached; in streaming mode a block's
+entities are read from its byte range only when it is first inserted, so only
+the converted arrays stay in memory. Every expanded member carries
+'block', 'block_instance' and 'block_member' so downstream stages can reuse
+per-block results.
+
+Curves are tessellated adaptively: ARC and ELLIPSE get as many chords as
+needed to stay within ``chord_tolerance`` (drawing units) of the true curve,
+and consecutive collinear segments of one entity (e.g. intermediate polyline
+vertices on a straight run) are coalesced into a single member.
+
+An optional layer filter (glob patterns or a named profile, see
+``src.pipeline.support.layer_filter``) is checked on each entity's layer
+before any attribute extraction or tessellation, so drafting layers cost
+nothing downstream.
+
+The same pass also collects the file statistics used to validate converted
+DXFs (entity/layer/block/proxy counts, hatch and polyline issues), so a file
+never has to be read a second time just to be checked.
 """
+import io
+import itertools
+import mmap
 import os
+import re
 import uuid
 import math
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from math import cos, sin, pi
 
+import numpy as np
+
+from src.pipeline.support.layer_filter import LayerFilter, make_layer_filter
+
+# DXF types converted by the parser; everything else in modelspace is skipped
+SUPPORTED_TYPES = ('LINE', 'POLYLINE', 'LWPOLYLINE', '3DFACE', 'CIRCLE', 'ARC', 'ELLIPSE', 'SPLINE', 'INSERT')
+
+# Extra types loaded only to collect validation statistics
+_STATS_TYPES = ('HATCH',)
+
+# Entities that belong to a parent entity and are not counted on their own
+_SUB_ENTITY_TYPES = {'VERTEX', 'SEQEND', 'ATTRIB'}
+
+_PROXY_TYPES = {'ACAD_PROXY_ENTITY', 'ACAD_PROXY_OBJECT'}
+
+# A group code 0 line followed by an entity/structure name. The name line
+# contains a letter, which a group code line never does, so a match is
+# always aligned on a tag even in the middle of a file.
+_ENTITY_START = re.compile(rb'\n[ \t]*0\r?\n([^\r\n]*[A-Za-z_][^\r\n]*)\r?\n')
+_SECTION_START = re.compile(rb'\n[ \t]*0\r?\nSECTION\r?\n[ \t]*2\r?\n([A-Za-z_]+)\r?\n')
+_SECTION_END = re.compile(rb'\n[ \t]*0\r?\nENDSEC\r?\n')
 
-def parse_dxf_file(file_path: str) -> Dict[str, Any]:
+# Issue messages kept per category in the statistics
+_MAX_ISSUE_SAMPLES = 10
+
+# Files larger than this are streamed when the caller does not choose a mode
+STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
+
+# Bytes of the ENTITIES section decoded per work unit when extracting in a process pool
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Statistics that are plain counters, summed over the chunks of a parallel read
+_STATS_COUNTERS = ('entity_count', 'proxy_count', 'hatch_issues', 'polyline_issues', 'block_instances',
+                   'curve_segments', 'segments_coalesced', 'entities_filtered')
+
+# Maximum distance (drawing units, usually mm) between a curve and its chords;
+# None falls back to the fixed steps (~15 degree arcs, 64-segment ellipses)
+DEFAULT_CHORD_TOLERANCE = 5.0
+
+# Sine of the largest angle between two segments that still counts as collinear
+_COLLINEAR_SINE = 1e-6
+
+_MAX_CURVE_SEGMENTS = 4096
+
+
+def parse_dxf_file(file_path: str, streaming: Optional[bool] = False, workers: Optional[int] = None,
+                   chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                   chord_tolerance: Optional[float] = DEFAULT_CHORD_TOLERANCE,
+                   coalesce: bool = True, layer_filter: Any = None) -> Dict[str, Any]:
     """
     Parse a DXF file and extract structural members.
-    
+
     Args:
         file_path: Path to the DXF file
-        
+        streaming: Read the modelspace entity by entity instead of loading
+            the whole document (see ``iter_dxf_records``). ``None`` streams
+            files larger than ``STREAMING_THRESHOLD_BYTES``.
+        workers: Worker processes that read and convert byte ranges of the
+            ENTITIES section. ``None`` or 1 reads in-process, 0 uses all CPUs.
+        chunk_bytes: Size of the byte range handed to a worker at a time
+        chord_tolerance: Maximum chord error for ARC/ELLIPSE tessellation in
+            drawing units; ``None`` uses the legacy fixed segment counts
+        coalesce: Merge consecutive collinear segments of an entity
+        layer_filter: Layers to keep: a profile name (e.g. ``"AISC
+            structural"``), a dict with ``profile``/``include``/``exclude``
+            glob patterns or a ``LayerFilter``; ``None`` keeps every layer
+
     Returns:
-        Dictionary with 'members' list containing extracted entities
+        Dictionary with 'members' and 'circles' lists and the 'dxf_stats'
+        collected while reading (see ``new_dxf_stats``)
+    """
+    if streaming is None:
+        streaming = should_stream(file_path)
+    members = []
+    circles = []
+    stats = new_dxf_stats()
+    records = iter_dxf_records(file_path, streaming=streaming, workers=workers, chunk_bytes=chunk_bytes,
+                               stats=stats, chord_tolerance=chord_tolerance, coalesce=coalesce,
+                               layer_filter=layer_filter)
+    for kind, record in records:
+        (members if kind == 'member' else circles).append(record)
+    return {'members': members, 'circles': circles, 'dxf_stats': stats}
+
+
+def iter_dxf_records(file_path: str, streaming: bool = True, workers: Optional[int] = None,
+                     chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                     stats: Optional[Dict[str, Any]] = None,
+                     chord_tolerance: Optional[float] = DEFAULT_CHORD_TOLERANCE,
+                     coalesce: bool = True, layer_filter: Any = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
     """
+    Yield member and circle records from the modelspace of a DXF file.
+
+    In streaming mode (the default) the file is read tag by tag and only one
+    entity is held in memory at a time, so this is suitable for drawings that
+    do not fit in memory once loaded by ``ezdxf.readfile``. With ``workers``
+    > 1 an ASCII file is read in byte ranges by a process pool whatever the
+    mode. Records are yielded in modelspace order either way.
+
+    Args:
+        file_path: Path to a seekable ASCII DXF file (binary DXF needs
+            ``streaming=False`` and is always read in-process)
+        streaming: Walk the tags directly instead of using ``ezdxf.readfile``
+        workers: Worker processes for extraction (see ``parse_dxf_file``)
+        chunk_bytes: Size of the byte range handed to a worker at a time
+        stats: Optional dict from ``new_dxf_stats`` filled in while reading
+        chord_tolerance: Curve tessellation tolerance (see ``parse_dxf_file``)
+        coalesce: Merge consecutive collinear segments of an entity
+        layer_filter: Layers to keep (see ``parse_dxf_file``)
+
+    Yields:
+        ``('member', member)`` or ``('circle', circle)`` tuples
+    """
+    if stats is None:
+        stats = new_dxf_stats()
+    options = (chord_tolerance, coalesce)
+    accept = make_layer_filter(layer_filter)
+    stats['chord_tolerance'] = chord_tolerance
+    stats['layer_filter'] = accept.describe() if accept else None
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers and workers > 1 and not _is_binary_dxf(file_path):
+        yield from _parallel_records(file_path, workers, chunk_bytes, stats, options, accept)
+        return
+    for primitive in _iter_primitives(file_path, streaming, stats, options, accept):
+        yield from _primitive_records(primitive, options, stats)
+
+
+def read_dxf_stats(file_path: str, streaming: Optional[bool] = None) -> Dict[str, Any]:
+    """Validation statistics of a DXF file (``new_dxf_stats``) without building members.
+
+    Reads the file like ``parse_dxf_file`` but skips tessellation and record
+    construction; for callers that only need to check a file.
+    """
+    if streaming is None:
+        streaming = should_stream(file_path)
+    stats = new_dxf_stats()
+    for _ in _iter_primitives(file_path, streaming, stats):
+        pass
+    return stats
+
+
+def dxf_parse_options(extra: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Select the ``parse_dxf_file`` keyword arguments from a pipeline ``extra`` dict."""
+    extra = extra or {}
+    options = {'streaming': extra.get('streaming'), 'workers': extra.get('workers')}
+    if extra.get('layer_filter') is not None:
+        options['layer_filter'] = extra['layer_filter']
+    if 'chord_tolerance' in extra:
+        options['chord_tolerance'] = extra['chord_tolerance']
+    if 'coalesce' in extra:
+        options['coalesce'] = bool(extra['coalesce'])
+    return options
+
+
+def should_stream(file_path: str) -> bool:
+    """Return True if the file is large enough to be ingested in streaming mode."""
+    try:
+        return os.path.getsize(file_path) >= STREAMING_THRESHOLD_BYTES
+    except OSError:
+        return False
+
+
+def new_dxf_stats() -> Dict[str, Any]:
+    """Empty statistics record filled in while a DXF file is read.
+
+    Table counts and units are None when the reader could not determine them.
+    """
+    return {
+        'entity_count': 0,
+        'layer_count': None,
+        'block_count': None,
+        'proxy_count': 0,
+        'dimstyle_count': None,
+        'textstyle_count': None,
+        'units': None,
+        'hatch_issues': 0,
+        'polyline_issues': 0,
+        'hatch_issue_samples': [],
+        'polyline_issue_samples': [],
+        'block_instances': 0,
+        'block_definitions_used': 0,
+        'chord_tolerance': None,
+        'curve_segments': 0,
+        'segments_coalesced': 0,
+        'layer_filter': None,
+        'entities_filtered': 0,
+    }
+
+
+def _add_issue(stats: Dict[str, Any], kind: str, message: str) -> None:
+    stats[f'{kind}_issues'] += 1
+    samples = stats[f'{kind}_issue_samples']
+    if len(samples) < _MAX_ISSUE_SAMPLES:
+        samples.append(message)
+
+
+def _observe_entity(stats: Dict[str, Any], entity, dxftype: str, primitive) -> None:
+    """Record validation findings for one modelspace entity."""
+    # Proxy object detection (critical for AEC/Civil3D content)
+    if dxftype in _PROXY_TYPES:
+        stats['proxy_count'] += 1
+
+    # Hatch boundary integrity
+    elif dxftype == 'HATCH':
+        try:
+            if hasattr(entity, 'paths'):
+                paths = entity.paths
+                if not paths or len(paths) == 0:
+                    _add_issue(stats, 'hatch', f"Empty hatch boundary: {entity.dxf.handle}")
+        except Exception:
+            _add_issue(stats, 'hatch', f"Invalid hatch: {entity.dxf.handle}")
+
+    # LWPOLYLINE geometry checks on the points already extracted for parsing
+    elif dxftype == 'LWPOLYLINE' and primitive is not None:
+        points, is_closed = primitive[2]
+        if is_closed and len(points) < 3:
+            _add_issue(stats, 'polyline', f"Invalid closed polyline (< 3 points): {entity.dxf.handle}")
+        # Check for self-intersection (basic): duplicate consecutive points
+        if len(points) > 3:
+            for i in range(len(points) - 1):
+                if points[i] == points[i+1]:
+                    _add_issue(stats, 'polyline', f"Duplicate points in polyline: {entity.dxf.handle}")
+                    break
+
+
+def _read_error(e: Exception) -> RuntimeError:
+    error_msg = str(e)
+    if "Invalid group code" in error_msg or "DXFStructureError" in error_msg or type(e).__name__ == "DXFStructureError":
+        return RuntimeError(
+            f"Invalid DXF file format. The file appears to be corrupted or contains non-DXF content. "
+            f"Please ensure the file is a valid DXF file exported from CAD software. Error: {error_msg}"
+        )
+    return RuntimeError(f"Failed to read DXF file: {error_msg}")
+
+
+def _require_ezdxf(file_path: str):
+    """The ``ezdxf`` module, after checking that ``file_path`` exists."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"DXF file not found: {file_path}")
-    
     try:
         import ezdxf
     except ImportError:
         raise RuntimeError("ezdxf is required for DXF parsing. Install with: pip install ezdxf")
-    
+    return ezdxf
+
+
+def _is_binary_dxf(file_path: str) -> bool:
+    try:
+        from ezdxf.lldxf.validator import is_binary_dxf_file
+        return is_binary_dxf_file(file_path)
+    except Exception:
+        return False
+
+
+def _parallel_records(file_path: str, workers: int, chunk_bytes: int, stats: Dict[str, Any],
+                      options: Tuple[Optional[float], bool],
+                      accept: Optional[LayerFilter]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Extract the records of an ASCII DXF file in a process pool.
+
+    The parent only scans the file for byte offsets and reads the sections
+    before ENTITIES for the table statistics; the workers decode and convert
+    the ENTITIES ranges (``_extract_entity_range``). Results are yielded in
+    range order and at most ``2 * workers`` ranges are in flight.
+    """
+    _require_ezdxf(file_path)
+    from concurrent.futures import ProcessPoolExecutor
+    from ezdxf.filemanagement import dxf_file_info
+    from ezdxf.lldxf.tagger import ascii_tags_loader, tag_compiler
+
+    try:
+        encoding = dxf_file_info(file_path).encoding
+        layout = _dxf_layout(file_path, encoding, entities=True)
+        with open(file_path, mode='rt', encoding=encoding, errors='surrogateescape') as fp:
+            _read_sections(tag_compiler(ascii_tags_loader(fp)), stats)
+        spans = _entity_ranges(file_path, layout, chunk_bytes)
+    except Exception as e:
+        raise _read_error(e)
+
+    converted = set()
+    pending = deque()
+
+    def drain():
+        try:
+            records, counts, blocks = pending.popleft().result()
+        except Exception as e:
+            raise _read_error(e)
+        for name, block_counts in blocks.items():
+            if name in converted:
+                # block also converted for an earlier range: count its tessellation once
+                for key, value in block_counts.items():
+                    counts[key] -= value
+            converted.add(name)
+        _merge_stats(stats, counts)
+        return records
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for span in spans:
+            pending.append(pool.submit(_extract_entity_range, file_path, layout, span, options, accept))
+            if len(pending) >= workers * 2:
+                yield from drain()
+        while pending:
+            yield from drain()
+    stats['block_definitions_used'] = len(converted)
+
+
+def _extract_entity_range(file_path: str, layout: Dict[str, Any], span: Tuple[int, int],
+                          options: Tuple[Optional[float], bool], accept: Optional[LayerFilter]):
+    """Process-pool worker: read, decode and convert the modelspace entities of one byte range.
+
+    Returns the records, the statistics counted for the range and the
+    tessellation counts of every block converted on the way.
+    """
+    stats = new_dxf_stats()
+    library = _BlockLibrary(_block_resolver(file_path, layout), options, stats, accept)
+    requested = _requested_types(SUPPORTED_TYPES + _STATS_TYPES)
+    records = []
+    for entity in _iter_entities(_range_tags(file_path, layout['encoding'], *span), requested, stats, accept):
+        for primitive in _modelspace_primitives(entity, stats, library):
+            records.extend(_primitive_records(primitive, options, stats))
+    return records, stats, library.converted()
+
+
+def _merge_stats(stats: Dict[str, Any], counts: Dict[str, Any]) -> None:
+    for key in _STATS_COUNTERS:
+        stats[key] += counts[key]
+    for kind in ('hatch', 'polyline'):
+        samples = stats[f'{kind}_issue_samples']
+        samples.extend(counts[f'{kind}_issue_samples'][:_MAX_ISSUE_SAMPLES - len(samples)])
+
+
+def _iter_primitives(file_path: str, streaming: bool, stats: Dict[str, Any],
+                     options: Tuple[Optional[float], bool] = (DEFAULT_CHORD_TOLERANCE, True),
+                     accept: Optional[LayerFilter] = None) -> Iterator[Tuple[str, str, Any]]:
+    """Read the modelspace and yield (dxftype, layer, data) primitives."""
+    ezdxf = _require_ezdxf(file_path)
+
+    if streaming:
+        try:
+            from ezdxf.filemanagement import dxf_file_info
+            layout = _dxf_layout(file_path, dxf_file_info(file_path).encoding)
+            library = _BlockLibrary(_block_resolver(file_path, layout), options, stats, accept)
+            entities = _stream_modelspace(file_path, SUPPORTED_TYPES + _STATS_TYPES, stats, accept, layout['encoding'])
+            for entity in entities:
+                yield from _modelspace_primitives(entity, stats, library)
+        except Exception as e:
+            raise _read_error(e)
+        stats['block_definitions_used'] = len(library)
+        return
+
     # Read DXF file
     try:
         doc = ezdxf.readfile(file_path)
     except Exception as e:
-        error_msg = str(e)
-        if "Invalid group code" in error_msg or "DXFStructureError" in error_msg:
-            raise RuntimeError(
-                f"Invalid DXF file format. The file appears to be corrupted or contains non-DXF content. "
-                f"Please ensure the file is a valid DXF file exported from CAD software. Error: {error_msg}"
-            )
+        raise _read_error(e)
+    stats.update({
+        'layer_count': len(doc.layers),
+        'block_count': len(doc.blocks),
+        'dimstyle_count': len(doc.dimstyles) if hasattr(doc, 'dimstyles') else 0,
+        'textstyle_count': len(doc.styles) if hasattr(doc, 'styles') else 0,
+        'units': doc.header.get('$INSUNITS'),
+    })
+
+    def resolve_block(name):
+        block = doc.blocks.get(name)
+        if block is None:
+            return None
+        return block.block.dxf.base_point, block
+
+    library = _BlockLibrary(resolve_block, options, stats, accept)
+    for entity in doc.modelspace():
+        stats['entity_count'] += 1
+        if accept is not None and entity.dxftype() != 'INSERT' and not accept(entity.dxf.get('layer')):
+            stats['entities_filtered'] += 1
+            continue
+        yield from _modelspace_primitives(entity, stats, library)
+    stats['block_definitions_used'] = len(library)
+
+
+def _modelspace_primitives(entity, stats: Dict[str, Any], library: '_BlockLibrary') -> Iterator[Tuple[str, str, Any]]:
+    dxftype = entity.dxftype()
+    if dxftype == 'INSERT':
+        try:
+            for primitive in library.instances(entity):
+                stats['block_instances'] += 1
+                yield primitive
+        except Exception:
+            pass
+        return
+    primitive = _entity_primitive(entity)
+    _observe_entity(stats, entity, dxftype, primitive)
+    if primitive is not None:
+        yield primitive
+
+
+def _stream_modelspace(file_path: str, types: Iterable[str], stats: Dict[str, Any],
+                       accept: Optional[LayerFilter] = None, encoding: Optional[str] = None):
+    """Single tag-level pass over an ASCII DXF file.
+
+    Yields modelspace entities of the requested types (with their VERTEX /
+    ATTRIB sub-entities linked) and counts table entries, blocks, modelspace
+    entities and proxies from the tags on the way. Block definitions are not
+    kept; INSERTs resolve them through ``_dxf_layout`` when first referenced.
+    Modelspace entities whose layer (group code 8) is rejected by ``accept``
+    are skipped with their sub-entities before they are built; INSERTs are
+    always built since their block content may live on other layers.
+    Modelled on ``ezdxf.addons.iterdxf.modelspace``; reading stops at the end
+    of the ENTITIES section.
+    """
+    from ezdxf.filemanagement import dxf_file_info
+    from ezdxf.lldxf.tagger import ascii_tags_loader, tag_compiler
+
+    if encoding is None:
+        encoding = dxf_file_info(file_path).encoding
+    with open(file_path, mode='rt', encoding=encoding, errors='surrogateescape') as fp:
+        tags = tag_compiler(ascii_tags_loader(fp))
+        if _read_sections(tags, stats):
+            yield from _iter_entities(tags, _requested_types(types), stats, accept)
+
+
+def _requested_types(types: Iterable[str]) -> set:
+    """Entity types to build, including the sub-entities linked to them."""
+    requested = set(types)
+    if 'POLYLINE' in requested:
+        requested.update({'VERTEX', 'SEQEND'})
+    if 'INSERT' in requested:
+        requested.update({'ATTRIB', 'SEQEND'})
+    return requested
+
+
+def _read_sections(tags: Iterator[Any], stats: Dict[str, Any]) -> bool:
+    """Count header units, table entries and blocks up to the ENTITIES section.
+
+    Consumes ``tags`` through the ENTITIES section header and returns True,
+    or False if the file has no ENTITIES section.
+    """
+    table_keys = {'LAYER': 'layer_count', 'BLOCK': 'block_count', 'DIMSTYLE': 'dimstyle_count', 'STYLE': 'textstyle_count'}
+    for key in table_keys.values():
+        stats[key] = 0
+    section = None
+    header_var = None
+    prev_code, prev_value = -1, ''
+    for tag in tags:
+        code, value = tag.code, tag.value
+        if code == 0:
+            if value == 'ENDSEC':
+                section = None
+            elif section in ('TABLES', 'BLOCKS') and value in table_keys:
+                stats[table_keys[value]] += 1
+        elif code == 2 and prev_code == 0 and prev_value == 'SECTION':
+            if value == 'ENTITIES':
+                return True
+            section = value
+        elif section == 'HEADER':
+            if code == 9:
+                header_var = value
+            elif header_var == '$INSUNITS':
+                stats['units'] = value
+        prev_code, prev_value = code, value
+    return False
+
+
+def _iter_entities(tags: Iterator[Any], requested: set, stats: Optional[Dict[str, Any]] = None,
+                   accept: Optional[LayerFilter] = None):
+    """Build the entities of a tag stream that starts at an entity's 0 tag.
+
+    Reads up to ENDSEC or the end of ``tags``, links VERTEX/ATTRIB
+    sub-entities to their parent and skips paperspace entities. With
+    ``stats`` the entities (and proxies) are counted; entities rejected by
+    ``accept`` are skipped before they are built (except INSERTs).
+    """
+    from ezdxf.lldxf.types import DXFTag
+    from ezdxf.lldxf.extendedtags import ExtendedTags
+    from ezdxf.entities import factory
+    from ezdxf.entities.subentity import entity_linker
+
+    linked_entity = entity_linker()
+    buffer = []
+    queued = None
+    skipping = False
+    for tag in itertools.chain(tags, [DXFTag(0, 'ENDSEC')]):
+        if tag.code != 0:
+            buffer.append(tag)
+            continue
+        if buffer:
+            etype = buffer[0].value
+            in_paperspace = any(t.code == 67 and t.value == 1 for t in buffer)
+            if etype not in _SUB_ENTITY_TYPES:
+                if stats is not None and not in_paperspace:
+                    stats['entity_count'] += 1
+                    if etype in _PROXY_TYPES:
+                        stats['proxy_count'] += 1
+                skipping = False
+                if accept is not None and etype in requested and etype != 'INSERT' and not in_paperspace:
+                    layer = next((t.value for t in buffer if t.code == 8), '0')
+                    if not accept(layer):
+                        if stats is not None:
+                            stats['entities_filtered'] += 1
+                        skipping = True
+            if etype in requested and not skipping:
+                entity = factory.load(ExtendedTags(buffer))
+                if not linked_entity(entity) and not in_paperspace:
+                    # queue one entity for collecting linked VERTEX/ATTRIB entities
+                    if queued:
+                        yield queued
+                    queued = entity
+        buffer = [tag]
+        if tag.value == 'ENDSEC':
+            if queued:
+                yield queued
+            return
+
+
+def _dxf_layout(file_path: str, encoding: str, entities: bool = False) -> Dict[str, Any]:
+    """Byte ranges of the block definitions in an ASCII DXF file.
+
+    Returns ``{'encoding': ..., 'blocks': {name: (base_point, start, stop)},
+    'entities': (start, stop) or None}`` where a block's ``start``/``stop``
+    enclose the entities between the BLOCK header and ENDBLK. Found with a
+    regex scan of the memory-mapped file, so nothing but the offsets is kept.
+    The scan stops at the ENTITIES section unless ``entities`` asks for that
+    section's range (from its first entity to its ENDSEC) too.
+    """
+    layout = {'encoding': encoding, 'blocks': {}, 'entities': None}
+    with open(file_path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return layout
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # offsets are line starts; patterns begin at the newline before a line
+            pos = 0
+            while True:
+                match = _SECTION_START.search(mm, max(pos - 1, 0))
+                if match is None:
+                    return layout
+                pos = match.end()
+                if match.group(1) == b'ENTITIES':
+                    if entities:
+                        end = _SECTION_END.search(mm, pos - 1)
+                        layout['entities'] = (pos, end.start() + 1 if end else len(mm))
+                    return layout
+                if match.group(1) == b'BLOCKS':
+                    pos = _scan_blocks(mm, pos, encoding, layout['blocks'])
+
+
+def _scan_blocks(mm, pos: int, encoding: str, blocks: Dict[str, Any]) -> int:
+    """Record the block ranges of the BLOCKS section starting at ``pos``; returns the offset after it."""
+    header = content = None
+    for match in _ENTITY_START.finditer(mm, pos - 1):
+        etype, at = match.group(1).strip(), match.start() + 1
+        if header is not None and content is None:
+            content = at
+        if etype == b'BLOCK':
+            header, content = at, None
+        elif etype == b'ENDBLK' and content is not None:
+            name, base = _block_header(mm[header:content], encoding)
+            if name is not None:
+                blocks[name] = (base, content, at)
+            header = content = None
+        elif etype == b'ENDSEC':
+            return match.end()
+    return len(mm)
+
+
+def _entity_ranges(file_path: str, layout: Dict[str, Any], chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Split the ENTITIES section into byte ranges of about ``chunk_bytes``.
+
+    Ranges are cut only where a top-level entity starts, so a POLYLINE or
+    INSERT always stays in one range with its VERTEX/ATTRIB/SEQEND entities.
+    """
+    if layout['entities'] is None:
+        return []
+    start, stop = layout['entities']
+    sub_entities = {t.encode() for t in _SUB_ENTITY_TYPES}
+    bounds = [start]
+    with open(file_path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        target = start + max(1, chunk_bytes)
+        while target < stop:
+            cut = next((m for m in _ENTITY_START.finditer(mm, target - 1, stop)
+                        if m.group(1).strip() not in sub_entities), None)
+            if cut is None:
+                break
+            bounds.append(cut.start() + 1)
+            target = bounds[-1] + max(1, chunk_bytes)
+    bounds.append(stop)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _block_header(data: bytes, encoding: str) -> Tuple[Optional[str], Tuple[float, ...]]:
+    """(name, base point) from the tags of a BLOCK header."""
+    tags = list(_decode_tags(data, encoding))
+    name = next((t.value for t in tags if t.code == 2), None)
+    base = next((t.value for t in tags if t.code == 10), (0.0, 0.0, 0.0))
+    return name, tuple(base)
+
+
+def _decode_tags(data: bytes, encoding: str) -> Iterator[Any]:
+    """Compiled tags of a DXF fragment that starts at a group code line."""
+    from ezdxf.lldxf.tagger import ascii_tags_loader, tag_compiler
+    # the compiler looks one tag ahead to finish a point, so close the fragment with a 0 tag
+    text = data.decode(encoding, errors='surrogateescape') + '  0\nENDSEC\n'
+    return tag_compiler(ascii_tags_loader(io.StringIO(text, newline=None)))
+
+
+def _range_tags(file_path: str, encoding: str, start: int, stop: int) -> Iterator[Any]:
+    """Compiled tags of the byte range [start, stop) of an ASCII DXF file."""
+    with open(file_path, 'rb') as fp:
+        fp.seek(start)
+        data = fp.read(stop - start)
+    return _decode_tags(data, encoding)
+
+
+def _block_resolver(file_path: str, layout: Dict[str, Any]):
+    """``_BlockLibrary`` resolver reading a block's entities from its byte range on demand."""
+    requested = _requested_types(SUPPORTED_TYPES)
+
+    def resolve(name):
+        span = layout['blocks'].get(name)
+        if span is None:
+            return None
+        base, start, stop = span
+        return base, _iter_entities(_range_tags(file_path, layout['encoding'], start, stop), requested)
+
+    return resolve
+
+
+class _BlockLibrary:
+    """Block definitions converted to line segments once and reused per INSERT.
+
+    Geometry is cached per block name in the block's own coordinate system as
+    NumPy arrays; each INSERT (or MINSERT grid element) then only applies its
+    4x4 transform to the cached arrays. Nested INSERTs are flattened into the
+    parent block's cached geometry.
+    """
+
+    def __init__(self, resolve, options: Tuple[Optional[float], bool] = (DEFAULT_CHORD_TOLERANCE, True),
+                 stats: Optional[Dict[str, Any]] = None, accept: Optional[LayerFilter] = None):
+        # resolve(name) -> (base_point, iterable of entities) or None
+        self._resolve = resolve
+        self._options = options
+        self._stats = stats
+        self._accept = accept
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._building = set()
+
+    def __len__(self) -> int:
+        return sum(1 for g in self._cache.values() if g is not None)
+
+    def converted(self) -> Dict[str, Dict[str, int]]:
+        """Tessellation counts of each block converted so far, by name."""
+        return {name: g['counts'] for name, g in self._cache.items() if g is not None}
+
+    def geometry(self, name: str) -> Optional[Dict[str, Any]]:
+        if name in self._cache:
+            return self._cache[name]
+        if name in self._building:
+            return None  # recursive block reference
+        definition = self._resolve(name)
+        if definition is None:
+            self._cache[name] = None
+            return None
+        base, entities = definition
+        self._building.add(name)
+        starts, ends, layers, circles = [], [], [], []
+        counts = {'curve_segments': 0, 'segments_coalesced': 0}
+        try:
+            for entity in entities:
+                if entity.dxftype() == 'INSERT':
+                    for _, _, data in self.instances(entity, nested=True):
+                        for start, end, layer in data['segments']:
+                            starts.append(start)
+                            ends.append(end)
+                            layers.append(layer)
+                        circles.extend(data['circles'])
+                    continue
+                primitive = _entity_primitive(entity)
+                if primitive is None:
+                    continue
+                dxftype, layer, data = primitive
+                # Layer 0 content takes the INSERT layer, so it is filtered per instance
+                if self._accept is not None and layer != '0' and not self._accept(layer):
+                    continue
+                if dxftype == 'CIRCLE':
+                    circles.append(data)
+                    continue
+                for start, end in _entity_segments(dxftype, data, self._options, counts):
+                    starts.append(start)
+                    ends.append(end)
+                    layers.append(layer)
+        finally:
+            self._building.discard(name)
+        if self._stats is not None:
+            for key, value in counts.items():
+                self._stats[key] += value
+        geometry = {
+            'base': [float(c) for c in base],
+            'starts': np.asarray(starts, dtype=float).reshape(-1, 3),
+            'ends': np.asarray(ends, dtype=float).reshape(-1, 3),
+            'layers': layers,
+            'circles': circles,
+            'counts': counts,
+        }
+        self._cache[name] = geometry
+        return geometry
+
+    def instances(self, entity, nested: bool = False) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield one BLOCKREF primitive per (M)INSERT grid element.
+
+        ``nested`` is set while flattening an INSERT into a parent block, where
+        layer 0 content still resolves against the outer reference.
+        """
+        name = entity.dxf.name
+        geometry = self.geometry(name)
+        if geometry is None:
+            return
+        layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
+        if self._accept is not None and not (nested and layer == '0') and not self._accept(layer):
+            # Layer 0 content would land on a rejected layer: keep the rest only
+            keep = np.array([lyr != '0' for lyr in geometry['layers']], dtype=bool)
+            geometry = {
+                **geometry,
+                'starts': geometry['starts'][keep],
+                'ends': geometry['ends'][keep],
+                'layers': [lyr for lyr in geometry['layers'] if lyr != '0'],
+                'circles': [c for c in geometry['circles'] if c['layer'] != '0'],
+            }
+            if not geometry['layers'] and not geometry['circles']:
+                if self._stats is not None:
+                    self._stats['entities_filtered'] += 1
+                return
+        handle = entity.dxf.get('handle') or f"{name}@{id(entity):x}"
+        grid = list(entity.multi_insert()) if entity.mcount > 1 else [entity]
+        for k, ins in enumerate(grid):
+            m = ins.matrix44()
+            if ins.block() is None:
+                # Detached entity (streaming mode): apply the block base point ourselves
+                from ezdxf.math import Vec3
+                m.set_row(3, (Vec3(m.get_row(3)[:3]) - m.transform_direction(geometry['base'])).xyz)
+            matrix = np.array(list(m.rows()), dtype=float)
+            rot, shift = matrix[:3, :3], matrix[3, :3]
+            starts = (geometry['starts'] @ rot + shift).tolist()
+            ends = (geometry['ends'] @ rot + shift).tolist()
+            # Entities on layer 0 inherit the layer of the block reference
+            seg_layers = [layer if lyr == '0' else lyr for lyr in geometry['layers']]
+            scale = float(np.linalg.norm(rot[0])) or 1.0
+            circles = []
+            for c in geometry['circles']:
+                center = (np.asarray(c['center'], dtype=float) @ rot + shift).tolist()
+                circles.append({**c, 'center': center, 'radius': c['radius'] * scale,
+                                'layer': layer if c['layer'] == '0' else c['layer']})
+            instance = handle if len(grid) == 1 else f"{handle}:{k}"
+            yield 'BLOCKREF', layer, {
+                'block': name,
+                'instance': instance,
+                'segments': list(zip(starts, ends, seg_layers)),
+                'circles': circles,
+            }
+
+
+def _make_member(start: List[float], end: List[float], layer: str) -> Dict[str, Any]:
+    return {
+        'id': str(uuid.uuid4()),
+        'start': start,
+        'end': end,
+        'length': _calculate_length(start, end),
+        'layer': layer
+    }
+
+
+def _primitive_records(primitive: Tuple[str, str, Any],
+                       options: Tuple[Optional[float], bool] = (DEFAULT_CHORD_TOLERANCE, True),
+                       counts: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Convert one primitive into member/circle records.
+
+    A failure while converting a primitive drops the rest of that entity only,
+    segments produced before the failure are kept.
+    """
+    dxftype, layer, data = primitive
+    if dxftype == 'CIRCLE':
+        yield 'circle', data
+        return
+    if dxftype == 'BLOCKREF':
+        ref = {'block': data['block'], 'block_instance': data['instance']}
+        for i, (start, end, seg_layer) in enumerate(data['segments']):
+            member = _make_member(start, end, seg_layer)
+            member.update(ref, block_member=i)
+            yield 'member', member
+        for circle in data['circles']:
+            yield 'circle', {**circle, **ref}
+        return
+    for start, end in _entity_segments(dxftype, data, options, counts):
+        yield 'member', _make_member(start, end, layer)
+
+
+def _entity_segments(dxftype: str, data: Any, options: Tuple[Optional[float], bool],
+                     counts: Optional[Dict[str, Any]] = None) -> List[Tuple[List[float], List[float]]]:
+    """Tessellate one primitive and optionally coalesce its collinear segments.
+
+    A failure while converting keeps the segments produced before it.
+    """
+    chord_tolerance, coalesce = options
+    segments = []
+    try:
+        for segment in _primitive_segments(dxftype, data, chord_tolerance):
+            segments.append(segment)
+    except Exception:
+        pass
+    if counts is not None and dxftype in ('ARC', 'ELLIPSE'):
+        counts['curve_segments'] += len(segments)
+    if coalesce and len(segments) > 1:
+        merged = _coalesce_segments(segments)
+        if counts is not None:
+            counts['segments_coalesced'] += len(segments) - len(merged)
+        segments = merged
+    return segments
+
+
+def _coalesce_segments(segments: List[Tuple[List[float], List[float]]]) -> List[Tuple[List[float], List[float]]]:
+    """Merge consecutive segments that share an endpoint and continue in the same direction."""
+    merged = [segments[0]]
+    for start, end in segments[1:]:
+        prev_start, prev_end = merged[-1]
+        if list(prev_end) == list(start) and _continues(prev_start, prev_end, end):
+            merged[-1] = (prev_start, end)
         else:
-            raise RuntimeError(f"Failed to read DXF file: {error_msg}")
-    
-    modelspace = doc.modelspace()
-    
-    entities = []
-    circles = []
-    
-    # Extract LINE entities and CIRCLE entities
-    for entity in modelspace:
-        if entity.dxftype() == 'LINE':
+            merged.append((start, end))
+    return merged
+
+
+def _continues(a: List[float], b: List[float], c: List[float]) -> bool:
+    """True if b -> c continues a -> b along the same straight line."""
+    u = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+    v = (c[0] - b[0], c[1] - b[1], c[2] - b[2])
+    dot = u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
+    if dot <= 0.0:
+        return False
+    cross = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0])
+    cross_norm = math.sqrt(cross[0] ** 2 + cross[1] ** 2 + cross[2] ** 2)
+    return cross_norm <= _COLLINEAR_SINE * math.sqrt(u[0] ** 2 + u[1] ** 2 + u[2] ** 2) * math.sqrt(v[0] ** 2 + v[1] ** 2 + v[2] ** 2)
+
+
+def _curve_segment_count(radius: float, sweep: float, chord_tolerance: float) -> int:
+    """Chords needed so a circular sweep of ``radius`` deviates at most ``chord_tolerance``."""
+    # At least one chord per quarter turn so closed curves keep their shape
+    minimum = max(1, math.ceil(sweep / (pi / 2) - 1e-9))
+    if radius <= chord_tolerance:
+        return minimum
+    step = 2.0 * math.acos(1.0 - chord_tolerance / radius)
+    return min(_MAX_CURVE_SEGMENTS, max(minimum, math.ceil(sweep / step - 1e-9)))
+
+
+def _point3(p) -> List[float]:
+    return [p[0], p[1], p[2] if len(p) > 2 else 0.0]
+
+
+def _entity_primitive(entity) -> Optional[Tuple[str, str, Any]]:
+    """Extract the plain data needed to convert an entity, or None to skip it.
+
+    Only attribute access happens here; tessellation is left to
+    ``_primitive_segments``.
+    """
+    dxftype = entity.dxftype()
+    if dxftype not in SUPPORTED_TYPES:
+        return None
+    try:
+        layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
+
+        # Extract LINE entities
+        if dxftype == 'LINE':
             start = entity.dxf.start
             end = entity.dxf.end
-            entities.append({
-                'type': 'LINE',
-                'start': [start.x, start.y, start.z],
-                'end': [end.x, end.y, end.z],
-                'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-            })
-        
+            return dxftype, layer, ([start.x, start.y, start.z], [end.x, end.y, end.z])
+
         # Extract POLYLINE entities
-        elif entity.dxftype() == 'POLYLINE':
+        if dxftype == 'POLYLINE':
+            # Handle classic POLYLINE with vertices iterator
+            pts = []
             try:
-                # Handle classic POLYLINE with vertices iterator
-                pts = []
+                # ezdxf < 1.0 may expose .points(); prefer vertices for robustness
+                pts = [_point3(p) for p in entity.points()]
+            except Exception:
                 try:
-                    # ezdxf < 1.0 may expose .points(); prefer vertices for robustness
-                    pts = list(entity.points())
+                    pts = [[v.dxf.location.x, v.dxf.location.y, getattr(v.dxf.location, 'z', 0.0)] for v in entity.vertices()]
                 except Exception:
-                    try:
-                        pts = [[v.dxf.location.x, v.dxf.location.y, getattr(v.dxf.location, 'z', 0.0)] for v in entity.vertices()]
-                    except Exception:
-                        pts = []
-
-                if len(pts) >= 2:
-                    for i in range(len(pts) - 1):
-                        p1, p2 = pts[i], pts[i+1]
-                        entities.append({
-                            'type': 'LINE',
-                            'start': [p1[0], p1[1], p1[2] if len(p1) > 2 else 0.0],
-                            'end': [p2[0], p2[1], p2[2] if len(p2) > 2 else 0.0],
-                            'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                        })
-                    # If closed polyline, connect last to first
-                    try:
-                        is_closed = bool(entity.dxf.flags & 1) if hasattr(entity.dxf, 'flags') else False
-                    except Exception:
-                        is_closed = False
-                    if is_closed:
-                        p1, p2 = pts[-1], pts[0]
-                        entities.append({
-                            'type': 'LINE',
-                            'start': [p1[0], p1[1], p1[2] if len(p1) > 2 else 0.0],
-                            'end': [p2[0], p2[1], p2[2] if len(p2) > 2 else 0.0],
-                            'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                        })
-            except Exception:
-                pass
-        
+                    pts = []
+            return dxftype, layer, (pts, _is_closed(entity))
+
         # Extract LWPOLYLINE entities
-        elif entity.dxftype() == 'LWPOLYLINE':
+        if dxftype == 'LWPOLYLINE':
+            # Support both xy and xyz retrieval; default z=0
             try:
-                # Support both xy and xyz retrieval; default z=0
-                try:
-                    points = list(entity.get_points('xy'))
-                except Exception:
-                    points = [(p[0], p[1]) for p in getattr(entity, 'points', [])]
-
-                if len(points) >= 2:
-                    for i in range(len(points) - 1):
-                        p1, p2 = points[i], points[i+1]
-                        entities.append({
-                            'type': 'LINE',
-                            'start': [p1[0], p1[1], 0.0],
-                            'end': [p2[0], p2[1], 0.0],
-                            'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                        })
-                    # If closed, connect last to first
-                    try:
-                        is_closed = bool(entity.dxf.flags & 1) if hasattr(entity.dxf, 'flags') else False
-                    except Exception:
-                        is_closed = False
-                    if is_closed:
-                        p1, p2 = points[-1], points[0]
-                        entities.append({
-                            'type': 'LINE',
-                            'start': [p1[0], p1[1], 0.0],
-                            'end': [p2[0], p2[1], 0.0],
-                            'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                        })
+                points = [(p[0], p[1]) for p in entity.get_points('xy')]
             except Exception:
-                pass
-        
+                points = [(p[0], p[1]) for p in getattr(entity, 'points', [])]
+            return dxftype, layer, (points, _is_closed(entity))
+
         # Extract 3DFACE entities (common in structural models)
-        elif entity.dxftype() == '3DFACE':
-            try:
-                # Extract edges of the 3D face as lines
-                vtx = entity.dxf
-                points = [
-                    [vtx.vtx0.x, vtx.vtx0.y, vtx.vtx0.z],
-                    [vtx.vtx1.x, vtx.vtx1.y, vtx.vtx1.z],
-                    [vtx.vtx2.x, vtx.vtx2.y, vtx.vtx2.z]
-                ]
-                if hasattr(vtx, 'vtx3'):
-                    points.append([vtx.vtx3.x, vtx.vtx3.y, vtx.vtx3.z])
-                
-                # Create lines from face edges
-                for i in range(len(points)):
-                    p1 = points[i]
-                    p2 = points[(i + 1) % len(points)]
-                    entities.append({
-                        'type': 'LINE',
-                        'start': p1,
-                        'end': p2,
-                        'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                    })
-            except Exception:
-                pass
-        
+        if dxftype == '3DFACE':
+            vtx = entity.dxf
+            points = [
+                [vtx.vtx0.x, vtx.vtx0.y, vtx.vtx0.z],
+                [vtx.vtx1.x, vtx.vtx1.y, vtx.vtx1.z],
+                [vtx.vtx2.x, vtx.vtx2.y, vtx.vtx2.z]
+            ]
+            if hasattr(vtx, 'vtx3'):
+                points.append([vtx.vtx3.x, vtx.vtx3.y, vtx.vtx3.z])
+            return dxftype, layer, points
+
         # Extract CIRCLE entities (connection points)
-        elif entity.dxftype() == 'CIRCLE':
-            try:
-                center = entity.dxf.center
-                radius = entity.dxf.radius
-                circles.append({
-                    'type': 'CIRCLE',
-                    'center': [center.x, center.y, center.z if hasattr(center, 'z') else 0.0],
-                    'radius': radius,
-                    'layer': entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                })
-            except Exception:
-                pass
+        if dxftype == 'CIRCLE':
+            center = entity.dxf.center
+            return dxftype, layer, {
+                'type': 'CIRCLE',
+                'center': [center.x, center.y, center.z if hasattr(center, 'z') else 0.0],
+                'radius': entity.dxf.radius,
+                'layer': layer
+            }
 
-        # Extract ARC entities (approximate with segments)
-        elif entity.dxftype() == 'ARC':
-            try:
-                center = entity.dxf.center
-                radius = float(entity.dxf.radius)
-                start_angle = float(entity.dxf.start_angle) * pi / 180.0
-                end_angle = float(entity.dxf.end_angle) * pi / 180.0
-                z = center.z if hasattr(center, 'z') else 0.0
-                layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                # Choose segments based on sweep
-                sweep = abs(end_angle - start_angle)
-                segments = max(8, int(sweep / (pi / 12)))  # ~15° per segment
-                pts = []
-                for i in range(segments + 1):
-                    t = start_angle + (sweep * i / segments) * (1 if end_angle >= start_angle else -1)
-                    x = center.x + radius * cos(t)
-                    y = center.y + radius * sin(t)
-                    pts.append([x, y, z])
-                for i in range(len(pts) - 1):
-                    entities.append({'type': 'LINE', 'start': pts[i], 'end': pts[i+1], 'layer': layer})
-            except Exception:
-                pass
+        # Extract ARC entities
+        if dxftype == 'ARC':
+            center = entity.dxf.center
+            return dxftype, layer, (
+                [center.x, center.y, center.z if hasattr(center, 'z') else 0.0],
+                float(entity.dxf.radius),
+                float(entity.dxf.start_angle),
+                float(entity.dxf.end_angle),
+            )
 
-        # Extract ELLIPSE entities (approximate with segments)
-        elif entity.dxftype() == 'ELLIPSE':
-            try:
-                center = entity.dxf.center
-                ratio = float(entity.dxf.ratio)
-                major = entity.dxf.major_axis
-                layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                z = center.z if hasattr(center, 'z') else 0.0
-                # Build orthonormal basis
-                ux, uy = major.x, major.y
-                # Normalize major axis
-                norm = (ux**2 + uy**2) ** 0.5 or 1.0
-                ux, uy = ux / norm, uy / norm
-                vx, vy = -uy, ux
-                segments = 64
-                pts = []
-                for i in range(segments + 1):
-                    t = 2 * pi * i / segments
-                    x = center.x + norm * (ux * cos(t) + vx * ratio * sin(t))
-                    y = center.y + norm * (uy * cos(t) + vy * ratio * sin(t))
-                    pts.append([x, y, z])
-                for i in range(len(pts) - 1):
-                    entities.append({'type': 'LINE', 'start': pts[i], 'end': pts[i+1], 'layer': layer})
-            except Exception:
-                pass
+        # Extract ELLIPSE entities
+        if dxftype == 'ELLIPSE':
+            center = entity.dxf.center
+            major = entity.dxf.major_axis
+            return dxftype, layer, (
+                [center.x, center.y, center.z if hasattr(center, 'z') else 0.0],
+                float(entity.dxf.ratio),
+                (major.x, major.y),
+            )
 
         # Extract SPLINE entities (approximate by sampling)
-        elif entity.dxftype() == 'SPLINE':
+        if dxftype == 'SPLINE':
+            pts = []
             try:
-                layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'default'
-                # Use ezdxf adaptive sampling if available
-                pts = []
+                # fit points usually exist
+                pts = [[p.x, p.y, getattr(p, 'z', 0.0)] for p in entity.fit_points]
+            except Exception:
+                pass
+            if not pts:
                 try:
-                    # fit points usually exist
-                    pts = [[p.x, p.y, getattr(p, 'z', 0.0)] for p in entity.fit_points]
+                    # control points fall back
+                    pts = [[p.x, p.y, getattr(p, 'z', 0.0)] for p in entity.control_points]
                 except Exception:
-                    pass
-                if not pts:
-                    try:
-                        # control points fall back
-                        pts = [[p.x, p.y, getattr(p, 'z', 0.0)] for p in entity.control_points]
-                    except Exception:
-                        pts = []
-                # If still empty, try to flatten to polyline using virtual entities
-                if not pts:
-                    try:
-                        for v in entity.virtual_entities():
-                            if v.dxftype() == 'LINE':
-                                s, e = v.dxf.start, v.dxf.end
-                                entities.append({'type': 'LINE', 'start': [s.x, s.y, getattr(s, 'z', 0.0)], 'end': [e.x, e.y, getattr(e, 'z', 0.0)], 'layer': layer})
-                    except Exception:
-                        pass
-                else:
-                    for i in range(len(pts) - 1):
-                        entities.append({'type': 'LINE', 'start': pts[i], 'end': pts[i+1], 'layer': layer})
+                    pts = []
+            if pts:
+                return dxftype, layer, pts
+            # If still empty, try to flatten to polyline using virtual entities
+            segments = []
+            try:
+                for v in entity.virtual_entities():
+                    if v.dxftype() == 'LINE':
+                        s, e = v.dxf.start, v.dxf.end
+                        segments.append(([s.x, s.y, getattr(s, 'z', 0.0)], [e.x, e.y, getattr(e, 'z', 0.0)]))
             except Exception:
                 pass
-    
-    # Convert entities to members format
-    members = []
-    for ent in entities:
-        members.append({
-            'id': str(uuid.uuid4()),
-            'start': ent['start'],
-            'end': ent['end'],
-            'length': _calculate_length(ent['start'], ent['end']),
-            'layer': ent.get('layer', 'default')
-        })
-    
-    return {'members': members, 'circles': circles}
+            return 'SEGMENTS', layer, segments
+    except Exception:
+        return None
+    return None
+
+
+def _is_closed(entity) -> bool:
+    try:
+        return bool(entity.dxf.flags & 1) if hasattr(entity.dxf, 'flags') else False
+    except Exception:
+        return False
+
+
+def _primitive_segments(dxftype: str, data: Any,
+                        chord_tolerance: Optional[float] = None) -> Iterator[Tuple[List[float], List[float]]]:
+    """Yield (start, end) line segments approximating a linear/curved primitive.
+
+    With a ``chord_tolerance`` arcs and ellipses are split adaptively,
+    otherwise the fixed legacy segment counts are used.
+    """
+    if dxftype == 'LINE':
+        yield data
+
+    elif dxftype == 'POLYLINE':
+        pts, is_closed = data
+        if len(pts) >= 2:
+            for i in range(len(pts) - 1):
+                yield list(pts[i]), list(pts[i+1])
+            # If closed polyline, connect last to first
+            if is_closed:
+                yield list(pts[-1]), list(pts[0])
+
+    elif dxftype == 'LWPOLYLINE':
+        points, is_closed = data
+        if len(points) >= 2:
+            for i in range(len(points) - 1):
+                p1, p2 = points[i], points[i+1]
+                yield [p1[0], p1[1], 0.0], [p2[0], p2[1], 0.0]
+            # If closed, connect last to first
+            if is_closed:
+                p1, p2 = points[-1], points[0]
+                yield [p1[0], p1[1], 0.0], [p2[0], p2[1], 0.0]
+
+    elif dxftype == '3DFACE':
+        # Create lines from face edges
+        points = data
+        for i in range(len(points)):
+            yield points[i], points[(i + 1) % len(points)]
+
+    elif dxftype == 'ARC':
+        (cx, cy, z), radius, start_deg, end_deg = data
+        start_angle = start_deg * pi / 180.0
+        end_angle = end_deg * pi / 180.0
+        # Choose segments based on sweep
+        sweep = abs(end_angle - start_angle)
+        if chord_tolerance:
+            segments = _curve_segment_count(radius, sweep, chord_tolerance)
+        else:
+            segments = max(8, int(sweep / (pi / 12)))  # ~15° per segment
+        pts = []
+        for i in range(segments + 1):
+            t = start_angle + (sweep * i / segments) * (1 if end_angle >= start_angle else -1)
+            x = cx + radius * cos(t)
+            y = cy + radius * sin(t)
+            pts.append([x, y, z])
+        for i in range(len(pts) - 1):
+            yield pts[i], pts[i+1]
+
+    elif dxftype == 'ELLIPSE':
+        (cx, cy, z), ratio, (ux, uy) = data
+        # Build orthonormal basis from the normalized major axis
+        norm = (ux**2 + uy**2) ** 0.5 or 1.0
+        ux, uy = ux / norm, uy / norm
+        vx, vy = -uy, ux
+        # Curvature never exceeds that of the circle over the major axis, so
+        # its chord error bounds the error of a uniform parameter step
+        segments = _curve_segment_count(norm, 2 * pi, chord_tolerance) if chord_tolerance else 64
+        pts = []
+        for i in range(segments + 1):
+            t = 2 * pi * i / segments
+            x = cx + norm * (ux * cos(t) + vx * ratio * sin(t))
+            y = cy + norm * (uy * cos(t) + vy * ratio * sin(t))
+            pts.append([x, y, z])
+        for i in range(len(pts) - 1):
+            yield pts[i], pts[i+1]
+
+    elif dxftype == 'SPLINE':
+        pts = data
+        for i in range(len(pts) - 1):
+            yield pts[i], pts[i+1]
+
+    elif dxftype == 'SEGMENTS':
+        yield from data
 
 
 def _calculate_length(p0: List[float], p1: List[float]) -> float:
     """Calculate Euclidean distance between two 3D points."""
     return math.sqrt(
-        (p1[0] - p0[0])**2 + 
-        (p1[1] - p0[1])**2 + 
+        (p1[0] - p0[0])**2 +
+        (p1[1] - p0[1])**2 +
         (p1[2] - p0[2])**2
     )
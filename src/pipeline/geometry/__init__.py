@@ -1,6 +1,7 @@
 """
 Geometry module init - provides access to all geometry calculation classes.
-Includes coordinate systems, rotations, curved members, camber, skew cuts, and eccentricity.
+Includes coordinate systems, rotations, curved members, camber, skew cuts, eccentricity,
+vectorized member kernels and a segment BVH for proximity queries.
 """
 
 from .coordinate_system import CoordinateSystemManager
@@ -9,6 +10,8 @@ from .curved_member import CurvedMemberHandler
 from .camber_calculator import CamberCalculator
 from .skew_cut import SkewCutGeometry
 from .eccentricity import EccentricityResolver
+from .kernels import MemberGeometry, get_member_geometry
+from .segment_bvh import SegmentBVH
 
 __all__ = [
     'CoordinateSystemManager',
@@ -17,4 +20,7 @@ __all__ = [
     'CamberCalculator',
     'SkewCutGeometry',
     'EccentricityResolver',
+    'MemberGeometry',
+    'get_member_geometry',
+    'SegmentBVH',
 ]
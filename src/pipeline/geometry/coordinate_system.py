@@ -50,6 +50,26 @@ class CoordinateSystemManager:
             self.ucs_origin[2] + ucs_point[0] * self.ucs_x[2] + ucs_point[1] * self.ucs_y[2] + ucs_point[2] * self.ucs_z[2],
         ]
     
+    def wcs_to_ucs_batch(self, wcs_points):
+        """
+        Convert an (n, 3) array of WCS points to UCS in one pass.
+
+        Returns:
+            numpy array of shape (n, 3)
+        """
+        from .kernels import wcs_to_ucs_points
+        return wcs_to_ucs_points(self.ucs_origin, self.ucs_x, self.ucs_y, self.ucs_z, wcs_points)
+
+    def ucs_to_wcs_batch(self, ucs_points):
+        """
+        Convert an (n, 3) array of UCS points to WCS in one pass.
+
+        Returns:
+            numpy array of shape (n, 3)
+        """
+        from .kernels import ucs_to_wcs_points
+        return ucs_to_wcs_points(self.ucs_origin, self.ucs_x, self.ucs_y, self.ucs_z, ucs_points)
+
     def set_ucs_origin(self, origin):
         """Set UCS origin point"""
         self.ucs_origin = list(origin)
@@ -0,0 +1,284 @@
+"""
+Vectorized member geometry kernels.
+
+Computes lengths, directions, local axes, rotations, midpoints and
+unit-normalized coordinates for all members in one NumPy pass, plus batch
+point transforms used by RotationMatrix3D and CoordinateSystemManager, and
+the batched segment-segment distance and oriented-box separating-axis test
+used by the clash detectors.
+
+A ``MemberGeometry`` is built once per set of member coordinates and cached
+on the run's ``Topology`` (``topology.geometry``), so later stages reuse the
+arrays instead of recomputing them member by member.
+"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def member_endpoints(members) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, 3) start and end arrays for a member list or ``MemberTable``.
+
+    Missing coordinates default to the origin and 2D points get ``z = 0``,
+    as in ``engineer_standardize``.
+    """
+    from ..member_table import MemberTable
+    if isinstance(members, MemberTable):
+        return members.start.copy(), members.end.copy()
+    n = len(members)
+    starts = np.zeros((n, 3))
+    ends = np.zeros((n, 3))
+    for i, m in enumerate(members):
+        s = m.get('start')
+        e = m.get('end')
+        if s is not None:
+            starts[i, :min(len(s), 3)] = s[:3]
+        if e is not None:
+            ends[i, :min(len(e), 3)] = e[:3]
+    return starts, ends
+
+
+def segment_frames(starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-segment frame arrays.
+
+    Returns ``length``, ``direction`` (zero for zero-length segments),
+    ``midpoint``, ``inclination_deg`` (angle above the XY plane),
+    ``rotation_z_deg`` (plan angle) and ``local_x``/``local_y``/``local_z``.
+    Local Y is global Z projected off the axis, or global Y for members
+    within ~25 degrees of vertical; local Z = X x Y.
+    """
+    delta = ends - starts
+    length = np.sqrt((delta * delta).sum(axis=1))
+    ok = length > 0
+    direction = np.zeros_like(delta)
+    direction[ok] = delta[ok] / length[ok, None]
+    ref = np.zeros_like(delta)
+    flat = np.abs(direction[:, 2]) < 0.9
+    ref[flat, 2] = 1.0
+    ref[~flat, 1] = 1.0
+    proj = (direction * ref).sum(axis=1)
+    ref -= proj[:, None] * direction
+    rlen = np.sqrt((ref * ref).sum(axis=1))
+    rlen[rlen == 0] = 1.0
+    local_y = ref / rlen[:, None]
+    return {
+        'length': length,
+        'direction': direction,
+        'midpoint': (starts + ends) / 2.0,
+        'inclination_deg': np.degrees(np.arctan2(np.abs(direction[:, 2]), np.hypot(direction[:, 0], direction[:, 1]))),
+        'rotation_z_deg': np.degrees(np.arctan2(direction[:, 1], direction[:, 0])),
+        'local_x': direction,
+        'local_y': local_y,
+        'local_z': np.cross(direction, local_y),
+    }
+
+
+class MemberGeometry:
+    """Geometry arrays for one set of member coordinates.
+
+    ``unit_scale`` converts input coordinates to the canonical unit (e.g.
+    ``0.001`` for mm -> m); ``starts_m``/``ends_m`` hold the scaled copies.
+    """
+
+    def __init__(self, members, unit_scale: float = 1.0):
+        self.starts, self.ends = member_endpoints(members)
+        self.unit_scale = unit_scale
+        frames = segment_frames(self.starts, self.ends)
+        self.lengths = frames['length']
+        self.directions = frames['direction']
+        self.midpoints = frames['midpoint']
+        self.inclination_deg = frames['inclination_deg']
+        self.rotation_z_deg = frames['rotation_z_deg']
+        self.local_x = frames['local_x']
+        self.local_y = frames['local_y']
+        self.local_z = frames['local_z']
+        self.starts_m = self.starts * unit_scale
+        self.ends_m = self.ends * unit_scale
+        self._row_of: Optional[Dict[int, int]] = None
+        self._bind(members)
+
+    def _bind(self, members) -> None:
+        self.members = members
+        self._row_of = None
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def is_current(self, members, unit_scale: Optional[float] = None) -> bool:
+        """True if ``members`` still have the coordinates these arrays were built from."""
+        if unit_scale is not None and unit_scale != self.unit_scale:
+            return False
+        if len(members) != len(self):
+            return False
+        starts, ends = member_endpoints(members)
+        return np.array_equal(starts, self.starts) and np.array_equal(ends, self.ends)
+
+    def update_rows(self, rows: Sequence[int]) -> None:
+        """Recompute ``rows`` after those members of the bound list were edited in place."""
+        rows = np.asarray(rows, dtype=int)
+        if not len(rows):
+            return
+        starts, ends = member_endpoints([self.members[r] for r in rows.tolist()])
+        frames = segment_frames(starts, ends)
+        self.starts[rows], self.ends[rows] = starts, ends
+        self.starts_m[rows] = starts * self.unit_scale
+        self.ends_m[rows] = ends * self.unit_scale
+        self.lengths[rows] = frames['length']
+        self.directions[rows] = frames['direction']
+        self.midpoints[rows] = frames['midpoint']
+        self.inclination_deg[rows] = frames['inclination_deg']
+        self.rotation_z_deg[rows] = frames['rotation_z_deg']
+        self.local_x[rows] = frames['local_x']
+        self.local_y[rows] = frames['local_y']
+        self.local_z[rows] = frames['local_z']
+
+    def row_of(self, member: Dict[str, Any]) -> Optional[int]:
+        """Row of a member object of the bound list (by identity), or None."""
+        if self._row_of is None:
+            self._row_of = {id(m): i for i, m in enumerate(self.members)}
+        return self._row_of.get(id(member))
+
+    def local_axes(self, i: int) -> Dict[str, tuple]:
+        return {'x': tuple(self.local_x[i].tolist()), 'y': tuple(self.local_y[i].tolist()),
+                'z': tuple(self.local_z[i].tolist())}
+
+
+def get_member_geometry(members, unit_scale: float = 1.0,
+                        geometry: Optional[MemberGeometry] = None) -> MemberGeometry:
+    """Return ``geometry`` if it still matches ``members``, otherwise build a new one."""
+    if geometry is not None and geometry.is_current(members, unit_scale):
+        if geometry.members is not members:
+            geometry._bind(members)
+        return geometry
+    return MemberGeometry(members, unit_scale=unit_scale)
+
+
+def segment_distances(a0, a1, b0, b1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Closest distances and points between segment pairs ``a0-a1`` and ``b0-b1``.
+
+    Inputs are (n, 3) arrays (or anything that broadcasts to them, e.g. one
+    segment against many). Returns ``(d, pa, pb)``: (n,) distances and (n, 3)
+    closest points on each segment. Zero-length segments act as points and
+    parallel pairs get their true minimum (the overlap is projected back onto
+    the first segment), as in Ericson's ClosestPtSegmentSegment.
+    """
+    a0, a1, b0, b1 = np.broadcast_arrays(*(np.atleast_2d(np.asarray(p, dtype=float)) for p in (a0, a1, b0, b1)))
+    u = a1 - a0
+    v = b1 - b0
+    r = a0 - b0
+    a = np.einsum('ij,ij->i', u, u)
+    e = np.einsum('ij,ij->i', v, v)
+    b = np.einsum('ij,ij->i', u, v)
+    c = np.einsum('ij,ij->i', u, r)
+    f = np.einsum('ij,ij->i', v, r)
+    point_a = a <= 1e-18
+    point_b = e <= 1e-18
+    safe_a = np.where(point_a, 1.0, a)
+    safe_e = np.where(point_b, 1.0, e)
+    denom = a * e - b * b
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # parameter on a for the infinite lines; 0 when (nearly) parallel
+        s = np.where(denom > 1e-12 * a * e, (b * f - c * e) / np.where(denom > 0, denom, 1.0), 0.0)
+        s = np.clip(s, 0.0, 1.0)
+        t = (b * s + f) / safe_e
+        # t off the end of b: clamp it and recompute s for the clamped t
+        s = np.where(t < 0.0, np.clip(-c / safe_a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / safe_a, 0.0, 1.0), s))
+        t = np.clip(t, 0.0, 1.0)
+    # degenerate segments
+    s = np.where(point_a, 0.0, s)
+    t = np.where(point_a, np.clip(f / safe_e, 0.0, 1.0), t)
+    s = np.where(point_b & ~point_a, np.clip(-c / safe_a, 0.0, 1.0), s)
+    t = np.where(point_b, 0.0, t)
+
+    pa = a0 + s[:, None] * u
+    pb = b0 + t[:, None] * v
+    diff = pa - pb
+    return np.sqrt(np.einsum('ij,ij->i', diff, diff)), pa, pb
+
+
+def segment_obbs(starts, ends, half_y, half_z) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Oriented boxes swept along segments: (centres, axes, half extents).
+
+    ``axes[k]`` holds the segment's local x/y/z axes (``segment_frames``) as
+    rows, ``half[k]`` is (length / 2, ``half_y``, ``half_z``); the layout of
+    ``SpatialIndex.add_obbs``. Zero-length segments get the global axes.
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    frames = segment_frames(starts, ends)
+    axes = np.stack([frames['local_x'], frames['local_y'], frames['local_z']], axis=1)
+    axes[frames['length'] == 0] = np.eye(3)
+    half = np.column_stack(np.broadcast_arrays(frames['length'] / 2.0, half_y, half_z)).astype(float)
+    return frames['midpoint'], axes, half
+
+
+def obb_overlaps(centres_a, axes_a, half_a, centres_b, axes_b, half_b,
+                 batch: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+    """Separating-axis test for pairs of oriented boxes.
+
+    Boxes use the ``segment_obbs`` layout: (n, 3) centres, (n, 3, 3) unit
+    axes as rows, (n, 3) half extents (one box broadcasts against many).
+    All 15 SAT axes are tried (3 + 3 face normals, 9 edge cross products;
+    near-parallel edge pairs are skipped). Returns ``(depth, axis)``:
+
+    - ``depth`` (n,): the smallest overlap of the two projections over the
+      axes. > 0: the boxes interpenetrate and ``depth`` is the translation
+      along ``axis`` that separates them; <= 0: they are apart (touching at
+      0) and ``-depth`` is their gap along that axis, a lower bound on the
+      distance between them.
+    - ``axis`` (n, 3): that unit axis, oriented from box a towards box b.
+    """
+    centres_a, centres_b, half_a, half_b = np.broadcast_arrays(
+        *(np.atleast_2d(np.asarray(v, dtype=float)) for v in (centres_a, centres_b, half_a, half_b)))
+    axes_a, axes_b = np.broadcast_arrays(*(np.asarray(v, dtype=float).reshape(-1, 3, 3) for v in (axes_a, axes_b)))
+    n = max(len(centres_a), len(axes_a))
+    centres_a, centres_b, half_a, half_b = (np.broadcast_to(v, (n, 3)) for v in (centres_a, centres_b, half_a, half_b))
+    axes_a, axes_b = (np.broadcast_to(v, (n, 3, 3)) for v in (axes_a, axes_b))
+    depth = np.empty(n)
+    axis = np.empty((n, 3))
+    for lo in range(0, n, batch):
+        s = slice(lo, min(lo + batch, n))
+        a, b = axes_a[s], axes_b[s]
+        # candidate axes (m, 15, 3): faces of a, faces of b, edge x edge
+        cross = np.cross(a[:, :, None, :], b[:, None, :, :]).reshape(-1, 9, 3)
+        candidates = np.concatenate([a, b, cross], axis=1)
+        norm = np.sqrt(np.einsum('mkd,mkd->mk', candidates, candidates))
+        valid = norm > 1e-9
+        valid[:, :6] = True
+        with np.errstate(invalid='ignore', divide='ignore'):
+            candidates = candidates / np.where(valid, norm, 1.0)[:, :, None]
+        ra = np.einsum('mj,mkj->mk', half_a[s], np.abs(np.einsum('mkd,mjd->mkj', candidates, a)))
+        rb = np.einsum('mj,mkj->mk', half_b[s], np.abs(np.einsum('mkd,mjd->mkj', candidates, b)))
+        dist = np.einsum('mkd,md->mk', candidates, centres_b[s] - centres_a[s])
+        overlap = np.where(valid, ra + rb - np.abs(dist), np.inf)
+        best = np.argmin(overlap, axis=1)
+        rows = np.arange(len(best))
+        depth[s] = overlap[rows, best]
+        sign = np.where(dist[rows, best] < 0.0, -1.0, 1.0)
+        axis[s] = candidates[rows, best] * sign[:, None]
+    return depth, axis
+
+
+def transform_points(matrix: Sequence[Sequence[float]], points) -> np.ndarray:
+    """Apply a 3x3 matrix to an (n, 3) point array (``matrix @ p`` per point)."""
+    return np.asarray(points, dtype=float).reshape(-1, 3) @ np.asarray(matrix, dtype=float).T
+
+
+def wcs_to_ucs_points(origin, x_axis, y_axis, z_axis, points) -> np.ndarray:
+    """Batch ``CoordinateSystemManager.wcs_to_ucs``."""
+    axes = np.array([x_axis, y_axis, z_axis], dtype=float)
+    return (np.asarray(points, dtype=float).reshape(-1, 3) - np.asarray(origin, dtype=float)) @ axes
+
+
+def ucs_to_wcs_points(origin, x_axis, y_axis, z_axis, points) -> np.ndarray:
+    """Batch ``CoordinateSystemManager.ucs_to_wcs``."""
+    axes = np.array([x_axis, y_axis, z_axis], dtype=float)
+    return np.asarray(origin, dtype=float) + np.asarray(points, dtype=float).reshape(-1, 3) @ axes
+
+
+__all__ = [
+    'MemberGeometry', 'get_member_geometry', 'member_endpoints', 'segment_frames',
+    'segment_distances', 'segment_obbs', 'obb_overlaps', 'transform_points',
+    'wcs_to_ucs_points', 'ucs_to_wcs_points',
+]
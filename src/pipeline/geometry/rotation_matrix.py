@@ -110,3 +110,18 @@ class RotationMatrix3D:
             for j in range(3):
                 result[i] += rotation_matrix[i][j] * point[j]
         return result
+
+    @staticmethod
+    def apply_rotation_batch(points, rotation_matrix):
+        """
+        Apply a rotation matrix to many points at once.
+
+        Args:
+            points: (n, 3) array-like of coordinates
+            rotation_matrix: 3x3 matrix
+
+        Returns:
+            numpy array of rotated points, shape (n, 3)
+        """
+        from .kernels import transform_points
+        return transform_points(rotation_matrix, points)
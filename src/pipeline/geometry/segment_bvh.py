@@ -0,0 +1,239 @@
+"""
+Bounding-volume hierarchy over 3D line segments.
+
+Members, and anything else that can be described as a segment (points are
+zero-length segments), are stored as axis-aligned boxes in a binary tree
+split at the median of the longest axis. Queries visit only the boxes near
+the query, so looking up the members around each of ``k`` points costs about
+``k log n`` instead of ``k * n``:
+
+- ``candidates(point, radius)``: segments whose box is within ``radius``
+  (a superset of the exact answer, for callers with their own distance test)
+- ``query_radius(point, radius)``: segments within ``radius``, with distances
+- ``nearest(point)``: the closest segment
+- ``query_box(lo, hi)``: segments whose box overlaps a box
+
+Results are returned in ascending segment order, so callers that used to scan
+the whole list keep their original ordering. Segments with non-finite
+coordinates are never returned.
+
+The index is built from coordinate arrays, so it can be shared: a run's
+``Topology`` keeps one over its members (``topology.segments``), and the clash
+detector and ``UniversalGeometryEngine`` build theirs from their own arrays.
+"""
+import heapq
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def point_segment_distances(point, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Distances from ``point`` to each segment (zero-length segments are points)."""
+    p = np.asarray(point, dtype=float)
+    seg = ends - starts
+    rel = p - starts
+    len_sq = (seg * seg).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.where(len_sq > 0, (rel * seg).sum(axis=1) / np.where(len_sq > 0, len_sq, 1.0), 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    diff = rel - t[:, None] * seg
+    return np.sqrt((diff * diff).sum(axis=1))
+
+
+class SegmentBVH:
+    """Static BVH over ``n`` segments given as (n, 3) start and end arrays."""
+
+    def __init__(self, starts, ends, leaf_size: int = 8):
+        self.starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        self.ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        self.leaf_size = max(1, int(leaf_size))
+        lo = np.minimum(self.starts, self.ends)
+        hi = np.maximum(self.starts, self.ends)
+        valid = np.flatnonzero(np.isfinite(lo).all(axis=1) & np.isfinite(hi).all(axis=1))
+        self._build(lo, hi, valid)
+
+    @classmethod
+    def from_points(cls, points, leaf_size: int = 8) -> 'SegmentBVH':
+        pts = np.asarray(points, dtype=float).reshape(-1, 3)
+        return cls(pts, pts, leaf_size=leaf_size)
+
+    @classmethod
+    def from_geometry(cls, geometry, metres: bool = False, leaf_size: int = 8) -> 'SegmentBVH':
+        """Index of a ``MemberGeometry``'s members (``metres`` uses ``starts_m``/``ends_m``)."""
+        if metres:
+            return cls(geometry.starts_m, geometry.ends_m, leaf_size=leaf_size)
+        return cls(geometry.starts, geometry.ends, leaf_size=leaf_size)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _build(self, lo: np.ndarray, hi: np.ndarray, valid: np.ndarray) -> None:
+        # Flat node lists; leaves own order[first:first + count], inner nodes two children.
+        # Built a level at a time: every node of a level is split at the median
+        # of its longest centre axis with one lexsort over the whole level.
+        self.order = valid.copy()
+        self.item_lo = lo
+        self.item_hi = hi
+        self.node_lo: List[Tuple[float, float, float]] = []
+        self.node_hi: List[Tuple[float, float, float]] = []
+        self.node_children: List[Optional[Tuple[int, int]]] = []
+        self.node_items: List[Optional[Tuple[int, int]]] = []
+        n = len(valid)
+        if not n:
+            return
+        centres = (lo + hi) / 2.0
+        first, last, left = [0], [n], [-1]
+        level_ids = np.array([0])
+        levels = []
+        while len(level_ids):
+            levels.append(level_ids)
+            f = np.asarray(first)[level_ids]
+            l = np.asarray(last)[level_ids]
+            split = (l - f) > self.leaf_size
+            if not split.any():
+                break
+            nid, f, l = level_ids[split], f[split], l[split]
+            count = l - f
+            offsets = np.cumsum(count) - count
+            label = np.repeat(np.arange(len(f)), count)
+            pos = np.repeat(f - offsets, count) + np.arange(int(count.sum()))
+            c = centres[self.order[pos]]
+            spread = np.maximum.reduceat(c, offsets, axis=0) - np.minimum.reduceat(c, offsets, axis=0)
+            axis = np.argmax(spread, axis=1)
+            perm = np.lexsort((c[np.arange(len(c)), axis[label]], label))
+            self.order[pos] = self.order[pos[perm]]
+            mid = f + count // 2
+            base = len(first)
+            children = base + 2 * np.arange(len(f))
+            for k, node in enumerate(nid.tolist()):
+                left[node] = int(children[k])
+            first.extend(np.stack([f, mid], axis=1).ravel().tolist())
+            last.extend(np.stack([mid, l], axis=1).ravel().tolist())
+            left.extend([-1] * (2 * len(f)))
+            level_ids = np.arange(base, len(first))
+        first_a, left_a = np.asarray(first), np.asarray(left)
+        node_lo = np.empty((len(first), 3))
+        node_hi = np.empty((len(first), 3))
+        # leaves partition the ordered items; inner boxes are merged bottom-up
+        leaves = np.flatnonzero(left_a < 0)
+        leaves = leaves[np.argsort(first_a[leaves])]
+        node_lo[leaves] = np.minimum.reduceat(lo[self.order], first_a[leaves], axis=0)
+        node_hi[leaves] = np.maximum.reduceat(hi[self.order], first_a[leaves], axis=0)
+        for ids in reversed(levels):
+            inner = ids[left_a[ids] >= 0]
+            if len(inner):
+                kids = left_a[inner]
+                node_lo[inner] = np.minimum(node_lo[kids], node_lo[kids + 1])
+                node_hi[inner] = np.maximum(node_hi[kids], node_hi[kids + 1])
+        self.node_lo = [tuple(v) for v in node_lo.tolist()]
+        self.node_hi = [tuple(v) for v in node_hi.tolist()]
+        for node, child in enumerate(left):
+            if child < 0:
+                self.node_children.append(None)
+                self.node_items.append((first[node], last[node]))
+            else:
+                self.node_children.append((child, child + 1))
+                self.node_items.append(None)
+
+    @staticmethod
+    def _box_distance_sq(p, lo, hi) -> float:
+        d = 0.0
+        for k in range(3):
+            if p[k] < lo[k]:
+                d += (lo[k] - p[k]) ** 2
+            elif p[k] > hi[k]:
+                d += (p[k] - hi[k]) ** 2
+        return d
+
+    def candidates(self, point: Sequence[float], radius: float) -> np.ndarray:
+        """Ascending indices of segments whose bounding box is within ``radius`` of ``point``."""
+        if not self.node_lo:
+            return np.empty(0, dtype=int)
+        p = tuple(float(v) for v in point[:3])
+        if not all(math.isfinite(v) for v in p):
+            return np.empty(0, dtype=int)
+        # a hair of slack so boundary cases are left to the caller's exact test
+        reach_sq = (radius * (1.0 + 1e-9) + 1e-9) ** 2
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance_sq(p, self.node_lo[node], self.node_hi[node]) > reach_sq:
+                continue
+            children = self.node_children[node]
+            if children is None:
+                first, last = self.node_items[node]
+                found.append(self.order[first:last])
+            else:
+                stack.extend(children)
+        if not found:
+            return np.empty(0, dtype=int)
+        idx = np.concatenate(found)
+        lo, hi = self.item_lo[idx], self.item_hi[idx]
+        pa = np.asarray(p)
+        gap = np.maximum(lo - pa, 0.0) + np.maximum(pa - hi, 0.0)
+        return np.sort(idx[(gap * gap).sum(axis=1) <= reach_sq])
+
+    def query_radius(self, point: Sequence[float], radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, distances) of segments within ``radius`` of ``point``, in index order."""
+        idx = self.candidates(point, radius)
+        if not len(idx):
+            return idx, np.empty(0)
+        d = point_segment_distances(point[:3], self.starts[idx], self.ends[idx])
+        keep = d <= radius
+        return idx[keep], d[keep]
+
+    def nearest(self, point: Sequence[float], max_distance: float = math.inf) -> Optional[Tuple[int, float]]:
+        """(index, distance) of the closest segment (lowest index on ties), or None."""
+        if not self.node_lo:
+            return None
+        p = tuple(float(v) for v in point[:3])
+        if not all(math.isfinite(v) for v in p):
+            return None
+        best: Optional[Tuple[float, int]] = None
+        heap = [(self._box_distance_sq(p, self.node_lo[0], self.node_hi[0]), 0)]
+        while heap:
+            box_sq, node = heapq.heappop(heap)
+            if box_sq > max_distance ** 2 or (best is not None and box_sq > best[0] ** 2):
+                break
+            children = self.node_children[node]
+            if children is None:
+                first, last = self.node_items[node]
+                idx = self.order[first:last]
+                d = point_segment_distances(p, self.starts[idx], self.ends[idx])
+                for dist, i in zip(d.tolist(), idx.tolist()):
+                    if dist <= max_distance and (best is None or (dist, i) < best):
+                        best = (dist, i)
+                continue
+            for child in children:
+                heapq.heappush(heap, (self._box_distance_sq(p, self.node_lo[child], self.node_hi[child]), child))
+        return (best[1], best[0]) if best is not None else None
+
+    def query_box(self, lo: Iterable[float], hi: Iterable[float]) -> np.ndarray:
+        """Ascending indices of segments whose bounding box overlaps the box ``[lo, hi]``."""
+        if not self.node_lo:
+            return np.empty(0, dtype=int)
+        qlo = tuple(float(v) for v in lo)
+        qhi = tuple(float(v) for v in hi)
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            nlo, nhi = self.node_lo[node], self.node_hi[node]
+            if any(nlo[k] > qhi[k] or nhi[k] < qlo[k] for k in range(3)):
+                continue
+            children = self.node_children[node]
+            if children is None:
+                first, last = self.node_items[node]
+                found.append(self.order[first:last])
+            else:
+                stack.extend(children)
+        if not found:
+            return np.empty(0, dtype=int)
+        idx = np.concatenate(found)
+        overlap = (self.item_lo[idx] <= np.asarray(qhi)).all(axis=1) & (self.item_hi[idx] >= np.asarray(qlo)).all(axis=1)
+        return np.sort(idx[overlap])
+
+
+__all__ = ['SegmentBVH', 'point_segment_distances']
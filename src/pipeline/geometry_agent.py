@@ -11,10 +11,23 @@ def set_global_coordinate_system(data: Dict[str,Any], origin: Tuple[float,float,
     logger.info("Global coordinate system set to %s", origin)
     return data
 
+def _weld_cell(tolerance: float) -> float:
+    # Cells a hair larger than the tolerance: points within tolerance always
+    # fall in the same or an adjacent cell despite floating point rounding
+    return tolerance * (1.0 + 1e-9) if tolerance > 0 else 1.0
+
 def merge_nodes(members: List[Dict[str,Any]], tolerance: float = 10.0) -> Tuple[List[Dict[str,Any]], Dict[Tuple[int,int,int], int]]:
-    """Merge nodes within tolerance (mm). Returns new nodes list and mapping from raw coord to node id."""
+    """Merge nodes within tolerance (mm). Returns new nodes list and mapping from raw coord to node id.
+
+    Endpoints are visited in member order; an endpoint joins the first
+    (lowest id) existing node within tolerance, otherwise it creates a node.
+    Existing nodes are bucketed in a uniform hash grid with cell size equal to
+    the tolerance, so only the 27 surrounding cells are searched.
+    """
     nodes = []
     mapping = {}
+    cell = _weld_cell(tolerance)
+    grid = {}
     def round_key(pt):
         return (int(round(pt[0])), int(round(pt[1])), int(round(pt[2])))
 
@@ -25,25 +38,124 @@ def merge_nodes(members: List[Dict[str,Any]], tolerance: float = 10.0) -> Tuple[
             key = round_key(pt)
             if key in mapping:
                 continue
-            # check existing nodes
+            # check existing nodes in the neighbouring cells
+            cx, cy, cz = math.floor(pt[0]/cell), math.floor(pt[1]/cell), math.floor(pt[2]/cell)
             found = None
-            for i,n in enumerate(nodes):
-                dx = n["x"]-pt[0]
-                dy = n["y"]-pt[1]
-                dz = n["z"]-pt[2]
-                if math.hypot(math.hypot(dx,dy),dz) <= tolerance:
-                    found = i
-                    break
+            for gx in (cx-1, cx, cx+1):
+                for gy in (cy-1, cy, cy+1):
+                    for gz in (cz-1, cz, cz+1):
+                        for i in grid.get((gx,gy,gz), ()):
+                            if found is not None and i >= found:
+                                continue
+                            n = nodes[i]
+                            dx = n["x"]-pt[0]
+                            dy = n["y"]-pt[1]
+                            dz = n["z"]-pt[2]
+                            if math.hypot(math.hypot(dx,dy),dz) <= tolerance:
+                                found = i
             if found is not None:
                 mapping[key] = found
             else:
                 nid = len(nodes)
                 nodes.append({"id": nid, "x": pt[0], "y": pt[1], "z": pt[2]})
                 mapping[key] = nid
+                grid.setdefault((cx,cy,cz), []).append(nid)
 
     logger.info("Merged %d nodes (tolerance=%s mm)", len(nodes), tolerance)
     return nodes, mapping
 
+def merge_nodes_array(starts, ends, tolerance: float = 10.0):
+    """Vectorized ``merge_nodes`` over endpoint arrays.
+
+    ``starts``/``ends`` are (n, 3) arrays of member endpoints. Returns
+    ``(node_xyz, start_ids, end_ids)``: an (k, 3) array of node coordinates
+    and the node id of every start/end point. Node ids and positions match
+    ``merge_nodes`` on the same members.
+    """
+    import numpy as np
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    n = len(starts)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros((0, 3)), empty, empty
+    points = np.empty((2 * n, 3))
+    points[0::2] = starts
+    points[1::2] = ends
+    # Points sharing a rounded key share a node; keep first occurrences in visiting order
+    keys = np.rint(points).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    reps = points[first[order]]
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    point_rep = rank[inverse.reshape(-1)]
+
+    # Greedy welding: a representative joins the earliest earlier node within tolerance
+    earlier, later = _grid_pairs(reps, tolerance)
+    is_node = [True] * len(reps)
+    target = list(range(len(reps)))
+    if len(later):
+        pair_order = np.lexsort((earlier, later))
+        # Pairs sorted by (later, earlier): the first earlier node seen per point wins
+        for i, j in zip(earlier[pair_order].tolist(), later[pair_order].tolist()):
+            if is_node[j] and is_node[i]:
+                target[j] = i
+                is_node[j] = False
+    is_node = np.array(is_node, dtype=bool)
+    target = np.array(target, dtype=np.int64)
+    node_ids = np.cumsum(is_node) - 1
+    point_node = node_ids[target][point_rep]
+    logger.info("Merged %d nodes (tolerance=%s mm)", int(is_node.sum()), tolerance)
+    return reps[is_node], point_node[0::2], point_node[1::2]
+
+def _grid_pairs(points, tolerance: float):
+    """All index pairs (i, j), i < j, of points within ``tolerance`` of each other.
+
+    Points are bucketed in a uniform grid (cell = tolerance) and each cell is
+    matched against its 27 neighbours with sorted-key range lookups.
+    """
+    import numpy as np
+    m = len(points)
+    none = np.zeros(0, dtype=np.int64)
+    if m < 2 or tolerance < 0:
+        return none, none
+    cell = _weld_cell(tolerance)
+    while True:
+        cells = np.floor(points / cell).astype(np.int64)
+        cells -= cells.min(axis=0) - 1
+        dims = cells.max(axis=0) + 2
+        # Keep the linearized cell keys inside int64; coarser cells only add candidates
+        if float(dims[0]) * float(dims[1]) * float(dims[2]) < 2.0 ** 62:
+            break
+        cell *= 2.0
+    cell_key = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(cell_key, kind='stable')
+    sorted_keys = cell_key[order]
+    earlier, later = [], []
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            for oz in (-1, 0, 1):
+                # Needles in sorted order keep the binary searches cache friendly
+                wanted = sorted_keys + (ox * dims[1] + oy) * dims[2] + oz
+                lo = np.searchsorted(sorted_keys, wanted, side='left')
+                counts = np.searchsorted(sorted_keys, wanted, side='right') - lo
+                total = int(counts.sum())
+                if not total:
+                    continue
+                query = np.repeat(order, counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                cand = order[np.repeat(lo, counts) + offsets]
+                keep = cand < query
+                query, cand = query[keep], cand[keep]
+                d = points[query] - points[cand]
+                close = np.hypot(np.hypot(d[:, 0], d[:, 1]), d[:, 2]) <= tolerance
+                earlier.append(cand[close])
+                later.append(query[close])
+    if not earlier:
+        return none, none
+    return np.concatenate(earlier), np.concatenate(later)
+
 def resolve_member_orientation(member: Dict[str,Any]) -> Dict[str,Any]:
     """Compute length, direction vector, and rotation about longitudinal axis for a member."""
     s = member.get("start", (0,0,0))
@@ -60,3 +172,33 @@ def resolve_member_orientation(member: Dict[str,Any]) -> Dict[str,Any]:
     rot = math.degrees(math.atan2(uy, ux))
     member.update({"length": L, "dir": (ux,uy,uz), "rotation": rot})
     return member
+
+def resolve_member_orientations(members, geometry=None):
+    """``resolve_member_orientation`` for every member of a list or ``MemberTable``.
+
+    Lengths, directions and rotations are computed for all members in one
+    vectorized pass (``geometry.kernels``); pass the run's cached
+    ``MemberGeometry`` (e.g. ``topology.geometry``) to reuse it. A
+    ``MemberTable`` is updated column-wise. Returns ``members``.
+    """
+    from .member_table import MemberTable
+    if isinstance(members, MemberTable):
+        ok = members.update_geometry()
+        zero = len(members) - int(ok.sum())
+        if zero:
+            logger.warning("Zero length member encountered (%d members)", zero)
+        return members
+    from .geometry.kernels import get_member_geometry
+    geometry = get_member_geometry(members, geometry=geometry)
+    lengths = geometry.lengths.tolist()
+    directions = geometry.directions.tolist()
+    rotations = geometry.rotation_z_deg.tolist()
+    zero = 0
+    for m, L, d, rot in zip(members, lengths, directions, rotations):
+        if L == 0:
+            zero += 1
+            continue
+        m.update({"length": L, "dir": tuple(d), "rotation": rot})
+    if zero:
+        logger.warning("Zero length member encountered (%d members)", zero)
+    return members
@@ -598,6 +598,43 @@ def generate_ifc_joint(joint: Dict[str,Any], member_map: Dict[str,str]) -> Optio
         print(f"Error generating IFC joint {joint.get('id')}: {e}", file=sys.stderr)
         return None
 
+def _is_column_member(layer: str, direction, role: str) -> bool:
+    # Primary classification: use 'layer' field from DXF
+    layer = (layer or '').upper()
+    # Secondary classification: check direction vector for vertical members
+    is_vertical = abs((direction or [0, 0, 0])[2]) > 0.9  # Z-direction dominates
+    # Tertiary classification: check for 'role' field (legacy support)
+    role = (role or '').lower()
+    if 'COLUMN' in layer:
+        return True
+    if is_vertical and layer != 'BEAMS':
+        return True  # Vertical member likely a column
+    return 'column' in role
+
+
+def _member_column_flags(members) -> List[bool]:
+    """Column/beam decision per member (see ``_is_column_member``).
+
+    For a ``MemberTable`` the layer and role rules are evaluated once per
+    distinct category and combined with the direction column.
+    """
+    from .member_table import MemberTable
+    if not isinstance(members, MemberTable):
+        return [_is_column_member(m.get('layer'), m.get('dir'), m.get('role')) for m in members]
+    import numpy as np
+    def per_code(name, rule):
+        values = members.categories[name].values
+        lookup = np.array([rule(v) for v in values] + [rule(None)], dtype=bool)
+        codes = members.codes[name]
+        return lookup[np.where(codes < 0, len(values), codes)]
+    column_layer = per_code('layer', lambda v: 'COLUMN' in (v or '').upper())
+    beams_layer = per_code('layer', lambda v: (v or '').upper() == 'BEAMS')
+    column_role = per_code('role', lambda v: 'column' in (v or '').lower())
+    dz = np.nan_to_num(members.direction[:, 2])
+    vertical = np.abs(dz) > 0.9
+    return (column_layer | (vertical & ~beams_layer) | column_role).tolist()
+
+
 def export_ifc_model(
     members: List[Dict[str,Any]],
     plates: List[Dict[str,Any]],
@@ -693,26 +730,7 @@ def export_ifc_model(
     member_map = {}
     
     # Classify and process members
-    for m in members:
-        # Primary classification: use 'layer' field from DXF
-        layer = (m.get('layer') or '').upper()
-        
-        # Secondary classification: check direction vector for vertical members
-        direction = m.get('dir') or [0, 0, 0]
-        is_vertical = abs(direction[2]) > 0.9  # Z-direction dominates
-        
-        # Tertiary classification: check for 'role' field (legacy support)
-        role = (m.get('role') or '').lower()
-        
-        # Decision logic
-        is_column = False
-        if 'COLUMN' in layer:
-            is_column = True
-        elif is_vertical and layer != 'BEAMS':
-            is_column = True  # Vertical member likely a column
-        elif 'column' in role:
-            is_column = True
-        
+    for m, is_column in zip(members, _member_column_flags(members)):
         if is_column:
             ifc_element = generate_ifc_column(m)
             model['columns'].append(ifc_element)
@@ -16,6 +16,8 @@ from __future__ import annotations
 from typing import List, Dict, Any, Tuple, Optional
 import math
 
+import numpy as np
+
 # Lazy import to avoid cycles
 try:  # pragma: no cover - optional
     from src.pipeline.agents.connection_synthesis_agent_enhanced import ModelInferenceEngine
@@ -59,28 +61,105 @@ def _maybe_model_infer_joints(members: List[Dict[str, Any]]) -> List[Dict[str, A
         return []
 
 
-def _near_miss_hidden_joints(members: List[Dict[str, Any]], tol: float = 75.0) -> List[Dict[str, Any]]:
+_NEIGHBOURS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+
+def _grid_cell(radius: float) -> float:
+    # Cells a hair larger than the query radius: points within the radius
+    # always fall in the same or an adjacent cell despite rounding
+    return radius * (1.0 + 1e-9) if radius > 0 else 1.0
+
+
+def _cell_key(p: List[float], cell: float) -> Optional[Tuple[int, int, int]]:
+    """Grid cell of a point, or None for non-finite coordinates (they never match)."""
+    try:
+        return (math.floor(p[0] / cell), math.floor(p[1] / cell), math.floor(p[2] / cell))
+    except (ValueError, OverflowError, IndexError, TypeError):
+        return None
+
+
+def _point3(p: Any) -> Optional[Tuple[float, float, float]]:
+    """Point as three floats, or None when it cannot be indexed (it never matches)."""
+    try:
+        pt = (float(p[0]), float(p[1]), float(p[2]))
+    except (ValueError, OverflowError, IndexError, TypeError):
+        return None
+    return pt if all(math.isfinite(v) for v in pt) else None
+
+
+class _EndpointIndex:
+    """Spatial index over the endpoints of members that have both endpoints.
+
+    Built once per enrichment run on the shared
+    ``support.spatial_index.SpatialIndex`` and used by the hidden-joint and
+    splice searches; ``radius`` is the largest radius it will be asked for.
+    """
+
+    def __init__(self, members: List[Dict[str, Any]], radius: float):
+        from .support.spatial_index import SpatialIndex
+        self.members = members
+        self.radius = radius
+        points: List[Tuple[float, float, float]] = []
+        owners: List[int] = []
+        for i, m in enumerate(members):
+            s, e = m.get("start"), m.get("end")
+            if not (s and e):
+                continue
+            for p in (s, e):
+                pt = _point3(p)
+                if pt is not None:
+                    points.append(pt)
+                    owners.append(i)
+        self.owners = np.asarray(owners, dtype=int)
+        self.index = SpatialIndex.from_points(np.asarray(points, dtype=float).reshape(-1, 3))
+
+    def candidate_pairs(self, radius: float) -> List[Tuple[int, int]]:
+        """Sorted member index pairs (i < j) with endpoints within about ``radius``."""
+        if radius > self.radius:
+            raise ValueError(f"query radius {radius} exceeds index radius {self.radius}")
+        # a hair of slack; callers apply their own exact distance test
+        pairs = self.index.pairs_within(radius * (1.0 + 1e-9))
+        if not len(pairs):
+            return []
+        i, j = self.owners[pairs[:, 0]], self.owners[pairs[:, 1]]
+        keep = i != j
+        members = np.unique(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1)[keep], axis=0)
+        return [(int(a), int(b)) for a, b in members.tolist()]
+
+
+def _endpoint_index(members: List[Dict[str, Any]], radius: float,
+                    index: Optional[_EndpointIndex] = None) -> _EndpointIndex:
+    if index is not None and index.members is members and index.radius >= radius:
+        return index
+    return _EndpointIndex(members, radius)
+
+
+def _near_miss_hidden_joints(members: List[Dict[str, Any]], tol: float = 75.0,
+                             index: Optional[_EndpointIndex] = None) -> List[Dict[str, Any]]:
+    """Joints between member pairs whose endpoints are within ``tol``.
+
+    Only pairs the endpoint index reports as close are tested; pairs are
+    visited in the same (i, j) order as a full pairwise scan.
+    """
     joints: List[Dict[str, Any]] = []
-    for i, m1 in enumerate(members):
+    for i, j in _endpoint_index(members, tol, index).candidate_pairs(tol):
+        m1, m2 = members[i], members[j]
         s1, e1 = m1.get("start"), m1.get("end")
-        for m2 in members[i + 1 :]:
-            s2, e2 = m2.get("start"), m2.get("end")
-            if not (s1 and e1 and s2 and e2):
-                continue
-            # endpoint-to-endpoint proximity
-            candidates = [
-                (s1, s2), (s1, e2), (e1, s2), (e1, e2)
-            ]
-            for p, q in candidates:
-                if _distance(p, q) <= tol:
-                    joints.append({
-                        "id": f"hidden_{len(joints)}",
-                        "position": [(p[i] + q[i]) / 2 for i in range(3)],
-                        "members": [m1.get("id"), m2.get("id")],
-                        "hidden": True,
-                        "joint_category": "hidden"
-                    })
-                    break
+        s2, e2 = m2.get("start"), m2.get("end")
+        # endpoint-to-endpoint proximity
+        candidates = [
+            (s1, s2), (s1, e2), (e1, s2), (e1, e2)
+        ]
+        for p, q in candidates:
+            if _distance(p, q) <= tol:
+                joints.append({
+                    "id": f"hidden_{len(joints)}",
+                    "position": [(p[k] + q[k]) / 2 for k in range(3)],
+                    "members": [m1.get("id"), m2.get("id")],
+                    "hidden": True,
+                    "joint_category": "hidden"
+                })
+                break
     return joints
 
 
@@ -105,67 +184,93 @@ def _classify_category(joint: Dict[str, Any], members_by_id: Dict[str, Dict[str,
     return joint.get("joint_category") or "standard"
 
 
-def _detect_splices(members: List[Dict[str, Any]], gap_tol: float = 120.0) -> List[Dict[str, Any]]:
+def _detect_splices(members: List[Dict[str, Any]], gap_tol: float = 120.0,
+                    index: Optional[_EndpointIndex] = None) -> List[Dict[str, Any]]:
+    """Splices between collinear members whose closest endpoints are within ``gap_tol``."""
     splices: List[Dict[str, Any]] = []
-    for i, m1 in enumerate(members):
-        v1 = _member_dir(m1)
-        for m2 in members[i + 1 :]:
-            v2 = _member_dir(m2)
-            if not _collinear(v1, v2):
-                continue
-            # gap between closest endpoints
-            endpoints = [m1.get("start"), m1.get("end")]
-            endpoints2 = [m2.get("start"), m2.get("end")]
-            if not all(endpoints) or not all(endpoints2):
-                continue
-            min_gap = min(_distance(p, q) for p in endpoints for q in endpoints2)
-            if 0 < min_gap <= gap_tol:
-                pos = [
-                    (m1.get("end", [0, 0, 0])[i] + m2.get("start", [0, 0, 0])[i]) / 2
-                    for i in range(3)
-                ]
-                splices.append({
-                    "id": f"splice_{len(splices)}",
-                    "position": pos,
-                    "members": [m1.get("id"), m2.get("id")],
-                    "joint_category": "splice",
-                    "splice_type": "bolted"
-                })
+    for i, j in _endpoint_index(members, gap_tol, index).candidate_pairs(gap_tol):
+        m1, m2 = members[i], members[j]
+        if not _collinear(_member_dir(m1), _member_dir(m2)):
+            continue
+        # gap between closest endpoints
+        endpoints = [m1.get("start"), m1.get("end")]
+        endpoints2 = [m2.get("start"), m2.get("end")]
+        min_gap = min(_distance(p, q) for p in endpoints for q in endpoints2)
+        if 0 < min_gap <= gap_tol:
+            pos = [
+                (m1.get("end", [0, 0, 0])[k] + m2.get("start", [0, 0, 0])[k]) / 2
+                for k in range(3)
+            ]
+            splices.append({
+                "id": f"splice_{len(splices)}",
+                "position": pos,
+                "members": [m1.get("id"), m2.get("id")],
+                "joint_category": "splice",
+                "splice_type": "bolted"
+            })
     return splices
 
 
 def merge_joints(base: List[Dict[str, Any]], new: List[Dict[str, Any]], tol: float = 15.0) -> List[Dict[str, Any]]:
+    """Append the joints of ``new`` that have no joint within ``tol`` in the merged list.
+
+    Positions of the merged joints are kept in a hash grid (cell = ``tol``),
+    so each duplicate check only looks at the 27 surrounding cells.
+    """
     merged = list(base)
+    if not new:
+        return merged
+    cell = _grid_cell(tol)
+    grid: Dict[Tuple[int, int, int], List[List[float]]] = {}
+
+    def index(joint: Dict[str, Any]) -> None:
+        kpos = joint.get("position") or joint.get("location")
+        if kpos:
+            key = _cell_key(kpos, cell)
+            if key is not None:
+                grid.setdefault(key, []).append(kpos)
+
+    for k in merged:
+        index(k)
     for j in new:
         pos = j.get("position") or j.get("location")
         if not pos:
             merged.append(j)
             continue
         duplicate = False
-        for k in merged:
-            kpos = k.get("position") or k.get("location")
-            if kpos and _distance(pos, kpos) <= tol:
-                duplicate = True
-                break
+        key = _cell_key(pos, cell)
+        if key is not None:
+            cx, cy, cz = key
+            for dx, dy, dz in _NEIGHBOURS:
+                if any(_distance(pos, kpos) <= tol for kpos in grid.get((cx + dx, cy + dy, cz + dz), ())):
+                    duplicate = True
+                    break
         if not duplicate:
             merged.append(j)
+            index(j)
     return merged
 
 
-def enrich_joints(members: List[Dict[str, Any]], joints: List[Dict[str, Any]], plate_markers: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
-    """Return enriched joints without breaking existing flow."""
+def enrich_joints(members: List[Dict[str, Any]], joints: List[Dict[str, Any]], plate_markers: Optional[List[Dict[str, Any]]] = None,
+                  topology: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """Return enriched joints without breaking existing flow.
+
+    ``topology`` is the run's shared ``Topology``; when it is bound to
+    ``members`` its member index is reused instead of being rebuilt here.
+    """
     joints = joints or []
 
     # 1) Add model-inferred joints if none or sparse
     model_joints = _maybe_model_infer_joints(members)
     joints = merge_joints(joints, model_joints, tol=10.0)
 
-    # 2) Add near-miss hidden joints
-    hidden = _near_miss_hidden_joints(members, tol=75.0)
+    # 2) Add near-miss hidden joints (one endpoint index serves both searches)
+    index = _EndpointIndex(members, radius=120.0)
+    hidden = _near_miss_hidden_joints(members, tol=75.0, index=index)
     joints = merge_joints(joints, hidden, tol=10.0)
 
     # 3) Add splice joints
-    splices = _detect_splices(members, gap_tol=120.0)
+    splices = _detect_splices(members, gap_tol=120.0, index=index)
     joints = merge_joints(joints, splices, tol=10.0)
 
     # 4) Plate markers (optional)
@@ -182,7 +287,10 @@ def enrich_joints(members: List[Dict[str, Any]], joints: List[Dict[str, Any]], p
             })
 
     # 5) Classify categories and weld preferences
-    members_by_id = {m.get("id"): m for m in members}
+    if topology is not None and topology.members is members:
+        members_by_id = topology.members_by_id
+    else:
+        members_by_id = {m.get("id"): m for m in members}
     for j in joints:
         j["joint_category"] = _classify_category(j, members_by_id)
         # slant/offset hints
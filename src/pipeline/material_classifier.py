@@ -27,3 +27,56 @@ def classify_material(entity: Dict[str,Any]) -> Dict[str,Any]:
     default = "S355" if "column" in (entity.get("role") or "").lower() else "S235"
     logger.info("Defaulting material to %s for entity %s", default, entity.get("id"))
     return {"name": default, **MATERIAL_CATALOG[default]}
+
+
+def classify_materials(members):
+    """Classify every member and fill ``material`` where missing.
+
+    ``classify_material`` runs once per distinct (material, mat, annotation,
+    column role) combination. ``members`` may be a list of dicts (each gets
+    its own copy of the material dict) or a ``MemberTable`` (rows share one
+    category code per material). Returns ``members``.
+    """
+    from .member_table import MemberTable
+    if not isinstance(members, MemberTable):
+        cache: Dict[tuple, Dict[str,Any]] = {}
+        for m in members:
+            existing = m.get('material')
+            if isinstance(existing, dict) and existing.get('name'):
+                mat = existing
+            else:
+                key = _material_key(m)
+                try:
+                    mat = cache[key] if key in cache else cache.setdefault(key, classify_material(m))
+                except TypeError:  # unhashable annotation/mat values
+                    mat = classify_material(m)
+                mat = dict(mat)
+            m.setdefault('material', mat)
+        return members
+
+    table = members
+    import numpy as np
+    codes = table.codes['material']
+    categories = table.categories['material']
+    unset = np.flatnonzero(codes < 0)
+    if not len(unset):
+        return table
+    groups: Dict[tuple, list] = {}
+    for i in unset.tolist():
+        key = _material_key(table[i])
+        try:
+            groups.setdefault(key, []).append(i)
+        except TypeError:
+            groups.setdefault(('row', i), []).append(i)
+    for rows in groups.values():
+        mat = classify_material(table[rows[0]])
+        codes[np.asarray(rows)] = categories.encode(mat)
+    logger.debug("Classified %d member materials from %d distinct keys", len(unset), len(groups))
+    return table
+
+
+def _material_key(entity) -> tuple:
+    mat = entity.get("material")
+    role = (entity.get("role") or "").lower()
+    return (mat if isinstance(mat, str) else None, entity.get("mat"), entity.get("annotation"),
+            "column" in role)
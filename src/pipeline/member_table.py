@@ -0,0 +1,452 @@
+"""Columnar (structure-of-arrays) member model.
+
+Members normally travel through the pipeline as a list of dicts. For large
+jobs a ``MemberTable`` keeps the same data column-wise instead:
+
+- ``vectors``: (n, 3) float arrays such as ``start``, ``end`` and ``dir``
+- ``floats``: (n,) float arrays such as ``length`` (NaN = key absent)
+- ``codes``: (n,) int32 arrays of category codes for low-cardinality values
+  such as ``role``, ``type``, ``layer``, ``profile`` and ``material``
+  (-1 = key absent); the distinct values live once in ``categories``
+- ``groups``: nested dict keys (e.g. ``loads``) assembled from columns
+- ``extras``: one small dict per member for everything else
+
+Stages that understand the table work on whole columns. Legacy code gets a
+dict-compatible view: iterating the table yields ``MemberRow`` mappings that
+read and write the columns in place, so ``m['start']``, ``m.get('layer')``
+and ``{**m, ...}`` keep working. ``to_members`` materializes plain dicts.
+"""
+import copy
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Column layout used by ``from_members`` for the well-known member keys
+VECTOR_KEYS = ('start', 'end', 'dir')
+FLOAT_KEYS = ('length', 'rotation')
+CODED_KEYS = ('role', 'type', 'layer', 'profile', 'material')
+
+
+class Categories:
+    """Distinct values of a coded column.
+
+    Values are interned by their full content (dicts and lists included), and
+    the table keeps its own copy of each, so rows only share equal values.
+    Treat ``values`` as read-only; rows hand out copies of dicts and lists.
+    """
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._index: Dict[Any, int] = {}
+
+    @staticmethod
+    def _key(value: Any) -> Any:
+        if isinstance(value, dict):
+            try:
+                return ('dict', frozenset((k, Categories._key(v)) for k, v in value.items()))
+            except TypeError:
+                return ('obj', id(value))
+        if isinstance(value, (list, tuple)):
+            return (type(value).__name__, tuple(Categories._key(v) for v in value))
+        try:
+            hash(value)
+        except TypeError:
+            return ('obj', id(value))
+        return (type(value).__name__, value)
+
+    def encode(self, value: Any) -> int:
+        key = self._key(value)
+        code = self._index.get(key)
+        if code is None:
+            code = len(self.values)
+            self.values.append(copy.deepcopy(value) if isinstance(value, (dict, list)) else value)
+            self._index[key] = code
+        return code
+
+    def value(self, code: int) -> Any:
+        """The value of ``code``; dicts and lists are copied so callers may modify them."""
+        value = self.values[code]
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def copy(self) -> 'Categories':
+        other = Categories()
+        other.values = list(self.values)
+        other._index = dict(self._index)
+        return other
+
+    def code_of(self, value: Any) -> int:
+        """Code of an existing value, or -1."""
+        return self._index.get(self._key(value), -1)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class MemberTable:
+    """Structure-of-arrays store of structural members (see module docstring)."""
+
+    def __init__(self, ids: Sequence[Any] = ()):
+        n = len(ids)
+        self.ids: List[Any] = list(ids)
+        self.vectors: Dict[str, np.ndarray] = {key: np.full((n, 3), np.nan) for key in VECTOR_KEYS}
+        self.vectors['start'][:] = 0.0
+        self.vectors['end'][:] = 0.0
+        self.floats: Dict[str, np.ndarray] = {key: np.full(n, np.nan) for key in FLOAT_KEYS}
+        self.codes: Dict[str, np.ndarray] = {key: np.full(n, -1, dtype=np.int32) for key in CODED_KEYS}
+        self.categories: Dict[str, Categories] = {key: Categories() for key in CODED_KEYS}
+        self.groups: Dict[str, Dict[str, str]] = {}
+        self.extras: List[Dict[str, Any]] = [{} for _ in range(n)]
+        self._grouped: set = set()
+        self._row_of_id: Optional[Dict[Any, int]] = None
+
+    # ------------------------------------------------------------------ build
+    @classmethod
+    def from_members(cls, members: Iterable[Dict[str, Any]]) -> 'MemberTable':
+        members = list(members)
+        table = cls([m.get('id') for m in members])
+        for key in ('start', 'end'):
+            table.vectors[key][:] = [_xyz(m.get(key)) for m in members]
+        direction = table.vectors['dir']
+        for i, m in enumerate(members):
+            extras = table.extras[i]
+            for key, value in m.items():
+                if key == 'id':
+                    continue
+                if key in ('start', 'end'):
+                    continue
+                if key == 'dir' and value is not None:
+                    direction[i] = _xyz(value)
+                elif key in table.floats and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    table.floats[key][i] = value
+                elif key in table.codes and value is not None:
+                    table.codes[key][i] = table.categories[key].encode(value)
+                else:
+                    extras[key] = value
+        return table
+
+    def to_members(self) -> List[Dict[str, Any]]:
+        """Plain dict copies of every row."""
+        return [row.to_dict() for row in self]
+
+    def copy(self) -> 'MemberTable':
+        """Independent copy of the table (columns, categories and extras)."""
+        table = MemberTable.__new__(MemberTable)
+        table.ids = list(self.ids)
+        table.vectors = {key: column.copy() for key, column in self.vectors.items()}
+        table.floats = {key: column.copy() for key, column in self.floats.items()}
+        table.codes = {key: column.copy() for key, column in self.codes.items()}
+        table.categories = {key: categories.copy() for key, categories in self.categories.items()}
+        table.groups = {key: dict(fields) for key, fields in self.groups.items()}
+        table.extras = [dict(extras) for extras in self.extras]
+        table._grouped = set(self._grouped)
+        table._row_of_id = None
+        return table
+
+    # ---------------------------------------------------------------- columns
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def start(self) -> np.ndarray:
+        return self.vectors['start']
+
+    @property
+    def end(self) -> np.ndarray:
+        return self.vectors['end']
+
+    @property
+    def direction(self) -> np.ndarray:
+        return self.vectors['dir']
+
+    @property
+    def length(self) -> np.ndarray:
+        return self.floats['length']
+
+    def add_vector_column(self, name: str, values: Optional[np.ndarray] = None) -> np.ndarray:
+        column = np.full((len(self), 3), np.nan) if values is None else np.asarray(values, dtype=float).reshape(-1, 3)
+        self.vectors[name] = column
+        return column
+
+    def add_float_column(self, name: str, values: Optional[np.ndarray] = None) -> np.ndarray:
+        column = np.full(len(self), np.nan) if values is None else np.asarray(values, dtype=float).reshape(-1)
+        self.floats[name] = column
+        return column
+
+    def add_coded_column(self, name: str, values: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """Add (or reset) a category-coded column, optionally filled from ``values``."""
+        categories = self.categories.setdefault(name, Categories())
+        if values is None:
+            column = np.full(len(self), -1, dtype=np.int32)
+        else:
+            column = np.fromiter((categories.encode(v) if v is not None else -1 for v in values),
+                                 dtype=np.int32, count=len(self))
+        self.codes[name] = column
+        return column
+
+    def set_codes(self, name: str, codes: np.ndarray, values: Sequence[Any]) -> None:
+        """Fill a coded column from per-row indices into ``values`` (-1 = absent)."""
+        if name not in self.codes:
+            self.add_coded_column(name)
+        categories = self.categories[name]
+        mapped = np.array([categories.encode(v) for v in values] + [-1], dtype=np.int32)
+        codes = np.asarray(codes)
+        self.codes[name] = mapped[np.where(codes < 0, len(values), codes)]
+
+    def code(self, name: str, value: Any) -> int:
+        """Code of ``value`` in column ``name`` (-1 if it never occurs)."""
+        categories = self.categories.get(name)
+        return categories.code_of(value) if categories is not None else -1
+
+    def mask(self, name: str, value: Any) -> np.ndarray:
+        """Boolean mask of the rows whose coded column ``name`` equals ``value``."""
+        code = self.code(name, value)
+        if code < 0 or name not in self.codes:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[name] == code
+
+    def decoded(self, name: str) -> List[Any]:
+        """Per-row values of a coded column (None where absent); equal values are shared, read-only."""
+        values = self.categories[name].values
+        return [values[c] if c >= 0 else None for c in self.codes[name].tolist()]
+
+    def add_group(self, name: str, fields: Dict[str, str]) -> None:
+        """Expose columns as the nested dict ``row[name]`` ({sub_key: column}).
+
+        Whatever the rows held under ``name`` before is replaced by the group.
+        """
+        self.groups[name] = dict(fields)
+        self._grouped.update(fields.values())
+        for extras in self.extras:
+            extras.pop(name, None)
+            extras.pop(name + '.extra', None)
+
+    # ------------------------------------------------------------------- rows
+    def __iter__(self) -> Iterator['MemberRow']:
+        for i in range(len(self)):
+            yield MemberRow(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MemberRow(self, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return MemberRow(self, index)
+
+    def rows(self) -> Iterator['MemberRow']:
+        return iter(self)
+
+    def row_of(self, member_id: Any) -> Optional[int]:
+        """Row index of the first member with ``member_id``."""
+        if self._row_of_id is None or len(self._row_of_id) > len(self):
+            self._row_of_id = {}
+            for i, mid in enumerate(self.ids):
+                self._row_of_id.setdefault(mid, i)
+        return self._row_of_id.get(member_id)
+
+    # --------------------------------------------------------------- geometry
+    def update_geometry(self) -> np.ndarray:
+        """Recompute ``length``, ``dir`` and ``rotation`` from the endpoints.
+
+        Zero-length members keep their previous values, like
+        ``geometry_agent.resolve_member_orientation``. Returns the mask of
+        members that were updated.
+        """
+        delta = self.end - self.start
+        lengths = np.sqrt((delta * delta).sum(axis=1))
+        ok = lengths > 0
+        unit = delta[ok] / lengths[ok, None]
+        self.floats['length'][ok] = lengths[ok]
+        self.vectors['dir'][ok] = unit
+        self.floats['rotation'][ok] = np.degrees(np.arctan2(unit[:, 1], unit[:, 0]))
+        return ok
+
+
+class MemberRow(MutableMapping):
+    """Dict-compatible view of one table row; writes go to the columns."""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: MemberTable, index: int):
+        self._table = table
+        self._index = index
+
+    def _lookup(self, key: str) -> Any:
+        t, i = self._table, self._index
+        if key == 'id':
+            return t.ids[i]
+        if key in t._grouped:
+            raise KeyError(key)
+        if key in t.vectors:
+            value = t.vectors[key][i]
+            if np.isnan(value[0]):
+                raise KeyError(key)
+            return value.tolist()
+        if key in t.floats:
+            value = t.floats[key][i]
+            if np.isnan(value):
+                raise KeyError(key)
+            return float(value)
+        if key in t.codes:
+            code = t.codes[key][i]
+            if code < 0:
+                raise KeyError(key)
+            return t.categories[key].value(code)
+        if key in t.groups:
+            group = {}
+            for sub_key, column in t.groups[key].items():
+                try:
+                    group[sub_key] = self._column_value(column)
+                except KeyError:
+                    continue
+            if not group:
+                raise KeyError(key)
+            return group
+        return t.extras[i][key]
+
+    def _column_value(self, column: str) -> Any:
+        t, i = self._table, self._index
+        if column in t.vectors:
+            value = t.vectors[column][i]
+            if np.isnan(value[0]):
+                raise KeyError(column)
+            return value.tolist()
+        if column in t.floats:
+            value = t.floats[column][i]
+            if np.isnan(value):
+                raise KeyError(column)
+            return float(value)
+        code = t.codes[column][i]
+        if code < 0:
+            raise KeyError(column)
+        return t.categories[column].value(code)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._lookup(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        t, i = self._table, self._index
+        if key == 'id':
+            t.ids[i] = value
+            t._row_of_id = None
+        elif key in t.groups and isinstance(value, dict):
+            fields = t.groups[key]
+            for sub_key, sub_value in value.items():
+                if sub_key in fields:
+                    self._set_column(fields[sub_key], sub_value)
+                else:
+                    # keys outside the group layout stay in the row's extras
+                    t.extras[i].setdefault(key + '.extra', {})[sub_key] = sub_value
+        elif key in t.vectors and value is not None and key not in t._grouped:
+            t.vectors[key][i] = _xyz(value)
+        elif key in t.floats and isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and key not in t._grouped:
+            t.floats[key][i] = value
+        elif key in t.codes and value is not None and key not in t._grouped:
+            t.codes[key][i] = t.categories[key].encode(value)
+        else:
+            self._clear(key)
+            t.extras[i][key] = value
+            return
+        t.extras[i].pop(key, None)
+
+    def _set_column(self, column: str, value: Any) -> None:
+        t, i = self._table, self._index
+        if column in t.vectors:
+            t.vectors[column][i] = _xyz(value) if value is not None else np.nan
+        elif column in t.floats:
+            t.floats[column][i] = value if value is not None else np.nan
+        else:
+            t.codes[column][i] = t.categories[column].encode(value) if value is not None else -1
+
+    def _clear(self, key: str) -> None:
+        t, i = self._table, self._index
+        if key in t._grouped:
+            return
+        if key in t.vectors:
+            t.vectors[key][i] = np.nan
+        elif key in t.floats:
+            t.floats[key][i] = np.nan
+        elif key in t.codes:
+            t.codes[key][i] = -1
+        elif key in t.groups:
+            for column in t.groups[key].values():
+                self._set_column(column, None)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        t, i = self._table, self._index
+        if key == 'id':
+            raise KeyError('id cannot be removed from a table row')
+        if t.extras[i].pop(key, _MISSING) is _MISSING:
+            self._clear(key)
+
+    def _keys(self) -> List[str]:
+        t, i = self._table, self._index
+        keys = ['id']
+        for name, column in t.vectors.items():
+            if name not in t._grouped and not np.isnan(column[i][0]):
+                keys.append(name)
+        for name, column in t.floats.items():
+            if name not in t._grouped and not np.isnan(column[i]):
+                keys.append(name)
+        for name, column in t.codes.items():
+            if name not in t._grouped and column[i] >= 0:
+                keys.append(name)
+        for name in t.groups:
+            if name in self:
+                keys.append(name)
+        keys.extend(k for k in t.extras[i] if not k.endswith('.extra'))
+        return keys
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self._lookup(key)  # type: ignore[arg-type]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {key: self[key] for key in self._keys()}
+        for name in self._table.groups:
+            more = self._table.extras[self._index].get(name + '.extra')
+            if more:
+                out.setdefault(name, {}).update(more)
+        return out
+
+    def copy(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return f"MemberRow({self.to_dict()!r})"
+
+
+_MISSING = object()
+
+
+def _xyz(point: Any) -> List[float]:
+    if point is None:
+        return [0.0, 0.0, 0.0]
+    point = list(point)
+    if len(point) < 3:
+        point = point + [0.0] * (3 - len(point))
+    return [float(point[0]), float(point[1]), float(point[2])]
+
+
+def as_member_table(members: Any) -> MemberTable:
+    """Return ``members`` if it already is a table, otherwise build one."""
+    if isinstance(members, MemberTable):
+        return members
+    return MemberTable.from_members(members or [])
+
+
+__all__ = ['MemberTable', 'MemberRow', 'Categories', 'as_member_table']
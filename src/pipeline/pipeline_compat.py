@@ -42,7 +42,7 @@ __all__ = [
     'MaterialSelector', 'CoatingSpecifier', 'MATERIAL_DATABASE',
     # Agents
     'agents',
-    'run_pipeline', 'run_from_dxf_entities', 'Pipeline',
+    'run_pipeline', 'run_from_dxf_entities', 'Pipeline', 'convert_dwg_to_dxf', 'convert_dwgs_to_dxf',
     # Support
     'translate_point', 'rotate_point_xy', 'distance', 'error_handlers', 'fallback', 'parallel_processor', 'cache', 'connection_classifier',
     'load_predictor', 'validators', 'support_warnings', 'spatial_index', 'profiler', 'anomaly_detector', 'connection_optimizer'
@@ -52,6 +52,7 @@ __all__ = [
 
 import subprocess
 import shutil
+import hashlib
 import os
 import logging
 import tempfile
@@ -60,8 +61,55 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+from src.pipeline.support.cache import FileLRUCache, file_digest
 
-def convert_dwg_to_dxf(dwg_path):
+_dwg_cache = None
+
+
+def get_dwg_conversion_cache():
+    """Process-wide DWG→DXF conversion cache, or None when disabled.
+
+    Configured through environment variables:
+    - AIBUILDX_DISABLE_DWG_CACHE: turn the cache off
+    - AIBUILDX_DWG_CACHE_DIR: cache directory (default ~/.cache/aibuildx/dwg_to_dxf)
+    - AIBUILDX_DWG_CACHE_MAX_MB: size budget before LRU eviction (default 2048)
+    """
+    global _dwg_cache
+    if os.getenv('AIBUILDX_DISABLE_DWG_CACHE'):
+        return None
+    if _dwg_cache is None:
+        cache_dir = os.getenv('AIBUILDX_DWG_CACHE_DIR') or str(Path.home() / '.cache' / 'aibuildx' / 'dwg_to_dxf')
+        max_mb = float(os.getenv('AIBUILDX_DWG_CACHE_MAX_MB', '2048'))
+        try:
+            _dwg_cache = FileLRUCache(cache_dir, max_bytes=int(max_mb * 1024 * 1024), suffix='.dxf')
+        except OSError as e:
+            logger.warning(f"DWG conversion cache unavailable ({cache_dir}): {e}")
+            return None
+    return _dwg_cache
+
+
+def _oda_converter_version(oda_converter):
+    """Identify the installed converter build for cache keys.
+
+    ODAFileConverter has no reliable version flag, so the resolved binary's
+    path, size and mtime stand in for it unless AIBUILDX_ODA_VERSION is set.
+    """
+    override = os.getenv('AIBUILDX_ODA_VERSION')
+    if override:
+        return override
+    real = os.path.realpath(oda_converter)
+    try:
+        st = os.stat(real)
+        return f"{real}:{st.st_size}:{int(st.st_mtime)}"
+    except OSError:
+        return real
+
+
+# DXF output variants to try (newest first for best accuracy)
+DXF_VERSIONS = ["ACAD2018", "ACAD2013", "ACAD2010"]
+
+
+def convert_dwg_to_dxf(dwg_path, cache=None):
     """
     Production-grade DWG to DXF conversion following best practices.
     
@@ -72,138 +120,254 @@ def convert_dwg_to_dxf(dwg_path):
     4. Preserve layers, blocks, proxy objects
     5. Log conversion details
     6. Normalize units and check geometry integrity
+
+    Validated DXFs are kept in a content-addressed cache keyed by the DWG
+    bytes and the converter version, so resubmitting the same drawing skips
+    ODA and validation. Pass ``cache=False`` to bypass it, or a
+    ``FileLRUCache`` to use a specific one (default: ``get_dwg_conversion_cache()``).
     
     Returns path to DXF file or None if conversion fails.
     """
-    dwg_file = Path(dwg_path)
-    output_dir = dwg_file.parent
-    base_name = dwg_file.stem
-    log_file = output_dir / f"{base_name}_conversion.log"
-    
-    # DXF output variants to try (newest first for best accuracy)
-    dxf_versions = ["ACAD2018", "ACAD2013", "ACAD2010"]
-    
+    return convert_dwgs_to_dxf([dwg_path], cache=cache)[str(dwg_path)]['dxf']
+
+
+def convert_dwgs_to_dxf(dwg_paths, output_dir=None, cache=None, timeout_per_file=120, parse_options=None):
+    """
+    Convert many DWG files with one ODA invocation per DXF version.
+
+    All drawings are staged into a single input folder and converted together
+    with ACAD2018; only the files that fail conversion or validation are
+    retried with ACAD2013 and then ACAD2010. Cache hits (see
+    ``convert_dwg_to_dxf``) are served without staging.
+
+    Args:
+        dwg_paths: DWG file paths
+        output_dir: Folder for the DXF outputs (default: next to each DWG)
+        cache: Conversion cache, False to disable, None for the default one
+        timeout_per_file: ODA timeout budget per staged file, in seconds
+        parse_options: When given, each freshly converted DXF is parsed with
+            these ``parse_dxf_file`` options during validation and the payload
+            is returned under 'parsed' (cache hits are not parsed)
+
+    Outputs are named after the DWG stem (``<stem>.dxf``); when several
+    inputs share a stem and an output folder, the later ones get
+    ``<stem>_<hash of the source path>.dxf`` so none overwrites another.
+
+    Returns:
+        Mapping of each input path (as str) to a dict with 'dxf' (path or
+        None), 'dxf_version', 'validation', 'cached' and 'error'.
+    """
+    results = {}
+    jobs = {}
+    claimed = set()  # (output folder, stem) pairs already taken by a job
+    for path in dwg_paths:
+        if str(path) in results:
+            continue
+        dwg_file = Path(path)
+        out = Path(output_dir) if output_dir else dwg_file.parent
+        results[str(path)] = {'dxf': None, 'dxf_version': None, 'validation': None, 'cached': False, 'error': None}
+        stem = dwg_file.stem
+        slot = (os.path.normcase(os.path.abspath(out)), stem.lower())
+        if slot in claimed:
+            digest = hashlib.sha1(os.path.abspath(str(path)).encode('utf-8')).hexdigest()[:8]
+            stem = f"{stem}_{digest}"
+            slot = (slot[0], stem.lower())
+        claimed.add(slot)
+        # Prefix with a sequence number so same-named drawings from different folders do not collide
+        staged_name = f"{len(jobs):05d}_{dwg_file.name}"
+        jobs[staged_name] = {
+            'path': str(path),
+            'dwg': dwg_file,
+            'out_dir': out,
+            'stem': stem,
+            'log': out / f"{stem}_conversion.log",
+            'key': None,
+        }
+
     # Check if ODA File Converter is available
     oda_converter = shutil.which("ODAFileConverter")
     if not oda_converter:
         logger.warning("ODA File Converter not found in PATH. Install for best results.")
-        return None
-    
-    # Create isolated temp directory for the DWG file to avoid converting other files
+        for res in results.values():
+            res['error'] = 'ODA File Converter not found'
+        return results
+
+    if cache is None:
+        cache = get_dwg_conversion_cache()
+    if cache:
+        converter_version = _oda_converter_version(oda_converter)
+        for staged_name, job in list(jobs.items()):
+            try:
+                job['key'] = file_digest(str(job['dwg']), salt=converter_version)
+                cached = cache.get(job['key'])
+            except OSError as e:
+                logger.warning(f"DWG conversion cache lookup failed: {e}")
+                cached = None
+            if not cached:
+                continue
+            cached_dxf, meta = cached
+            standard_dxf = job['out_dir'] / f"{job['stem']}.dxf"
+            shutil.copy2(cached_dxf, str(standard_dxf))
+            logger.info(f"✓ DWG conversion cache hit for {job['path']} ({meta.get('dxf_version')}, key={job['key'][:12]})")
+            with open(job['log'], 'a') as log:
+                log.write(f"\n{'='*60}\n")
+                log.write(f"Conversion cache hit ({meta.get('dxf_version')}): {job['key']}\n")
+                log.write(f"Validation: {meta.get('validation')}\n")
+            results[job['path']].update({
+                'dxf': str(standard_dxf),
+                'dxf_version': meta.get('dxf_version'),
+                'validation': meta.get('validation'),
+                'cached': True,
+            })
+            del jobs[staged_name]
+
+    if not jobs:
+        return results
+
+    # Stage every remaining DWG into one isolated folder (never convert unrelated files)
     with tempfile.TemporaryDirectory(prefix="dwg_convert_") as isolated_input_dir:
-        # Copy DWG to isolated directory
-        isolated_dwg = Path(isolated_input_dir) / dwg_file.name
-        shutil.copy2(str(dwg_file), str(isolated_dwg))
-        
-        # Try conversion with each DXF version
-        for dxf_version in dxf_versions:
-            # Unique DXF name for each version to avoid overwriting
-            final_dxf = output_dir / f"{base_name}_{dxf_version}.dxf"
+        for staged_name, job in jobs.items():
+            shutil.copy2(str(job['dwg']), str(Path(isolated_input_dir) / staged_name))
+
+        remaining = list(jobs)
+        for dxf_version in DXF_VERSIONS:
+            if not remaining:
+                break
             temp_output_dir = Path(tempfile.mkdtemp(prefix=f"oda_output_{dxf_version}_"))
-            
+            timeout = timeout_per_file * len(remaining)
             try:
-                logger.info(f"Converting {dwg_path} to DXF using ODA ({dxf_version})...")
-                
+                logger.info(f"Converting {len(remaining)} DWG file(s) to DXF using ODA ({dxf_version})...")
+
                 # ODA File Converter command (correct syntax without file filter)
                 # Format: ODAFileConverter <input_folder> <output_folder> <output_version> <output_format> <recursive> <audit>
                 result = subprocess.run([
                     oda_converter,
-                    str(isolated_input_dir),     # Input folder (isolated with only our DWG)
+                    str(isolated_input_dir),     # Input folder (only the staged DWGs still to convert)
                     str(temp_output_dir),         # Output folder
                     dxf_version,                  # DXF version (ACAD2018/2013/2010)
                     "DXF",                        # Output format
                     "0",                          # Not recursive
                     "1"                           # Audit and fix errors (preserves proxy objects)
-                ], 
-                capture_output=True, 
-                text=True, 
-                timeout=120
+                ],
+                capture_output=True,
+                text=True,
+                timeout=timeout
                 )
-                
-                # Log conversion output with correct timestamp
-                timestamp = datetime.datetime.fromtimestamp(dwg_file.stat().st_mtime).isoformat()
-                log_mode = 'w' if dxf_version == dxf_versions[0] else 'a'
-                with open(log_file, log_mode) as log:
-                    log.write(f"\n{'='*60}\n")
-                    log.write(f"DWG to DXF Conversion Log - {dxf_version}\n")
-                    log.write(f"DWG File: {dwg_path}\n")
-                    log.write(f"DXF Version: {dxf_version}\n")
-                    log.write(f"Timestamp: {timestamp}\n")
-                    log.write(f"\n--- ODA Output ---\n")
-                    log.write(result.stdout)
-                    if result.stderr:
-                        log.write(f"\n--- ODA Errors ---\n")
-                        log.write(result.stderr)
-                
-                # Find converted DXF file (exact name match to avoid false positives)
-                converted_dxf = None
-                expected_name = dwg_file.stem + ".dxf"
-                
+
+                # Index converted files (exact name match to avoid false positives)
+                converted_files = {}
                 for root, dirs, files in os.walk(temp_output_dir):
                     for f in files:
-                        if f.lower() == expected_name.lower():
-                            converted_dxf = Path(root) / f
-                            break
-                    if converted_dxf:
-                        break
-                
-                if not converted_dxf or not converted_dxf.exists():
-                    logger.warning(f"Conversion with {dxf_version} failed or produced no output.")
-                    with open(log_file, 'a') as log:
-                        log.write(f"\n⚠️ Conversion failed - no output file found\n")
-                    continue
-                
-                # Move DXF to target location with version-specific name
-                shutil.move(str(converted_dxf), str(final_dxf))
-                
-                # Validate DXF integrity
-                validation_result = _validate_dxf(final_dxf, log_file, dxf_version)
-                
-                if validation_result['valid']:
-                    logger.info(f"✓ Successfully converted {dwg_path} to {final_dxf} using {dxf_version}")
+                        converted_files.setdefault(f.lower(), Path(root) / f)
+
+                for staged_name in list(remaining):
+                    job = jobs[staged_name]
+                    dwg_file = job['dwg']
+                    log_file = job['log']
+
+                    # Log conversion output with correct timestamp
+                    timestamp = datetime.datetime.fromtimestamp(dwg_file.stat().st_mtime).isoformat()
+                    log_mode = 'w' if dxf_version == DXF_VERSIONS[0] else 'a'
+                    with open(log_file, log_mode) as log:
+                        log.write(f"\n{'='*60}\n")
+                        log.write(f"DWG to DXF Conversion Log - {dxf_version}\n")
+                        log.write(f"DWG File: {job['path']}\n")
+                        log.write(f"DXF Version: {dxf_version}\n")
+                        log.write(f"Timestamp: {timestamp}\n")
+                        log.write(f"\n--- ODA Output ---\n")
+                        log.write(result.stdout)
+                        if result.stderr:
+                            log.write(f"\n--- ODA Errors ---\n")
+                            log.write(result.stderr)
+
+                    converted_dxf = converted_files.get((Path(staged_name).stem + ".dxf").lower())
+                    if not converted_dxf or not converted_dxf.exists():
+                        logger.warning(f"Conversion of {job['path']} with {dxf_version} failed or produced no output.")
+                        with open(log_file, 'a') as log:
+                            log.write(f"\n⚠️ Conversion failed - no output file found\n")
+                        results[job['path']]['error'] = 'no output file found'
+                        continue
+
+                    # Move DXF to target location with version-specific name
+                    final_dxf = job['out_dir'] / f"{job['stem']}_{dxf_version}.dxf"
+                    shutil.move(str(converted_dxf), str(final_dxf))
+
+                    # Validate DXF integrity
+                    validation_result = _validate_dxf(final_dxf, log_file, dxf_version, parse_options=parse_options)
+                    parsed = validation_result.pop('parsed', None)
+
+                    if not validation_result['valid']:
+                        logger.warning(f"DXF validation failed for {job['path']} ({dxf_version}): {validation_result.get('error')}")
+                        with open(log_file, 'a') as log:
+                            log.write(f"\n⚠️ Validation failed: {validation_result.get('error')}\n")
+                        results[job['path']].update({'validation': validation_result, 'error': validation_result.get('error')})
+                        # Keep trying next version
+                        continue
+
+                    logger.info(f"✓ Successfully converted {job['path']} to {final_dxf} using {dxf_version}")
                     logger.info(f"  Entities: {validation_result.get('entity_count', 'N/A')}")
                     logger.info(f"  Layers: {validation_result.get('layer_count', 'N/A')}")
                     logger.info(f"  Blocks: {validation_result.get('block_count', 'N/A')}")
                     logger.info(f"  Proxy Objects: {validation_result.get('proxy_count', 'N/A')}")
-                    
+
+                    if cache and job['key']:
+                        try:
+                            cache.put(job['key'], str(final_dxf), {
+                                'dxf_version': dxf_version,
+                                'validation': validation_result,
+                                'source': str(dwg_file.name),
+                            })
+                        except OSError as e:
+                            logger.warning(f"Could not store DXF in conversion cache: {e}")
+
                     # Rename to standard name (without version suffix) for pipeline
-                    standard_dxf = output_dir / f"{base_name}.dxf"
+                    standard_dxf = job['out_dir'] / f"{job['stem']}.dxf"
                     if standard_dxf.exists():
                         standard_dxf.unlink()  # Remove old version
                     shutil.copy2(str(final_dxf), str(standard_dxf))
-                    
-                    return str(standard_dxf)
-                else:
-                    logger.warning(f"DXF validation failed for {dxf_version}: {validation_result.get('error')}")
-                    with open(log_file, 'a') as log:
-                        log.write(f"\n⚠️ Validation failed: {validation_result.get('error')}\n")
-                    # Keep trying next version
-                    continue
-                    
+
+                    results[job['path']].update({
+                        'dxf': str(standard_dxf),
+                        'dxf_version': dxf_version,
+                        'validation': validation_result,
+                        'error': None,
+                    })
+                    if parsed is not None:
+                        results[job['path']]['parsed'] = parsed
+                    # Drop it from the staging folder so older formats only retry failures
+                    remaining.remove(staged_name)
+                    (Path(isolated_input_dir) / staged_name).unlink()
+
             except subprocess.TimeoutExpired:
                 logger.error(f"ODA conversion timeout for {dxf_version}")
-                with open(log_file, 'a') as log:
-                    log.write(f"\n❌ Conversion timeout after 120 seconds\n")
+                for staged_name in remaining:
+                    with open(jobs[staged_name]['log'], 'a') as log:
+                        log.write(f"\n❌ Conversion timeout after {timeout} seconds\n")
+                    results[jobs[staged_name]['path']]['error'] = 'conversion timeout'
                 continue
             except Exception as e:
                 logger.error(f"ODA conversion error with {dxf_version}: {e}")
-                with open(log_file, 'a') as log:
-                    log.write(f"\n❌ Conversion error: {str(e)}\n")
+                for staged_name in remaining:
+                    with open(jobs[staged_name]['log'], 'a') as log:
+                        log.write(f"\n❌ Conversion error: {str(e)}\n")
+                    results[jobs[staged_name]['path']]['error'] = str(e)
                 continue
             finally:
                 # Always cleanup temp directory
                 if temp_output_dir.exists():
                     shutil.rmtree(temp_output_dir, ignore_errors=True)
-    
-    # All ODA conversions failed
-    logger.error("All ODA conversions failed. Cannot proceed without valid DXF.")
-    with open(log_file, 'a') as log:
-        log.write(f"\n{'='*60}\n")
-        log.write(f"❌ FINAL RESULT: All conversion attempts failed\n")
-    return None
+
+    # All ODA conversions failed for whatever is left
+    for staged_name in remaining:
+        job = jobs[staged_name]
+        logger.error(f"All ODA conversions failed for {job['path']}. Cannot proceed without valid DXF.")
+        with open(job['log'], 'a') as log:
+            log.write(f"\n{'='*60}\n")
+            log.write(f"❌ FINAL RESULT: All conversion attempts failed\n")
+    return results
 
 
-def _validate_dxf(dxf_path, log_file, dxf_version):
+def _validate_dxf(dxf_path, log_file, dxf_version, parse_options=None):
     """
     Production-grade DXF validation using ezdxf.
     
@@ -216,106 +380,70 @@ def _validate_dxf(dxf_path, log_file, dxf_version):
     - Hatch boundary integrity
     - Dimension and text style existence
     - Polyline geometry issues
+
+    With ``parse_options`` (keyword arguments for ``parse_dxf_file``) the
+    checks run inside the parser's ingestion pass and the parsed payload is
+    returned under 'parsed' for the caller to reuse, so validating costs no
+    extra read. Without them only the statistics are collected
+    (``read_dxf_stats``), skipping member extraction.
     """
     try:
-        import ezdxf
         from ezdxf.lldxf.validator import is_dxf_file
+        from src.pipeline.dxf_parser import parse_dxf_file, read_dxf_stats
         
         # Check if it's a valid DXF file
         if not is_dxf_file(str(dxf_path)):
             return {'valid': False, 'error': 'Not a valid DXF file'}
         
-        # Load and validate
-        doc = ezdxf.readfile(str(dxf_path))
-        modelspace = doc.modelspace()
-        
-        entity_count = len(list(modelspace))
-        layer_count = len(doc.layers)
-        block_count = len(doc.blocks)
-        
-        # Count proxy objects (critical for AEC/Civil3D content)
-        proxy_count = 0
-        hatch_issues = []
-        polyline_issues = []
-        
-        for entity in modelspace:
-            # Proxy object detection
-            if entity.dxftype() in ('ACAD_PROXY_ENTITY', 'ACAD_PROXY_OBJECT'):
-                proxy_count += 1
-            
-            # Hatch boundary integrity
-            if entity.dxftype() == 'HATCH':
-                try:
-                    if hasattr(entity, 'paths'):
-                        paths = entity.paths
-                        if not paths or len(paths) == 0:
-                            hatch_issues.append(f"Empty hatch boundary: {entity.dxf.handle}")
-                except Exception:
-                    hatch_issues.append(f"Invalid hatch: {entity.dxf.handle}")
-            
-            # LWPOLYLINE geometry checks (use proper flag check)
-            if entity.dxftype() == 'LWPOLYLINE':
-                try:
-                    # Check closure using DXF flags (bit 0 = closed)
-                    is_closed = bool(entity.dxf.flags & 1) if hasattr(entity.dxf, 'flags') else False
-                    points = list(entity.get_points('xy'))
-                    
-                    if is_closed and len(points) < 3:
-                        polyline_issues.append(f"Invalid closed polyline (< 3 points): {entity.dxf.handle}")
-                    
-                    # Check for self-intersection (basic)
-                    if len(points) > 3:
-                        # Simple check: duplicate consecutive points
-                        for i in range(len(points) - 1):
-                            if points[i] == points[i+1]:
-                                polyline_issues.append(f"Duplicate points in polyline: {entity.dxf.handle}")
-                                break
-                except Exception as e:
-                    polyline_issues.append(f"Polyline check error: {entity.dxf.handle} - {str(e)}")
-        
-        # Check dimension styles
-        dimstyle_count = len(doc.dimstyles) if hasattr(doc, 'dimstyles') else 0
-        
-        # Check text styles
-        textstyle_count = len(doc.styles) if hasattr(doc, 'styles') else 0
+        # Collect validation statistics, parsing in the same pass when the payload is wanted
+        if parse_options is not None:
+            parsed = parse_dxf_file(str(dxf_path), **parse_options)
+            stats = parsed['dxf_stats']
+        else:
+            parsed = None
+            stats = read_dxf_stats(str(dxf_path))
+        entity_count = stats['entity_count']
         
         # Log comprehensive validation details
         with open(log_file, 'a') as log:
             log.write(f"\n--- DXF Validation ({dxf_version}) ---\n")
             log.write(f"Status: VALID\n")
             log.write(f"Entities: {entity_count}\n")
-            log.write(f"Layers: {layer_count}\n")
-            log.write(f"Blocks: {block_count}\n")
-            log.write(f"Proxy Objects: {proxy_count}\n")
-            log.write(f"Dimension Styles: {dimstyle_count}\n")
-            log.write(f"Text Styles: {textstyle_count}\n")
-            log.write(f"Units: {doc.header.get('$INSUNITS', 'Not specified')}\n")
+            log.write(f"Layers: {stats['layer_count']}\n")
+            log.write(f"Blocks: {stats['block_count']}\n")
+            log.write(f"Proxy Objects: {stats['proxy_count']}\n")
+            log.write(f"Dimension Styles: {stats['dimstyle_count']}\n")
+            log.write(f"Text Styles: {stats['textstyle_count']}\n")
+            log.write(f"Units: {stats['units'] if stats['units'] is not None else 'Not specified'}\n")
             
-            if hatch_issues:
-                log.write(f"\n--- Hatch Issues ({len(hatch_issues)}) ---\n")
-                for issue in hatch_issues[:10]:
+            if stats['hatch_issues']:
+                log.write(f"\n--- Hatch Issues ({stats['hatch_issues']}) ---\n")
+                for issue in stats['hatch_issue_samples']:
                     log.write(f"{issue}\n")
             
-            if polyline_issues:
-                log.write(f"\n--- Polyline Issues ({len(polyline_issues)}) ---\n")
-                for issue in polyline_issues[:10]:
+            if stats['polyline_issues']:
+                log.write(f"\n--- Polyline Issues ({stats['polyline_issues']}) ---\n")
+                for issue in stats['polyline_issue_samples']:
                     log.write(f"{issue}\n")
         
         # Basic integrity checks
         if entity_count == 0:
             return {'valid': False, 'error': 'No entities found in DXF'}
         
-        return {
+        result = {
             'valid': True,
             'entity_count': entity_count,
-            'layer_count': layer_count,
-            'block_count': block_count,
-            'proxy_count': proxy_count,
-            'dimstyle_count': dimstyle_count,
-            'textstyle_count': textstyle_count,
-            'hatch_issues': len(hatch_issues),
-            'polyline_issues': len(polyline_issues)
+            'layer_count': stats['layer_count'],
+            'block_count': stats['block_count'],
+            'proxy_count': stats['proxy_count'],
+            'dimstyle_count': stats['dimstyle_count'],
+            'textstyle_count': stats['textstyle_count'],
+            'hatch_issues': stats['hatch_issues'],
+            'polyline_issues': stats['polyline_issues']
         }
+        if parse_options is not None:
+            result['parsed'] = parsed
+        return result
         
     except Exception as e:
         with open(log_file, 'a') as log:
@@ -380,12 +508,93 @@ def list_agents():
     return sorted([name for name in dir(agents) if not name.startswith('_')])
 
 
+def _dxf_parse_options(extra):
+    from src.pipeline.dxf_parser import dxf_parse_options
+    return dxf_parse_options(extra)
+
+
+def _ingest_dxf(dxf_path, extra=None):
+    """Parse a DXF in a single pass; if it is structurally invalid, try an
+    ODA re-conversion to ACAD2013 and parse the cleaned file instead."""
+    from src.pipeline.dxf_parser import parse_dxf_file
+    options = _dxf_parse_options(extra)
+    try:
+        return parse_dxf_file(dxf_path, **options)
+    except RuntimeError as e:
+        if "Invalid DXF file format" not in str(e):
+            raise
+        logger.warning("DXF has invalid group codes; attempting ODA re-conversion to ACAD2013...")
+        if not _reconvert_dxf_with_oda(dxf_path):
+            raise
+    return parse_dxf_file(dxf_path, **options)
+
+
+def _reconvert_dxf_with_oda(dxf_path):
+    """Replace a malformed DXF with an ODA-cleaned copy (keeps a .bak). Returns True on success."""
+    oda_converter = shutil.which("ODAFileConverter")
+    if not oda_converter:
+        logger.error("ODA File Converter not found. Please re-export the DXF (R2013) or install ODA.")
+        return False
+    tmp_in = Path(tempfile.mkdtemp(prefix="oda_fix_in_"))
+    tmp_out = Path(tempfile.mkdtemp(prefix="oda_fix_dxf_"))
+    try:
+        # ODA requires a folder; stage only this DXF
+        shutil.copy2(dxf_path, str(tmp_in / Path(dxf_path).name))
+        subprocess.run([
+            oda_converter,
+            str(tmp_in),
+            str(tmp_out),
+            "ACAD2013",
+            "DXF",
+            "0",
+            "1"
+        ], capture_output=True, text=True, timeout=120)
+        # Find cleaned DXF with same stem
+        stem = Path(dxf_path).stem
+        cleaned = None
+        for root, dirs, files in os.walk(tmp_out):
+            for f in files:
+                if f.lower() == f"{stem}.dxf".lower():
+                    cleaned = Path(root) / f
+                    break
+            if cleaned:
+                break
+        if not cleaned or not cleaned.exists():
+            logger.warning("ODA did not produce a matching DXF; proceeding with original")
+            return False
+        # Replace original with cleaned copy (keep backup)
+        backup = Path(dxf_path).with_suffix('.dxf.bak')
+        try:
+            shutil.copy2(dxf_path, backup)
+        except Exception:
+            pass
+        shutil.copy2(str(cleaned), dxf_path)
+        logger.info("✓ ODA re-conversion applied; proceeding with cleaned DXF")
+        return True
+    except Exception as e:
+        logger.warning(f"ODA re-conversion failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(tmp_in, ignore_errors=True)
+        shutil.rmtree(tmp_out, ignore_errors=True)
+
+
 def run_pipeline(input_data, out_dir=None, extra=None):
     """Compatibility wrapper to run the high-level pipeline orchestration.
 
     - `input_data` can be a DXF/IFC path (string), a list of DXF-like entities,
       or a dict containing `members`.
     - Returns the agent orchestrator result (same shape as main_pipeline_agent.process).
+    - `extra` carries ingestion options for DXF inputs:
+        - `streaming`: stream the modelspace instead of loading the document
+          (default: automatic for large files)
+        - `workers`: worker processes that read and convert the drawing's
+          entities in parallel (0 = all CPUs, default: serial)
+        - `chord_tolerance`: maximum chord error for curve tessellation in
+          drawing units (None = fixed legacy segment counts)
+        - `coalesce`: merge consecutive collinear segments (default True)
+        - `layer_filter`: layers to read, as a profile name ("AISC structural",
+          "tekla-export") or a dict of `profile`/`include`/`exclude` globs
 
     This wrapper intentionally uses the `main_pipeline_agent` to drive the
     orchestration so new modular logic is exercised while preserving an
@@ -403,88 +612,19 @@ def run_pipeline(input_data, out_dir=None, extra=None):
             if p.exists() and p.is_file():
                 suf = p.suffix.lower()
                 if suf == '.dwg':
-                    # Convert DWG to DXF first
+                    # Convert DWG to DXF first; the validation pass doubles as the parse
                     logger.info(f"DWG file detected: {input_data}. Converting to DXF...")
-                    dxf_path = convert_dwg_to_dxf(str(p))
+                    converted = convert_dwgs_to_dxf([str(p)], parse_options=_dxf_parse_options(extra))[str(p)]
+                    dxf_path = converted['dxf']
                     if dxf_path and os.path.exists(dxf_path):
-                        payload_data = dxf_path
+                        payload_data = converted.get('parsed') or _ingest_dxf(dxf_path, extra)
                         logger.info(f"✓ DWG converted to DXF: {dxf_path}")
                     else:
                         raise RuntimeError("DWG to DXF conversion failed. Please install ODA File Converter.")
                 elif suf == '.dxf':
-                    # DXF file: validate and auto-recover if malformed
-                    logger.info(f"DXF file detected: {input_data}. Validating structure before parsing...")
-                    dxf_path = str(p)
-                    def _basic_dxf_sanity(path: str) -> bool:
-                        try:
-                            with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
-                                # Check first 2000 lines for non-numeric group codes
-                                for i in range(2000):
-                                    code = fh.readline()
-                                    if not code:
-                                        break
-                                    s = code.strip()
-                                    # Empty lines are fine; numeric codes should parse
-                                    if not s:
-                                        continue
-                                    # Many DXFs start with 0, 9, etc.; if not numeric, likely malformed
-                                    if not s.isdigit():
-                                        # Allow some known headers in binary DXF detection – else fail
-                                        if s not in {"SECTION", "ENDSEC", "EOF"}:
-                                            return False
-                                return True
-                        except Exception:
-                            return True  # If unreadable (binary), let ezdxf decide
-
-                    sane = _basic_dxf_sanity(dxf_path)
-                    if not sane:
-                        logger.warning("DXF pre-scan found non-numeric group codes; attempting ODA re-conversion to ACAD2013...")
-                        oda_converter = shutil.which("ODAFileConverter")
-                        if oda_converter:
-                            try:
-                                tmp_out = Path(tempfile.mkdtemp(prefix="oda_fix_dxf_"))
-                                # ODA requires a folder; use the parent folder of the DXF
-                                in_dir = str(Path(dxf_path).parent)
-                                subprocess.run([
-                                    oda_converter,
-                                    in_dir,
-                                    str(tmp_out),
-                                    "ACAD2013",
-                                    "DXF",
-                                    "0",
-                                    "1"
-                                ], capture_output=True, text=True, timeout=120)
-                                # Find cleaned DXF with same stem
-                                stem = Path(dxf_path).stem
-                                cleaned = None
-                                for root, dirs, files in os.walk(tmp_out):
-                                    for f in files:
-                                        if f.lower() == f"{stem}.dxf".lower():
-                                            cleaned = Path(root) / f
-                                            break
-                                    if cleaned:
-                                        break
-                                if cleaned and cleaned.exists():
-                                    # Replace original with cleaned copy (keep backup)
-                                    backup = Path(dxf_path).with_suffix('.dxf.bak')
-                                    try:
-                                        shutil.copy2(dxf_path, backup)
-                                    except Exception:
-                                        pass
-                                    shutil.copy2(str(cleaned), dxf_path)
-                                    logger.info("✓ ODA re-conversion applied; proceeding with cleaned DXF")
-                                else:
-                                    logger.warning("ODA did not produce a matching DXF; proceeding with original")
-                            except Exception as e:
-                                logger.warning(f"ODA re-conversion failed: {e}")
-                            finally:
-                                try:
-                                    shutil.rmtree(tmp_out, ignore_errors=True)
-                                except Exception:
-                                    pass
-                        else:
-                            logger.error("ODA File Converter not found. Please re-export the DXF (R2013) or install ODA.")
-                    payload_data = dxf_path
+                    # DXF file: parse once (validation statistics are collected on the way)
+                    logger.info(f"DXF file detected: {input_data}. Parsing...")
+                    payload_data = _ingest_dxf(str(p), extra)
                 elif suf == '.json':
                     with p.open('r', encoding='utf-8') as fh:
                         try:
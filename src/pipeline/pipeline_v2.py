@@ -9,10 +9,12 @@ import math
 import json
 import uuid
 import os
-from collections import defaultdict
 from typing import Dict, List, Tuple, Optional, Any
 import warnings
 
+from .member_table import MemberTable, as_member_table
+from .geometry.kernels import member_endpoints, obb_overlaps, segment_distances, segment_frames, segment_obbs
+
 # Deprecation notice: prefer `src.pipeline.pipeline_compat.run_pipeline` or
 # the `src.pipeline.agents` package for new integrations. `pipeline_v2.py`
 # remains for backwards compatibility during migration but will be removed
@@ -1132,6 +1134,187 @@ def miner_from_dxf(dxf_entities):
     return {'members': members}
 
 
+# ---------------------------------------------------------------------------
+# Column-wise implementations of the standardize, load, stability and
+# optimizer stages. Lists of member dicts are converted to a MemberTable on
+# the way in and handed back as dicts (see ``_same_kind``).
+# ---------------------------------------------------------------------------
+
+_TYPE_CODES = {0: 'beam', 1: 'column', 2: 'brace'}
+
+
+def _stage_table(members):
+    """Table a stage can extend without touching its input."""
+    return members.copy() if isinstance(members, MemberTable) else as_member_table(members)
+
+
+def _same_kind(members, table):
+    """``table`` for MemberTable input, plain member dicts for list input."""
+    return table if isinstance(members, MemberTable) else table.to_members()
+
+
+def _member_type_codes(lengths, angles, layer_hints, clf):
+    """Type index per member (see ``_TYPE_CODES``): classifier, then layer hints, then the angle rule."""
+    import numpy as _np
+    n = len(lengths)
+    type_idx = _np.full(n, -1, dtype=_np.int64)
+    if clf is not None and n:
+        try:
+            pred = _np.asarray(clf.predict(_np.column_stack([lengths, angles])), dtype=_np.int64)
+            type_idx = _np.where(_np.isin(pred, (0, 1, 2)), pred, -1)
+        except Exception:
+            type_idx[:] = -1
+    hint_types = {}
+    for i, hint in enumerate(layer_hints):
+        if not hint:
+            continue
+        if hint not in hint_types:
+            lh = hint.upper()
+            hint_types[hint] = 1 if ('COL' in lh or 'COLUMN' in lh) else (0 if ('BEAM' in lh or 'BM' in lh) else -1)
+        if hint_types[hint] >= 0:
+            type_idx[i] = hint_types[hint]
+    unset = type_idx < 0
+    type_idx[unset] = _np.where(angles[unset] > 60, 1, _np.where(angles[unset] < 20, 0, 2))
+    return type_idx
+
+
+def _standardize_table(table, clf):
+    import numpy as _np
+    s = table.start.copy()
+    e = table.end.copy()
+    frames = segment_frames(s, e)
+    L = _np.where(_np.isnan(table.length), frames['length'], table.length)
+    raws = [x.get('raw') or {} for x in table.extras]
+    layer_values = table.decoded('layer')
+    layers = [lay or raw.get('layer') or raw.get('dxf_layer') for lay, raw in zip(layer_values, raws)]
+    hints = [(lay or raw.get('layer') or '') for lay, raw in zip(layer_values, raws)]
+    type_idx = _member_type_codes(L, frames['inclination_deg'], hints, clf)
+
+    ids = [mid_ if mid_ is not None else str(uuid.uuid4()) for mid_ in table.ids]
+    out = MemberTable(ids)
+    out.start[:] = s
+    out.end[:] = e
+    out.length[:] = L
+    out.set_codes('type', type_idx, [_TYPE_CODES[k] for k in range(3)])
+    out.add_coded_column('layer', layers)
+    out.add_vector_column('orientation', frames['direction'])
+    out.add_vector_column('midpoint', frames['midpoint'])
+    out.add_vector_column('local_x', frames['local_x'].copy())
+    out.add_vector_column('local_y', frames['local_y'])
+    out.add_vector_column('local_z', frames['local_z'])
+    out.add_group('local_axes', {'x': 'local_x', 'y': 'local_y', 'z': 'local_z'})
+    out.add_float_column('rotation_z_deg', frames['rotation_z_deg'])
+    for extras, src in zip(out.extras, table.extras):
+        extras['source'] = src.get('source')
+        extras['raw'] = src.get('raw')
+    return out
+
+
+def _resolve_loads_table(table):
+    import numpy as _np
+    span = table.length
+    beam = table.mask('type', 'beam')
+    column = table.mask('type', 'column')
+    other = ~(beam | column)
+    axial = _np.empty(len(table))
+    moment = _np.empty(len(table))
+    shear = _np.empty(len(table))
+    w = 5.0
+    axial[beam] = 0.1 * span[beam]
+    moment[beam] = w * span[beam] ** 2 / 8.0
+    shear[beam] = w * span[beam] / 2.0
+    axial[column] = 50.0 * _np.where(span[column] < 3, 1.0, span[column] / 3)
+    moment[column] = 0.2 * axial[column] * span[column]
+    shear[column] = axial[column] * 0.05
+    axial[other] = 20.0
+    moment[other] = 0.1 * 20.0 * span[other]
+    shear[other] = 20.0 * 0.05
+    table.add_float_column('axial_kN', axial)
+    table.add_float_column('moment_kNm', moment)
+    table.add_float_column('shear_kN', shear)
+    table.add_group('loads', {'axial_kN': 'axial_kN', 'moment_kNm': 'moment_kNm', 'shear_kN': 'shear_kN'})
+    return table
+
+
+def _stability_table(table):
+    import numpy as _np
+    L = table.length
+    r = _np.maximum(0.02, 0.05 * L)
+    sl = L / r
+    risk = _np.where(sl > 200, 2, _np.where(sl > 120, 1, 0))
+    table.add_float_column('slenderness', sl)
+    table.set_codes('buckling_risk', risk, ['low', 'medium', 'high'])
+    table.add_group('stability', {'slenderness': 'slenderness', 'buckling_risk': 'buckling_risk'})
+    return table
+
+
+def _pick_sections(axial, moment, span):
+    """Vectorized ``pick_section_for_member``: catalog index per member."""
+    import numpy as _np
+    area = _np.array([s['area'] for s in SECTION_CATALOG])
+    ixx = _np.array([s['Ixx'] for s in SECTION_CATALOG])
+    unit_cost = _np.array([s['weight_kg_per_m'] * s['price_per_kg'] for s in SECTION_CATALOG])
+    lever = _np.where(span > 0.01, span / 2, 0.01)[:, None]
+    feasible = (axial[:, None] <= area * 250e6 * 0.6) & (moment[:, None] <= ixx * 250e6 * 0.6 / lever)
+    cost = _np.where(feasible, unit_cost * span[:, None], _np.inf)
+    best = cost.argmin(axis=1)
+    return _np.where(feasible.any(axis=1), best, 0)
+
+
+def _optimize_table(table, selector, cost_db):
+    import numpy as _np
+    n = len(table)
+    if 'loads' in table.groups:
+        axial = table.floats['axial_kN'] * 1000.0
+        moment = table.floats['moment_kNm'] * 1000.0
+    else:
+        # member dicts bring their loads as a per-row extra
+        loads = [extras['loads'] for extras in table.extras]
+        axial = _np.array([l['axial_kN'] for l in loads], dtype=float) * 1000.0
+        moment = _np.array([l['moment_kNm'] for l in loads], dtype=float) * 1000.0
+    span = table.length
+    names = [s['name'] for s in SECTION_CATALOG]
+    section_idx = _np.full(n, -1, dtype=_np.int64)
+    if selector is not None and n:
+        try:
+            pred = _np.asarray(selector.predict(_np.column_stack([axial, moment, span])), dtype=_np.int64)
+            section_idx = _np.where((pred >= 0) & (pred < len(SECTION_CATALOG)), pred, -1)
+        except Exception:
+            section_idx[:] = -1
+    # respect any manually locked selection from previous correction iterations;
+    # a previous optimizer run keeps it in columns, member dicts bring it as an extra
+    locked = _np.zeros(n, dtype=bool)
+    locked_idx = _np.full(n, -1, dtype=_np.int64)
+    if 'locked' in table.codes and 'section_name' in table.codes:
+        locked = table.mask('locked', True)
+        current = [names.index(v) if v in names else -1 for v in table.categories['section_name'].values]
+        lookup = _np.array(current + [-1], dtype=_np.int64)
+        codes = table.codes['section_name']
+        locked_idx = lookup[_np.where(codes < 0, len(current), codes)]
+    for i, extras in enumerate(table.extras):
+        sel = extras.get('selection')
+        if isinstance(sel, dict) and sel.get('locked'):
+            locked[i] = True
+            locked_idx[i] = names.index(sel['section_name']) if sel.get('section_name') in names else -1
+    section_idx = _np.where(locked, locked_idx, section_idx)
+    missing = section_idx < 0
+    if missing.any():
+        section_idx[missing] = _pick_sections(axial[missing], moment[missing], span[missing])
+
+    # compute weight and cost using section properties (fall back to catalog values)
+    w_per_m = _np.array([s.get('weight_kg_per_m') or s.get('weight_kg', 0.0) for s in SECTION_CATALOG])
+    price = _np.array([cost_db.get(s['name']) or s.get('price_per_kg', 0.0) for s in SECTION_CATALOG])
+    weight = w_per_m[section_idx] * span
+    cost = weight * price[section_idx]
+    table.set_codes('section_name', section_idx, names)
+    table.add_float_column('weight_kg', weight)
+    table.add_float_column('estimated_cost', cost)
+    table.set_codes('locked', locked.astype(_np.int64), [False, True])
+    table.add_group('selection', {'section_name': 'section_name', 'weight_kg': 'weight_kg',
+                                  'estimated_cost': 'estimated_cost', 'locked': 'locked'})
+    return {'members': table, 'totals': {'weight_kg': float(weight.sum()), 'cost_currency': float(cost.sum())}}
+
+
 def engineer_standardize(input_json):
     # normalize input from miner: ensure start/end are mutable lists, length present, and include source/raw info
     clf = None
@@ -1140,87 +1323,21 @@ def engineer_standardize(input_json):
     except Exception:
         clf = None
     members = input_json.get('members', [])
-    out = {'members': []}
-    for m in members:
-        # normalize coordinate types to lists of floats so later agents can modify them
-        s = list(m.get('start') if m.get('start') is not None else (0.0, 0.0, 0.0))
-        e = list(m.get('end') if m.get('end') is not None else (0.0, 0.0, 0.0))
-        s = [float(s[0]), float(s[1]), float(s[2])] if len(s) >= 3 else [float(s[0]), float(s[1]), 0.0]
-        e = [float(e[0]), float(e[1]), float(e[2])] if len(e) >= 3 else [float(e[0]), float(e[1]), 0.0]
-        L = m.get('length') if m.get('length') is not None else length(s, e)
-        v = unit_vector(s, e)
-        angle = vec_angle_deg(v)
-        # midpoint and local axes: useful for later geometry ops and CNC orientation
-        mid = [(s[0] + e[0]) / 2.0, (s[1] + e[1]) / 2.0, (s[2] + e[2]) / 2.0]
-        # choose a reference direction for local Y (prefer global Z unless parallel)
-        if abs(v[2]) < 0.9:
-            ref_cand = (0.0, 0.0, 1.0)
-        else:
-            ref_cand = (0.0, 1.0, 0.0)
-        # orthonormalize: project out component along v
-        proj = v[0]*ref_cand[0] + v[1]*ref_cand[1] + v[2]*ref_cand[2]
-        ref = (ref_cand[0] - proj*v[0], ref_cand[1] - proj*v[1], ref_cand[2] - proj*v[2])
-        # normalize ref
-        rlen = math.sqrt(ref[0]*ref[0] + ref[1]*ref[1] + ref[2]*ref[2]) or 1.0
-        ydir = (ref[0]/rlen, ref[1]/rlen, ref[2]/rlen)
-        # local x is axis direction, local z is cross(x,y)
-        xdir = (v[0], v[1], v[2])
-        zdir = (xdir[1]*ydir[2] - xdir[2]*ydir[1], xdir[2]*ydir[0] - xdir[0]*ydir[2], xdir[0]*ydir[1] - xdir[1]*ydir[0])
-        # rotation about global Z for simple orientation (useful for CNC/labels)
-        rot_z = math.degrees(math.atan2(xdir[1], xdir[0]))
-        typ = None
-        if clf is not None:
-            try:
-                pred = clf.predict([[float(L), float(angle)]])[0]
-                typ = {0: 'beam', 1: 'column', 2: 'brace'}.get(int(pred), None)
-            except Exception:
-                typ = None
-        # layer heuristics can override classifier
-        layer_hint = (m.get('layer') or '').upper() if m.get('layer') else ((m.get('raw',{}) or {}).get('layer') or '')
-        if layer_hint:
-            lh = layer_hint.upper()
-            if 'COL' in lh or 'COLUMN' in lh: typ = 'column'
-            elif 'BEAM' in lh or 'BM' in lh: typ = 'beam'
-        if typ is None:
-            if angle > 60:
-                typ = 'column'
-            elif angle < 20:
-                typ = 'beam'
-            else:
-                typ = 'brace'
-        layer = m.get('layer') or (m.get('raw', {}) or {}).get('layer') or (m.get('raw', {}) or {}).get('dxf_layer')
-        out['members'].append({'id': m.get('id', str(uuid.uuid4())), 'start': s, 'end': e, 'length': float(L), 'type': typ, 'orientation': v, 'midpoint': mid, 'local_axes': {'x': xdir, 'y': ydir, 'z': zdir}, 'rotation_z_deg': rot_z, 'layer': layer, 'source': m.get('source'), 'raw': m.get('raw')})
-    return out
+    table = _standardize_table(as_member_table(members), clf)
+    return {'members': _same_kind(members, table)}
 
 
 def load_path_resolver(std_json):
-    out = {'members': []}
-    for m in std_json['members']:
-        span = m['length']
-        if m['type']=='beam':
-            w=5.0; axial=0.1*span; moment=w*span**2/8.0; shear=w*span/2.0
-        elif m['type']=='column':
-            axial=50.0*(1 if span<3 else span/3); moment=0.2*axial*span; shear=axial*0.05
-        else:
-            axial=20.0; moment=0.1*axial*span; shear=axial*0.05
-        out['members'].append({**m, 'loads': {'axial_kN': axial, 'moment_kNm': moment, 'shear_kN': shear}})
-    return out
+    members = std_json['members']
+    return {'members': _same_kind(members, _resolve_loads_table(_stage_table(members)))}
 
 
 def stability_agent(loaded_json):
-    out={'members':[]}
-    for m in loaded_json['members']:
-        L=m['length']; r=max(0.02,0.05*L); sl=L/r if r>0 else float('inf')
-        br='low'
-        if sl>200: br='high'
-        elif sl>120: br='medium'
-        out['members'].append({**m, 'stability': {'slenderness': sl, 'buckling_risk': br}})
-    return out
+    members = loaded_json['members']
+    return {'members': _same_kind(members, _stability_table(_stage_table(members)))}
 
 
 def optimizer_agent(stable_json):
-    out={'members':[],'totals':{}}
-    tw=0.0; tc=0.0
     selector = None
     try:
         selector = load_section_selector()
@@ -1228,38 +1345,9 @@ def optimizer_agent(stable_json):
         selector = None
     # cost DB stub (section -> price override per kg)
     COST_DB = {s['name']: s.get('price_per_kg', None) for s in SECTION_CATALOG}
-    for m in stable_json['members']:
-        axial=m['loads']['axial_kN']*1000.0; moment=m['loads']['moment_kNm']*1000.0; span=m['length']
-        # respect any manually locked selection from previous correction iterations
-        locked_sel = m.get('selection', {}) if isinstance(m.get('selection', {}), dict) else {}
-        if locked_sel and locked_sel.get('locked'):
-            sec_name = locked_sel.get('section_name')
-            sec = next((s for s in SECTION_CATALOG if s['name']==sec_name), None)
-            if sec is None:
-                sec = pick_section_for_member(axial, moment, span)
-        else:
-            section = None
-            if selector is not None:
-                try:
-                    idx = int(selector.predict([[axial, moment, span]])[0])
-                    # map idx to SECTION_CATALOG safely
-                    if 0 <= idx < len(SECTION_CATALOG):
-                        section = SECTION_CATALOG[idx]
-                except Exception:
-                    section = None
-            if section is None:
-                section = pick_section_for_member(axial, moment, span)
-            sec = section
-
-        # compute weight and cost using section properties (fall back to catalog values)
-        w_per_m = sec.get('weight_kg_per_m') or sec.get('weight_kg', 0.0)
-        price_per_kg = COST_DB.get(sec['name']) or sec.get('price_per_kg', 0.0)
-        w = w_per_m * span
-        cost = w * price_per_kg
-        tw += w; tc += cost
-        sel_out = {'section_name': sec['name'], 'weight_kg': w, 'estimated_cost': cost, 'locked': bool(locked_sel.get('locked', False))}
-        out['members'].append({**m, 'selection': sel_out})
-    out['totals']={'weight_kg':tw,'cost_currency':tc}
+    members = stable_json['members']
+    out = _optimize_table(_stage_table(members), selector, COST_DB)
+    out['members'] = _same_kind(members, out['members'])
     return out
 
 
@@ -2096,223 +2184,198 @@ def builder_ifc(full_json, out_path=None):
 
 
 def _segment_segment_distance(a0,a1,b0,b1):
-    """Pure Python fallback for segment-segment distance (no numpy dependency)."""
-    try:
+    """Closest distance between segments a0-a1 and b0-b1 (one pair of ``segment_distances``)."""
+    d, _, _ = segment_distances(a0, a1, b0, b1)
+    return float(d[0])
+
+
+def _id_codes(ids):
+    """Integer code per id (equal ids share a code), for vectorized same-id tests."""
+    import numpy as _np
+    codes = {}
+    return _np.array([codes.setdefault(k, len(codes)) for k in ids], dtype=_np.intp)
+
+
+def _shares_node(starts, ends, i, j):
+    """Pairs (i, j) whose members have an identical start/end node."""
+    same = lambda p, q: (p[i] == q[j]).all(axis=1)
+    return same(starts, starts) | same(ends, ends) | same(starts, ends) | same(ends, starts)
+
+
+def _section_box_dims(m):
+    """(width, depth) of the member's section box from ``SECTION_GEOM``, 0.05 x 0.05 if unknown."""
+    sel = m.get('selection') or {}
+    name = sel.get('section_name')
+    w = 0.05; h = 0.05
+    if name and name in SECTION_GEOM:
+        g = SECTION_GEOM[name]
+        if g.get('type') == 'I':
+            w = g.get('width', w); h = g.get('depth', h)
+        elif g.get('type') == 'Rect':
+            w = g.get('width', w); h = g.get('depth', h)
+        elif g.get('type') == 'HollowRect':
+            w = g.get('outer_w', w); h = g.get('outer_h', h)
+    return w, h
+
+
+class ClashCandidates:
+    """Broad phase shared by the legacy clash agents of one run.
+
+    Member centerlines go into one ``SpatialIndex``, padded by their section
+    box (half diagonal, plus any overhang of a box built from a longer
+    ``length`` field), and the index is joined once: ``pairs`` holds every
+    member pair (i < j, row order) whose padded boxes come within ``reach``,
+    ``mep_pairs`` every (member, MEP run) pair within ``reach``. Each agent
+    then filters these candidates and runs its own narrow phase, so all of
+    them together cost one O(n log n) join instead of one O(n^2) scan each.
+    """
+
+    def __init__(self, members, mep_data=None, reach=0.10):
         import numpy as _np
-        u=_np.array([a1[i]-a0[i] for i in range(3)]); v=_np.array([b1[i]-b0[i] for i in range(3)])
-        w0=_np.array([a0[i]-b0[i] for i in range(3)]); a=_np.dot(u,u); b=_np.dot(u,v); c=_np.dot(v,v)
-        d=_np.dot(u,w0); e=_np.dot(v,w0); denom=a*c-b*b
-        s=0.0; t=0.0
-        if denom!=0.0: s=(b*e-c*d)/denom; t=(a*e-b*d)/denom
-        s=max(0.0,min(1.0,s)); t=max(0.0,min(1.0,t))
-        cp=_np.array(a0)+s*u; cq=_np.array(b0)+t*v
-        return float(_np.linalg.norm(cp-cq))
-    except Exception:
-        # Fallback: pure Python implementation
-        def vec_sub(v1, v2):
-            return [v1[i] - v2[i] for i in range(3)]
-        def vec_dot(v1, v2):
-            return sum(v1[i] * v2[i] for i in range(3))
-        def vec_scale(v, s):
-            return [v[i] * s for i in range(3)]
-        def vec_add(v1, v2):
-            return [v1[i] + v2[i] for i in range(3)]
-        def vec_norm(v):
-            return math.sqrt(sum(vi**2 for vi in v))
-        
-        u = vec_sub(a1, a0)
-        v = vec_sub(b1, b0)
-        w0 = vec_sub(a0, b0)
-        a = vec_dot(u, u)
-        b_dot = vec_dot(u, v)
-        c = vec_dot(v, v)
-        d = vec_dot(u, w0)
-        e = vec_dot(v, w0)
-        denom = a * c - b_dot * b_dot
-        
-        s = 0.0; t = 0.0
-        if denom != 0.0:
-            s = (b_dot * e - c * d) / denom
-            t = (a * e - b_dot * d) / denom
-        s = max(0.0, min(1.0, s))
-        t = max(0.0, min(1.0, t))
-        
-        cp = vec_add(a0, vec_scale(u, s))
-        cq = vec_add(b0, vec_scale(v, t))
-        return float(vec_norm(vec_sub(cp, cq)))
-
-
-def clasher_agent(full_json,tol=0.02):
-    clashes=[]; mems=full_json['members']; n=len(mems)
-    for i in range(n):
-        for j in range(i+1,n):
-            a=mems[i]; b=mems[j]
-            if a['start']==b['start'] or a['end']==b['end'] or a['start']==b['end'] or a['end']==b['start']: continue
-            d=_segment_segment_distance(a['start'],a['end'],b['start'],b['end'])
-            if d<tol: clashes.append({'a':a['id'],'b':b['id'],'dist_m':d})
+        from .support.spatial_index import SpatialIndex
+        self.members = members
+        self.ids = [m.get('id') for m in members]
+        self.id_codes = _id_codes(self.ids)
+        self.starts, self.ends = member_endpoints(members)
+        self.frames = segment_frames(self.starts, self.ends)
+        dims = _np.array([_section_box_dims(m) for m in members], dtype=float).reshape(-1, 2)
+        self.box_dims = dims
+        self.radii = 0.5 * _np.hypot(dims[:, 0], dims[:, 1])
+        box_length = _np.array([m.get('length') or 0.0 for m in members], dtype=float)
+        overhang = _np.maximum(_np.nan_to_num(box_length) - self.frames['length'], 0.0) / 2.0
+        self.reach = float(reach)
+        self.index = SpatialIndex.from_segments(self.starts, self.ends, radii=self.radii + overhang)
+        self.pairs = self.index.pairs_within(self.reach)
+        self.mep_data = mep_data or []
+        self.mep_pairs = self._mep_pairs(self.mep_data, self.reach)
+
+    def _mep_pairs(self, mep_data, reach):
+        import numpy as _np
+        if not len(mep_data):
+            return _np.empty((0, 2), dtype=int)
+        mep_starts, mep_ends = member_endpoints(mep_data)
+        found = self.index.overlapping(_np.minimum(mep_starts, mep_ends), _np.maximum(mep_starts, mep_ends), reach)
+        # member-major, MEP runs in input order
+        return found[_np.lexsort((found[:, 0], found[:, 1]))][:, ::-1]
+
+    def member_pairs(self, reach):
+        """(i, j) candidate index arrays for a narrow phase that needs at most ``reach``."""
+        pairs = self.pairs if reach <= self.reach else self.index.pairs_within(reach)
+        return pairs[:, 0], pairs[:, 1]
+
+    def member_mep_pairs(self, mep_data, reach):
+        """(member row, MEP row) candidate arrays for ``mep_data`` within ``reach``."""
+        pairs = self.mep_pairs
+        if mep_data is not self.mep_data or reach > self.reach:
+            pairs = self._mep_pairs(mep_data, reach)
+        return pairs[:, 0], pairs[:, 1]
+
+
+def _clash_candidates(full_json, candidates=None, mep_data=None):
+    """``candidates`` if it was built for this run's members, else a fresh ``ClashCandidates``."""
+    mems = full_json.get('members', [])
+    if candidates is not None and candidates.members is mems:
+        return candidates
+    return ClashCandidates(mems, mep_data=mep_data)
+
+
+def clasher_agent(full_json,tol=0.02,candidates=None):
+    clashes=[]; mems=full_json['members']
+    cand = _clash_candidates(full_json, candidates)
+    starts, ends = cand.starts, cand.ends
+    i, j = cand.member_pairs(tol)
+    d, _, _ = segment_distances(starts[i], ends[i], starts[j], ends[j])
+    hit = (d < tol) & ~_shares_node(starts, ends, i, j)
+    for a, b, dist in zip(i[hit].tolist(), j[hit].tolist(), d[hit].tolist()):
+        clashes.append({'a':mems[a]['id'],'b':mems[b]['id'],'dist_m':dist})
     return {'clashes':clashes}
 
 
-def mesh_clasher_agent(full_json, tol=0.0):
-    """Coarse mesh/solid clash approximation:
+def mesh_clasher_agent(full_json, tol=0.0, candidates=None):
+    """Mesh/solid clash detection via ``precise_mesh_clasher``.
+
+    The coarse approximation below only runs when the precise detector
+    raises - in practice when trimesh and python-fcl import but meshing or
+    the ``CollisionManager`` query fails (e.g. an incompatible fcl build):
     - Stage 1: AABB overlap check using member length and section outer dims
     - Stage 2: precise centerline segment-segment distance compared to bounding radii
     Returns: {'clashes': [...]}
     """
-    # Try higher-fidelity precise clashing if available, otherwise run coarse method
     try:
-        res = precise_mesh_clasher(full_json, tol=tol)
-        # return early if precise detector runs (may return empty clashes)
-        return res
+        # may return empty clashes; the SAT path itself does not raise
+        return precise_mesh_clasher(full_json, tol=tol, candidates=candidates)
     except Exception:
-        # precise clasher not available or failed; fall back to coarse method
+        # fcl/trimesh failed inside the precise clasher; fall back to coarse method
         clashes = []
-    mems = full_json['members']
-    # helper to get outer half-diagonal (approx bounding radius) from selection/section
-    def bounding_radius(m):
-        sel = m.get('selection', {})
-        name = sel.get('section_name')
-        # fallback dims
-        w = 0.05; h = 0.05
-        if name and name in SECTION_GEOM:
-            g = SECTION_GEOM[name]
-            if g.get('type') in ('I','Rect','HollowRect'):
-                if g.get('type') == 'I':
-                    w = g.get('width', w); h = g.get('depth', h)
-                elif g.get('type') == 'Rect':
-                    w = g.get('width', w); h = g.get('depth', h)
-                elif g.get('type') == 'HollowRect':
-                    w = g.get('outer_w', w); h = g.get('outer_h', h)
-        # radius ~ half diagonal
-        return 0.5 * math.hypot(w, h)
-
-    def aabb_for_member(m):
-        x_coords = [m['start'][0], m['end'][0]]
-        y_coords = [m['start'][1], m['end'][1]]
-        z_coords = [m['start'][2], m['end'][2]]
-        r = bounding_radius(m)
-        return (min(x_coords)-r, min(y_coords)-r, min(z_coords)-r), (max(x_coords)+r, max(y_coords)+r, max(z_coords)+r), r
-
-    n = len(mems)
-    for i in range(n):
-        for j in range(i+1, n):
-            a = mems[i]; b = mems[j]
-            if a['id'] == b['id']: continue
-            # quick skip for shared nodes
-            if a['start'] == b['start'] or a['end'] == b['end'] or a['start'] == b['end'] or a['end'] == b['start']:
-                continue
-            a_min, a_max, ra = aabb_for_member(a)
-            b_min, b_max, rb = aabb_for_member(b)
-            # check AABB overlap
-            overlap = not (a_max[0] < b_min[0] or a_min[0] > b_max[0] or a_max[1] < b_min[1] or a_min[1] > b_max[1] or a_max[2] < b_min[2] or a_min[2] > b_max[2])
-            if not overlap:
-                continue
-            # refined check: segment-segment distance
-            d = _segment_segment_distance(a['start'], a['end'], b['start'], b['end'])
-            # compare against sum of bounding radii (plus tolerance)
-            if d <= (ra + rb + tol):
-                clashes.append({'a': a['id'], 'b': b['id'], 'dist_m': d, 'radius_sum': (ra + rb)})
+    import numpy as _np
+    cand = _clash_candidates(full_json, candidates)
+    starts, ends, radii, ids = cand.starts, cand.ends, cand.radii, cand.ids
+    lo = _np.minimum(starts, ends) - radii[:, None]
+    hi = _np.maximum(starts, ends) + radii[:, None]
+
+    # candidates whose padded boxes touch; skip same-id pairs and shared nodes, then AABB overlap
+    i, j = cand.member_pairs(tol)
+    keep = cand.id_codes[i] != cand.id_codes[j]
+    keep &= ~_shares_node(starts, ends, i, j)
+    keep &= (hi[i] >= lo[j]).all(axis=1) & (hi[j] >= lo[i]).all(axis=1)
+    i, j = i[keep], j[keep]
+    # refined check: segment-segment distance against the sum of bounding radii (plus tolerance)
+    d, _, _ = segment_distances(starts[i], ends[i], starts[j], ends[j])
+    radius_sum = radii[i] + radii[j]
+    hit = d <= radius_sum + tol
+    for a, b, dist, rs in zip(i[hit].tolist(), j[hit].tolist(), d[hit].tolist(), radius_sum[hit].tolist()):
+        clashes.append({'a': ids[a], 'b': ids[b], 'dist_m': dist, 'radius_sum': rs})
     return {'clashes': clashes}
 
 
-def precise_mesh_clasher(full_json, tol=0.0):
-    """Attempt a higher-fidelity clash detection using `trimesh`.
-    Builds simple swept boxes for members using `SECTION_GEOM` dims and tests pairwise collisions.
-    Falls back or raises if trimesh isn't available.
+def precise_mesh_clasher(full_json, tol=0.0, candidates=None):
+    """Higher-fidelity clash detection on swept section boxes.
+
+    Each candidate member becomes an oriented box: its length along the
+    member axis, section depth along local Y and width along local Z (dims
+    from ``SECTION_GEOM``). Members sharing a node are skipped, as in the
+    coarse path. With trimesh and python-fcl the boxes are meshed and tested
+    by a ``CollisionManager``; without them the separating-axis test
+    (``obb_overlaps``) decides, for all candidate pairs in one batch, with
+    boxes up to ``tol`` apart counted as clashing. Each clash carries the
+    centerline distance and the SAT penetration depth and axis.
     """
+    import numpy as _np
+    mems = full_json.get('members', [])
+    cand = _clash_candidates(full_json, candidates)
+    starts, ends, ids = cand.starts, cand.ends, cand.ids
+    i, j = cand.member_pairs(tol)
+    keep = (cand.id_codes[i] != cand.id_codes[j]) & ~_shares_node(starts, ends, i, j)
+    i, j = i[keep], j[keep]
+
+    # box length from the member's 'length' field when given (as the meshes always did)
+    box_length = _np.array([m.get('length') or 0.0 for m in mems], dtype=float).reshape(-1)
+    box_length = _np.where(box_length > 0, box_length, cand.frames['length'])
+    centres, axes, half = segment_obbs(starts, ends, cand.box_dims[:, 1] / 2.0, cand.box_dims[:, 0] / 2.0)
+    half[:, 0] = _np.maximum(box_length, 1e-6) / 2.0
+    depth, axis = obb_overlaps(centres[i], axes[i], half[i], centres[j], axes[j], half[j])
+    d, _, _ = segment_distances(starts[i], ends[i], starts[j], ends[j])
+    hit = depth >= -tol
+
     try:
         import trimesh
-        import numpy as _np
-    except Exception as e:
-        raise RuntimeError('trimesh not available') from e
+        mgr = trimesh.collision.CollisionManager()  # raises without python-fcl
+    except Exception:
+        mgr = None
+    if mgr is not None:
+        for k in _np.unique(_np.concatenate([i, j])).tolist():
+            transform = _np.eye(4)
+            transform[:3, :3] = axes[k].T
+            transform[:3, 3] = centres[k]
+            mgr.add_object(str(k), trimesh.creation.box(extents=2.0 * half[k], transform=transform))
+        colliding = {frozenset((int(a), int(b))) for a, b in mgr.in_collision_internal(return_names=True)[1]}
+        hit = _np.array([frozenset((a, b)) in colliding for a, b in zip(i.tolist(), j.tolist())], dtype=bool)
 
-    mems = full_json.get('members', [])
-    meshes = []
-    ids = []
-    for m in mems:
-        start = m['start']; end = m['end']
-        axis = tuple(unit_vector(start, end))
-        L = max(1e-6, m.get('length') or length(start, end))
-        sel = m.get('selection', {})
-        name = sel.get('section_name') if sel else None
-        # fallback dims
-        w = 0.05; h = 0.05
-        if name and name in SECTION_GEOM:
-            g = SECTION_GEOM[name]
-            if g.get('type') == 'I':
-                w = g.get('width', w); h = g.get('depth', h)
-            elif g.get('type') == 'Rect':
-                w = g.get('width', w); h = g.get('depth', h)
-            elif g.get('type') == 'HollowRect':
-                w = g.get('outer_w', w); h = g.get('outer_h', h)
-
-        # create a box with length along X axis, centered at origin
-        extents = (_np.abs(L), _np.abs(w), _np.abs(h))
-        box = trimesh.creation.box(extents=extents)
-
-        # align box X-axis to member axis
-        x_axis = _np.array([1.0, 0.0, 0.0])
-        tgt = _np.array(axis)
-        # if axis is degenerate, skip
-        if _np.linalg.norm(tgt) == 0:
-            rot = _np.eye(3)
-        else:
-            try:
-                rot = trimesh.geometry.align_vectors(x_axis, tgt)
-            except Exception:
-                # fallback: compute rotation via simple method
-                rot = _np.eye(3)
-
-        # build homogeneous transform
-        transform = _np.eye(4)
-        transform[:3, :3] = rot
-        mid = _np.array([(start[0] + end[0]) / 2.0, (start[1] + end[1]) / 2.0, (start[2] + end[2]) / 2.0])
-        transform[:3, 3] = mid
-        box.apply_transform(transform)
-        meshes.append(box)
-        ids.append(m['id'])
-
-    # broad-phase AABB check then precise collision using trimesh.collision
     clashes = []
-    try:
-        mgr = trimesh.collision.CollisionManager()
-        for i, mesh in enumerate(meshes):
-            mgr.add_object(ids[i], mesh)
-        pairs = mgr.in_collision_internal()
-        # pairs is list of tuple pairs (name1, name2)
-        for a,b in pairs:
-            # compute approximate distance by centerline segment distance for reporting
-            ma = next((m for m in mems if m['id']==a), None)
-            mb = next((m for m in mems if m['id']==b), None)
-            if ma and mb:
-                d = _segment_segment_distance(ma['start'], ma['end'], mb['start'], mb['end'])
-            else:
-                d = 0.0
-            clashes.append({'a': a, 'b': b, 'dist_m': float(d)})
-        return {'clashes': clashes}
-    except Exception:
-        # if CollisionManager or in_collision_internal isn't available, fallback to pairwise intersection sampling
-        clashes = []
-        for i in range(len(meshes)):
-            for j in range(i+1, len(meshes)):
-                a = meshes[i]; b = meshes[j]
-                if not trimesh.bounds_overlap(a.bounds, b.bounds):
-                    continue
-                try:
-                    inter = a.intersects(b)
-                    if inter:
-                        ma = mems[i]; mb = mems[j]
-                        d = _segment_segment_distance(ma['start'], ma['end'], mb['start'], mb['end'])
-                        clashes.append({'a': mems[i]['id'], 'b': mems[j]['id'], 'dist_m': float(d)})
-                except Exception:
-                    # final fallback: use centerline distance test
-                    ma = mems[i]; mb = mems[j]
-                    d = _segment_segment_distance(ma['start'], ma['end'], mb['start'], mb['end'])
-                    ra = 0.5*math.hypot(extents[1], extents[2])
-                    rb = ra
-                    if d <= (ra + rb + tol):
-                        clashes.append({'a': mems[i]['id'], 'b': mems[j]['id'], 'dist_m': float(d)})
-        return {'clashes': clashes}
+    for a, b, dist, dep, ax in zip(i[hit].tolist(), j[hit].tolist(), d[hit].tolist(),
+                                   depth[hit].tolist(), axis[hit].tolist()):
+        clashes.append({'a': ids[a], 'b': ids[b], 'dist_m': dist, 'depth_m': dep, 'axis': ax})
+    return {'clashes': clashes}
 
 
 def risk_detector(full_json):
@@ -2508,22 +2571,20 @@ def dstv_exporter(full_json, out_dir=None):
     return {'index': index_path, 'parts_dir': out_dir, 'rows': index_rows}
 
 
-def soft_clash_detector(full_json, min_clearance_mm=50.0):
+def soft_clash_detector(full_json, min_clearance_mm=50.0, candidates=None):
     """Detect soft clashes: insufficient clearance between members or with ground.
     Returns: {'soft_clashes': [{'a': id, 'b': id, 'clearance_mm': val, 'required_mm': min_clearance_mm}]}
     """
     soft_clashes = []
     mems = full_json.get('members', [])
-    n = len(mems)
-    for i in range(n):
-        for j in range(i+1, n):
-            a = mems[i]; b = mems[j]
-            if a['id'] == b['id']:
-                continue
-            d = _segment_segment_distance(a['start'], a['end'], b['start'], b['end'])
-            d_mm = d * 1000.0
-            if 0 < d_mm < min_clearance_mm:
-                soft_clashes.append({'a': a['id'], 'b': b['id'], 'clearance_mm': d_mm, 'required_mm': min_clearance_mm})
+    cand = _clash_candidates(full_json, candidates)
+    starts, ends, ids = cand.starts, cand.ends, cand.ids
+    i, j = cand.member_pairs(min_clearance_mm / 1000.0)
+    d, _, _ = segment_distances(starts[i], ends[i], starts[j], ends[j])
+    d_mm = d * 1000.0
+    hit = (0 < d_mm) & (d_mm < min_clearance_mm) & (cand.id_codes[i] != cand.id_codes[j])
+    for a, b, c in zip(i[hit].tolist(), j[hit].tolist(), d_mm[hit].tolist()):
+        soft_clashes.append({'a': ids[a], 'b': ids[b], 'clearance_mm': c, 'required_mm': min_clearance_mm})
     for m in mems:
         min_z = min(m['start'][2], m['end'][2])
         if min_z < 0.5:
@@ -2531,15 +2592,15 @@ def soft_clash_detector(full_json, min_clearance_mm=50.0):
     return {'soft_clashes': soft_clashes}
 
 
-def functional_clash_detector(full_json):
+def functional_clash_detector(full_json, candidates=None):
     """Detect functional clashes: misalignments, hole mismatches, wrong part orientation.
     Returns: {'functional_clashes': [{'member_id': id, 'issue': desc, 'severity': 'low'|'medium'|'high'}]}
     """
     functional_clashes = []
     mems = full_json.get('members', [])
-    for m in mems:
-        v = unit_vector(m['start'], m['end'])
-        angle = vec_angle_deg(v)
+    # member inclinations from the run's shared geometry (angle above the XY plane)
+    angles = _clash_candidates(full_json, candidates).frames['inclination_deg'].tolist()
+    for m, angle in zip(mems, angles):
         if m.get('type') == 'column' and angle < 30:
             functional_clashes.append({'member_id': m['id'], 'issue': 'column_orientation_suspect', 'angle_deg': angle, 'severity': 'medium'})
         if m.get('type') == 'beam' and angle > 45:
@@ -2552,7 +2613,7 @@ def functional_clash_detector(full_json):
     return {'functional_clashes': functional_clashes}
 
 
-def mep_clash_detector(full_json, mep_data=None):
+def mep_clash_detector(full_json, mep_data=None, candidates=None):
     """Detect multi-discipline clashes: steel vs MEP (duct, pipe, cable, HVAC).
     mep_data: optional list of MEP objects {'type': 'duct'|'pipe'|'cable', 'start': [...], 'end': [...], 'size': val}
     Returns: {'mep_clashes': [{'member_id': id, 'mep_type': type, 'clash_distance': val}]}
@@ -2561,12 +2622,15 @@ def mep_clash_detector(full_json, mep_data=None):
     if mep_data is None or len(mep_data) == 0:
         return {'mep_clashes': mep_clashes}
     mems = full_json.get('members', [])
-    for m in mems:
-        for mep in mep_data:
-            d = _segment_segment_distance(m['start'], m['end'], mep.get('start'), mep.get('end'))
-            min_clear = 0.10
-            if d < min_clear:
-                mep_clashes.append({'member_id': m['id'], 'mep_type': mep.get('type', 'unknown'), 'clash_distance_m': d, 'required_clearance_m': min_clear, 'severity': 'high' if d == 0 else 'medium'})
+    min_clear = 0.10
+    cand = _clash_candidates(full_json, candidates, mep_data=mep_data)
+    mep_starts, mep_ends = member_endpoints(mep_data)
+    k, q = cand.member_mep_pairs(mep_data, min_clear)
+    d, _, _ = segment_distances(cand.starts[k], cand.ends[k], mep_starts[q], mep_ends[q])
+    hit = d < min_clear
+    for a, b, dist in zip(k[hit].tolist(), q[hit].tolist(), d[hit].tolist()):
+        mep = mep_data[b]
+        mep_clashes.append({'member_id': mems[a]['id'], 'mep_type': mep.get('type', 'unknown'), 'clash_distance_m': float(dist), 'required_clearance_m': min_clear, 'severity': 'high' if dist == 0 else 'medium'})
     return {'mep_clashes': mep_clashes}
 
 
@@ -2760,29 +2824,20 @@ class ParallelProcessor:
         return results
 
 class SpatialIndex:
-    """Simple spatial indexing for fast clash queries"""
+    """Member proximity queries on the shared ``support.spatial_index.SpatialIndex``"""
     def __init__(self, members, grid_size=10.0):
+        from .support.spatial_index import SpatialIndex as _SharedIndex
         self.grid_size = grid_size
-        self.grid = defaultdict(list)
-        for m in members:
-            key = self._grid_key(m)
-            self.grid[key].append(m)
-    
-    def _grid_key(self, member):
-        """Map member to grid cell"""
-        mid = [(member['start'][i] + member['end'][i]) / 2 for i in range(3)]
-        return tuple(int(mid[i] / self.grid_size) for i in range(3))
-    
+        self.members = list(members)
+        starts, ends = member_endpoints(self.members)
+        self.index = _SharedIndex.from_segments(starts, ends)
+
     def nearby_members(self, member, radius=1):
-        """Get members near given member"""
-        key = self._grid_key(member)
-        nearby = []
-        for di in [-radius, 0, radius]:
-            for dj in [-radius, 0, radius]:
-                for dk in [-radius, 0, radius]:
-                    new_key = (key[0] + di, key[1] + dj, key[2] + dk)
-                    nearby.extend(self.grid.get(new_key, []))
-        return nearby
+        """Members whose bounding box is within ``radius`` grid cells of the member's box"""
+        reach = radius * self.grid_size
+        lo = [min(member['start'][i], member['end'][i]) - reach for i in range(3)]
+        hi = [max(member['start'][i], member['end'][i]) + reach for i in range(3)]
+        return [self.members[i] for i in self.index.query_box(lo, hi).tolist()]
 
 class ResultCache:
     """Memoization cache for repeated calculations"""
@@ -2958,16 +3013,21 @@ class Pipeline:
                 a = extract_from_dxf(dxf_entities)
         else:
             a = extract_from_dxf(dxf_entities)
-        b=engineer_standardize(a); c=load_path_resolver(b); d=stability_agent(c)
+        # members become a column store once; the standardize, load, stability
+        # and optimizer stages share it, later stages see dict-compatible rows
+        b=engineer_standardize({**a, 'members': as_member_table(a['members'])})
+        c=load_path_resolver(b); d=stability_agent(c)
         e=optimizer_agent(d); f=connection_designer(e); g=fabrication_detailing(f); h=fabrication_standards(g)
         i=erection_planner(h); j=safety_compliance(i); k=analysis_model_generator(j)
         l=builder_ifc(h,out_path=os.path.join(out_dir or 'outputs','model.ifc'))
         v = validator_agent(h)
-        clash = clasher_agent(h)
-        mesh_clash = mesh_clasher_agent(h)
-        soft_clash = soft_clash_detector(h)
-        func_clash = functional_clash_detector(h)
-        mep_clash = mep_clash_detector(h)
+        # one broad phase for all clash agents of the run
+        candidates = ClashCandidates(h['members'])
+        clash = clasher_agent(h, candidates=candidates)
+        mesh_clash = mesh_clasher_agent(h, candidates=candidates)
+        soft_clash = soft_clash_detector(h, candidates=candidates)
+        func_clash = functional_clash_detector(h, candidates=candidates)
+        mep_clash = mep_clash_detector(h, candidates=candidates)
         # prefer mesh-based clashes for final reporting
         h['clash_list'] = mesh_clash['clashes'] if mesh_clash['clashes'] else clash['clashes']
         r = risk_detector({**h, 'clash_list': h['clash_list']})
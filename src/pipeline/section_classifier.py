@@ -23,3 +23,73 @@ def classify_section(member: Dict[str,Any]) -> Optional[Dict[str,Any]]:
     else:
         logger.debug("No profile mapping for member %s", member.get("id"))
     return prof
+
+
+def _section_key(member) -> tuple:
+    prof = member.get("profile")
+    return (member.get("section"), prof, member.get("tag"), member.get("layer"), member.get("annotation"))
+
+
+def classify_sections(members):
+    """Classify every member and fill ``profile``/``geom``/``area``/``Zx`` where missing.
+
+    ``profile_mapper`` runs once per distinct (section, profile, tag, layer,
+    annotation) combination. ``members`` may be a list of dicts or a
+    ``MemberTable``; a table stores the profile as a category code shared by
+    all rows with the same section. Returns ``members``.
+    """
+    from .member_table import MemberTable
+    if not isinstance(members, MemberTable):
+        cache: Dict[tuple, Optional[Dict[str,Any]]] = {}
+        for m in members:
+            if isinstance(m.get("profile"), dict):
+                prof = m["profile"]
+            else:
+                key = _section_key(m)
+                try:
+                    prof = cache[key] if key in cache else cache.setdefault(key, classify_section(m))
+                except TypeError:  # unhashable annotation/profile values
+                    prof = classify_section(m)
+            if prof:
+                m.setdefault('profile', prof)
+                m.setdefault('geom', prof)
+                m.setdefault('area', prof.get('area'))
+                m.setdefault('Zx', prof.get('Zx'))
+        return members
+
+    import numpy as np
+    table = members
+    if 'geom' not in table.codes:
+        table.add_coded_column('geom')
+    for name in ('area', 'Zx'):
+        if name not in table.floats:
+            table.add_float_column(name)
+    profiles = table.categories['profile'].values
+    profile_codes = table.codes['profile'].tolist()
+    layers = table.decoded('layer')
+    groups: Dict[tuple, list] = {}
+    for i, code in enumerate(profile_codes):
+        if code >= 0 and isinstance(profiles[code], dict):
+            key = (code,)
+        else:
+            extras = table.extras[i]
+            key = (extras.get("section"), profiles[code] if code >= 0 else None, extras.get("tag"),
+                   layers[i], extras.get("annotation"))
+        try:
+            groups.setdefault(key, []).append(i)
+        except TypeError:
+            groups.setdefault(('row', i, None), []).append(i)
+    for key, rows in groups.items():
+        prof = profiles[key[0]] if len(key) == 1 else classify_section(table[rows[0]])
+        if not prof:
+            continue
+        rows = np.asarray(rows)
+        for column in ('profile', 'geom'):
+            codes = table.codes[column]
+            codes[rows[codes[rows] < 0]] = table.categories[column].encode(prof)
+        for column in ('area', 'Zx'):
+            if prof.get(column) is not None:
+                values = table.floats[column]
+                values[rows[np.isnan(values[rows])]] = prof[column]
+    logger.debug("Classified %d members from %d distinct section keys", len(table), len(groups))
+    return table
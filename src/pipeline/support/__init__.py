@@ -11,8 +11,10 @@ from . import spatial_index
 from . import profiler
 from . import anomaly_detector
 from . import connection_optimizer
+from . import layer_filter
 
 __all__ = [
     'error_handlers', 'fallback', 'parallel_processor', 'cache', 'connection_classifier', 'load_predictor',
-    'validators', 'warnings', 'spatial_index', 'profiler', 'anomaly_detector', 'connection_optimizer'
+    'validators', 'warnings', 'spatial_index', 'profiler', 'anomaly_detector', 'connection_optimizer',
+    'layer_filter'
 ]
@@ -1,5 +1,12 @@
-"""Very small in-memory cache helper (dict wrapper)."""
-from typing import Any, Optional
+"""Cache helpers: a very small in-memory dict wrapper and a persistent,
+size-bounded file cache used for expensive file conversions."""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional, Tuple
 
 
 class SimpleCache:
@@ -16,4 +23,112 @@ class SimpleCache:
         self._d.clear()
 
 
-__all__ = ['SimpleCache']
+def file_digest(path: str, salt: str = '', chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes (plus an optional salt such as a tool version)."""
+    h = hashlib.sha256(salt.encode('utf-8'))
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class FileLRUCache:
+    """Persistent content-addressed cache of files with JSON metadata.
+
+    Each entry is stored as ``<key><suffix>`` plus ``<key>.json`` in
+    ``cache_dir``. Recency is tracked through the metadata file's mtime so the
+    LRU order survives restarts; once the stored payloads exceed ``max_bytes``
+    the least recently used entries are evicted. ``hits``/``misses``/``evictions``
+    count activity for this instance.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3, suffix: str = ''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return base + self.suffix, base + '.json'
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return (payload_path, metadata) for a cached key, or None."""
+        payload, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+            if not os.path.isfile(payload):
+                raise FileNotFoundError(payload)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        now = time.time()
+        try:
+            os.utime(meta_path, (now, now))
+        except OSError:
+            pass
+        self.hits += 1
+        return payload, meta
+
+    def put(self, key: str, src_path: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Copy ``src_path`` into the cache under ``key`` and evict if over budget."""
+        payload, meta_path = self._paths(key)
+        # Write to temp files first so concurrent readers never see partial entries
+        fd, tmp_payload = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(src_path, tmp_payload)
+        os.replace(tmp_payload, payload)
+        meta = dict(metadata or {})
+        meta['size'] = os.path.getsize(payload)
+        fd, tmp_meta = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh)
+        os.replace(tmp_meta, meta_path)
+        self.evict()
+        return payload
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-5]
+            payload, meta_path = self._paths(key)
+            try:
+                size = os.path.getsize(payload)
+                used = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((used, key, size))
+            total += size
+        removed = 0
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        self.evictions += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+__all__ = ['SimpleCache', 'FileLRUCache', 'file_digest']
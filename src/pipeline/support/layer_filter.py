@@ -0,0 +1,108 @@
+"""Layer include/exclude filters applied while DXF entities are read.
+
+A filter is built from glob patterns (matched case-insensitively against the
+layer name) and/or a named profile describing the layer conventions of a
+common source. A layer is kept when it matches an include pattern (or there
+are no include patterns) and no exclude pattern; excludes always win.
+"""
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Annotation/drafting layers that never carry structural geometry
+_DRAFTING_LAYERS = [
+    '*ANNO*', '*DIM*', '*TEXT*', '*NOTE*', '*HATCH*', '*TITLE*', '*BORDER*',
+    '*SYMB*', '*LEADER*', '*REVCLOUD*', '*VIEWPORT*', 'DEFPOINTS',
+]
+
+LAYER_PROFILES: Dict[str, Dict[str, List[str]]] = {
+    # US structural drawings: NCS/AIA "S-" discipline layers and the member
+    # names used by AISC-style steel detailing
+    'aisc-structural': {
+        'include': [
+            'S-*', '*BEAM*', '*COL*', '*BRAC*', '*GIRD*', '*JOIST*', '*TRUSS*',
+            '*PURLIN*', '*GIRT*', '*FRAME*', '*STEEL*', '*CONN*', '*PLATE*', '*BOLT*',
+        ],
+        'exclude': _DRAFTING_LAYERS + ['*GRID*', 'S-*-IDEN*', 'S-*-PATT*'],
+    },
+    # Tekla Structures DXF exports: layers named after part names and profiles
+    'tekla-export': {
+        'include': [
+            '*BEAM*', '*COLUMN*', '*BRAC*', '*PLATE*', '*PURLIN*', '*CONN*', '*BOLT*',
+            'HE[0-9]*', 'HE[ABM][0-9]*', 'IPE*', 'UB[0-9]*', 'UC[0-9]*', 'UPN*', 'UPE*', 'PFC*',
+            'W[0-9]*', 'HSS*', 'RHS*', 'SHS*', 'CHS*', 'PL[0-9]*', 'FL[0-9]*', 'L[0-9]*', 'C[0-9]*',
+        ],
+        'exclude': _DRAFTING_LAYERS + ['*GRID*', '*MARK*', '*WELD*'],
+    },
+    # Keep everything except drafting layers
+    'no-annotation': {
+        'include': [],
+        'exclude': list(_DRAFTING_LAYERS),
+    },
+}
+
+
+def _profile_key(name: str) -> str:
+    return '-'.join(name.strip().lower().replace('_', ' ').split())
+
+
+class LayerFilter:
+    """Callable ``layer_name -> bool`` with per-layer memoization."""
+
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                 profile: Optional[str] = None):
+        self.include = [p.upper() for p in include or []]
+        self.exclude = [p.upper() for p in exclude or []]
+        self.profile = None
+        if profile:
+            key = _profile_key(profile)
+            if key not in LAYER_PROFILES:
+                raise ValueError(f"Unknown layer profile '{profile}'. Available: {', '.join(sorted(LAYER_PROFILES))}")
+            self.profile = key
+            self.include += LAYER_PROFILES[key]['include']
+            self.exclude += LAYER_PROFILES[key]['exclude']
+        self._decisions: Dict[str, bool] = {}
+
+    def __call__(self, layer: Optional[str]) -> bool:
+        layer = layer or '0'
+        decision = self._decisions.get(layer)
+        if decision is None:
+            name = layer.upper()
+            decision = (not self.include or any(fnmatchcase(name, p) for p in self.include)) \
+                and not any(fnmatchcase(name, p) for p in self.exclude)
+            self._decisions[layer] = decision
+        return decision
+
+    def describe(self) -> Dict[str, Any]:
+        return {'profile': self.profile, 'include': list(self.include), 'exclude': list(self.exclude)}
+
+
+def make_layer_filter(spec: Any) -> Optional[LayerFilter]:
+    """Build a filter from a profile name, a dict or an existing LayerFilter.
+
+    ``spec`` may be ``None`` (no filtering), a profile name such as
+    ``"AISC structural"`` or ``"tekla-export"``, or a dict with optional
+    ``profile``, ``include`` and ``exclude`` keys (patterns may be given as a
+    list or a comma-separated string).
+    """
+    if spec is None or spec == '' or spec == {}:
+        return None
+    if isinstance(spec, LayerFilter):
+        return spec
+    if isinstance(spec, str):
+        return LayerFilter(profile=spec)
+    if isinstance(spec, dict):
+        return LayerFilter(include=_patterns(spec.get('include')), exclude=_patterns(spec.get('exclude')),
+                           profile=spec.get('profile'))
+    raise TypeError(f"Unsupported layer filter specification: {spec!r}")
+
+
+def _patterns(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [p.strip() for p in value if p and p.strip()]
+
+
+__all__ = ['LAYER_PROFILES', 'LayerFilter', 'make_layer_filter']
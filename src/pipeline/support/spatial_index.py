@@ -1,30 +1,499 @@
-"""Very small spatial index for 2D points (grid bucketing).
-Used for simple proximity queries in clash detection or spatial lookups.
+"""3D spatial index shared by the clash, joint, parser and correction code.
+
+A ``SpatialIndex`` holds axis-aligned boxes, segments (optionally swept by a
+radius; points are zero-length segments) and oriented boxes. Every item is
+stored with its bounding box in NumPy arrays; a ``geometry.segment_bvh``
+tree over those boxes answers the queries:
+
+- ``candidates(point, radius)``: items whose bounding box is within ``radius``
+- ``query_radius(point, radius)``: items within ``radius``, exact distances
+- ``nearest(point, k)``: the ``k`` closest items
+- ``query_box(lo, hi)``: items whose bounding box overlaps a box
+- ``pairs_within(distance)``: all item pairs whose bounding boxes are within
+  ``distance`` (a BVH self-join; exact for boxes and points)
+- ``overlapping(lo, hi, distance)``: the same for a batch of query boxes
+  against the index
+
+Items are bulk loaded from arrays (``from_boxes``, ``from_points``,
+``from_segments``, ``from_obbs``) or inserted and removed one at a time.
+Inserted items are kept in a small pending list that is scanned directly and
+folded into the tree once it grows, so incremental edits do not rebuild the
+tree on every call. Query results are slot numbers in ascending order; for a
+bulk-loaded index the slots are the input rows. Items with non-finite
+coordinates are never returned.
+
+``GridIndex`` keeps the old 2D point interface on top of the index.
 """
-from typing import Tuple, List, Dict
-from collections import defaultdict
+import math
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..geometry.segment_bvh import SegmentBVH, point_segment_distances
+
+BOX, SEGMENT, OBB = 0, 1, 2
+
+# Item pairs expanded per chunk when leaves are joined (bounds temporary memory)
+_PAIR_CHUNK = 1 << 20
+
+
+def _gap_sq(lo_a, hi_a, lo_b, hi_b) -> np.ndarray:
+    gap = np.maximum(np.maximum(lo_b - hi_a, lo_a - hi_b), 0.0)
+    return (gap * gap).sum(axis=1)
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Rows ``repeat(arange, counts)`` and the position ``0..counts-1`` within each row."""
+    rows = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return rows, np.arange(int(counts.sum())) - starts[rows]
+
+
+class _TreeArrays:
+    """A ``SegmentBVH`` flattened into arrays for level-by-level traversal."""
+
+    def __init__(self, tree: SegmentBVH):
+        n = len(tree.node_lo)
+        self.lo = np.asarray(tree.node_lo, dtype=float).reshape(-1, 3)
+        self.hi = np.asarray(tree.node_hi, dtype=float).reshape(-1, 3)
+        self.left = np.full(n, -1)
+        self.right = np.full(n, -1)
+        self.first = np.zeros(n, dtype=int)
+        self.count = np.zeros(n, dtype=int)
+        for k, (children, items) in enumerate(zip(tree.node_children, tree.node_items)):
+            if children is None:
+                self.first[k] = items[0]
+                self.count[k] = items[1] - items[0]
+            else:
+                self.left[k], self.right[k] = children
+        # children are always added after their parent
+        self.size = self.count.copy()
+        for k in range(n - 1, -1, -1):
+            if self.left[k] >= 0:
+                self.size[k] = self.size[self.left[k]] + self.size[self.right[k]]
+        self.order = tree.order
+        self.item_lo = tree.item_lo
+        self.item_hi = tree.item_hi
+
+
+def _join(ta: _TreeArrays, tb: _TreeArrays, distance: float, same: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Item pairs of two trees whose boxes are within ``distance`` (dual-tree traversal).
+
+    With ``same`` (a tree joined with itself) each unordered pair is reported
+    once and items never pair with themselves.
+    """
+    empty = (np.empty(0, dtype=int), np.empty(0, dtype=int))
+    if not len(ta.lo) or not len(tb.lo):
+        return empty
+    limit = distance * distance
+    a = np.zeros(1, dtype=int)
+    b = np.zeros(1, dtype=int)
+    leaf_a, leaf_b = [], []
+    while len(a):
+        eq = a == b if same else np.zeros(len(a), dtype=bool)
+        keep = eq | (_gap_sq(ta.lo[a], ta.hi[a], tb.lo[b], tb.hi[b]) <= limit)
+        a, b, eq = a[keep], b[keep], eq[keep]
+        is_leaf_a = ta.left[a] < 0
+        is_leaf_b = tb.left[b] < 0
+        both = is_leaf_a & is_leaf_b
+        leaf_a.append(a[both])
+        leaf_b.append(b[both])
+        # a node paired with itself: both children with themselves and each other
+        inner = eq & ~is_leaf_a
+        l, r = ta.left[a[inner]], ta.right[a[inner]]
+        next_a, next_b = [l, r, l], [l, r, r]
+        # otherwise split the larger inner node
+        rest = ~both & ~eq
+        ar, br = a[rest], b[rest]
+        split_a = ~is_leaf_a[rest] & (is_leaf_b[rest] | (ta.size[ar] >= tb.size[br]))
+        sa, sb = split_a, ~split_a
+        next_a += [ta.left[ar[sa]], ta.right[ar[sa]], ar[sb], ar[sb]]
+        next_b += [br[sa], br[sa], tb.left[br[sb]], tb.right[br[sb]]]
+        a, b = np.concatenate(next_a), np.concatenate(next_b)
+    la, lb = np.concatenate(leaf_a), np.concatenate(leaf_b)
+    counts = ta.count[la] * tb.count[lb]
+    out_a, out_b = [], []
+    bounds = np.cumsum(counts)
+    k0 = 0
+    while k0 < len(la):
+        base = bounds[k0 - 1] if k0 else 0
+        k1 = max(int(np.searchsorted(bounds, base + _PAIR_CHUNK, side='right')), k0 + 1)
+        rows, pos = _expand(counts[k0:k1])
+        rows = rows + k0
+        cb = tb.count[lb[rows]]
+        ia = ta.first[la[rows]] + pos // cb
+        ib = tb.first[lb[rows]] + pos % cb
+        if same:
+            keep = (la[rows] != lb[rows]) | (ia < ib)
+            ia, ib = ia[keep], ib[keep]
+        ia, ib = ta.order[ia], tb.order[ib]
+        keep = _gap_sq(ta.item_lo[ia], ta.item_hi[ia], tb.item_lo[ib], tb.item_hi[ib]) <= limit
+        out_a.append(ia[keep])
+        out_b.append(ib[keep])
+        k0 = k1
+    if not out_a:
+        return empty
+    return np.concatenate(out_a), np.concatenate(out_b)
+
+
+def _sorted_pairs(i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    order = np.lexsort((j, i))
+    return np.stack([i[order], j[order]], axis=1).reshape(-1, 2)
+
+
+def box_pairs(lo, hi, distance: float = 0.0, lo_b=None, hi_b=None, leaf_size: int = 8) -> np.ndarray:
+    """Row pairs of (n, 3) boxes whose boxes are within ``distance`` of each other.
+
+    With only ``lo``/``hi`` the result is the (i, j), i < j pairs of one set;
+    with ``lo_b``/``hi_b`` it is the (i, j) pairs between the two sets. Both
+    sets are put in BVHs that are joined level by level, so only pairs of
+    nearby subtrees are ever expanded. Pairs come back sorted
+    lexicographically as an (m, 2) int array; rows with non-finite
+    coordinates never pair.
+    """
+    distance = max(float(distance), 0.0)
+    ta = _TreeArrays(SegmentBVH(lo, hi, leaf_size=leaf_size))
+    if lo_b is None:
+        i, j = _join(ta, ta, distance, same=True)
+        return _sorted_pairs(np.minimum(i, j), np.maximum(i, j))
+    tb = _TreeArrays(SegmentBVH(lo_b, hi_b, leaf_size=leaf_size))
+    return _sorted_pairs(*_join(ta, tb, distance, same=False))
+
+
+class SpatialIndex:
+    """Incremental 3D index over boxes, (swept) segments, points and oriented boxes."""
+
+    def __init__(self, leaf_size: int = 8, capacity: int = 16):
+        self.leaf_size = leaf_size
+        self._n = 0
+        self._alloc(max(1, capacity))
+        self.ids: List[Hashable] = []
+        self._slot_of: Dict[Hashable, int] = {}
+        self._tree: Optional[SegmentBVH] = None
+        self._tree_slots = np.empty(0, dtype=int)
+        self._pending: List[int] = []
+        self._removed_since_build = 0
+        self._arrays: Optional[_TreeArrays] = None
+
+    # ------------------------------------------------------------------
+    # storage
+    # ------------------------------------------------------------------
+    def _alloc(self, capacity: int) -> None:
+        old = getattr(self, '_lo', None)
+        lo = np.full((capacity, 3), np.nan)
+        hi = np.full((capacity, 3), np.nan)
+        a = np.zeros((capacity, 3))
+        b = np.zeros((capacity, 3))
+        axes = np.zeros((capacity, 3, 3))
+        pad = np.zeros(capacity)
+        kind = np.zeros(capacity, dtype=np.int8)
+        active = np.zeros(capacity, dtype=bool)
+        if old is not None:
+            n = self._n
+            lo[:n], hi[:n], a[:n], b[:n] = self._lo[:n], self._hi[:n], self._a[:n], self._b[:n]
+            axes[:n], pad[:n], kind[:n], active[:n] = self._axes[:n], self._pad[:n], self._kind[:n], self._active[:n]
+        self._lo, self._hi, self._a, self._b = lo, hi, a, b
+        self._axes, self._pad, self._kind, self._active = axes, pad, kind, active
+
+    def _reserve(self, count: int) -> None:
+        need = self._n + count
+        if need > len(self._lo):
+            self._alloc(max(need, 2 * len(self._lo)))
+
+    def _append(self, kind: int, lo, hi, a, b, pad, axes=None, ids=None) -> np.ndarray:
+        count = len(lo)
+        if ids is None:
+            ids = range(self._n, self._n + count)
+        ids = list(ids)
+        if len(ids) != count:
+            raise ValueError(f"{len(ids)} ids for {count} items")
+        self._reserve(count)
+        s = slice(self._n, self._n + count)
+        self._lo[s], self._hi[s], self._a[s], self._b[s] = lo, hi, a, b
+        self._pad[s] = pad
+        self._kind[s] = kind
+        self._active[s] = True
+        if axes is not None:
+            self._axes[s] = axes
+        slots = np.arange(self._n, self._n + count)
+        for slot, key in zip(slots.tolist(), ids):
+            # an existing key is replaced by the new item
+            previous = self._slot_of.get(key)
+            if previous is not None:
+                self._active[previous] = False
+                self._removed_since_build += 1
+            self.ids.append(key)
+            self._slot_of[key] = slot
+        self._n += count
+        self._pending.extend(slots.tolist())
+        return slots
+
+    @staticmethod
+    def _rows(values, count: Optional[int] = None) -> np.ndarray:
+        arr = np.asarray(values, dtype=float)
+        if arr.ndim == 1 and count is not None:
+            arr = np.broadcast_to(arr, (count,) + arr.shape)
+        return arr.reshape(-1, 3)
+
+    def add_boxes(self, lo, hi, ids: Optional[Iterable[Hashable]] = None) -> np.ndarray:
+        lo = self._rows(lo)
+        hi = self._rows(hi)
+        box_lo, box_hi = np.minimum(lo, hi), np.maximum(lo, hi)
+        return self._append(BOX, box_lo, box_hi, box_lo, box_hi, 0.0, ids=ids)
+
+    def add_segments(self, starts, ends, radii=0.0, ids: Optional[Iterable[Hashable]] = None) -> np.ndarray:
+        starts = self._rows(starts)
+        ends = self._rows(ends)
+        pad = np.broadcast_to(np.asarray(radii, dtype=float), (len(starts),)).copy()
+        pad[~(pad > 0)] = 0.0
+        lo = np.minimum(starts, ends) - pad[:, None]
+        hi = np.maximum(starts, ends) + pad[:, None]
+        return self._append(SEGMENT, lo, hi, starts, ends, pad, ids=ids)
+
+    def add_points(self, points, radii=0.0, ids: Optional[Iterable[Hashable]] = None) -> np.ndarray:
+        pts = self._rows(points)
+        return self.add_segments(pts, pts, radii=radii, ids=ids)
+
+    def add_obbs(self, centres, axes, half_extents, ids: Optional[Iterable[Hashable]] = None) -> np.ndarray:
+        """Oriented boxes: ``axes[k]`` holds the three unit axes as rows, ``half_extents[k]`` their half sizes."""
+        centres = self._rows(centres)
+        axes = np.asarray(axes, dtype=float).reshape(-1, 3, 3)
+        half = np.abs(self._rows(half_extents, len(centres)))
+        reach = np.einsum('kij,ki->kj', np.abs(axes), half)
+        return self._append(OBB, centres - reach, centres + reach, centres, half, 0.0, axes=axes, ids=ids)
+
+    def insert_box(self, key: Hashable, lo, hi) -> int:
+        return int(self.add_boxes([lo], [hi], ids=[key])[0])
+
+    def insert_segment(self, key: Hashable, start, end, radius: float = 0.0) -> int:
+        return int(self.add_segments([start], [end], radii=radius, ids=[key])[0])
+
+    def insert_point(self, key: Hashable, point, radius: float = 0.0) -> int:
+        return int(self.add_points([point], radii=radius, ids=[key])[0])
+
+    def insert_obb(self, key: Hashable, centre, axes, half_extents) -> int:
+        return int(self.add_obbs([centre], [axes], [half_extents], ids=[key])[0])
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop the item stored under ``key``; False if there is none."""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        self._active[slot] = False
+        self._removed_since_build += 1
+        return True
+
+    @classmethod
+    def from_boxes(cls, lo, hi, ids=None, leaf_size: int = 8) -> 'SpatialIndex':
+        index = cls(leaf_size=leaf_size, capacity=len(np.asarray(lo).reshape(-1, 3)))
+        index.add_boxes(lo, hi, ids=ids)
+        return index
+
+    @classmethod
+    def from_segments(cls, starts, ends, radii=0.0, ids=None, leaf_size: int = 8) -> 'SpatialIndex':
+        index = cls(leaf_size=leaf_size, capacity=len(np.asarray(starts).reshape(-1, 3)))
+        index.add_segments(starts, ends, radii=radii, ids=ids)
+        return index
+
+    @classmethod
+    def from_points(cls, points, radii=0.0, ids=None, leaf_size: int = 8) -> 'SpatialIndex':
+        index = cls(leaf_size=leaf_size, capacity=len(np.asarray(points).reshape(-1, 3)))
+        index.add_points(points, radii=radii, ids=ids)
+        return index
+
+    @classmethod
+    def from_obbs(cls, centres, axes, half_extents, ids=None, leaf_size: int = 8) -> 'SpatialIndex':
+        index = cls(leaf_size=leaf_size, capacity=len(np.asarray(centres).reshape(-1, 3)))
+        index.add_obbs(centres, axes, half_extents, ids=ids)
+        return index
+
+    @classmethod
+    def from_geometry(cls, geometry, metres: bool = False, radii=0.0, leaf_size: int = 8) -> 'SpatialIndex':
+        """Segments of a ``MemberGeometry`` (``metres`` uses ``starts_m``/``ends_m``); slots are member rows."""
+        if metres:
+            return cls.from_segments(geometry.starts_m, geometry.ends_m, radii=radii, leaf_size=leaf_size)
+        return cls.from_segments(geometry.starts, geometry.ends, radii=radii, leaf_size=leaf_size)
+
+    # ------------------------------------------------------------------
+    # bookkeeping
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def slot(self, key: Hashable) -> Optional[int]:
+        return self._slot_of.get(key)
+
+    def ids_of(self, slots: Iterable[int]) -> List[Hashable]:
+        return [self.ids[s] for s in slots]
+
+    def bounds(self, slots=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Bounding boxes (lo, hi) of ``slots`` (all slots if None; removed ones are NaN)."""
+        if slots is None:
+            slots = np.arange(self._n)
+        lo, hi = self._lo[slots].copy(), self._hi[slots].copy()
+        dead = ~self._active[slots]
+        lo[dead] = np.nan
+        hi[dead] = np.nan
+        return lo, hi
+
+    def _ensure_tree(self, force: bool = False) -> None:
+        """Rebuild the tree once enough edits have piled up (``force``: after any edit)."""
+        built = len(self._tree_slots)
+        slack = 0 if force else max(32, built // 4)
+        if self._tree is not None and len(self._pending) <= slack and self._removed_since_build <= slack:
+            return
+        slots = np.flatnonzero(self._active[:self._n])
+        self._tree_slots = slots
+        self._tree = SegmentBVH(self._lo[slots], self._hi[slots], leaf_size=self.leaf_size)
+        self._pending = []
+        self._removed_since_build = 0
+        self._arrays = None
+
+    def _tree_arrays(self) -> _TreeArrays:
+        if self._arrays is None:
+            self._arrays = _TreeArrays(self._tree)
+        return self._arrays
+
+    def _live_pending(self) -> np.ndarray:
+        if not self._pending:
+            return np.empty(0, dtype=int)
+        slots = np.asarray(self._pending, dtype=int)
+        return slots[self._active[slots]]
+
+    # ------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------
+    def candidates(self, point: Sequence[float], radius: float) -> np.ndarray:
+        """Ascending slots of items whose bounding box is within ``radius`` of ``point``."""
+        self._ensure_tree()
+        found = self._tree_slots[self._tree.candidates(point, radius)]
+        found = found[self._active[found]]
+        pending = self._live_pending()
+        if len(pending):
+            p = np.asarray(point[:3], dtype=float)
+            reach_sq = (radius * (1.0 + 1e-9) + 1e-9) ** 2
+            lo, hi = self._lo[pending], self._hi[pending]
+            gap = np.maximum(lo - p, 0.0) + np.maximum(p - hi, 0.0)
+            hit = (gap * gap).sum(axis=1) <= reach_sq
+            found = np.concatenate([found, pending[hit]])
+        return np.sort(found)
+
+    def distances(self, point: Sequence[float], slots) -> np.ndarray:
+        """Exact distances from ``point`` to the items in ``slots`` (0 inside)."""
+        slots = np.asarray(slots, dtype=int)
+        p = np.asarray(point[:3], dtype=float)
+        out = np.zeros(len(slots))
+        kind = self._kind[slots]
+        sel = kind == BOX
+        if sel.any():
+            s = slots[sel]
+            gap = np.maximum(self._lo[s] - p, 0.0) + np.maximum(p - self._hi[s], 0.0)
+            out[sel] = np.sqrt((gap * gap).sum(axis=1))
+        sel = kind == SEGMENT
+        if sel.any():
+            s = slots[sel]
+            d = point_segment_distances(p, self._a[s], self._b[s]) - self._pad[s]
+            out[sel] = np.maximum(d, 0.0)
+        sel = kind == OBB
+        if sel.any():
+            s = slots[sel]
+            local = np.einsum('kij,kj->ki', self._axes[s], p - self._a[s])
+            excess = np.maximum(np.abs(local) - self._b[s], 0.0)
+            out[sel] = np.sqrt((excess * excess).sum(axis=1))
+        return out
+
+    def query_radius(self, point: Sequence[float], radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots, distances) of items within ``radius`` of ``point``, in slot order."""
+        slots = self.candidates(point, radius)
+        if not len(slots):
+            return slots, np.empty(0)
+        d = self.distances(point, slots)
+        keep = d <= radius
+        return slots[keep], d[keep]
+
+    def nearest(self, point: Sequence[float], k: int = 1,
+                max_distance: float = math.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots, distances) of the ``k`` closest items, closest first (lower slot on ties)."""
+        live = np.flatnonzero(self._active[:self._n])
+        p = np.asarray(point[:3], dtype=float)
+        if k <= 0 or not len(live) or not np.isfinite(p).all():
+            return np.empty(0, dtype=int), np.empty(0)
+        lo, hi = self._lo[live], self._hi[live]
+        finite = np.isfinite(lo).all(axis=1) & np.isfinite(hi).all(axis=1)
+        if not finite.any():
+            return np.empty(0, dtype=int), np.empty(0)
+        glo, ghi = lo[finite].min(axis=0), hi[finite].max(axis=0)
+        # a radius reaching every item, and a first guess from the mean item size
+        reach_all = float(np.linalg.norm(np.maximum(glo - p, 0.0) + np.maximum(p - ghi, 0.0))
+                          + np.linalg.norm(ghi - glo))
+        radius = min(max(float(np.mean(hi[finite] - lo[finite])), 1e-9), reach_all)
+        while True:
+            r = min(radius, max_distance)
+            slots, d = self.query_radius(p, r)
+            if len(slots) >= k or r >= reach_all or r >= max_distance:
+                order = np.lexsort((slots, d))[:k]
+                return slots[order], d[order]
+            radius *= 4.0
+
+    def query_box(self, lo: Iterable[float], hi: Iterable[float]) -> np.ndarray:
+        """Ascending slots of items whose bounding box overlaps the box ``[lo, hi]``."""
+        self._ensure_tree()
+        qlo = np.asarray(list(lo), dtype=float)
+        qhi = np.asarray(list(hi), dtype=float)
+        found = self._tree_slots[self._tree.query_box(qlo, qhi)]
+        found = found[self._active[found]]
+        pending = self._live_pending()
+        if len(pending):
+            hit = (self._lo[pending] <= qhi).all(axis=1) & (self._hi[pending] >= qlo).all(axis=1)
+            found = np.concatenate([found, pending[hit]])
+        return np.sort(found)
+
+    def pairs_within(self, distance: float = 0.0) -> np.ndarray:
+        """(m, 2) ascending slot pairs (i < j) whose bounding boxes are within ``distance``.
+
+        Exact for boxes and points; for segments and oriented boxes this is
+        the broad phase and callers apply their own narrow-phase test.
+        """
+        self._ensure_tree(force=True)
+        if self._tree is None or not len(self._tree_slots):
+            return np.empty((0, 2), dtype=int)
+        tree = self._tree_arrays()
+        i, j = _join(tree, tree, max(float(distance), 0.0), same=True)
+        i, j = self._tree_slots[i], self._tree_slots[j]
+        return _sorted_pairs(np.minimum(i, j), np.maximum(i, j))
+
+    def overlapping(self, lo, hi, distance: float = 0.0) -> np.ndarray:
+        """(m, 2) pairs (query row, slot) of query boxes and items whose boxes are within ``distance``."""
+        self._ensure_tree(force=True)
+        if self._tree is None or not len(self._tree_slots):
+            return np.empty((0, 2), dtype=int)
+        queries = _TreeArrays(SegmentBVH(lo, hi, leaf_size=self.leaf_size))
+        i, j = _join(queries, self._tree_arrays(), max(float(distance), 0.0), same=False)
+        return _sorted_pairs(i, self._tree_slots[j])
 
 
 class GridIndex:
+    """2D point index with the original ``insert``/``query_radius`` interface.
+
+    Points are stored in a ``SpatialIndex`` at z = 0; ``query_radius`` returns
+    the ``(id, point)`` entries within ``radius``.
+    """
+
     def __init__(self, cell_size: float = 1.0):
         self.cell_size = cell_size
-        self._cells = defaultdict(list)
-
-    def _cell_key(self, pt: Tuple[float, float]) -> Tuple[int, int]:
-        return (int(pt[0] // self.cell_size), int(pt[1] // self.cell_size))
+        self._index = SpatialIndex()
+        self._items: List[Tuple[Any, Tuple[float, float]]] = []
 
     def insert(self, id: str, pt: Tuple[float, float]):
-        self._cells[self._cell_key(pt)].append((id, pt))
+        self._index.insert_point(len(self._items), (float(pt[0]), float(pt[1]), 0.0))
+        self._items.append((id, pt))
 
     def query_radius(self, pt: Tuple[float, float], radius: float) -> List[Tuple[str, Tuple[float, float]]]:
-        kx, ky = self._cell_key(pt)
-        r_cells = int(radius // self.cell_size) + 1
-        out = []
-        for dx in range(-r_cells, r_cells + 1):
-            for dy in range(-r_cells, r_cells + 1):
-                for item in self._cells.get((kx + dx, ky + dy), []):
-                    out.append(item)
-        return out
+        slots, _ = self._index.query_radius((float(pt[0]), float(pt[1]), 0.0), radius)
+        return [self._items[self._index.ids[s]] for s in slots.tolist()]
 
 
-__all__ = ['GridIndex']
+__all__ = ['SpatialIndex', 'GridIndex', 'box_pairs', 'BOX', 'SEGMENT', 'OBB']
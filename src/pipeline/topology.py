@@ -0,0 +1,171 @@
+"""Shared node/member topology for one pipeline run.
+
+Node welding (``geometry_agent.merge_nodes``) used to be repeated by the
+geometry stage, ``snap_nodes``, ``auto_generate_joints`` and the auto-repair
+engine. A ``Topology`` is built once from the members and then handed to
+every stage that needs nodes or connectivity:
+
+- ``nodes`` / ``mapping``: the ``merge_nodes`` result
+- ``member_nodes``: member id -> (start node, end node)
+- ``node_members``: node id -> ids of the members meeting there
+- ``degree``: node id -> number of member ends at the node
+- ``geometry``: lengths, directions, local axes etc. of all members
+  (``geometry.kernels.MemberGeometry``), computed on first use
+- ``segments``: a ``support.spatial_index.SpatialIndex`` over the members
+  for point/radius, nearest, box and pair queries, built on first use
+
+``get_topology`` returns the existing object as long as the member
+coordinates are unchanged and only rebuilds after they move (e.g. after the
+coordinate origin fix).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import math
+
+from .logging_setup import get_logger
+
+logger = get_logger("topology")
+
+
+def _round_key(pt) -> Tuple[int, int, int]:
+    return (int(round(pt[0])), int(round(pt[1])), int(round(pt[2])))
+
+
+def coordinate_signature(members: List[Dict[str, Any]]) -> Tuple:
+    """Member ids and endpoint coordinates, compared to detect moved geometry."""
+    return tuple(
+        (m.get('id'), tuple(m.get('start', (0, 0, 0))), tuple(m.get('end', (0, 0, 0))))
+        for m in members
+    )
+
+
+class Topology:
+    """Nodes, member->node incidence, node->member adjacency and node degree."""
+
+    def __init__(self, members: List[Dict[str, Any]], tolerance: float = 10.0):
+        from .geometry_agent import merge_nodes
+        self.tolerance = tolerance
+        self.nodes, self.mapping = merge_nodes(members, tolerance=tolerance)
+        self.incidence: List[Tuple[Optional[int], Optional[int]]] = []
+        self.member_nodes: Dict[Any, Tuple[Optional[int], Optional[int]]] = {}
+        self.node_members: Dict[Optional[int], List[Any]] = {}
+        self.degree: Dict[Optional[int], int] = {}
+        for m in members:
+            ns = self.mapping.get(_round_key(tuple(m.get('start', (0, 0, 0)))))
+            ne = self.mapping.get(_round_key(tuple(m.get('end', (0, 0, 0)))))
+            member_id = m.get('id')
+            self.incidence.append((ns, ne))
+            self.member_nodes[member_id] = (ns, ne)
+            for nid in (ns, ne):
+                self.degree[nid] = self.degree.get(nid, 0) + 1
+                attached = self.node_members.setdefault(nid, [])
+                if member_id not in attached:
+                    attached.append(member_id)
+        self.signature = coordinate_signature(members)
+        self._bind(members)
+        self._grids: Dict[float, Dict[Tuple[int, int, int], List[int]]] = {}  # cell size -> node buckets
+        self._geometry = None
+        self._segments = None
+        logger.info("Built topology: %d members, %d nodes (tolerance=%s mm)",
+                    len(members), len(self.nodes), tolerance)
+
+    def _bind(self, members: List[Dict[str, Any]]) -> None:
+        self.members = members
+        self.members_by_id = {}
+        for m in members:
+            self.members_by_id.setdefault(m.get('id'), m)
+
+    @property
+    def geometry(self):
+        """Vectorized member geometry (``geometry.kernels.MemberGeometry``), built on first use."""
+        from .geometry.kernels import MemberGeometry
+        if self._geometry is None:
+            self._geometry = MemberGeometry(self.members)
+        elif self._geometry.members is not self.members:
+            self._geometry._bind(self.members)
+        return self._geometry
+
+    @property
+    def segments(self):
+        """Spatial index over the members (``support.spatial_index.SpatialIndex``), built on first use."""
+        from .support.spatial_index import SpatialIndex
+        if self._segments is None:
+            self._segments = SpatialIndex.from_geometry(self.geometry)
+        return self._segments
+
+    def is_current(self, members: List[Dict[str, Any]], tolerance: Optional[float] = None) -> bool:
+        """True if ``members`` still have the coordinates this topology was built from."""
+        if tolerance is not None and tolerance != self.tolerance:
+            return False
+        if len(members) != len(self.incidence):
+            return False
+        return coordinate_signature(members) == self.signature
+
+    def apply(self, members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write ``node_start``/``node_end`` onto the (current) members."""
+        for m, (ns, ne) in zip(members, self.incidence):
+            m['node_start'] = ns
+            m['node_end'] = ne
+        return members
+
+    def members_at(self, node_id: int) -> List[Any]:
+        return self.node_members.get(node_id, [])
+
+    def joints(self, min_degree: int = 3) -> List[Dict[str, Any]]:
+        """Joints at nodes where at least ``min_degree`` member ends meet."""
+        joints = []
+        for n in self.nodes:
+            node_id = n['id']
+            if self.degree.get(node_id, 0) >= min_degree:
+                joints.append({
+                    'id': f"joint_{node_id}",
+                    'position': [n['x'], n['y'], n['z']],
+                    'location': [n['x'], n['y'], n['z']],
+                    'x': n['x'],
+                    'y': n['y'],
+                    'z': n['z'],
+                    'node_id': node_id,
+                    'members': list(self.node_members.get(node_id, [])),
+                    'type': 'Bolted',
+                })
+        return joints
+
+    def nearest_node(self, point, radius: float) -> Optional[int]:
+        """Id of the closest node within ``radius`` of ``point``, or None.
+
+        Nodes are bucketed in a grid whose cell is at least ``radius`` (one
+        grid per cell size, built on first use), so a query probes 27 cells.
+        """
+        # a hair larger than the radius, so rounding never pushes a match two cells away
+        cell = max(self.tolerance, radius * (1.0 + 1e-9), 1.0)
+        grid = self._grids.get(cell)
+        if grid is None:
+            grid = self._grids[cell] = {}
+            for n in self.nodes:
+                key = (math.floor(n['x'] / cell), math.floor(n['y'] / cell), math.floor(n['z'] / cell))
+                grid.setdefault(key, []).append(n['id'])
+        cx, cy, cz = (math.floor(point[i] / cell) for i in range(3))
+        best = None
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for gz in (cz - 1, cz, cz + 1):
+                    for nid in grid.get((gx, gy, gz), ()):
+                        n = self.nodes[nid]
+                        d = math.sqrt((n['x'] - point[0]) ** 2 + (n['y'] - point[1]) ** 2 + (n['z'] - point[2]) ** 2)
+                        if d <= radius and (best is None or (d, nid) < best):
+                            best = (d, nid)
+        return best[1] if best else None
+
+
+def get_topology(members: List[Dict[str, Any]], tolerance: float = 10.0,
+                 topology: Optional[Topology] = None) -> Topology:
+    """Return ``topology`` if it still matches ``members``, otherwise build a new one."""
+    if topology is not None and topology.is_current(members, tolerance):
+        if topology.members is not members:
+            topology._bind(members)
+        return topology
+    if topology is not None:
+        logger.info("Member coordinates changed; rebuilding topology")
+    return Topology(members, tolerance=tolerance)
+
+
+__all__ = ['Topology', 'get_topology', 'coordinate_signature']
@@ -64,6 +64,117 @@ class Point3D:
         return f"Point3D({self.x:.2f}, {self.y:.2f}, {self.z:.2f})"
 
 
+_NEIGHBOURS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+
+def _proximity_pairs(point_groups: List[Tuple[Point3D, ...]], radius: float) -> List[Tuple[int, int]]:
+    """Sorted index pairs (i, j), i < j, of groups with points in neighbouring grid cells.
+
+    The grid cell is a hair larger than ``radius``, so every pair with two
+    points within ``radius`` of each other is returned; callers apply the
+    exact distance test. Points with non-finite coordinates are skipped.
+    """
+    cell = radius * (1.0 + 1e-9) if radius > 0 else 1.0
+    grid: Dict[Tuple[int, int, int], List[int]] = {}
+    for i, group in enumerate(point_groups):
+        seen = set()
+        for p in group:
+            try:
+                key = (math.floor(p.x / cell), math.floor(p.y / cell), math.floor(p.z / cell))
+            except (ValueError, OverflowError, TypeError):
+                continue
+            if key not in seen:
+                seen.add(key)
+                grid.setdefault(key, []).append(i)
+    pairs = set()
+    for (cx, cy, cz), bucket in grid.items():
+        for dx, dy, dz in _NEIGHBOURS:
+            other = grid.get((cx + dx, cy + dy, cz + dz))
+            if not other:
+                continue
+            for i in bucket:
+                for j in other:
+                    if i < j:
+                        pairs.add((i, j))
+    return sorted(pairs)
+
+
+class _UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+
+
+class _PlateJointLookup:
+    """Per-pass indexes used to match plates to joints.
+
+    Built once per ``fix_plate_positions`` call instead of rescanning the
+    relationships, plates and joints for every plate.
+    """
+
+    def __init__(self, engine: 'UniversalGeometryEngine', ifc_data: Dict):
+        relationships = ifc_data.get('relationships', {})
+        connections = relationships.get('structural_connections', []) if isinstance(relationships, dict) else []
+        # plate id → ids of the elements connected to it
+        self.plate_members: Dict[str, Set[str]] = {}
+        for conn in connections:
+            related = conn.get('related_element')
+            relating = conn.get('relating_element')
+            if relating and relating != related:  # Exclude self-references
+                self.plate_members.setdefault(related, set()).add(relating)
+        self.plates_by_id: Dict[str, Dict] = {}
+        for plate in ifc_data.get('plates', []):
+            self.plates_by_id.setdefault(plate.get('id'), plate)
+        # member id → joints containing it, and each joint's insertion order
+        self.joint_order: Dict[str, int] = {}
+        self.member_joints: Dict[str, List[str]] = {}
+        for order, (joint_id, joint_members) in enumerate(engine.joint_connections.items()):
+            self.joint_order[joint_id] = order
+            for member_id in set(joint_members):
+                self.member_joints.setdefault(member_id, []).append(joint_id)
+        self.joint_ids = list(engine.joints)
+        self._joint_index = None
+        self._engine = engine
+
+    def best_overlap_joint(self, plate_members: Set[str]) -> Tuple[Optional[str], int]:
+        """Joint sharing the most members (earliest joint on ties), and the overlap."""
+        counts: Dict[str, int] = {}
+        for member_id in plate_members:
+            for joint_id in self.member_joints.get(member_id, ()):
+                counts[joint_id] = counts.get(joint_id, 0) + 1
+        if not counts:
+            return None, 0
+        best = min(counts, key=lambda jid: (-counts[jid], self.joint_order[jid]))
+        return best, counts[best]
+
+    def closest_joint(self, point: Point3D) -> Optional[str]:
+        """Closest joint to ``point`` (first on ties), ignoring non-finite locations."""
+        if self._joint_index is None:
+            from .support.spatial_index import SpatialIndex
+            joints = self._engine.joints
+            self._joint_index = SpatialIndex.from_points([joints[j].to_tuple() for j in self.joint_ids])
+        slots, _ = self._joint_index.nearest(point.to_tuple())
+        return self.joint_ids[int(slots[0])] if len(slots) else None
+
+
 class UniversalGeometryEngine:
     """
     Universal geometry engine for structural joint detection and positioning.
@@ -90,8 +201,12 @@ class UniversalGeometryEngine:
         """
         self.tolerance_mm = tolerance_mm
         self.members = []
+        self.members_by_id = {}  # member_id → member (first occurrence wins)
         self.joints = {}  # joint_id → Point3D
         self.joint_connections = {}  # joint_id → [member_ids]
+        # Incremental state: plate_id → (joint_id, [x, y, z]) from the last pass
+        self.plate_assignments: Dict[str, Tuple[str, List[float]]] = {}
+        self.previous_joints: Dict[str, Point3D] = {}
     
     def extract_members(self, ifc_data: Dict) -> List[Dict]:
         """
@@ -137,6 +252,9 @@ class UniversalGeometryEngine:
             members.append(member)
         
         self.members = members
+        self.members_by_id = {}
+        for m in members:
+            self.members_by_id.setdefault(m['id'], m)
         logger.info(f"Extracted {len(members)} members ({len(ifc_data.get('beams', []))} beams, {len(ifc_data.get('columns', []))} columns)")
         
         return members
@@ -223,7 +341,7 @@ class UniversalGeometryEngine:
         # Get coordinates of these members
         member_coords = []
         for mid in member_ids:
-            member = next((m for m in self.members if m['id'] == mid), None)
+            member = self.members_by_id.get(mid)
             if member:
                 member_coords.append({
                     'id': mid,
@@ -284,87 +402,79 @@ class UniversalGeometryEngine:
     def _detect_joints_from_geometry_candidates(self) -> Dict[str, Point3D]:
         """
         Detect joints from member geometry by finding all intersections.
-        
+
+        Member endpoints are bucketed in a hash grid (cell = tolerance), so
+        only members with endpoints in neighbouring cells are paired. Joint
+        candidates closer than 10 mm are clustered with union-find; each
+        cluster keeps its closest-gap candidate and the union of its members.
+
         Returns:
             Dictionary of detected joints
         """
         joints = {}
-        joint_id_counter = 0
         joint_candidates = []
-        
-        # Check all pairs of members
-        for i, member1 in enumerate(self.members):
-            for j, member2 in enumerate(self.members):
-                if i >= j:
-                    continue
-                
-                # Check all 4 endpoint combinations
-                endpoints = [
-                    (member1['start'], member2['start']),
-                    (member1['start'], member2['end']),
-                    (member1['end'], member2['start']),
-                    (member1['end'], member2['end']),
-                ]
-                
-                min_distance = float('inf')
-                closest_pair = None
-                
-                for p1, p2 in endpoints:
-                    dist = p1.distance_to(p2)
-                    if dist < min_distance:
-                        min_distance = dist
-                        closest_pair = (p1, p2)
-                
-                if min_distance <= self.tolerance_mm:
-                    joint_location = Point3D(
-                        x=(closest_pair[0].x + closest_pair[1].x) / 2,
-                        y=(closest_pair[0].y + closest_pair[1].y) / 2,
-                        z=(closest_pair[0].z + closest_pair[1].z) / 2,
-                    )
-                    
-                    joint_candidates.append({
-                        'location': joint_location,
-                        'distance': min_distance,
-                        'members': [member1['id'], member2['id']],
-                    })
-        
-        # De-duplicate by clustering
-        used_candidates = set()
-        
-        for idx, candidate in enumerate(joint_candidates):
-            if idx in used_candidates:
-                continue
-            
-            cluster = [idx]
-            for other_idx in range(idx + 1, len(joint_candidates)):
-                if other_idx in used_candidates:
-                    continue
-                
-                dist = candidate['location'].distance_to(joint_candidates[other_idx]['location'])
-                if dist < 10.0:
-                    cluster.append(other_idx)
-            
+
+        # Check member pairs whose endpoints share a grid neighbourhood
+        for i, j in _proximity_pairs(
+                [(m['start'], m['end']) for m in self.members], self.tolerance_mm):
+            member1, member2 = self.members[i], self.members[j]
+            # Check all 4 endpoint combinations
+            endpoints = [
+                (member1['start'], member2['start']),
+                (member1['start'], member2['end']),
+                (member1['end'], member2['start']),
+                (member1['end'], member2['end']),
+            ]
+
+            min_distance = float('inf')
+            closest_pair = None
+
+            for p1, p2 in endpoints:
+                dist = p1.distance_to(p2)
+                if dist < min_distance:
+                    min_distance = dist
+                    closest_pair = (p1, p2)
+
+            if min_distance <= self.tolerance_mm:
+                joint_location = Point3D(
+                    x=(closest_pair[0].x + closest_pair[1].x) / 2,
+                    y=(closest_pair[0].y + closest_pair[1].y) / 2,
+                    z=(closest_pair[0].z + closest_pair[1].z) / 2,
+                )
+
+                joint_candidates.append({
+                    'location': joint_location,
+                    'distance': min_distance,
+                    'members': [member1['id'], member2['id']],
+                })
+
+        # De-duplicate by clustering candidates closer than 10 mm
+        clusters = _UnionFind(len(joint_candidates))
+        for a, b in _proximity_pairs([(c['location'],) for c in joint_candidates], 10.0):
+            if joint_candidates[a]['location'].distance_to(joint_candidates[b]['location']) < 10.0:
+                clusters.union(a, b)
+        grouped: Dict[int, List[int]] = {}
+        for idx in range(len(joint_candidates)):
+            grouped.setdefault(clusters.find(idx), []).append(idx)
+
+        # Joints are numbered in order of each cluster's first candidate
+        for joint_id_counter, cluster in enumerate(sorted(grouped.values(), key=lambda c: c[0])):
             best_idx = min(cluster, key=lambda i: joint_candidates[i]['distance'])
-            best_candidate = joint_candidates[best_idx]
-            
             joint_id = f"joint_{joint_id_counter}"
-            joints[joint_id] = best_candidate['location']
-            
-            self.joint_connections[joint_id] = list(set(best_candidate['members']))
+            joints[joint_id] = joint_candidates[best_idx]['location']
+            connected = list(joint_candidates[best_idx]['members'])
             for other_idx in cluster:
                 if other_idx != best_idx:
-                    self.joint_connections[joint_id].extend(joint_candidates[other_idx]['members'])
-            self.joint_connections[joint_id] = list(set(self.joint_connections[joint_id]))
-            
-            joint_id_counter += 1
-            used_candidates.update(cluster)
-        
+                    connected.extend(joint_candidates[other_idx]['members'])
+            self.joint_connections[joint_id] = list(dict.fromkeys(connected))
+
         self.joints = joints
         logger.info(f"Detected {len(joints)} joints from geometry ({len(joint_candidates)} candidates)")
-        
+
         return joints
-    
-    def get_joint_for_plate(self, plate_id: str, ifc_data: Dict) -> Optional[Point3D]:
+
+    def get_joint_for_plate(self, plate_id: str, ifc_data: Dict,
+                            lookup: Optional[_PlateJointLookup] = None) -> Optional[Point3D]:
         """
         Determine which joint a plate belongs to using intelligent matching.
         
@@ -378,39 +488,32 @@ class UniversalGeometryEngine:
         Args:
             plate_id: ID of the plate
             ifc_data: Full IFC data dictionary
+            lookup: Indexes built once per pass by ``fix_plate_positions``
         
         Returns:
             Point3D location or None
         """
+        joint_id = self._joint_id_for_plate(plate_id, ifc_data, lookup)
+        return self.joints[joint_id] if joint_id is not None else None
+
+    def _joint_id_for_plate(self, plate_id: str, ifc_data: Dict,
+                            lookup: Optional[_PlateJointLookup] = None) -> Optional[str]:
+        """Id of the joint ``get_joint_for_plate`` resolves ``plate_id`` to."""
         if not self.joints:
             return None
+        if lookup is None:
+            lookup = _PlateJointLookup(self, ifc_data)
         
         # STRATEGY 1: Member overlap analysis
         # Find which members this plate is connected to
         relationships = ifc_data.get('relationships', {})
-        structural_connections = relationships.get('structural_connections', [])
-        
-        plate_connected_members = set()
-        for conn in structural_connections:
-            if conn.get('related_element') == plate_id:
-                relating_elem = conn.get('relating_element')
-                if relating_elem and relating_elem != plate_id:  # Exclude self-references
-                    plate_connected_members.add(relating_elem)
-        
+        plate_connected_members = lookup.plate_members.get(plate_id)
         if plate_connected_members:
             # Find joint with maximum overlap
-            best_joint_id = None
-            best_overlap = 0
-            
-            for joint_id, joint_members in self.joint_connections.items():
-                overlap = len(plate_connected_members & set(joint_members))
-                if overlap > best_overlap:
-                    best_overlap = overlap
-                    best_joint_id = joint_id
-            
+            best_joint_id, best_overlap = lookup.best_overlap_joint(plate_connected_members)
             if best_joint_id and best_joint_id in self.joints:
                 logger.debug(f"Plate {plate_id}: mapped to {best_joint_id} by member overlap ({best_overlap})")
-                return self.joints[best_joint_id]
+                return best_joint_id
         
         # STRATEGY 2: Check relationships for explicit mapping
         if isinstance(relationships, dict):
@@ -420,46 +523,34 @@ class UniversalGeometryEngine:
                     joint_id = mapping[plate_id]
                     if joint_id in self.joints:
                         logger.debug(f"Plate {plate_id}: mapped by explicit relationship")
-                        return self.joints[joint_id]
+                        return joint_id
         
         # STRATEGY 3: Check for direct joint reference in plate
-        plates = ifc_data.get('plates', [])
-        plate_obj = next((p for p in plates if p.get('id') == plate_id), None)
+        plate_obj = lookup.plates_by_id.get(plate_id)
         if plate_obj:
             if 'connected_joint' in plate_obj:
                 joint_ref = plate_obj['connected_joint']
                 if isinstance(joint_ref, str) and joint_ref in self.joints:
                     logger.debug(f"Plate {plate_id}: has direct joint reference")
-                    return self.joints[joint_ref]
+                    return joint_ref
         
         # STRATEGY 4: Find closest joint by distance
         if plate_obj and 'placement' in plate_obj:
             plate_loc = plate_obj['placement'].get('location', [0, 0, 0])
-            plate_point = Point3D(plate_loc)
-            
-            closest_joint_id = None
-            closest_distance = float('inf')
-            
-            for joint_id, joint_point in self.joints.items():
-                dist = plate_point.distance_to(joint_point)
-                if dist < closest_distance:
-                    closest_distance = dist
-                    closest_joint_id = joint_id
-            
+            closest_joint_id = lookup.closest_joint(Point3D(plate_loc))
             if closest_joint_id:
                 logger.debug(f"Plate {plate_id}: mapped to closest joint {closest_joint_id}")
-                return self.joints[closest_joint_id]
+                return closest_joint_id
         
         # STRATEGY 5: Default to first joint (fallback)
         if self.joints:
-            first_joint = next(iter(self.joints.values()))
             logger.warning(f"Plate {plate_id}: using first joint as fallback")
-            return first_joint
+            return next(iter(self.joints))
         
         logger.warning(f"Plate {plate_id}: no joint found")
         return None
     
-    def fix_plate_positions(self, ifc_data: Dict) -> Dict:
+    def fix_plate_positions(self, ifc_data: Dict, changed_joints: Optional[Set[str]] = None) -> Dict:
         """
         Fix all plate positions from [0,0,0] to calculated joint locations.
         
@@ -471,18 +562,27 @@ class UniversalGeometryEngine:
         
         Args:
             ifc_data: Full IFC data dictionary
+            changed_joints: Incremental mode. When given, only plates that
+                were not placed by a previous pass, whose joint is in this
+                set, or that moved since they were placed are revisited.
         
         Returns:
             Updated IFC data
         """
         plates = ifc_data.get('plates', [])
         fixed_count = 0
+        revisited = 0
+        lookup = _PlateJointLookup(self, ifc_data)
         
         for plate in plates:
             plate_id = plate.get('id')
+            if changed_joints is not None and not self._plate_needs_revisit(plate, changed_joints):
+                continue
+            revisited += 1
             
             # Determine joint location
-            joint_location = self.get_joint_for_plate(plate_id, ifc_data)
+            joint_id = self._joint_id_for_plate(plate_id, ifc_data, lookup)
+            joint_location = self.joints[joint_id] if joint_id is not None else None
             
             if joint_location:
                 # Update position fields
@@ -497,15 +597,39 @@ class UniversalGeometryEngine:
                 if 'Axis2Placement3D' in plate['placement']:
                     plate['placement']['Axis2Placement3D']['location'] = joint_location.to_list()
                 
+                self.plate_assignments[plate_id] = (joint_id, joint_location.to_list())
                 fixed_count += 1
                 logger.debug(f"Plate {plate_id}: position → {joint_location}")
         
         ifc_data['plates'] = plates
-        logger.info(f"Fixed {fixed_count}/{len(plates)} plate positions")
+        if changed_joints is None:
+            logger.info(f"Fixed {fixed_count}/{len(plates)} plate positions")
+        else:
+            logger.info(f"Fixed {fixed_count}/{len(plates)} plate positions "
+                        f"(incremental: revisited {revisited}, {len(changed_joints)} joints changed)")
         
         return ifc_data
+
+    def _plate_needs_revisit(self, plate: Dict, changed_joints: Set[str]) -> bool:
+        assignment = self.plate_assignments.get(plate.get('id'))
+        if assignment is None:
+            return True
+        joint_id, location = assignment
+        if joint_id in changed_joints or joint_id not in self.joints:
+            return True
+        return plate.get('position') != location
+
+    def changed_joints(self) -> Set[str]:
+        """Joints added, removed or moved since the previous detection pass."""
+        previous, current = self.previous_joints, self.joints
+        changed = {jid for jid in previous if jid not in current}
+        for jid, point in current.items():
+            old = previous.get(jid)
+            if old is None or old.to_tuple() != point.to_tuple():
+                changed.add(jid)
+        return changed
     
-    def fix_bolt_positions(self, ifc_data: Dict) -> Dict:
+    def fix_bolt_positions(self, ifc_data: Dict, plate_ids: Optional[Set[str]] = None) -> Dict:
         """
         Fix bolt positions using proper transformations.
         
@@ -517,6 +641,8 @@ class UniversalGeometryEngine:
         
         Args:
             ifc_data: Full IFC data dictionary
+            plate_ids: Incremental mode. When given, only bolts of these
+                plates (or without a parent plate) are revisited.
         
         Returns:
             Updated IFC data
@@ -531,16 +657,43 @@ class UniversalGeometryEngine:
                 pass
         
         # Process bolts array
+        revisited = 0
         for bolt in bolts:
+            if plate_ids is not None and bolt.get('plate_id') and bolt.get('plate_id') not in plate_ids:
+                continue
+            revisited += 1
             # Will be handled by synthesis agent with correct parent joint
             pass
         
         ifc_data['fasteners'] = fasteners
         ifc_data['bolts'] = bolts
         
-        logger.info(f"Processed {len(fasteners)} fasteners, {len(bolts)} bolts")
+        logger.info(f"Processed {len(fasteners)} fasteners, {revisited}/{len(bolts)} bolts")
         
         return ifc_data
+
+    def fix_coordinate_origins(self, ifc_data: Dict, incremental: bool = False) -> Dict:
+        """
+        Extract members, detect joints and place plates/bolts in one pass.
+
+        With ``incremental=True`` (on an engine that already ran a pass) only
+        plates and bolts whose joints were added, removed or moved since the
+        previous pass, or that were not placed before, are revisited.
+        """
+        self.previous_joints = dict(self.joints)
+        had_pass = bool(self.plate_assignments) or bool(self.previous_joints)
+        self.joint_connections = {}
+        self.extract_members(ifc_data)
+        self.detect_joints_from_geometry(ifc_data)  # Pass ifc_data to use pre-existing joints
+        if not (incremental and had_pass):
+            ifc_data = self.fix_plate_positions(ifc_data)
+            return self.fix_bolt_positions(ifc_data)
+        changed = self.changed_joints()
+        before = dict(self.plate_assignments)
+        ifc_data = self.fix_plate_positions(ifc_data, changed_joints=changed)
+        revisited_plates = {pid for pid, a in self.plate_assignments.items() if before.get(pid) != a}
+        revisited_plates |= {pid for pid, (jid, _) in before.items() if jid in changed}
+        return self.fix_bolt_positions(ifc_data, plate_ids=revisited_plates)
     
     def process_ifc_file(self, ifc_file_path: str, output_file_path: str) -> bool:
         """
@@ -609,7 +762,8 @@ class UniversalGeometryEngine:
         }
 
 
-def fix_coordinate_origins_universal(ifc_data: Dict) -> Dict:
+def fix_coordinate_origins_universal(ifc_data: Dict, engine: Optional[UniversalGeometryEngine] = None,
+                                     incremental: bool = False) -> Dict:
     """
     Quick function to fix coordinate origins in any IFC data.
     
@@ -623,17 +777,16 @@ def fix_coordinate_origins_universal(ifc_data: Dict) -> Dict:
     
     Args:
         ifc_data: Input IFC dictionary
+        engine: Engine to (re)use; keeps joint/plate state between passes
+        incremental: Only revisit plates and bolts whose joints changed since
+            ``engine``'s previous pass (see ``fix_coordinate_origins``)
     
     Returns:
         Corrected IFC dictionary with proper coordinates
     """
-    engine = UniversalGeometryEngine()
-    engine.extract_members(ifc_data)
-    engine.detect_joints_from_geometry(ifc_data)  # Pass ifc_data to use pre-existing joints
-    ifc_data = engine.fix_plate_positions(ifc_data)
-    ifc_data = engine.fix_bolt_positions(ifc_data)
-    
-    return ifc_data
+    if engine is None:
+        engine = UniversalGeometryEngine()
+    return engine.fix_coordinate_origins(ifc_data, incremental=incremental)
 
 
 if __name__ == '__main__':
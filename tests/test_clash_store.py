@@ -0,0 +1,77 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from src.pipeline.agents.comprehensive_clash_detector_v2 import ComprehensiveClashDetector
+from src.pipeline.clash_store import ClashStore, JsonlSink, ParquetSink
+
+
+def _model(n=60, seed=2):
+    rng = np.random.default_rng(seed)
+    members = []
+    for i in range(n):
+        s = rng.uniform(0, 10, 3)
+        members.append({'id': f'M{i}', 'type': 'beam', 'start': s.tolist(), 'end': (s + rng.normal(0, 4, 3)).tolist()})
+    plates = [{'id': f'{"base_" if k % 3 == 0 else ""}P{k}', 'position': rng.uniform(0, 10, 3).tolist(),
+               'thickness_mm': 5, 'members': [f'M{k}'] if k % 2 else []} for k in range(20)]
+    bolts = [{'id': f'B{k}', 'plate_id': f'P{k % 25}', 'position': rng.uniform(0, 10, 3).tolist(), 'diameter_mm': 21}
+             for k in range(40)]
+    return {'members': members, 'plates': plates, 'bolts': bolts, 'joints': [], 'welds': []}
+
+
+def test_store_streams_and_summarizes_detector_findings():
+    fh = io.StringIO()
+    detector = ComprehensiveClashDetector()
+    detector.store = ClashStore(sink=JsonlSink(fh), flush_every=7)
+    clashes, summary = detector.detect_all_clashes(_model())
+    store = detector.store
+    assert len(store) == len(clashes) > 50
+    # rows reach the sink in batches while the run is going
+    assert len(fh.getvalue().splitlines()) == len(clashes) // 7 * 7
+    store.close()
+
+    streamed = [json.loads(line) for line in fh.getvalue().splitlines()]
+    assert streamed == json.loads(json.dumps(store.records()))
+    assert [r['clash_id'] for r in streamed] == [c.clash_id for c in clashes]
+    for record, clash in zip(streamed, clashes):
+        assert record['category'] == clash.category.value
+        assert record['severity'] == clash.severity.name
+        assert (record['element_id'], record['description'], record['check']) == \
+               (clash.element_id, clash.description, clash.check)
+        current = clash.current_value
+        assert record['current_value'] == (list(current) if isinstance(current, tuple) else current)
+
+    counts = store.summary()
+    for key in ('total', 'critical', 'major', 'moderate', 'by_category'):
+        assert counts[key] == summary[key]
+    assert sum(counts['by_element_type'].values()) == len(clashes)
+    pair = next(r for r in streamed if r['category'] == 'GEOMETRIC_3D_INTERSECTION')
+    assert pair['related_id'] in pair['description'] and len(pair['current_value']) == 3
+
+
+def test_paged_iteration():
+    store = ClashStore.from_clashes(ComprehensiveClashDetector().detect_all_clashes(_model())[0])
+    first = store.page(0, size=25)
+    assert first['total'] == len(store) and first['pages'] == -(-len(store) // 25)
+    assert first['items'] == store.records(0, 25)
+    assert store.page(first['pages'], size=25)['items'] == []
+    pages = list(store.iter_pages(size=25))
+    assert len(pages) == first['pages'] and sum(pages, []) == store.records()
+
+
+def test_parquet_sink_needs_pyarrow(tmp_path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        with pytest.raises(ImportError):
+            ParquetSink(str(tmp_path / 'clashes.parquet'))
+        return
+    clashes, _ = ComprehensiveClashDetector().detect_all_clashes(_model())
+    path = str(tmp_path / 'clashes.parquet')
+    with ClashStore(sink=ParquetSink(path), flush_every=10) as store:
+        store.extend(clashes)
+    table = pq.read_table(path)
+    assert table.num_rows == len(clashes)
+    assert table.column('clash_id').to_pylist() == [c.clash_id for c in clashes]
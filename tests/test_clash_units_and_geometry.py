@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 from src.pipeline.agents.comprehensive_clash_detector_v2 import ComprehensiveClashDetector, ClashCategory
 from src.pipeline.agents.tolerance_and_standards_providers import ToleranceProvider, StandardsProvider
+from src.pipeline.geometry.kernels import segment_distances
 
 class TestUnitsAndGeometry(unittest.TestCase):
     def setUp(self):
@@ -45,5 +46,212 @@ class TestUnitsAndGeometry(unittest.TestCase):
         categories = [c.category for c in self.detector.clashes]
         self.assertIn(ClashCategory.PLATE_ELEVATION_MISMATCH, categories)
 
+    def test_member_intersections_match_pairwise_scan_beyond_old_cap(self):
+        rng = np.random.default_rng(8)
+        members = []
+        for i in range(220):  # 24090 pairs, past the old 10000-pair cap
+            # beams along x and y on a few levels, some just off the level
+            s = np.array([rng.uniform(0, 20), rng.uniform(0, 20), rng.choice([0.0, 0.005, 3.0, 3.05])])
+            axis = i % 2
+            s[axis] = 0.0
+            e = s.copy()
+            e[axis] = 20.0
+            members.append({'id': f'M{i}', 'start': s.tolist(), 'end': e.tolist()})
+        members.append({'id': 'M_no_end', 'start': [0.5, 0.0, 0.0]})
+        joints = [{'members': ['M0', 'M1', 'M2']}]
+        clashes, summary = self.detector.detect_all_clashes({'members': members, 'joints': joints})
+        found = [c.description for c in clashes if c.category == ClashCategory.GEOMETRIC_3D_INTERSECTION]
+
+        # every pair through the kernel, ends defaulting to (1, 0, 0) as in _members_3d_intersect
+        starts = np.array([m['start'] for m in members], dtype=float)
+        ends = np.array([m.get('end', [1.0, 0.0, 0.0]) for m in members], dtype=float)
+        i, j = np.triu_indices(len(members), 1)
+        d, _, _ = segment_distances(starts[i], ends[i], starts[j], ends[j])
+        expected = [f"Members {members[a]['id']} and {members[b]['id']} intersect in 3D without joint"
+                    for a, b in zip(i[d < 0.01], j[d < 0.01])
+                    if not {members[a]['id'], members[b]['id']} <= {'M0', 'M1', 'M2'}]
+        self.assertTrue(self.detector._members_3d_intersect(members[int(i[d < 0.01][0])], members[int(j[d < 0.01][0])]))
+        self.assertTrue(expected)
+        self.assertEqual(found, expected)
+        stats = summary['broad_phase']['member_pairs']
+        self.assertEqual(stats['total'], 221 * 220 // 2)
+        self.assertEqual(stats['considered'] + stats['pruned'], stats['total'])
+        self.assertGreater(stats['pruned'], 0)
+
+    def test_member_plate_penetrations_match_pairwise_scan_beyond_old_cap(self):
+        rng = np.random.default_rng(9)
+        members = []
+        for i in range(150):  # 150 x 60 = 9000 pairs, past the old 5000-check cap
+            s = rng.uniform(0, 10, 3)
+            members.append({'id': f'M{i}', 'start': s.tolist(), 'end': (s + rng.normal(0, 1.5, 3)).tolist()})
+        members.append({'id': 'M_no_end', 'start': [2.0, 2.0, 4.0]})
+        plates = [{'id': f'P{k}', 'position': rng.uniform(0, 10, 3).tolist(), 'thickness_mm': 20,
+                   'outline': {'width_mm': 900, 'height_mm': 600}} for k in range(60)]
+        plates.append({'id': 'P_origin', 'position': [0.0, 0.0, 2.0]})
+        clashes, summary = self.detector.detect_all_clashes({'members': members, 'plates': plates})
+        found = [c.description for c in clashes if c.category == ClashCategory.GEOMETRIC_PENETRATION]
+
+        expected = [f"Member {m['id']} penetrates plate {p['id']}"
+                    for m in members for p in plates if self.detector._member_penetrates_plate(m, p)]
+        self.assertGreater(len(expected), 10)
+        self.assertIn("Member M_no_end penetrates plate P_origin", expected)
+        self.assertEqual(found, expected)
+        stats = summary['broad_phase']['member_plate_pairs']
+        self.assertEqual(stats['total'], 151 * 61)
+        self.assertEqual(stats['penetrating'], len(expected))
+        self.assertGreater(stats['pruned'], 0)
+
+    def test_plate_checks_use_run_indexes(self):
+        members = [{'id': 'C1', 'start': [0.0, 0.0, 0.0], 'end': [0.0, 0.0, 12.0]}]
+        # every plate references C1 from 1m away: past the old 2000-check alignment cap
+        plates = [{'id': f'P{k}', 'position': [1.0, 0.0, 0.0], 'members': ['C1']} for k in range(2100)]
+        plates.append({'id': 'base_plate_1', 'position': [0.0, 0.0, 0.5], 'members': ['C1'],
+                       'thickness_mm': 5, 'outline': {'width_mm': 400, 'height_mm': 400}})
+        bolts = [{'id': f'B{k}', 'plate_id': 'base_plate_1', 'position': [0.1 * k, 0.0, 0.5], 'diameter_mm': 20}
+                 for k in range(3)]
+        joints = [{'id': 'J1', 'members': ['C1', 'C1']}]
+        clashes, _ = self.detector.detect_all_clashes({'members': members, 'plates': plates, 'bolts': bolts, 'joints': joints})
+        by_category = {}
+        for c in clashes:
+            by_category.setdefault(c.category, []).append(c.element_id)
+        self.assertEqual(len(by_category[ClashCategory.PLATE_MEMBER_MISALIGNMENT]), 2100)
+        self.assertEqual(by_category[ClashCategory.PLATE_BEARING_INSUFFICIENT], ['base_plate_1'])
+        # one joint lists C1 (twice): still a single bracing point
+        self.assertEqual(by_category[ClashCategory.MEMBER_LATERAL_BRACING], ['C1'])
+        self.assertEqual([c.current_value for c in clashes if c.category == ClashCategory.MEMBER_LATERAL_BRACING], [1])
+        self.assertEqual(self.detector.indexes.bolts_by_plate['base_plate_1'], bolts)
+
+    def test_parallel_families_merge_like_a_sequential_run(self):
+        rng = np.random.default_rng(11)
+        members = []
+        for i in range(80):
+            s = rng.uniform(0, 12, 3)
+            members.append({'id': f'M{i}', 'type': 'beam', 'start': s.tolist(), 'end': (s + rng.normal(0, 4, 3)).tolist()})
+        plates = [{'id': f'{"base_" if k % 4 == 0 else ""}P{k}', 'position': rng.uniform(0, 12, 3).tolist(),
+                   'thickness_mm': 5, 'members': [f'M{k}']} for k in range(30)]
+        bolts = [{'id': f'B{k}', 'plate_id': f'P{k % 35}', 'position': rng.uniform(0, 12, 3).tolist(), 'diameter_mm': 21}
+                 for k in range(60)]
+        ifc = {'members': members, 'plates': plates, 'bolts': bolts, 'joints': [{'members': ['M0', 'M1']}],
+               'welds': [{'id': 'W1', 'plate_id': 'P1', 'size_mm': 7}]}
+
+        def run(**kwargs):
+            clashes, summary = self.detector.detect_all_clashes(ifc, **kwargs)
+            return [(c.clash_id, c.category, c.element_id, c.description) for c in clashes], summary
+
+        sequential, summary = run()
+        self.assertGreater(len(sequential), 50)
+        for kwargs in ({'workers': 4}, {'workers': 3, 'executor': 'process'}):
+            clashes, parallel_summary = run(**kwargs)
+            self.assertEqual(clashes, sequential)
+            self.assertEqual(parallel_summary['broad_phase'], summary['broad_phase'])
+            self.assertEqual(parallel_summary['by_category'], summary['by_category'])
+        timings = summary['family_timings_s']
+        self.assertEqual(len(timings), 13)
+        self.assertEqual(list(timings)[-1], 'cascading')
+        with self.assertRaises(ValueError):
+            run(workers=2, executor='fibers')
+
+    def test_redetect_after_in_place_edits_matches_full_run(self):
+        from collections import Counter
+        from src.pipeline.agents.comprehensive_clash_corrector_v2 import ComprehensiveClashCorrector
+        rng = np.random.default_rng(5)
+        members = []
+        for i in range(120):
+            s = rng.uniform(0, 15, 3)
+            members.append({'id': f'M{i}', 'type': 'beam', 'start': s.tolist(), 'end': (s + rng.normal(0, 4, 3)).tolist()})
+        plates = [{'id': f'{"base_" if k % 4 == 0 else ""}P{k}', 'position': rng.uniform(0, 15, 3).tolist(),
+                   'thickness_mm': 5, 'outline': {'width_mm': 400, 'height_mm': 400}, 'members': [f'M{k}']}
+                  for k in range(40)]
+        bolts = [{'id': f'B{k}', 'plate_id': f'P{k % 45}', 'position': rng.uniform(0, 15, 3).tolist(), 'diameter_mm': 21}
+                 for k in range(80)]
+        joints = [{'id': f'J{k}', 'members': [f'M{k}', f'M{k + 1}']} for k in range(0, 60, 2)]
+        ifc = {'members': members, 'plates': plates, 'bolts': bolts, 'joints': joints,
+               'welds': [{'id': 'W1', 'plate_id': 'P1', 'size_mm': 7}],
+               'anchors': [{'id': 'A1', 'position': [0.5, 0.5, 0.0]}]}
+        clashes, _ = self.detector.detect_all_clashes(ifc)
+
+        corrector = ComprehensiveClashCorrector()
+        corrector.correct_all_clashes(clashes, ifc)
+        self.assertIn('B2', corrector.modified_ids()['bolt'])
+
+        members[3]['end'] = [7.0, 7.0, 7.0]
+        members[50]['start'] = plates[6]['position']
+        plates[6]['position'] = [1.0, 2.0, 3.0]
+        plates[7]['members'] = []
+        bolts[2]['plate_id'] = 'P9'
+        bolts[4]['diameter_mm'] = 22.225
+        ifc['welds'][0]['size_mm'] = 6.4
+        joints[1]['members'] = ['M2', 'M40']
+        ifc['anchors'][0]['position'] = [0.01, 0.5, 0.0]
+        modified = {'member': {'M3', 'M50'}, 'plate': {'P6', 'P7'}, 'bolt': {'B2', 'B4'}, 'weld': {'W1'},
+                    'joint': {'J2'}, 'anchor': {'A1'}}
+        updated, summary = self.detector.redetect(modified)
+        self.assertFalse(summary['incremental']['full_run'])
+        self.assertEqual(summary['incremental']['rechecked']['z_level_rules'], 2)
+
+        key = lambda cs: Counter((c.category, c.element_id, c.description) for c in cs)
+        fresh, fresh_summary = ComprehensiveClashDetector().detect_all_clashes(ifc)
+        self.assertEqual(key(updated), key(fresh))
+        self.assertEqual(summary['by_category'], fresh_summary['by_category'])
+
+        # growing the model is not an in-place edit: full run
+        members.append({'id': 'M999', 'start': [0, 0, 0], 'end': [1, 0, 0]})
+        _, summary = self.detector.redetect({'member': {'M999'}})
+        self.assertTrue(summary['incremental']['full_run'])
+
+    def test_member_section_overlaps_match_pairwise_sat(self):
+        import itertools
+        from collections import Counter
+        from src.pipeline.geometry.kernels import obb_overlaps, segment_obbs
+        rng = np.random.default_rng(8)
+        ipe = {'dims': {'h': 300, 'b': 150, 'tf': 10.7, 'tw': 7.1}}
+        members = []
+        for i in range(150):
+            s = rng.uniform(0, 12, 3)
+            members.append({'id': f'M{i}', 'type': 'beam', 'start': s.tolist(), 'end': (s + rng.normal(0, 3, 3)).tolist()})
+            if i % 5:
+                members[-1]['profile'] = ipe if i % 3 else {'dims': {'d': 219}}
+        # a parallel pair 0.2m apart, overlapping only as solids
+        members[1].update(start=[0.0, 0.0, 20.0], end=[6.0, 0.0, 20.0])
+        members[2].update(start=[1.0, 0.0, 20.2], end=[7.0, 0.0, 20.2])
+        joints = [{'id': f'J{k}', 'members': [f'M{k}', f'M{k + 1}']} for k in range(10, 60, 2)]
+        ifc = {'members': members, 'joints': joints, 'plates': [], 'bolts': [], 'welds': []}
+        clashes, summary = self.detector.detect_all_clashes(ifc)
+        found = [(c.element_id, c.sources[1][1]) for c in clashes if c.category == ClashCategory.GEOMETRIC_3D_OVERLAP]
+
+        joined = {frozenset(j['members']) for j in joints}
+        expected = []
+        for a, b in itertools.combinations(range(len(members)), 2):
+            ma, mb = members[a], members[b]
+            if 'profile' not in ma or 'profile' not in mb or frozenset([ma['id'], mb['id']]) in joined:
+                continue
+            d, _, _ = segment_distances(ma['start'], ma['end'], mb['start'], mb['end'])
+            if d[0] < 0.01:
+                continue
+            boxes = [segment_obbs([m['start']], [m['end']], m['profile']['dims'].get('h', 219) / 2000.0,
+                                  m['profile']['dims'].get('b', 219) / 2000.0) for m in (ma, mb)]
+            depth, _ = obb_overlaps(*boxes[0], *boxes[1])
+            if depth[0] > 0.005:
+                expected.append((ma['id'], mb['id']))
+        self.assertIn(('M1', 'M2'), expected)
+        self.assertGreater(len(expected), 5)
+        self.assertEqual(found, expected)
+        self.assertEqual(summary['by_category']['GEOMETRIC_3D_OVERLAP'], len(expected))
+        pair = next(c for c in clashes if c.category == ClashCategory.GEOMETRIC_3D_OVERLAP and c.element_id == 'M1')
+        self.assertAlmostEqual(pair.current_value, 0.1)
+
+        # no profiles, no overlap check
+        bare = [{k: v for k, v in m.items() if k != 'profile'} for m in members]
+        clashes, _ = ComprehensiveClashDetector().detect_all_clashes(dict(ifc, members=bare))
+        self.assertFalse(any(c.category == ClashCategory.GEOMETRIC_3D_OVERLAP for c in clashes))
+
+        # moving or re-profiling members re-runs the overlap check for them only
+        members[2]['start'], members[2]['end'] = [1.0, 0.0, 20.25], [7.0, 0.0, 20.25]
+        members[7]['profile'] = {'dims': {'h': 900, 'b': 300}}
+        updated, summary = self.detector.redetect({'member': {'M2', 'M7'}})
+        self.assertFalse(summary['incremental']['full_run'])
+        key = lambda cs: Counter((c.category, c.element_id, c.description) for c in cs)
+        self.assertEqual(key(updated), key(ComprehensiveClashDetector().detect_all_clashes(ifc)[0]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,178 @@
+import os
+import shutil
+import stat
+
+import ezdxf
+import pytest
+
+from src.pipeline import pipeline_compat
+from src.pipeline.support.cache import FileLRUCache, file_digest
+
+
+FAKE_ODA = """#!/bin/sh
+# fake ODAFileConverter <in_dir> <out_dir> <version> ...: "converts" by copying
+echo "$3" >> "{calls}"
+for f in "$1"/*.dwg; do
+  b=$(basename "$f" .dwg)
+  cp "$f" "$2/$b.dxf"
+done
+"""
+
+
+@pytest.fixture
+def fake_oda(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    calls = tmp_path / 'calls.txt'
+    script = bin_dir / 'ODAFileConverter'
+    script.write_text(FAKE_ODA.format(calls=calls))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return calls
+
+
+def _fake_dwg(path):
+    # The fake converter copies bytes, so a DXF payload passes validation
+    doc = ezdxf.new()
+    doc.modelspace().add_line((0, 0, 0), (1000, 0, 0))
+    doc.saveas(path)
+    return str(path)
+
+
+def test_file_lru_cache_hits_misses_and_eviction(tmp_path):
+    src = tmp_path / 'payload.bin'
+    src.write_bytes(b'x' * 100)
+    cache = FileLRUCache(str(tmp_path / 'cache'), max_bytes=250, suffix='.bin')
+    assert cache.get('a') is None
+    cache.put('a', str(src), {'n': 1})
+    cache.put('b', str(src), {'n': 2})
+    path, meta = cache.get('a')
+    assert meta['n'] == 1 and open(path, 'rb').read() == b'x' * 100
+    os.utime(os.path.join(cache.cache_dir, 'b.json'), (1, 1))
+    cache.put('c', str(src), {'n': 3})
+    # 'b' was least recently used and is evicted to stay under 250 bytes
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats() == {'hits': 3, 'misses': 2, 'evictions': 1, 'hit_rate': 0.6}
+
+
+def test_file_digest_depends_on_salt(tmp_path):
+    f = tmp_path / 'f'
+    f.write_bytes(b'abc')
+    assert file_digest(str(f)) != file_digest(str(f), salt='ODA 25.4')
+
+
+def test_repeat_dwg_submission_skips_oda(tmp_path, fake_oda):
+    cache = FileLRUCache(str(tmp_path / 'cache'), suffix='.dxf')
+    first_dir = tmp_path / 'job1'
+    first_dir.mkdir()
+    dxf1 = pipeline_compat.convert_dwg_to_dxf(_fake_dwg(first_dir / 'frame.dwg'), cache=cache)
+    assert dxf1 and os.path.exists(dxf1)
+    assert fake_oda.read_text().split() == ['ACAD2018']
+
+    second_dir = tmp_path / 'job2'
+    second_dir.mkdir()
+    shutil.copyfile(first_dir / 'frame.dwg', second_dir / 'frame.dwg')
+    dxf2 = pipeline_compat.convert_dwg_to_dxf(str(second_dir / 'frame.dwg'), cache=cache)
+    assert dxf2 == str(second_dir / 'frame.dxf')
+    assert fake_oda.read_text().split() == ['ACAD2018']
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    _, meta = cache.get(file_digest(str(second_dir / 'frame.dwg'),
+                                    salt=pipeline_compat._oda_converter_version(str(fake_oda.parent / 'bin' / 'ODAFileConverter'))))
+    assert meta['dxf_version'] == 'ACAD2018'
+    assert meta['validation']['entity_count'] == 1
+
+
+FAKE_ODA_LEGACY_ONLY = """#!/bin/sh
+# fake converter: drawings named *legacy* only convert to ACAD2010
+echo "$3 $(ls "$1" | wc -l)" >> "{calls}"
+for f in "$1"/*.dwg; do
+  b=$(basename "$f" .dwg)
+  case "$b" in
+    *legacy*) [ "$3" = "ACAD2010" ] && cp "$f" "$2/$b.dxf" ;;
+    *) cp "$f" "$2/$b.dxf" ;;
+  esac
+done
+"""
+
+
+def test_batch_conversion_single_run_per_version(tmp_path, fake_oda):
+    script = fake_oda.parent / 'bin' / 'ODAFileConverter'
+    script.write_text(FAKE_ODA_LEGACY_ONLY.format(calls=fake_oda))
+    a_dir, b_dir = tmp_path / 'a', tmp_path / 'b'
+    a_dir.mkdir()
+    b_dir.mkdir()
+    paths = [
+        _fake_dwg(a_dir / 'frame.dwg'),
+        _fake_dwg(b_dir / 'frame.dwg'),
+        _fake_dwg(a_dir / 'legacy_truss.dwg'),
+    ]
+    results = pipeline_compat.convert_dwgs_to_dxf(paths, cache=False)
+
+    # one converter run per version; only the failing drawing is retried
+    assert fake_oda.read_text().splitlines() == ['ACAD2018 3', 'ACAD2013 1', 'ACAD2010 1']
+    assert results[paths[0]]['dxf'] == str(a_dir / 'frame.dxf')
+    assert results[paths[1]]['dxf'] == str(b_dir / 'frame.dxf')
+    assert results[paths[0]]['dxf_version'] == 'ACAD2018'
+    legacy = results[paths[2]]
+    assert legacy['dxf_version'] == 'ACAD2010' and legacy['error'] is None
+    assert legacy['validation']['valid'] and not legacy['cached']
+
+
+def test_same_stem_inputs_into_one_output_folder(tmp_path, fake_oda):
+    a_dir, b_dir, out_dir = tmp_path / 'a', tmp_path / 'b', tmp_path / 'out'
+    for d in (a_dir, b_dir, out_dir):
+        d.mkdir()
+    first = _fake_dwg(a_dir / 'frame.dwg')
+    doc = ezdxf.new()
+    doc.modelspace().add_line((0, 0, 0), (1000, 0, 0))
+    doc.modelspace().add_line((0, 0, 0), (0, 1000, 0))
+    doc.saveas(b_dir / 'frame.dwg')
+    second = str(b_dir / 'frame.dwg')
+
+    results = pipeline_compat.convert_dwgs_to_dxf([first, second], output_dir=str(out_dir), cache=False)
+    assert results[first]['dxf'] == str(out_dir / 'frame.dxf')
+    assert results[second]['dxf'] != results[first]['dxf']
+    assert os.path.dirname(results[second]['dxf']) == str(out_dir)
+    # each result describes the file on disk under its own name
+    for path, lines in ((first, 1), (second, 2)):
+        res = results[path]
+        assert res['validation']['entity_count'] == lines
+        assert len(ezdxf.readfile(res['dxf']).modelspace().query('LINE')) == lines
+
+
+def test_batch_cli_parses_each_drawing_once(tmp_path, fake_oda, monkeypatch):
+    import json
+    import cli
+    from src.pipeline import dxf_parser
+
+    parses, runs = [], []
+    real_parse = dxf_parser.parse_dxf_file
+
+    def counting_parse(path, **options):
+        parses.append((path, options.get('layer_filter')))
+        return real_parse(path, **options)
+
+    monkeypatch.setattr(dxf_parser, 'parse_dxf_file', counting_parse)
+    monkeypatch.setattr(cli, 'run_pipeline', lambda data, out_dir=None, extra=None: runs.append((data, extra)) or {})
+    paths = [_fake_dwg(tmp_path / 'frame.dwg'), _fake_dwg(tmp_path / 'truss.dwg')]
+    config = tmp_path / 'jobs.json'
+    config.write_text(json.dumps({'jobs': [
+        {'input': paths[0], 'output': str(tmp_path / 'o1')},
+        {'input': paths[1], 'output': str(tmp_path / 'o2'), 'layer_filter': 'no-annotation'},
+    ]}))
+    monkeypatch.setenv('AIBUILDX_DISABLE_DWG_CACHE', '1')
+    assert cli.ConversionCLI.batch(str(config)) == 0
+
+    # validation parsed each drawing with its job's options; the runs reuse those payloads
+    assert sorted(parses) == [(str(tmp_path / 'frame_ACAD2018.dxf'), None),
+                              (str(tmp_path / 'truss_ACAD2018.dxf'), 'no-annotation')]
+    assert [len(data['members']) for data, _ in runs] == [1, 1]
+    assert runs[1][1] == {'layer_filter': 'no-annotation'}
+    assert fake_oda.read_text().split() == ['ACAD2018', 'ACAD2018']
+
+    # without parse options conversion only collects the statistics
+    parses.clear()
+    results = pipeline_compat.convert_dwgs_to_dxf(paths, cache=False)
+    assert not parses and results[paths[0]]['validation']['entity_count'] == 1
@@ -0,0 +1,332 @@
+import types
+
+import ezdxf
+import pytest
+
+from src.pipeline.agents import main_pipeline_agent
+from src.pipeline.dxf_parser import parse_dxf_file, iter_dxf_records
+
+
+def _geometry(members):
+    return [(m['start'], m['end'], m['layer']) for m in members]
+
+
+@pytest.fixture
+def mixed_dxf(tmp_path):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((0, 0, 0), (6000, 0, 0), dxfattribs={'layer': 'BEAMS'})
+    msp.add_line((0, 0, 0), (0, 0, 4000), dxfattribs={'layer': 'COLUMNS'})
+    msp.add_lwpolyline([(0, 0), (1000, 0), (1000, 1000)], close=True, dxfattribs={'layer': 'BRACING'})
+    msp.add_polyline3d([(0, 0, 0), (500, 500, 500), (1000, 0, 1000)])
+    msp.add_3dface([(0, 0, 0), (100, 0, 0), (100, 100, 0), (0, 100, 0)])
+    msp.add_arc((0, 0), 1000, 0, 90)
+    msp.add_ellipse((0, 0), major_axis=(2000, 0), ratio=0.5)
+    msp.add_spline(fit_points=[(0, 0), (1000, 500), (2000, 0)])
+    msp.add_circle((6000, 0, 0), 50, dxfattribs={'layer': 'CONNECTIONS'})
+    msp.add_text('ignored')
+    path = tmp_path / 'mixed.dxf'
+    doc.saveas(path)
+    return str(path)
+
+
+def test_streaming_matches_full_document_parse(mixed_dxf):
+    full = parse_dxf_file(mixed_dxf)
+    streamed = parse_dxf_file(mixed_dxf, streaming=True)
+    assert len(full['members']) > 60
+    assert _geometry(streamed['members']) == _geometry(full['members'])
+    assert streamed['circles'] == full['circles']
+
+
+def test_iter_dxf_records_is_lazy_and_tagged(mixed_dxf):
+    records = iter_dxf_records(mixed_dxf)
+    assert isinstance(records, types.GeneratorType)
+    kind, record = next(records)
+    assert kind == 'member'
+    assert record['start'] == [0.0, 0.0, 0.0] and record['layer'] == 'BEAMS'
+    kinds = {k for k, _ in records}
+    assert kinds == {'member', 'circle'}
+
+
+def test_iter_dxf_records_invalid_file(tmp_path):
+    bad = tmp_path / 'bad.dxf'
+    bad.write_text('not a dxf file\n')
+    with pytest.raises(RuntimeError):
+        list(iter_dxf_records(str(bad)))
+
+
+def test_main_pipeline_consumes_record_stream(mixed_dxf, monkeypatch):
+    monkeypatch.setenv('AIBUILDX_DISABLE_DETECTION', '1')
+    monkeypatch.setenv('AIBUILDX_DISABLE_IFC', '1')
+    res = main_pipeline_agent.process({'data': {'dxf_entities': iter_dxf_records(mixed_dxf)}})
+    assert res['status'] == 'ok'
+    assert len(res['result']['miner']['circles']) == 1
+    assert len(res['result']['miner']['members']) == len(parse_dxf_file(mixed_dxf)['members'])
+
+
+def _without_ids(records):
+    return [{k: v for k, v in r.items() if k != 'id'} for r in records]
+
+
+@pytest.mark.parametrize('fixture', ['mixed_dxf', 'block_dxf', 'layered_dxf'])
+def test_parallel_extraction_matches_serial(fixture, request):
+    path = request.getfixturevalue(fixture)
+    layer_filter = {'exclude': ['*DIMS*', 'A-*']} if fixture == 'layered_dxf' else None
+    serial = parse_dxf_file(path, streaming=True, layer_filter=layer_filter)
+    # tiny ranges: every entity lands in its own worker task
+    parallel = parse_dxf_file(path, workers=2, chunk_bytes=64, layer_filter=layer_filter)
+    assert _without_ids(parallel['members']) == _without_ids(serial['members'])
+    assert parallel['circles'] == serial['circles']
+    assert parallel['dxf_stats'] == serial['dxf_stats']
+
+
+def test_entity_ranges_keep_sub_entities_with_their_parent(tmp_path):
+    from src.pipeline import dxf_parser
+
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for k in range(20):
+        msp.add_polyline3d([(0, k, 0), (1000, k, 0), (1000, k, 1000)])
+        msp.add_line((0, k, 0), (0, k, 3000))
+    path = str(tmp_path / 'polylines.dxf')
+    doc.saveas(path)
+    info = ezdxf.filemanagement.dxf_file_info(path)
+    layout = dxf_parser._dxf_layout(path, info.encoding, entities=True)
+    spans = dxf_parser._entity_ranges(path, layout, 1)
+    with open(path, 'rb') as fp:
+        data = fp.read()
+    heads = [data[a:b].split(b'\n')[1].strip() for a, b in spans]
+    assert set(heads) == {b'POLYLINE', b'LINE'} and len(spans) == 40
+    assert spans[0][0] == layout['entities'][0] and spans[-1][1] == layout['entities'][1]
+
+
+def test_ingest_stats_collected_in_both_modes(tmp_path):
+    doc = ezdxf.new()
+    doc.layers.add('BEAMS')
+    msp = doc.modelspace()
+    msp.add_line((0, 0, 0), (1000, 0, 0), dxfattribs={'layer': 'BEAMS'})
+    msp.add_lwpolyline([(0, 0), (100, 0)], close=True)
+    msp.add_lwpolyline([(0, 0), (100, 0), (100, 0), (100, 100), (0, 100)])
+    msp.add_hatch()
+    path = str(tmp_path / 'issues.dxf')
+    doc.saveas(path)
+
+    for streaming in (False, True):
+        stats = parse_dxf_file(path, streaming=streaming)['dxf_stats']
+        assert stats['entity_count'] == 4
+        assert stats['layer_count'] == 3 and stats['block_count'] == 2
+        assert stats['polyline_issues'] == 2 and stats['hatch_issues'] == 1
+        assert stats['proxy_count'] == 0
+        assert stats['units'] == 6
+
+
+def test_run_pipeline_reads_dxf_once(mixed_dxf, monkeypatch):
+    from src.pipeline import pipeline_compat
+    import src.pipeline.dxf_parser as dxf_parser
+
+    calls = []
+    real_parse = dxf_parser.parse_dxf_file
+    monkeypatch.setattr(dxf_parser, 'parse_dxf_file', lambda *a, **k: calls.append(a) or real_parse(*a, **k))
+    reads = []
+    real_readfile = ezdxf.readfile
+    monkeypatch.setattr(ezdxf, 'readfile', lambda *a, **k: reads.append(a) or real_readfile(*a, **k))
+    monkeypatch.setenv('AIBUILDX_DISABLE_DETECTION', '1')
+    monkeypatch.setenv('AIBUILDX_DISABLE_IFC', '1')
+
+    res = pipeline_compat.run_pipeline(mixed_dxf)
+    assert len(calls) == 1 and len(reads) == 1
+    assert res['dxf_stats']['entity_count'] == 10
+    assert len(res['miner']['circles']) == 1
+
+
+@pytest.fixture
+def block_dxf(tmp_path):
+    doc = ezdxf.new()
+    bay = doc.blocks.new('BAY', base_point=(10, 0, 0))
+    bay.add_line((10, 0, 0), (6010, 0, 0))
+    bay.add_line((10, 0, 0), (10, 0, 4000), dxfattribs={'layer': 'COLUMNS'})
+    bay.add_circle((6010, 0, 0), 50)
+    nested = doc.blocks.new('FRAME')
+    nested.add_blockref('BAY', (0, 0, 0))
+    nested.add_line((0, 0, 0), (0, 3000, 0))
+    msp = doc.modelspace()
+    msp.add_blockref('BAY', (100, 0, 0), dxfattribs={'rotation': 90, 'layer': 'BEAMS'})
+    msp.add_blockref('BAY', (0, 0, 0)).grid(size=(2, 2), spacing=(8000, 7000))
+    msp.add_blockref('FRAME', (0, 20000, 0), dxfattribs={'xscale': 2, 'yscale': 2, 'zscale': 2})
+    path = tmp_path / 'blocks.dxf'
+    doc.saveas(path)
+    return str(path)
+
+
+def _reference_lines(path):
+    doc = ezdxf.readfile(path)
+    lines = []
+
+    def explode(insert):
+        for e in insert.virtual_entities():
+            if e.dxftype() == 'INSERT':
+                explode(e)
+            elif e.dxftype() == 'LINE':
+                lines.append((tuple(round(c, 6) for c in e.dxf.start), tuple(round(c, 6) for c in e.dxf.end)))
+
+    for insert in doc.modelspace().query('INSERT'):
+        for single in insert.multi_insert():
+            explode(single)
+    return sorted(lines)
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_insert_expansion_matches_ezdxf_explode(block_dxf, streaming):
+    parsed = parse_dxf_file(block_dxf, streaming=streaming)
+    lines = sorted((tuple(round(c, 6) for c in m['start']), tuple(round(c, 6) for c in m['end']))
+                   for m in parsed['members'])
+    assert lines == _reference_lines(block_dxf)
+    stats = parsed['dxf_stats']
+    assert stats['block_instances'] == 6
+    assert stats['block_definitions_used'] == 2
+    assert len(parsed['circles']) == 6
+
+
+def test_streaming_decodes_only_referenced_blocks(block_dxf, monkeypatch):
+    from src.pipeline import dxf_parser
+
+    doc = ezdxf.readfile(block_dxf)
+    unused = doc.blocks.new('UNUSED')
+    for k in range(50):
+        unused.add_line((0, k, 0), (1000, k, 0))
+    # a point list at the very end of a block range must not be cut short
+    doc.blocks.new('TAIL').add_lwpolyline([(0, 0), (500, 500), (900, 0)])
+    doc.modelspace().add_blockref('TAIL', (0, -5000, 0))
+    doc.saveas(block_dxf)
+    decoded = []
+    range_tags = dxf_parser._range_tags
+
+    def spy(file_path, encoding, start, stop):
+        decoded.append((start, stop))
+        return range_tags(file_path, encoding, start, stop)
+
+    monkeypatch.setattr(dxf_parser, '_range_tags', spy)
+    parsed = parse_dxf_file(block_dxf, streaming=True)
+    # BAY, FRAME and TAIL are each read once from their byte range, UNUSED never
+    assert len(decoded) == 3
+    assert parsed['dxf_stats']['block_definitions_used'] == 3
+    assert _geometry(parsed['members']) == _geometry(parse_dxf_file(block_dxf)['members'])
+
+
+def test_block_layout_finds_every_definition(block_dxf):
+    from src.pipeline import dxf_parser
+
+    blocks = dxf_parser._dxf_layout(block_dxf, 'utf8')['blocks']
+    # the first definition directly follows the section header
+    assert {'*Model_Space', '*Paper_Space', 'BAY', 'FRAME'} <= set(blocks)
+    assert blocks['BAY'][0] == (10.0, 0.0, 0.0)
+
+
+def test_block_members_carry_instance_references(block_dxf):
+    members = parse_dxf_file(block_dxf)['members']
+    rotated = [m for m in members if m['layer'] in ('BEAMS', 'COLUMNS') and m['block_instance'] == members[0]['block_instance']]
+    # entities on layer 0 take the INSERT layer, others keep their own
+    assert [m['layer'] for m in rotated] == ['BEAMS', 'COLUMNS']
+    assert [m['block_member'] for m in rotated] == [0, 1]
+    grid_instances = {m['block_instance'] for m in members if m['block'] == 'BAY'}
+    assert len(grid_instances) == 5
+    frame = [m for m in members if m['block'] == 'FRAME']
+    assert len(frame) == 3 and max(m['length'] for m in frame) == pytest.approx(12000.0)
+
+
+def _max_chord_error(members, center, radius):
+    errors = []
+    for m in members:
+        mid = [(s + e) / 2 for s, e in zip(m['start'], m['end'])]
+        errors.append(radius - sum((c - o) ** 2 for c, o in zip(mid, center)) ** 0.5)
+    return max(errors)
+
+
+@pytest.mark.parametrize('tolerance', [0.5, 5.0, 50.0])
+def test_arc_tessellation_respects_chord_tolerance(tmp_path, tolerance):
+    doc = ezdxf.new()
+    doc.modelspace().add_arc((0, 0), 20000, 0, 90)
+    path = str(tmp_path / 'arc.dxf')
+    doc.saveas(path)
+    parsed = parse_dxf_file(path, chord_tolerance=tolerance)
+    members = parsed['members']
+    assert _max_chord_error(members, (0, 0, 0), 20000) <= tolerance
+    assert parsed['dxf_stats']['curve_segments'] == len(members)
+    coarser = parse_dxf_file(path, chord_tolerance=tolerance * 4)['members']
+    assert len(coarser) < len(members)
+
+
+def test_legacy_tessellation_without_tolerance(mixed_dxf):
+    parsed = parse_dxf_file(mixed_dxf, chord_tolerance=None, coalesce=False)
+    # fixed steps: 8 segments for the quarter arc, 64 for the ellipse
+    assert len(parsed['members']) == 83
+    assert parsed['dxf_stats']['curve_segments'] == 72
+
+
+def test_collinear_polyline_segments_are_coalesced(tmp_path):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (1000, 0), (2500, 0), (6000, 0), (6000, 3000)], dxfattribs={'layer': 'BEAMS'})
+    msp.add_polyline3d([(0, 0, 0), (0, 0, 1000), (0, 0, 4000), (0, 0, 1000)], dxfattribs={'layer': 'COLUMNS'})
+    msp.add_line((6000, 3000, 0), (9000, 3000, 0), dxfattribs={'layer': 'BEAMS'})
+    msp.add_line((9000, 3000, 0), (12000, 3000, 0), dxfattribs={'layer': 'BEAMS'})
+    path = str(tmp_path / 'runs.dxf')
+    doc.saveas(path)
+    for streaming, workers in ((False, None), (True, None), (False, 2)):
+        parsed = parse_dxf_file(path, streaming=streaming, workers=workers)
+        assert _geometry(parsed['members']) == [
+            ([0.0, 0.0, 0.0], [6000.0, 0.0, 0.0], 'BEAMS'),
+            ([6000.0, 0.0, 0.0], [6000.0, 3000.0, 0.0], 'BEAMS'),
+            ([0.0, 0.0, 0.0], [0.0, 0.0, 4000.0], 'COLUMNS'),
+            # reversal is not a continuation
+            ([0.0, 0.0, 4000.0], [0.0, 0.0, 1000.0], 'COLUMNS'),
+            # separate entities are never merged
+            ([6000.0, 3000.0, 0.0], [9000.0, 3000.0, 0.0], 'BEAMS'),
+            ([9000.0, 3000.0, 0.0], [12000.0, 3000.0, 0.0], 'BEAMS'),
+        ]
+        assert parsed['dxf_stats']['segments_coalesced'] == 3
+    assert len(parse_dxf_file(path, coalesce=False)['members']) == 9
+
+
+@pytest.fixture
+def layered_dxf(tmp_path):
+    doc = ezdxf.new()
+    detail = doc.blocks.new('DETAIL')
+    detail.add_line((0, 0, 0), (100, 0, 0))
+    detail.add_line((0, 0, 0), (0, 100, 0), dxfattribs={'layer': 'S-DIMS'})
+    detail.add_circle((0, 0, 0), 10, dxfattribs={'layer': 'CONNECTIONS'})
+    msp = doc.modelspace()
+    msp.add_line((0, 0, 0), (6000, 0, 0), dxfattribs={'layer': 'S-BEAM'})
+    msp.add_polyline3d([(0, 0, 0), (0, 3000, 0), (0, 3000, 3000)], dxfattribs={'layer': 'A-WALL'})
+    msp.add_lwpolyline([(0, 0), (500, 500)], dxfattribs={'layer': 'S-BEAM-DIMS'})
+    msp.add_polyline3d([(0, 0, 0), (0, 0, 4000)], dxfattribs={'layer': 'S-COLS'})
+    msp.add_circle((6000, 0, 0), 50, dxfattribs={'layer': 'CONNECTIONS'})
+    msp.add_blockref('DETAIL', (1000, 0, 0), dxfattribs={'layer': 'S-BEAM'})
+    msp.add_blockref('DETAIL', (2000, 0, 0), dxfattribs={'layer': 'A-FURN'})
+    path = tmp_path / 'layers.dxf'
+    doc.saveas(path)
+    return str(path)
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_layer_filter_skips_entities_before_conversion(layered_dxf, streaming):
+    parsed = parse_dxf_file(layered_dxf, streaming=streaming,
+                            layer_filter={'include': ['S-*', 'CONNECTIONS'], 'exclude': ['*DIMS*']})
+    assert sorted({m['layer'] for m in parsed['members']}) == ['S-BEAM', 'S-COLS']
+    # block layer 0 content follows the INSERT layer; the A-FURN insert keeps only its connection circle
+    assert len([m for m in parsed['members'] if m.get('block')]) == 1
+    assert len(parsed['circles']) == 3
+    stats = parsed['dxf_stats']
+    assert stats['entities_filtered'] == 2
+    assert stats['layer_filter']['exclude'] == ['*DIMS*']
+    unfiltered = parse_dxf_file(layered_dxf, streaming=streaming)
+    assert unfiltered['dxf_stats']['entity_count'] == stats['entity_count']
+    assert len(unfiltered['members']) == len(parsed['members']) + 6
+
+
+def test_layer_filter_from_pipeline_extra():
+    from src.pipeline.dxf_parser import dxf_parse_options
+
+    options = dxf_parse_options({'layer_filter': 'AISC structural', 'workers': 2})
+    assert options['layer_filter'] == 'AISC structural' and options['workers'] == 2
+    assert 'layer_filter' not in dxf_parse_options({})
@@ -0,0 +1,70 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from src.pipeline.geometry_agent import merge_nodes, merge_nodes_array
+
+
+def _round_key(pt):
+    return (int(round(pt[0])), int(round(pt[1])), int(round(pt[2])))
+
+
+def _linear_scan_merge(members, tolerance):
+    """Reference: the original O(endpoints x nodes) welding loop."""
+    nodes, mapping = [], {}
+    for m in members:
+        for pt in (tuple(m['start']), tuple(m['end'])):
+            key = _round_key(pt)
+            if key in mapping:
+                continue
+            found = next((i for i, n in enumerate(nodes)
+                          if math.hypot(math.hypot(n['x'] - pt[0], n['y'] - pt[1]), n['z'] - pt[2]) <= tolerance), None)
+            if found is None:
+                found = len(nodes)
+                nodes.append({'id': found, 'x': pt[0], 'y': pt[1], 'z': pt[2]})
+            mapping[key] = found
+    return nodes, mapping
+
+
+def _jittered_frame(n, jitter, seed=7):
+    rng = random.Random(seed)
+    grid = [(x * 500.0, y * 500.0, z * 3000.0) for x in range(12) for y in range(12) for z in range(3)]
+
+    def point():
+        return [c + rng.uniform(-jitter, jitter) for c in rng.choice(grid)]
+    return [{'id': f'm{i}', 'start': point(), 'end': point()} for i in range(n)]
+
+
+@pytest.mark.parametrize('tolerance', [0.0, 5.0, 10.0, 25.0])
+def test_grid_merge_matches_linear_scan(tolerance):
+    members = _jittered_frame(600, jitter=12.0)
+    assert merge_nodes(members, tolerance=tolerance) == _linear_scan_merge(members, tolerance)
+
+
+@pytest.mark.parametrize('tolerance', [0.0, 10.0, 25.0])
+def test_array_merge_matches_merge_nodes(tolerance):
+    members = _jittered_frame(600, jitter=12.0, seed=3)
+    nodes, mapping = merge_nodes(members, tolerance=tolerance)
+    xyz, start_ids, end_ids = merge_nodes_array([m['start'] for m in members], [m['end'] for m in members], tolerance)
+    assert xyz.tolist() == [[n['x'], n['y'], n['z']] for n in nodes]
+    assert start_ids.tolist() == [mapping[_round_key(m['start'])] for m in members]
+    assert end_ids.tolist() == [mapping[_round_key(m['end'])] for m in members]
+
+
+def test_merge_keeps_first_node_when_clusters_chain():
+    # 0 -> 8 -> 16: the middle point joins node 0, the last one is 16 away from it
+    members = [{'start': (0, 0, 0), 'end': (8, 0, 0)}, {'start': (16, 0, 0), 'end': (1000, 0, 0)}]
+    nodes, mapping = merge_nodes(members, tolerance=10.0)
+    assert [n['x'] for n in nodes] == [0, 16, 1000]
+    assert mapping[(8, 0, 0)] == 0
+    xyz, start_ids, end_ids = merge_nodes_array(np.array([m['start'] for m in members]),
+                                                np.array([m['end'] for m in members]), 10.0)
+    assert xyz[:, 0].tolist() == [0, 16, 1000]
+    assert start_ids.tolist() == [0, 1] and end_ids.tolist() == [0, 2]
+
+
+def test_array_merge_empty_input():
+    xyz, start_ids, end_ids = merge_nodes_array(np.zeros((0, 3)), np.zeros((0, 3)))
+    assert xyz.shape == (0, 3) and len(start_ids) == 0 and len(end_ids) == 0
@@ -0,0 +1,138 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from src.pipeline.geometry import CoordinateSystemManager, RotationMatrix3D
+from src.pipeline.geometry.kernels import (MemberGeometry, get_member_geometry, obb_overlaps, segment_distances,
+                                          segment_obbs)
+from src.pipeline.geometry_agent import resolve_member_orientation, resolve_member_orientations
+from src.pipeline.topology import get_topology
+
+
+def _members(n=200, seed=3):
+    rng = random.Random(seed)
+    members = []
+    for i in range(n):
+        s = [rng.uniform(-5000, 5000) for _ in range(3)]
+        e = list(s) if i % 40 == 0 else [rng.uniform(-5000, 5000) for _ in range(3)]
+        if i % 9 == 0:
+            e = [s[0], s[1], s[2] + 3000]
+        members.append({'id': f'm{i}', 'start': s, 'end': e})
+    return members
+
+
+def test_member_geometry_matches_scalar_resolution():
+    members = _members()
+    geometry = MemberGeometry(members, unit_scale=0.001)
+    expected = [resolve_member_orientation(dict(m)) for m in members]
+    for i, want in enumerate(expected):
+        if 'length' not in want:
+            assert geometry.lengths[i] == 0 and not geometry.directions[i].any()
+            continue
+        assert geometry.lengths[i] == pytest.approx(want['length'])
+        assert geometry.directions[i] == pytest.approx(want['dir'])
+        assert geometry.rotation_z_deg[i] == pytest.approx(want['rotation'])
+        x, y, z = (np.array(v) for v in geometry.local_axes(i).values())
+        assert np.allclose([x @ y, x @ z, y @ z], 0.0, atol=1e-12)
+        assert np.allclose(np.cross(x, y), z)
+    assert np.allclose(geometry.starts_m, geometry.starts / 1000.0)
+
+    resolved = resolve_member_orientations([dict(m) for m in members], geometry=geometry)
+    assert [m.get('rotation') for m in resolved] == [m.get('rotation') for m in
+                                                      resolve_member_orientations([dict(m) for m in members])]
+
+
+def test_geometry_cached_on_topology_until_coordinates_move():
+    members = _members(30)
+    topology = get_topology(members)
+    geometry = topology.geometry
+    assert topology.geometry is geometry
+    assert get_member_geometry(members, geometry=geometry) is geometry
+    assert geometry.row_of(members[7]) == 7
+    members[0]['end'] = [1.0, 2.0, 3.0]
+    assert get_member_geometry(members, geometry=geometry) is not geometry
+    assert get_topology(members, topology=topology).geometry is not geometry
+
+
+def test_batch_transforms_match_point_methods():
+    rng = random.Random(5)
+    points = [[rng.uniform(-10, 10) for _ in range(3)] for _ in range(50)]
+    rotation = RotationMatrix3D.rotation_axis_angle([1, 2, 3], 0.7)
+    batch = RotationMatrix3D.apply_rotation_batch(points, rotation)
+    assert np.allclose(batch, [RotationMatrix3D.apply_rotation(p, rotation) for p in points])
+
+    csm = CoordinateSystemManager()
+    csm.set_ucs_origin([100.0, -50.0, 25.0])
+    c, s = math.cos(0.3), math.sin(0.3)
+    csm.set_ucs_axes([c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0])
+    assert np.allclose(csm.wcs_to_ucs_batch(points), [csm.wcs_to_ucs(p) for p in points])
+    assert np.allclose(csm.ucs_to_wcs_batch(points), [csm.ucs_to_wcs(p) for p in points])
+
+
+def test_segment_distances_match_sampled_minimum():
+    rng = np.random.default_rng(2)
+    n = 400
+    a0, b0 = rng.normal(size=(n, 3)), rng.normal(size=(n, 3))
+    a1, b1 = a0 + rng.normal(size=(n, 3)), b0 + rng.normal(size=(n, 3))
+    a1[::7] = a0[::7]  # points
+    b1[::11] = b0[::11]
+    # parallel, partly overlapping pairs
+    k = slice(None, None, 5)
+    b0[k] = a0[k] + [0.0, 0.3, 0.0]
+    b1[k] = b0[k] + (a1[k] - a0[k]) * rng.uniform(-2, 2, (len(b0[k]), 1))
+    d, pa, pb = segment_distances(a0, a1, b0, b1)
+    assert np.allclose(np.linalg.norm(pa - pb, axis=1), d)
+    t = np.linspace(0.0, 1.0, 401)[:, None]
+    for i in range(0, n, 3):
+        p = a0[i] + t * (a1[i] - a0[i])
+        q = b0[i] + t * (b1[i] - b0[i])
+        sampled = np.sqrt(((p[:, None] - q[None]) ** 2).sum(axis=-1)).min()
+        assert d[i] <= sampled + 1e-9 and sampled - d[i] < 1e-4
+
+    # one segment against many, and the parallel overlap case exactly
+    d, _, _ = segment_distances([0, 0, 0], [4, 0, 0], [[1, 1, 0], [5, 0, 0], [2, 0, 3]], [[3, 1, 0], [6, 0, 0], [2, 0, 3]])
+    assert np.allclose(d, [1.0, 1.0, 3.0])
+
+
+def test_obb_overlaps_match_trimesh_boxes():
+    trimesh = pytest.importorskip('trimesh')
+    from scipy.spatial import ConvexHull
+    rng = np.random.default_rng(4)
+    n = 300
+    centres_a, centres_b = rng.uniform(-1, 1, (n, 3)), rng.uniform(-1, 1, (n, 3))
+    half_a, half_b = rng.uniform(0.05, 0.8, (n, 3)), rng.uniform(0.05, 0.8, (n, 3))
+    axes_a = np.array([trimesh.transformations.random_rotation_matrix(rng.random(3))[:3, :3].T for _ in range(n)])
+    axes_b = np.array([trimesh.transformations.random_rotation_matrix(rng.random(3))[:3, :3].T for _ in range(n)])
+    axes_b[::10] = axes_a[::10]  # parallel edges: degenerate cross axes
+    depth, axis = obb_overlaps(centres_a, axes_a, half_a, centres_b, axes_b, half_b)
+    assert np.allclose(np.linalg.norm(axis, axis=1), 1.0)
+    assert (np.einsum('ij,ij->i', axis, centres_b - centres_a) >= -1e-12).all()
+
+    def vertices(c, ax, h):
+        transform = np.eye(4)
+        transform[:3, :3], transform[:3, 3] = ax.T, c
+        return trimesh.creation.box(extents=2 * h, transform=transform).vertices
+
+    # reference: the Minkowski difference b - a of the two trimesh boxes holds
+    # the origin as deep as the boxes interpenetrate (or is as far off as the gap
+    # along its best face normal)
+    for k in range(n):
+        va = vertices(centres_a[k], axes_a[k], half_a[k])
+        vb = vertices(centres_b[k], axes_b[k], half_b[k])
+        hull = ConvexHull((vb[:, None] - va[None]).reshape(-1, 3))
+        assert depth[k] == pytest.approx(-hull.equations[:, 3].max(), abs=1e-9)
+    assert (depth > 0).sum() > 50 and (depth < 0).sum() > 50
+
+    # axis-aligned: overlap along x, gap along y; one box against many
+    eye = np.eye(3)
+    depth, axis = obb_overlaps([0, 0, 0], eye, [1, 1, 1], [[1.5, 0.2, 0], [0, -2.5, 0]], eye, [1, 1, 1])
+    assert np.allclose(depth, [0.5, -0.5]) and np.allclose(axis, [[1, 0, 0], [0, -1, 0]])
+
+
+def test_segment_obbs_follow_member_frames():
+    centres, axes, half = segment_obbs([[0, 0, 0], [1, 1, 1]], [[4, 0, 0], [1, 1, 1]], [0.15, 0.1], 0.075)
+    assert np.allclose(centres, [[2, 0, 0], [1, 1, 1]])
+    assert np.allclose(axes[0], [[1, 0, 0], [0, 0, 1], [0, -1, 0]]) and np.allclose(axes[1], np.eye(3))
+    assert np.allclose(half, [[2, 0.15, 0.075], [0, 0.1, 0.075]])
@@ -0,0 +1,90 @@
+import random
+
+from src.pipeline import joint_enrichment
+from src.pipeline.joint_enrichment import _detect_splices, _distance, _collinear, _member_dir, \
+    _near_miss_hidden_joints, merge_joints
+
+
+def _pairwise_hidden(members, tol):
+    """Reference: the original all-pairs hidden joint scan."""
+    joints = []
+    for i, m1 in enumerate(members):
+        s1, e1 = m1.get("start"), m1.get("end")
+        for m2 in members[i + 1:]:
+            s2, e2 = m2.get("start"), m2.get("end")
+            if not (s1 and e1 and s2 and e2):
+                continue
+            for p, q in [(s1, s2), (s1, e2), (e1, s2), (e1, e2)]:
+                if _distance(p, q) <= tol:
+                    joints.append({"id": f"hidden_{len(joints)}", "position": [(p[k] + q[k]) / 2 for k in range(3)],
+                                   "members": [m1.get("id"), m2.get("id")], "hidden": True,
+                                   "joint_category": "hidden"})
+                    break
+    return joints
+
+
+def _pairwise_splices(members, gap_tol):
+    """Reference: the original all-pairs splice scan."""
+    splices = []
+    for i, m1 in enumerate(members):
+        for m2 in members[i + 1:]:
+            if not _collinear(_member_dir(m1), _member_dir(m2)):
+                continue
+            ends1, ends2 = [m1.get("start"), m1.get("end")], [m2.get("start"), m2.get("end")]
+            if not all(ends1) or not all(ends2):
+                continue
+            gap = min(_distance(p, q) for p in ends1 for q in ends2)
+            if 0 < gap <= gap_tol:
+                splices.append({"id": f"splice_{len(splices)}",
+                                "position": [(m1["end"][k] + m2["start"][k]) / 2 for k in range(3)],
+                                "members": [m1.get("id"), m2.get("id")], "joint_category": "splice",
+                                "splice_type": "bolted"})
+    return splices
+
+
+def _pairwise_merge(base, new, tol):
+    merged = list(base)
+    for j in new:
+        pos = j.get("position") or j.get("location")
+        if not pos or not any((k.get("position") or k.get("location")) and
+                              _distance(pos, k.get("position") or k.get("location")) <= tol for k in merged):
+            merged.append(j)
+    return merged
+
+
+def _frame(n, seed=7):
+    rng = random.Random(seed)
+    members = []
+    for i in range(n):
+        x, y, z = rng.randint(0, 8) * 1000.0 + rng.uniform(-80, 80), rng.randint(0, 8) * 1000.0, rng.randint(0, 3) * 3000.0
+        kind = rng.random()
+        if kind < 0.4:
+            end = [x + 1000.0 + rng.uniform(-150, 150), y, z]
+        elif kind < 0.7:
+            end = [x, y, z + 3000.0]
+        else:
+            end = [x + rng.uniform(-2000, 2000), y + 1000.0, z + 3000.0]
+        start = None if i % 53 == 0 else [x, y, z]
+        members.append({"id": f"m{i}", "start": start, "end": end})
+    return members
+
+
+def test_indexed_searches_match_pairwise_scans():
+    members = _frame(600)
+    hidden = _near_miss_hidden_joints(members, tol=75.0)
+    assert hidden and hidden == _pairwise_hidden(members, 75.0)
+    splices = _detect_splices(members, gap_tol=120.0)
+    assert splices and splices == _pairwise_splices(members, 120.0)
+    # a shared index built for the larger radius gives the same answers
+    index = joint_enrichment._EndpointIndex(members, radius=120.0)
+    assert _near_miss_hidden_joints(members, tol=75.0, index=index) == hidden
+    assert _detect_splices(members, gap_tol=120.0, index=index) == splices
+
+
+def test_merge_joints_matches_pairwise_duplicate_check():
+    rng = random.Random(11)
+    joints = [{"position": [rng.uniform(0, 500), rng.uniform(0, 500), 0.0]} for _ in range(300)]
+    joints += [{"location": [5.0, 5.0, 0.0]}, {"id": "no_position"}, {"position": [float("nan"), 0.0, 0.0]}]
+    rng.shuffle(joints)
+    assert merge_joints(joints[:50], joints[50:], tol=20.0) == _pairwise_merge(joints[:50], joints[50:], 20.0)
+    assert merge_joints(joints[:5], [], tol=20.0) == joints[:5]
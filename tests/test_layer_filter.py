@@ -0,0 +1,44 @@
+import pytest
+
+from src.pipeline.support.layer_filter import LAYER_PROFILES, LayerFilter, make_layer_filter
+
+
+def test_include_and_exclude_globs_are_case_insensitive():
+    keep = LayerFilter(include=['s-*', 'BEAMS'], exclude=['*-DIM*'])
+    assert keep('S-COLS') and keep('beams')
+    assert not keep('S-BEAM-DIMS')  # exclude wins over include
+    assert not keep('A-WALL')
+
+
+def test_empty_include_keeps_everything_not_excluded():
+    keep = LayerFilter(exclude=['*TEXT*'])
+    assert keep('0') and keep(None) and keep('A-WALL')
+    assert not keep('ANNO-TEXT')
+
+
+@pytest.mark.parametrize('name', ['AISC structural', 'aisc_structural', 'Tekla export', 'no-annotation'])
+def test_named_profiles_resolve(name):
+    layer_filter = make_layer_filter(name)
+    assert layer_filter.profile in LAYER_PROFILES
+    assert not layer_filter('DEFPOINTS')
+
+
+def test_profiles_keep_structural_layers_only():
+    aisc = make_layer_filter('AISC structural')
+    assert aisc('S-BEAM') and aisc('STEEL COLUMNS') and aisc('CONNECTIONS')
+    assert not aisc('A-WALL') and not aisc('S-GRID') and not aisc('S-BEAM-TEXT')
+    tekla = make_layer_filter('tekla-export')
+    assert tekla('HEA300') and tekla('IPE240') and tekla('W310X97') and tekla('PL10*200')
+    assert not tekla('WALL') and not tekla('PLAN-NOTES') and not tekla('CLOUD')
+
+
+def test_make_layer_filter_specs():
+    assert make_layer_filter(None) is None and make_layer_filter({}) is None
+    combined = make_layer_filter({'profile': 'tekla-export', 'include': 'ROOF*, CANOPY', 'exclude': ['IPE80']})
+    assert combined('ROOF-PURLINS') and combined('CANOPY') and not combined('IPE80')
+    existing = LayerFilter(include=['X'])
+    assert make_layer_filter(existing) is existing
+    with pytest.raises(ValueError):
+        make_layer_filter('unknown profile')
+    with pytest.raises(TypeError):
+        make_layer_filter(42)
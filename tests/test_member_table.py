@@ -0,0 +1,154 @@
+import math
+
+import pytest
+
+from src.pipeline import pipeline_v2
+from src.pipeline.agents import main_pipeline_agent
+from src.pipeline.geometry_agent import resolve_member_orientation, resolve_member_orientations
+from src.pipeline.ifc_generator import _member_column_flags
+from src.pipeline.material_classifier import classify_materials
+from src.pipeline.member_table import MemberTable, as_member_table
+from src.pipeline.section_classifier import classify_sections
+
+
+def _members():
+    return [
+        {'id': 'c1', 'start': [0, 0, 0], 'end': [0, 0, 4000], 'layer': 'COLUMNS', 'role': 'column'},
+        {'id': 'b1', 'start': [0, 0, 4000], 'end': [6000, 0, 4000], 'layer': 'BEAMS', 'profile': 'W14x22'},
+        {'id': 'br', 'start': [0, 0, 0], 'end': [6000, 0, 4000], 'layer': 'BRACING', 'annotation': 'S355 brace'},
+        {'id': 'z0', 'start': [5, 5, 5], 'end': [5, 5, 5], 'layer': 'BEAMS', 'note': {'k': 1}},
+    ]
+
+
+def test_round_trip_and_dict_view():
+    members = _members()
+    table = MemberTable.from_members(members)
+    assert len(table) == 4
+    assert table.to_members() == members
+    assert table.categories['layer'].values == ['COLUMNS', 'BEAMS', 'BRACING']
+    row = table[1]
+    assert row['start'] == [0.0, 0.0, 4000.0]
+    assert row.get('role') is None and 'role' not in row
+    assert {**row}['profile'] == 'W14x22'
+    row['end'] = [7000, 0, 4000]
+    row['layer'] = 'GIRDERS'
+    row['custom'] = 3
+    assert table.end[1].tolist() == [7000.0, 0.0, 4000.0]
+    assert table.decoded('layer')[1] == 'GIRDERS'
+    del row['profile']
+    assert 'profile' not in table.to_members()[1]
+    assert table.to_members()[1]['custom'] == 3
+    assert as_member_table(table) is table
+    assert table.row_of('br') == 2
+
+
+def test_dict_values_keep_their_content_per_row():
+    members = [
+        {'id': 'a', 'start': [0, 0, 0], 'end': [1, 0, 0], 'profile': {'name': 'W10', 'depth': 250}},
+        {'id': 'b', 'start': [0, 0, 0], 'end': [1, 0, 0], 'profile': {'name': 'W10', 'depth': 999}},
+        {'id': 'c', 'start': [0, 0, 0], 'end': [1, 0, 0], 'profile': {'name': 'W10', 'depth': 250}},
+    ]
+    table = MemberTable.from_members(members)
+    assert [row['profile']['depth'] for row in table] == [250, 999, 250]
+    # equal values share a code, but rows never share the dict they hand out
+    assert len(table.categories['profile']) == 2
+    list(table)[0]['profile']['depth'] = 1
+    members[2]['profile']['depth'] = 2
+    assert [row['profile']['depth'] for row in table] == [250, 999, 250]
+    assert table.to_members()[1]['profile'] == {'name': 'W10', 'depth': 999}
+
+
+def test_update_geometry_matches_per_member_resolution():
+    members = _members()
+    expected = [resolve_member_orientation(dict(m)) for m in members]
+    table = resolve_member_orientations(MemberTable.from_members(members))
+    for got, want in zip(table.to_members(), expected):
+        assert ('length' in got) == ('length' in want)
+        if 'length' in want:
+            assert got['length'] == pytest.approx(want['length'])
+            assert got['dir'] == pytest.approx(list(want['dir']))
+            assert got['rotation'] == pytest.approx(want['rotation'])
+
+
+def test_classification_matches_dict_path():
+    dict_members = classify_materials(classify_sections(_members()))
+    table = classify_materials(classify_sections(MemberTable.from_members(_members())))
+    for got, want in zip(table.to_members(), dict_members):
+        assert got['material']['name'] == want['material']['name']
+        assert got.get('profile') == want.get('profile')
+        assert got.get('area') == want.get('area')
+    # rows with the same material share one category entry
+    assert len(table.categories['material']) < len(table)
+
+
+def _entities():
+    entities = [{'id': m['id'], 'start': m['start'], 'end': m['end'], 'layer': m['layer']} for m in _members()[:3]]
+    for e in entities:
+        e['start'] = [c / 1000.0 for c in e['start']]
+        e['end'] = [c / 1000.0 for c in e['end']]
+    return entities
+
+
+def test_pipeline_v2_stages_take_dicts_or_tables():
+    dict_out = pipeline_v2.engineer_standardize({'members': _entities()})
+    table_out = standardized = pipeline_v2.engineer_standardize({'members': MemberTable.from_members(_entities())})
+    for stage in (pipeline_v2.load_path_resolver, pipeline_v2.stability_agent):
+        dict_out = stage(dict_out)
+        table_out = stage(table_out)
+    dict_opt = pipeline_v2.optimizer_agent(dict_out)
+    table_opt = pipeline_v2.optimizer_agent(table_out)
+    assert isinstance(table_opt['members'], MemberTable)
+    assert all(type(m) is dict for m in dict_opt['members'])
+    assert table_opt['members'].to_members() == dict_opt['members']
+    assert table_opt['totals'] == pytest.approx(dict_opt['totals'])
+    # each stage extends a copy; its input keeps what it had
+    assert 'loads' not in standardized['members'][0]
+    assert 'selection' not in table_out['members'][0]
+    members = {m['id']: m for m in dict_opt['members']}
+    assert [members[k]['type'] for k in ('c1', 'b1', 'br')] == ['column', 'beam', 'brace']
+    assert members['b1']['loads'] == pytest.approx({'axial_kN': 0.6, 'moment_kNm': 22.5, 'shear_kN': 15.0})
+    assert members['c1']['loads']['axial_kN'] == pytest.approx(50.0 * 4 / 3)
+    assert members['br']['loads']['axial_kN'] == 20.0
+    assert members['b1']['stability'] == {'slenderness': pytest.approx(20.0), 'buckling_risk': 'low'}
+    assert all(m['selection']['locked'] is False for m in dict_opt['members'])
+
+
+def test_pipeline_v2_dict_stages_replace_stale_values_and_keep_locks():
+    loaded = pipeline_v2.load_path_resolver(pipeline_v2.engineer_standardize({'members': _entities()}))['members']
+    loaded[1]['loads'] = {'axial_kN': -1.0, 'stale': True}
+    reloaded = pipeline_v2.load_path_resolver({'members': loaded})['members']
+    assert reloaded[1]['loads'] == pytest.approx({'axial_kN': 0.6, 'moment_kNm': 22.5, 'shear_kN': 15.0})
+    largest = max(pipeline_v2.SECTION_CATALOG, key=lambda s: s['area'])['name']
+    reloaded[0]['selection'] = {'section_name': largest, 'locked': True}
+    optimized = pipeline_v2.optimizer_agent({'members': reloaded})['members']
+    assert optimized[0]['selection']['section_name'] == largest
+    assert optimized[0]['selection']['locked'] is True
+    assert optimized[1]['selection']['locked'] is False
+
+
+def test_pipelines_ingest_members_into_one_table(monkeypatch, tmp_path):
+    monkeypatch.setenv('AIBUILDX_DISABLE_DETECTION', '1')
+    monkeypatch.setenv('AIBUILDX_DISABLE_IFC', '1')
+    built = []
+    from_members = MemberTable.from_members.__func__
+    monkeypatch.setattr(MemberTable, 'from_members',
+                        classmethod(lambda cls, members: built.append(cls) or from_members(cls, members)))
+    res = main_pipeline_agent.process({'data': {'members': _members()[:3]}})
+    assert res['status'] == 'ok' and len(built) == 1
+    classified = res['result']['members_classified']
+    assert all(type(m) is dict for m in classified + res['result']['erection_sequence'])
+    assert [m['id'] for m in classified] == ['c1', 'b1', 'br']
+    assert all(m['material']['name'] and m['node_start'] is not None for m in classified)
+
+    out = pipeline_v2.Pipeline().run_from_dxf_entities(_entities(), out_dir=str(tmp_path))
+    assert isinstance(out['engineer']['members'], MemberTable)
+    assert 'loads' not in out['engineer']['members'][0]
+    assert out['optimizer']['members'][0]['selection']['section_name']
+    assert out['final']['members']
+
+
+def test_ifc_column_flags_match_dict_path():
+    members = resolve_member_orientations(_members())
+    table = resolve_member_orientations(MemberTable.from_members(_members()))
+    assert _member_column_flags(table) == _member_column_flags(members) == [True, False, False, False]
+    assert not math.isnan(table.length[0])
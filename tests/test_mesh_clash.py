@@ -26,3 +26,55 @@ def test_precise_mesh_clasher_optional():
     res = precise_mesh_clasher(sample)
     assert isinstance(res, dict)
     assert 'clashes' in res
+
+
+def test_precise_mesh_clasher_tolerance_reaches_past_candidate_padding():
+    try:
+        import fcl  # type: ignore  # noqa: F401
+        pytest.skip('python-fcl decides contact without tolerance')
+    except ImportError:
+        pass
+    # default 0.05 m boxes, 0.15 m apart: beyond the shared 0.10 m broad-phase reach
+    sample = {'members': [
+        {'id': 'm1', 'start': [0, 0, 0], 'end': [2, 0, 0], 'length': 2.0},
+        {'id': 'm2', 'start': [0, 0.2, 0], 'end': [2, 0.2, 0], 'length': 2.0}
+    ]}
+    assert precise_mesh_clasher(sample)['clashes'] == []
+    clashes = precise_mesh_clasher(sample, tol=0.2)['clashes']
+    assert [(c['a'], c['b']) for c in clashes] == [('m1', 'm2')]
+    assert clashes[0]['depth_m'] == pytest.approx(-0.15)
+
+
+def test_shared_candidates_match_all_pairs_scan():
+    import itertools
+    import random
+    from src.pipeline import pipeline_v2 as pv2
+    rng = random.Random(7)
+    mems = []
+    for i in range(150):
+        s = [round(rng.uniform(0, 12), 1), round(rng.uniform(0, 12), 1), rng.choice([0.0, 3.0])]
+        e = [s[0] + rng.choice([0, 6]), s[1] + rng.choice([0, 0.03, 6]), s[2] + rng.choice([0.0, 3.0])]
+        mems.append({'id': f'M{i}', 'start': s, 'end': e, 'selection': {'section_name': rng.choice(['W8x10', 'HSS100x100x6'])}})
+    mep = [{'type': 'pipe', 'start': [rng.uniform(0, 12), 0.0, 2.95], 'end': [rng.uniform(0, 12), 12.0, 2.95]} for _ in range(10)]
+    h = {'members': mems}
+    candidates = pv2.ClashCandidates(mems)
+
+    expected_hard, expected_soft = [], []
+    for a, b in itertools.combinations(range(len(mems)), 2):
+        ma, mb = mems[a], mems[b]
+        d = pv2._segment_segment_distance(ma['start'], ma['end'], mb['start'], mb['end'])
+        shared = {tuple(ma['start']), tuple(ma['end'])} & {tuple(mb['start']), tuple(mb['end'])}
+        if d < 0.02 and not shared:
+            expected_hard.append((ma['id'], mb['id']))
+        if 0 < d * 1000.0 < 50.0:
+            expected_soft.append((ma['id'], mb['id']))
+    hard = pv2.clasher_agent(h, candidates=candidates)['clashes']
+    soft = [c for c in pv2.soft_clash_detector(h, candidates=candidates)['soft_clashes'] if 'a' in c]
+    assert expected_hard and [(c['a'], c['b']) for c in hard] == expected_hard
+    assert expected_soft and [(c['a'], c['b']) for c in soft] == expected_soft
+
+    expected_mep = [(m['id'], k) for m in mems for k, run in enumerate(mep)
+                    if pv2._segment_segment_distance(m['start'], m['end'], run['start'], run['end']) < 0.10]
+    found = pv2.mep_clash_detector(h, mep_data=mep, candidates=candidates)['mep_clashes']
+    assert expected_mep and len(found) == len(expected_mep)
+    assert [c['member_id'] for c in found] == [m for m, _ in expected_mep]
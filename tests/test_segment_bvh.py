@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+
+from src.pipeline.agents.connection_parser_agent import _point_to_line_distance, parse_connections
+from src.pipeline.geometry.segment_bvh import SegmentBVH, point_segment_distances
+from src.pipeline.topology import get_topology
+
+
+def _segments(n=400, seed=2):
+    rng = random.Random(seed)
+    starts, ends = [], []
+    for i in range(n):
+        s = [rng.uniform(0, 20000), rng.uniform(0, 20000), rng.choice([0.0, 3500.0, 7000.0])]
+        e = list(s) if i % 37 == 0 else [s[0] + rng.uniform(-4000, 4000), s[1] + rng.uniform(-4000, 4000),
+                                          s[2] + rng.choice([0.0, 3500.0])]
+        starts.append(s)
+        ends.append(e)
+    starts[5] = [float('nan'), 0.0, 0.0]
+    return np.array(starts), np.array(ends)
+
+
+def test_queries_match_brute_force():
+    starts, ends = _segments()
+    bvh = SegmentBVH(starts, ends, leaf_size=4)
+    rng = random.Random(9)
+    for _ in range(60):
+        p = [rng.uniform(-1000, 21000), rng.uniform(-1000, 21000), rng.uniform(-500, 7500)]
+        d = point_segment_distances(p, starts, ends)
+        idx, dist = bvh.query_radius(p, 900.0)
+        want = np.flatnonzero(d <= 900.0)
+        assert idx.tolist() == want.tolist() and np.allclose(dist, d[want])
+        assert set(want.tolist()) <= set(bvh.candidates(p, 900.0).tolist())
+        finite = np.where(np.isfinite(d), d, np.inf)
+        assert bvh.nearest(p) == (int(np.argmin(finite)), float(finite.min()))
+        lo, hi = np.array(p) - 1500.0, np.array(p) + 1500.0
+        boxes = np.flatnonzero((np.minimum(starts, ends) <= hi).all(axis=1) & (np.maximum(starts, ends) >= lo).all(axis=1))
+        assert bvh.query_box(lo, hi).tolist() == boxes.tolist()
+    assert 5 not in bvh.query_box([-1e9] * 3, [1e9] * 3).tolist()
+    assert SegmentBVH.from_points([]).nearest([0, 0, 0]) is None
+
+
+def _pairwise_member_ids(circle, members, radius):
+    hits = []
+    for m in members:
+        d = _point_to_line_distance(circle['center'], m.get('start', [0, 0, 0]), m.get('end', [1, 0, 0]))
+        if d <= radius:
+            hits.append((d, m['id']))
+    return [mid for _, mid in sorted(hits, key=lambda h: h[0])]
+
+
+def test_parse_connections_matches_full_scan():
+    starts, ends = _segments()
+    members = [{'id': f'm{i}', 'start': s.tolist(), 'end': e.tolist()}
+               for i, (s, e) in enumerate(zip(starts, ends)) if i != 5]
+    rng = random.Random(4)
+    circles = [{'center': list(m['start']), 'radius': 50.0} for m in rng.sample(members, 40)]
+    circles += [{'center': [rng.uniform(0, 20000), rng.uniform(0, 20000), 3500.0]} for _ in range(40)]
+    joints = parse_connections(circles, members)
+    expected = [ids for ids in (_pairwise_member_ids(c, members, 150.0) for c in circles) if ids]
+    assert expected and [j['members'] for j in joints] == expected
+
+    # the run's topology provides the same index
+    topology = get_topology(members)
+    shared = parse_connections(circles, members, topology=topology)
+    assert [j['members'] for j in shared] == expected
+    assert topology.segments is topology.segments
@@ -0,0 +1,112 @@
+import random
+
+import numpy as np
+
+from src.pipeline.agents.clash_detection_correction_agent import ClashDetector
+from src.pipeline.geometry.segment_bvh import point_segment_distances
+from src.pipeline.support.spatial_index import GridIndex, SpatialIndex, box_pairs
+
+
+def _segments(n=500, seed=4):
+    rng = np.random.default_rng(seed)
+    starts = rng.uniform(0, 100, (n, 3))
+    # grid-aligned coordinates, as in building models
+    starts[::3, 0] = np.round(starts[::3, 0] / 6.0) * 6.0
+    ends = starts + rng.normal(0, 3, (n, 3))
+    ends[::17] = starts[::17]
+    starts[7] = [np.nan, 0.0, 0.0]
+    return starts, ends
+
+
+def _box_gaps(lo_a, hi_a, lo_b, hi_b):
+    with np.errstate(invalid='ignore'):
+        gap = np.maximum(np.maximum(lo_b[None] - hi_a[:, None], lo_a[:, None] - hi_b[None]), 0.0)
+        return np.sqrt((gap * gap).sum(axis=-1))
+
+
+def test_queries_match_brute_force():
+    starts, ends = _segments()
+    index = SpatialIndex.from_segments(starts, ends, radii=0.25, leaf_size=4)
+    lo, hi = index.bounds()
+    rng = random.Random(3)
+    for _ in range(40):
+        p = [rng.uniform(-5, 105) for _ in range(3)]
+        d = np.maximum(point_segment_distances(p, starts, ends) - 0.25, 0.0)
+        slots, dist = index.query_radius(p, 6.0)
+        want = np.flatnonzero(d <= 6.0)
+        assert slots.tolist() == want.tolist() and np.allclose(dist, d[want])
+        finite = np.where(np.isfinite(d), d, np.inf)
+        nearest, _ = index.nearest(p, k=5)
+        assert nearest.tolist() == np.lexsort((np.arange(len(d)), finite))[:5].tolist()
+        qlo, qhi = np.array(p) - 4.0, np.array(p) + 4.0
+        boxes = np.flatnonzero((lo <= qhi).all(axis=1) & (hi >= qlo).all(axis=1))
+        assert index.query_box(qlo, qhi).tolist() == boxes.tolist()
+
+    gaps = _box_gaps(lo, hi, lo, hi)
+    i, j = np.nonzero(np.triu(gaps <= 0.5, 1))
+    assert index.pairs_within(0.5).tolist() == np.stack([i, j], axis=1).tolist()
+    assert 7 not in index.pairs_within(1e9).ravel().tolist()
+
+    qlo = np.random.default_rng(1).uniform(0, 100, (80, 3))
+    qhi = qlo + 5.0
+    i, j = np.nonzero(_box_gaps(qlo, qhi, lo, hi) <= 0.2)
+    assert index.overlapping(qlo, qhi, 0.2).tolist() == np.stack([i, j], axis=1).tolist()
+    i, j = np.nonzero(np.triu(_box_gaps(qlo, qhi, qlo, qhi) <= 0.0, 1))
+    assert box_pairs(qlo, qhi).tolist() == np.stack([i, j], axis=1).tolist()
+
+
+def test_incremental_insert_and_remove():
+    starts, ends = _segments(200)
+    index = SpatialIndex.from_segments(starts, ends)
+    for k in range(0, 200, 3):
+        assert index.remove(k)
+    assert not index.remove(0)
+    extra = [('p', k) for k in range(60)]
+    for k, key in enumerate(extra):
+        index.insert_point(key, [k * 1.5, 50.0, 50.0])
+    index.insert_box('box', [10, 10, 10], [12, 12, 12])
+    index.insert_box('box', [80, 80, 80], [81, 81, 81])  # replaces the first box
+    assert len(index) == 200 - 67 + 60 + 1
+    # removed and replaced slots have NaN bounds and never pair
+    lo, hi = index.bounds()
+    i, j = np.nonzero(np.triu(_box_gaps(lo, hi, lo, hi) <= 1.0, 1))
+    assert index.pairs_within(1.0).tolist() == np.stack([i, j], axis=1).tolist()
+    slots, _ = index.query_radius([81.5, 80.5, 80.5], 1.0)
+    assert 'box' in index.ids_of(slots)
+    assert index.ids_of(index.query_box([9, 9, 9], [13, 13, 13])) == []
+
+
+def test_oriented_boxes_and_grid_index():
+    axes = np.array([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+    index = SpatialIndex.from_obbs([[0.0, 0.0, 0.0]], [axes], [[1.0, 2.0, 3.0]])
+    lo, hi = index.bounds()
+    assert lo.tolist() == [[-2.0, -1.0, -3.0]] and hi.tolist() == [[2.0, 1.0, 3.0]]
+    assert np.allclose(index.distances([5.0, 0.0, 0.0], [0]), [3.0])
+
+    grid = GridIndex(cell_size=1.0)
+    grid.insert('a', (0.0, 0.0))
+    grid.insert('b', (1.2, 0.0))
+    assert grid.query_radius((0.2, 0.0), 1.0) == [('a', (0.0, 0.0)), ('b', (1.2, 0.0))]
+    assert grid.query_radius((0.0, 0.0), 0.5) == [('a', (0.0, 0.0))]
+
+
+def test_correction_agent_member_overlaps_match_pairwise_scan():
+    rng = random.Random(5)
+    members = []
+    for i in range(150):
+        s = [rng.choice([0.0, 6000.0, 12000.0]) + rng.uniform(-40, 40), rng.uniform(0, 3000), 0.0]
+        members.append({'id': f'm{i}', 'start': s, 'end': [s[0], s[1], 3500.0 + rng.uniform(-40, 40)]})
+    joints = [{'members': ['m0', 'm1', 'm2']}]
+    detector = ClashDetector()
+    detector._check_member_clashes(members, joints)
+    found = [c.description for c in detector.clashes]
+
+    expected = []
+    for i, m1 in enumerate(members):
+        for m2 in members[i + 1:]:
+            if {m1['id'], m2['id']} <= {'m0', 'm1', 'm2'}:
+                continue
+            d = detector._member_overlap_distance(m1['start'], m1['end'], m2['start'], m2['end'])
+            if d < 50:
+                expected.append(f"Members {m1['id']} and {m2['id']} overlap (distance {d:.1f}mm) without joint")
+    assert expected and found == expected
@@ -0,0 +1,86 @@
+from src.pipeline import geometry_agent
+from src.pipeline.agents import main_pipeline_agent
+from src.pipeline.node_resolution import auto_generate_joints, snap_nodes
+from src.pipeline.topology import Topology, get_topology
+
+
+def _frame():
+    return [
+        {'id': 'c1', 'start': [0, 0, 0], 'end': [0, 0, 4000]},
+        {'id': 'c2', 'start': [6000, 0, 0], 'end': [6000, 0, 4000]},
+        {'id': 'b1', 'start': [0, 0, 4000], 'end': [6000, 0, 4002]},
+        {'id': 'b2', 'start': [6000, 0, 4000], 'end': [12000, 0, 4000]},
+        {'id': 'br', 'start': [3, 0, 4000], 'end': [6000, 0, 0]},
+    ]
+
+
+def test_topology_incidence_adjacency_and_degree():
+    topology = Topology(_frame())
+    assert len(topology.nodes) == 5
+    top_left = topology.member_nodes['c1'][1]
+    assert topology.member_nodes['b1'][0] == top_left == topology.member_nodes['br'][0]
+    assert topology.members_at(top_left) == ['c1', 'b1', 'br']
+    assert topology.degree[top_left] == 3
+    assert [j['members'] for j in topology.joints()] == [['c1', 'b1', 'br'], ['c2', 'b1', 'b2']]
+    assert topology.nearest_node([5, 0, 4010], radius=50) == top_left
+    assert topology.nearest_node([3000, 0, 2000], radius=50) is None
+
+
+def test_nearest_node_matches_scan_for_any_radius():
+    import math
+    import random
+    rng = random.Random(3)
+    members = []
+    for i in range(300):
+        s = [rng.randrange(0, 20000, 250), rng.randrange(0, 20000, 250), rng.choice([0, 4000])]
+        members.append({'id': f'm{i}', 'start': s, 'end': [s[0] + 3000, s[1], s[2]]})
+    topology = Topology(members)
+
+    def scan(point, radius):
+        found = [(math.dist(point, (n['x'], n['y'], n['z'])), n['id']) for n in topology.nodes]
+        found = [f for f in found if f[0] <= radius]
+        return min(found)[1] if found else None
+
+    for radius in (5, 150, 400, 2500):
+        for _ in range(100):
+            point = [rng.uniform(0, 23000), rng.uniform(0, 20000), rng.choice([0, 4000, 4100])]
+            assert topology.nearest_node(point, radius) == scan(point, radius)
+
+
+def test_get_topology_reuses_until_coordinates_change():
+    members = _frame()
+    topology = get_topology(members)
+    assert get_topology(members, topology=topology) is topology
+    copies = [dict(m) for m in members]
+    assert get_topology(copies, topology=topology) is topology
+    assert topology.members_by_id['c1'] is copies[0]
+    assert get_topology(copies, tolerance=5.0, topology=topology) is not topology
+    copies[3]['end'] = [12000, 0, 4500]
+    rebuilt = get_topology(copies, topology=topology)
+    assert rebuilt is not topology and rebuilt.is_current(copies)
+
+
+def test_node_resolution_uses_shared_topology(monkeypatch):
+    members = _frame()
+    topology = Topology(members)
+    monkeypatch.setattr(geometry_agent, 'merge_nodes', lambda *a, **k: (_ for _ in ()).throw(AssertionError('re-welded')))
+    nodes, snapped = snap_nodes(members, topology=topology)
+    assert nodes is topology.nodes
+    assert [(m['node_start'], m['node_end']) for m in snapped] == topology.incidence
+    assert auto_generate_joints(members, topology=topology) == topology.joints()
+
+
+def test_main_pipeline_welds_nodes_once(monkeypatch):
+    monkeypatch.setenv('AIBUILDX_DISABLE_IFC', '1')
+    calls = []
+    original = geometry_agent.merge_nodes
+
+    def counting_merge(members, tolerance=10.0):
+        calls.append(len(members))
+        return original(members, tolerance)
+
+    monkeypatch.setattr(geometry_agent, 'merge_nodes', counting_merge)
+    res = main_pipeline_agent.process({'data': {'members': _frame()}})
+    assert res['status'] == 'ok'
+    assert len(res['result']['joints']) >= 2
+    assert calls == [5]
@@ -0,0 +1,96 @@
+import random
+
+from src.pipeline.universal_geometry_engine import Point3D, UniversalGeometryEngine, \
+    fix_coordinate_origins_universal
+
+
+def _frame(seed=4):
+    """Beams/columns on a 3 m grid whose endpoints meet within a few mm."""
+    rng = random.Random(seed)
+    beams, columns = [], []
+    for i in range(6):
+        for j in range(6):
+            x, y = i * 3000.0, j * 3000.0
+            columns.append({'id': f'c{i}_{j}', 'start': [x, y, 0.0],
+                            'end': [x + rng.uniform(-3, 3), y, 4000.0]})
+            if i < 5:
+                beams.append({'id': f'b{i}_{j}', 'start': [x + rng.uniform(-3, 3), y, 4000.0],
+                              'end': [x + 3000.0, y + rng.uniform(-3, 3), 4000.0]})
+    return {'beams': beams, 'columns': columns}
+
+
+def _pairwise_joint_locations(members, tolerance):
+    """Reference: the original all-pairs candidate scan and greedy 10 mm clustering."""
+    candidates = []
+    for i, m1 in enumerate(members):
+        for m2 in members[i + 1:]:
+            pairs = [(m1['start'], m2['start']), (m1['start'], m2['end']),
+                     (m1['end'], m2['start']), (m1['end'], m2['end'])]
+            p, q = min(pairs, key=lambda pq: pq[0].distance_to(pq[1]))
+            if p.distance_to(q) <= tolerance:
+                candidates.append((p.distance_to(q), Point3D(x=(p.x + q.x) / 2, y=(p.y + q.y) / 2,
+                                                             z=(p.z + q.z) / 2)))
+    used, locations = set(), []
+    for idx, (_, location) in enumerate(candidates):
+        if idx in used:
+            continue
+        cluster = [idx] + [k for k in range(idx + 1, len(candidates))
+                           if k not in used and location.distance_to(candidates[k][1]) < 10.0]
+        used.update(cluster)
+        locations.append(min((candidates[k] for k in cluster), key=lambda c: c[0])[1])
+    return sorted(tuple(round(v, 6) for v in p.to_tuple()) for p in locations)
+
+
+def test_grid_joint_detection_matches_pairwise_scan():
+    engine = UniversalGeometryEngine()
+    members = engine.extract_members(_frame())
+    joints = engine.detect_joints_from_geometry({})
+    got = sorted(tuple(round(v, 6) for v in p.to_tuple()) for p in joints.values())
+    assert got and got == _pairwise_joint_locations(members, engine.tolerance_mm)
+    assert all(len(set(ids)) == len(ids) for ids in engine.joint_connections.values())
+    assert engine.members_by_id['b0_0'] is members[0]
+
+
+def _ifc():
+    joints = [{'id': f'j{k}', 'location': [k * 1000.0, 0.0, 0.0], 'members': [f'm{2 * k}', f'm{2 * k + 1}']}
+              for k in range(4)]
+    plates = [{'id': f'p{k}', 'position': [0, 0, 0], 'placement': {'location': [k * 1000.0 + 5, 0.0, 0.0]}}
+              for k in range(4)]
+    connections = [{'relating_element': f'm{2 * k}', 'related_element': f'p{k}'} for k in range(4)]
+    return {'joints': joints, 'plates': plates, 'bolts': [{'id': 'b0', 'plate_id': 'p0'}],
+            'relationships': {'structural_connections': connections}}
+
+
+def test_plate_matching_by_overlap_and_distance():
+    ifc = _ifc()
+    ifc['relationships']['structural_connections'].pop()  # p3 falls back to the closest joint
+    out = fix_coordinate_origins_universal(ifc)
+    assert [p['position'] for p in out['plates']] == [[k * 1000.0, 0.0, 0.0] for k in range(4)]
+
+
+def test_incremental_pass_only_revisits_changed_joints():
+    engine = UniversalGeometryEngine()
+    ifc = fix_coordinate_origins_universal(_ifc(), engine=engine)
+    first = {pid: a for pid, a in engine.plate_assignments.items()}
+    assert len(first) == 4
+
+    ifc['joints'][2]['location'] = [2000.0, 500.0, 0.0]
+    ifc['plates'][0]['placement']['location'] = [1.0, 2.0, 3.0]  # not a reason to move an assigned plate
+    revisited = []
+    original = engine._joint_id_for_plate
+
+    def spy(plate_id, *args, **kwargs):
+        revisited.append(plate_id)
+        return original(plate_id, *args, **kwargs)
+
+    engine._joint_id_for_plate = spy
+    ifc = fix_coordinate_origins_universal(ifc, engine=engine, incremental=True)
+    assert revisited == ['p2']
+    assert engine.changed_joints() == {'j2'}
+    assert ifc['plates'][2]['position'] == [2000.0, 500.0, 0.0]
+
+    # a plate moved by someone else is put back on its joint
+    ifc['plates'][1]['position'] = [9.0, 9.0, 9.0]
+    revisited.clear()
+    fix_coordinate_origins_universal(ifc, engine=engine, incremental=True)
+    assert revisited == ['p1'] and ifc['plates'][1]['position'] == [1000.0, 0.0, 0.0]